@@ -11,6 +11,7 @@
 # 
 
 import argparse
+import asyncio
 import logging
 import traceback
 
@@ -73,6 +74,38 @@ class ConstrainedDeviceApp():
         
         logging.info("CDA stopped with exit code %s.", str(code))
         
+async def runAppAsync(runSecs: float = None):
+    """
+    Runs the CDA with the asyncio runtime: the CDA is created, started and
+    stopped on the running event loop, so the scheduler and the MQTT and
+    CoAP clients run on that loop.
+    
+    @param runSecs How long to run, or None to run until cancelled (e.g. by
+    a keyboard interrupt).
+    """
+    cda = ConstrainedDeviceApp()
+    cda.startApp()
+    
+    code = -1
+    
+    try:
+        if runSecs is None:
+            await asyncio.Event().wait()
+        else:
+            await asyncio.sleep(runSecs)
+            
+        code = 0
+        
+    except Exception:
+        code = -2
+        raise
+        
+    finally:
+        cda.stopApp(code)
+        
+        # the requests made while stopping are sent before the loop closes
+        await cda.dataManager.closeClientsAsync()
+        
 def main():
     """
     Main function definition for running client as application.
@@ -98,6 +131,24 @@ def main():
     configUtil = ConfigUtil(configFile)
     cda = None
 
+    # check if CDA should run forever
+    runForever = configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.RUN_FOREVER_KEY)
+
+    if configUtil.getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.RUNTIME_MODE_KEY, ConfigConst.DEFAULT_RUNTIME_MODE) == ConfigConst.ASYNCIO_RUNTIME_MODE:
+        try:
+            # run CDA forever, or for ~65 seconds then exit
+            asyncio.run(runAppAsync(None if runForever else 65))
+            
+        except KeyboardInterrupt:
+            logging.warning('Keyboard interruption for CDA. Exiting.')
+            
+        except Exception as e:
+            logging.error('Startup exception caused CDA to fail. Exiting.')
+            traceback.print_exception(type(e), e, e.__traceback__)
+            
+        logging.info('Exiting CDA.')
+        exit()
+
     try:
         # init CDA
         cda = ConstrainedDeviceApp()
@@ -105,9 +156,6 @@ def main():
         # start CDA
         cda.startApp()
 
-        # check if CDA should run forever
-        runForever = configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.RUN_FOREVER_KEY)
-
         if runForever:
             # sleep ~5 seconds every loop
             while (True):
@@ -12,16 +12,26 @@
 
 import logging
 
-from programmingtheiot.cda.connection.CoapClientConnector import CoapClientConnector
-from programmingtheiot.cda.connection.MqttClientConnector import MqttClientConnector
-from programmingtheiot.cda.connection.RedisPersistenceAdapter import RedisPersistenceAdapter
+from importlib import import_module
+
+from programmingtheiot.cda.pipeline.AnomalyDetector import AnomalyDetector
+from programmingtheiot.cda.pipeline.DataPipeline import DataPipeline
+from programmingtheiot.cda.pipeline.DeadbandFilter import DeadbandFilter
+from programmingtheiot.cda.pipeline.PredictiveFilter import PredictiveFilter
+from programmingtheiot.cda.pipeline.MessageBatcher import MessageBatcher
+from programmingtheiot.cda.pipeline.PriorityLanes import PriorityLanes
+from programmingtheiot.cda.pipeline.RuleEngine import RuleEngine
+from programmingtheiot.cda.pipeline.SinkFanout import SinkFanout
+from programmingtheiot.cda.pipeline.WindowAggregator import WindowAggregator
 
 from programmingtheiot.cda.system.ActuatorAdapterManager import ActuatorAdapterManager
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
 from programmingtheiot.cda.system.SensorAdapterManager import SensorAdapterManager
 from programmingtheiot.cda.system.SystemPerformanceManager import SystemPerformanceManager
 
 import programmingtheiot.common.ConfigConst as ConfigConst
 from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.LatestValueCache import LatestValueCache
 
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 from programmingtheiot.common.ISystemPerformanceDataListener import ISystemPerformanceDataListener
@@ -29,8 +39,11 @@ from programmingtheiot.common.ITelemetryDataListener import ITelemetryDataListen
 from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
 
 from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
 from programmingtheiot.data.ActuatorData import ActuatorData
 from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataHistory import SensorDataHistory
+from programmingtheiot.data.SensorDataSummary import SensorDataSummary
 from programmingtheiot.data.SystemPerformanceData import SystemPerformanceData
 
 logging.basicConfig(format = '%(asctime)s:%(filename)s:%(levelname)s:%(message)s', level = logging.DEBUG)
@@ -71,39 +84,113 @@ class DeviceDataManager(IDataMessageListener):
             key=ConfigConst.ENABLE_REDIS_KEY
         ) and not noComms
         
-        # data range config
-        self.handleTemperatureChangeOnDevice = self.configUtil.getBoolean(
+        # 'threaded' or 'asyncio'
+        self.isAsyncRuntime = self.configUtil.getProperty(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.RUNTIME_MODE_KEY,
+            defaultVal=ConfigConst.DEFAULT_RUNTIME_MODE
+        ) == ConfigConst.ASYNCIO_RUNTIME_MODE
+        
+        # upstream pipeline config
+        self.enableUpstreamPipeline = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_UPSTREAM_PIPELINE_KEY
+        )
+        
+        self.enableUpstreamBatching = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_UPSTREAM_BATCHING_KEY
+        )
+        
+        self.enableDeadbandFilter = self.configUtil.getBoolean(
             section=ConfigConst.CONSTRAINED_DEVICE,
-            key=ConfigConst.HANDLE_TEMP_CHANGE_ON_DEVICE_KEY
+            key=ConfigConst.ENABLE_DEADBAND_FILTER_KEY
         )
-        self.triggerHvacTemperatureFloor = self.configUtil.getFloat(
+        
+        self.enablePredictiveFilter = self.configUtil.getBoolean(
             section=ConfigConst.CONSTRAINED_DEVICE,
-            key=ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY
+            key=ConfigConst.ENABLE_PREDICTIVE_FILTER_KEY
         )
-        self.triggerHvacTemperatureCeiling = self.configUtil.getFloat(
+        
+        self.enableEgressLanes = self.configUtil.getBoolean(
             section=ConfigConst.CONSTRAINED_DEVICE,
-            key=ConfigConst.TRIGGER_HVAC_TEMP_CEILING_KEY
+            key=ConfigConst.ENABLE_EGRESS_LANES_KEY
         )
         
+        self.enableSinkFanout = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_SINK_FANOUT_KEY
+        )
+        self.enableWindowAggregation = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_WINDOW_AGGREGATION_KEY
+        )
+        self.suppressAggregatedReadings = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.AGGREGATION_SUPPRESS_RAW_KEY
+        )
+        self.enableAnomalyDetection = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_ANOMALY_DETECTION_KEY
+        )
+        
+        # actuation rules, including the HVAC temperature triggers
+        self.ruleEngine = RuleEngine()
+        
         self.systemPerformanceManager   = None
         self.sensorAdapterManager       = None
         self.actuatorAdapterManager     = None
         
-        self.actuatorResponseCache = {}
+        # written from the sensing, actuation and network threads and read
+        # by the CoAP server, so they're LatestValueCache, not plain dicts
+        cacheMaxSize = self.configUtil.getInteger(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.CACHE_MAX_SIZE_KEY,
+            defaultVal=ConfigConst.DEFAULT_CACHE_MAX_SIZE
+        )
+        cacheTtl = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.CACHE_TTL_KEY,
+            defaultVal=ConfigConst.DEFAULT_CACHE_TTL
+        )
+        
+        self.actuatorResponseCache      = LatestValueCache(maxSize=cacheMaxSize, ttl=cacheTtl)
+        self.sensorDataCache            = LatestValueCache(maxSize=cacheMaxSize, ttl=cacheTtl)
+        self.systemPerformanceDataCache = LatestValueCache(maxSize=cacheMaxSize, ttl=cacheTtl)
         
         self.mqttClient     = None
         self.coapClient     = None
         self.coapServer     = None
         self.redisClient    = None
         
+        self.upstreamPipeline = None
+        self.upstreamBatcher  = None
+        self.deadbandFilter   = None
+        self.predictiveFilter = None
+        self.egressLanes      = None
+        self.sinkFanout       = None
+        self.windowAggregator = None
+        self.anomalyDetector  = None
+        
+        # the connectors (and paho, CoAPthon, aiocoap and redis) are only
+        # imported when enabled; with the asyncio runtime, the MQTT and CoAP
+        # clients run on the event loop this manager is created on
         if self.enableMqttClient:
-            self.mqttClient = MqttClientConnector()
+            mqttClassName = 'AsyncMqttClientConnector' if self.isAsyncRuntime else 'MqttClientConnector'
+            mqttModule = import_module('programmingtheiot.cda.connection.' + mqttClassName, mqttClassName)
+            mqttClazz = getattr(mqttModule, mqttClassName)
+            self.mqttClient = mqttClazz()
             self.mqttClient.setDataMessageListener(self)
         if self.enableCoapClient:
-            self.coapClient = CoapClientConnector()
+            coapClassName = 'AsyncCoapClientConnector' if self.isAsyncRuntime else 'CoapClientConnector'
+            coapModule = import_module('programmingtheiot.cda.connection.' + coapClassName, coapClassName)
+            coapClazz = getattr(coapModule, coapClassName)
+            self.coapClient = coapClazz()
             self.coapClient.setDataMessageListener(self)
         if self.enableRedis:
-            self.redisClient = RedisPersistenceAdapter()
+            redisModule = import_module('programmingtheiot.cda.connection.RedisPersistenceAdapter', 'RedisPersistenceAdapter')
+            redisClazz = getattr(redisModule, 'RedisPersistenceAdapter')
+            self.redisClient = redisClazz()
         
         if self.enableSystemPerformanceData:
             self.systemPerformanceManager = SystemPerformanceManager()
@@ -119,32 +206,95 @@ class DeviceDataManager(IDataMessageListener):
             self.actuatorAdapterManager = ActuatorAdapterManager(self)
             logging.info("ActuatorAdapterManager enabled.")
         
+        if self.enableUpstreamPipeline:
+            self.upstreamPipeline = self._createUpstreamPipeline()
+            logging.info("Upstream pipeline enabled.")
+        
+        if self.enablePredictiveFilter:
+            # the receiver's models only stay in step if they see every
+            # reading the filter lets through, so the deadband filter is off
+            self.predictiveFilter = PredictiveFilter()
+            logging.info("Predictive filter enabled.")
+            
+            if self.enableDeadbandFilter:
+                logging.warning("Deadband filter disabled, as the predictive filter is enabled.")
+                
+        elif self.enableDeadbandFilter:
+            self.deadbandFilter = DeadbandFilter()
+            logging.info("Deadband filter enabled.")
+        
+        if self.enableWindowAggregation:
+            self.windowAggregator = WindowAggregator()
+            logging.info("Windowed aggregation enabled.")
+        
+        if self.enableAnomalyDetection:
+            self.anomalyDetector = AnomalyDetector()
+            logging.info("Anomaly detection enabled.")
+        
+        if self.enableUpstreamBatching:
+            self.upstreamBatcher = MessageBatcher(
+                flushHandler=self._dispatchUpstream,
+                maxBatchSize=self.configUtil.getInteger(
+                    section=ConfigConst.CONSTRAINED_DEVICE,
+                    key=ConfigConst.BATCH_MAX_SIZE_KEY,
+                    defaultVal=ConfigConst.DEFAULT_BATCH_MAX_SIZE
+                ),
+                maxBatchDelay=self.configUtil.getFloat(
+                    section=ConfigConst.CONSTRAINED_DEVICE,
+                    key=ConfigConst.BATCH_MAX_DELAY_KEY,
+                    defaultVal=ConfigConst.DEFAULT_BATCH_MAX_DELAY
+                )
+            )
+            logging.info("Upstream batching enabled.")
+        
+        if self.enableEgressLanes:
+            self.egressLanes = self._createEgressLanes()
+            logging.info("Egress lanes enabled.")
+        
+        if self.enableSinkFanout:
+            self.sinkFanout = self._createSinkFanout()
+            logging.info("Upstream sink fan-out enabled.")
+            
+        if self.predictiveFilter:
+            self._checkPredictiveFilterPath()
+        
     def getLatestActuatorDataResponseFromCache(self, name: str = None) -> ActuatorData:
         """
         Retrieves the named actuator data (response) item from the internal data cache.
         
-        @param name
-        @return ActuatorData
+        @param name The actuator name, or None for the latest response.
+        @return ActuatorData The cached response, or None if there isn't one.
         """
-        pass
+        return self.actuatorResponseCache.get(name)
         
     def getLatestSensorDataFromCache(self, name: str = None) -> SensorData:
         """
         Retrieves the named sensor data item from the internal data cache.
         
-        @param name
-        @return SensorData
+        @param name The sensor name, or None for the latest reading.
+        @return SensorData The cached reading, or None if there isn't one.
         """
-        pass
+        return self.sensorDataCache.get(name)
     
     def getLatestSystemPerformanceDataFromCache(self, name: str = None) -> SystemPerformanceData:
         """
         Retrieves the named system performance data from the internal data cache.
         
-        @param name
-        @return SystemPerformanceData
+        @param name The data name, or None for the latest data.
+        @return SystemPerformanceData The cached data, or None if there isn't any.
         """
-        pass
+        return self.systemPerformanceDataCache.get(name)
+    
+    def getSensorHistory(self, name: str) -> SensorDataHistory:
+        """
+        Retrieves the reading history of the named sensor, for local queries
+        over time ranges, the latest readings or downsampled views.
+        
+        @param name The sensor name.
+        @return SensorDataHistory The history, or None if sensing or history
+        is disabled, or the sensor hasn't produced a reading yet.
+        """
+        return self.sensorAdapterManager.getSensorHistory(name) if self.sensorAdapterManager else None
     
     def handleActuatorCommandMessage(self, data: ActuatorData) -> ActuatorData:
         """
@@ -177,11 +327,15 @@ class DeviceDataManager(IDataMessageListener):
         
         if data:
             logging.debug(f"Processing actuator response...")
-            self.actuatorResponseCache[data.getName()] = data
-            self._handleUpstreamTransmission(
-                resourceName=ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE,
-                msg=DataUtil().actuatorDataToJson(data)
-            )
+            self.actuatorResponseCache.put(data)
+            message = self._ingestMessage((ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE, data))
+            
+            # responses skip local analysis; with egress lanes, they also skip
+            # the pipeline queues and go straight to the control lane
+            if self.upstreamPipeline and not self.egressLanes:
+                return self.upstreamPipeline.submit(message, ConfigConst.ENCODE_STAGE)
+            
+            self._transmitMessage(message)
             return True
         else:
             logging.warning("Incoming actuator response is invalid (None). Ignoring.")
@@ -217,16 +371,19 @@ class DeviceDataManager(IDataMessageListener):
         logging.info(f"Handling sensor message: {data}")
         if data:
             logging.debug("Processing sensor data...")
+            self.sensorDataCache.put(data)
             
-            if self.redisClient:
-                self.redisClient.storeSensorData(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, data)
-            self._handleSensorDataAnalysis(data=data)
+            message = (ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, data)
             
-            jsonData = DataUtil().sensorDataToJson(data)
-            self._handleUpstreamTransmission(
-                resourceName=ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, 
-                msg=jsonData
-            )
+            # hand off to the pipeline workers so polling isn't held up by
+            # slow sinks; otherwise process inline on the caller's thread
+            if self.upstreamPipeline:
+                return self.upstreamPipeline.submit(message)
+            
+            message = self._analyzeMessage(self._ingestMessage(message))
+            
+            if message:
+                self._transmitMessage(message)
             
             return True
         
@@ -247,11 +404,105 @@ class DeviceDataManager(IDataMessageListener):
         logging.debug(f"Handling system performance message: {data}")
         if data:
             logging.debug("System performance data OK.")
+            self.systemPerformanceDataCache.put(data)
             return True
         else:
             logging.warning("Incoming system performance data is invalid (None). Ignoring.")
             return False
     
+    def getUpstreamPipelineMetrics(self) -> dict:
+        """
+        Returns the queue depth, drop count and latency metrics of each
+        upstream pipeline stage, or an empty dict if the pipeline is disabled.
+        
+        @return dict
+        """
+        return self.upstreamPipeline.getMetrics() if self.upstreamPipeline else {}
+    
+    def getDeadbandFilterMetrics(self) -> dict:
+        """
+        Returns the reading and suppression counts and suppression ratio of
+        the deadband filter, or an empty dict if the filter is disabled.
+        
+        @return dict
+        """
+        return self.deadbandFilter.getMetrics() if self.deadbandFilter else {}
+    
+    def getPredictiveFilterMetrics(self) -> dict:
+        """
+        Returns the reading, sent, model update and suppression counts and
+        suppression ratio of the predictive filter, or an empty dict if the
+        filter is disabled.
+        
+        @return dict
+        """
+        return self.predictiveFilter.getMetrics() if self.predictiveFilter else {}
+    
+    def getSchedulerMetrics(self) -> dict:
+        """
+        Returns the job, wakeup, run, misfire, overrun and error counts of
+        the shared scheduler, in total and per job.
+        
+        @return dict
+        """
+        return SchedulerService().getMetrics()
+    
+    def getWindowAggregationMetrics(self) -> dict:
+        """
+        Returns the reading, summary and late reading counts and number of
+        open windows of the window aggregator, or an empty dict if
+        aggregation is disabled.
+        
+        @return dict
+        """
+        return self.windowAggregator.getMetrics() if self.windowAggregator else {}
+    
+    def getAnomalyDetectionMetrics(self) -> dict:
+        """
+        Returns the sensor, reading, anomaly, forwarded and suppressed
+        counts of the anomaly detector, or an empty dict if detection is
+        disabled.
+        
+        @return dict
+        """
+        return self.anomalyDetector.getMetrics() if self.anomalyDetector else {}
+    
+    def getRuleEngineMetrics(self) -> dict:
+        """
+        Returns the rule, reading, check and command counts of the rule
+        engine.
+        
+        @return dict
+        """
+        return self.ruleEngine.getMetrics()
+    
+    def getUpstreamBatchMetrics(self) -> dict:
+        """
+        Returns the message and batch counts of the upstream batcher, or an
+        empty dict if batching is disabled.
+        
+        @return dict
+        """
+        return self.upstreamBatcher.getMetrics() if self.upstreamBatcher else {}
+    
+    def getEgressLaneMetrics(self) -> dict:
+        """
+        Returns the queue depth, drop count and wait time metrics of each
+        egress lane, or an empty dict if the lanes are disabled.
+        
+        @return dict
+        """
+        return self.egressLanes.getMetrics() if self.egressLanes else {}
+    
+    def getUpstreamSinkMetrics(self) -> dict:
+        """
+        Returns the send, success, failure and timeout counts and send
+        latency of each upstream sink, or an empty dict if fan-out is disabled.
+        
+        @return dict
+        """
+        return self.sinkFanout.getMetrics() if self.sinkFanout else {}
+    
     def setSystemPerformanceDataListener(self, listener: ISystemPerformanceDataListener = None):
         self.systemPerformanceManager.setDataMessageListener(listener)
             
@@ -261,12 +512,13 @@ class DeviceDataManager(IDataMessageListener):
     def startManager(self):
         logging.info("Starting DeviceDataManager...")
         
-        if self.systemPerformanceManager:
-            self.systemPerformanceManager.startManager()
+        if self.upstreamPipeline:
+            self.upstreamPipeline.start()
         
-        if self.sensorAdapterManager:
-            self.sensorAdapterManager.startManager()
-            
+        if self.egressLanes:
+            self.egressLanes.start()
+        
+        # the clients connect first, as the first readings are taken at start
         if self.redisClient:
             self.redisClient.connectClient()
             
@@ -278,6 +530,15 @@ class DeviceDataManager(IDataMessageListener):
                 qos=ConfigConst.DEFAULT_QOS
             )
             
+        if self.systemPerformanceManager:
+            self.systemPerformanceManager.startManager()
+        
+        if self.sensorAdapterManager:
+            self.sensorAdapterManager.startManager()
+            
+        if self.actuatorAdapterManager:
+            self.actuatorAdapterManager.startManager()
+            
         logging.info("DeviceDataManager started.")
         
     def stopManager(self):
@@ -289,6 +550,32 @@ class DeviceDataManager(IDataMessageListener):
         if self.sensorAdapterManager:	
             self.sensorAdapterManager.stopManager()
             
+        if self.actuatorAdapterManager:
+            self.actuatorAdapterManager.stopManager()
+            
+        # send the summaries of the windows still open
+        if self.windowAggregator:
+            self._publishSummaries(self.windowAggregator.flush())
+            
+        # let the pipeline pass on what it still holds, summaries included,
+        # before the stages downstream of it are drained
+        if self.upstreamPipeline:
+            if not self.upstreamPipeline.waitUntilIdle():
+                logging.warning("Upstream pipeline didn't drain before stopping.")
+                
+            self.upstreamPipeline.stop()
+            
+        # send whatever is still batched before the clients disconnect
+        if self.upstreamBatcher:
+            self.upstreamBatcher.flushAll()
+            
+        if self.egressLanes:
+            self.egressLanes.waitUntilIdle()
+            self.egressLanes.stop()
+            
+        if self.sinkFanout:
+            self.sinkFanout.shutdown()
+            
         if self.redisClient:
             self.redisClient.disconnectClient()
             
@@ -296,8 +583,278 @@ class DeviceDataManager(IDataMessageListener):
             self.mqttClient.unsubscribeFromTopic(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE)
             self.mqttClient.disconnectClient()
             
+        if self.coapClient and self.coapClient.getSpool():
+            self.coapClient.getSpool().stop()
+            
         logging.info("Stopped DeviceDataManager.")
         
+    async def closeClientsAsync(self):
+        """
+        With the asyncio runtime, waits for the CoAP requests still in flight
+        (e.g. the window summaries sent by stopManager()) and closes the
+        client, before the event loop stops. Call after stopManager().
+        
+        """
+        if self.isAsyncRuntime and self.coapClient:
+            await self.coapClient.closeClient()
+            
+    def _createUpstreamPipeline(self) -> DataPipeline:
+        queueSize = self.configUtil.getInteger(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.PIPELINE_QUEUE_SIZE_KEY,
+            defaultVal=ConfigConst.DEFAULT_PIPELINE_QUEUE_SIZE
+        )
+        overflowPolicy = self.configUtil.getProperty(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.PIPELINE_OVERFLOW_POLICY_KEY,
+            defaultVal=ConfigConst.DEFAULT_OVERFLOW_POLICY
+        )
+        blockTimeout = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.PIPELINE_BLOCK_TIMEOUT_KEY,
+            defaultVal=ConfigConst.DEFAULT_PIPELINE_BLOCK_TIMEOUT
+        )
+        
+        stages = [
+            (ConfigConst.INGEST_STAGE, self._ingestMessage, None),
+            (ConfigConst.ANALYZE_STAGE, self._analyzeMessage, ConfigConst.PIPELINE_ANALYZE_WORKERS_KEY),
+            (ConfigConst.ENCODE_STAGE, self._encodeMessage, ConfigConst.PIPELINE_ENCODE_WORKERS_KEY),
+            (ConfigConst.TRANSMIT_STAGE, self._transmitMessage, ConfigConst.PIPELINE_TRANSMIT_WORKERS_KEY)
+        ]
+        
+        pipeline = DataPipeline(name="UpstreamPipeline")
+        
+        for name, handler, workersKey in stages:
+            workerCount = ConfigConst.DEFAULT_PIPELINE_WORKERS
+            
+            if workersKey:
+                workerCount = self.configUtil.getInteger(
+                    section=ConfigConst.CONSTRAINED_DEVICE,
+                    key=workersKey,
+                    defaultVal=ConfigConst.DEFAULT_PIPELINE_WORKERS
+                )
+                
+            pipeline.addStage(
+                name=name,
+                handler=handler,
+                workerCount=workerCount,
+                queueSize=queueSize,
+                overflowPolicy=overflowPolicy,
+                blockTimeout=blockTimeout
+            )
+            
+        return pipeline
+    
+    def _checkPredictiveFilterPath(self):
+        # readings the predictive filter lets through go on the alert lane;
+        # warn about the stages after the filter that may still drop them
+        pipelinePolicy = self.configUtil.getProperty(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.PIPELINE_OVERFLOW_POLICY_KEY,
+            defaultVal=ConfigConst.DEFAULT_OVERFLOW_POLICY
+        )
+        alertLanePolicy = self.configUtil.getProperty(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ALERT_LANE_OVERFLOW_POLICY_KEY,
+            defaultVal=ConfigConst.DEFAULT_ALERT_LANE_OVERFLOW_POLICY
+        )
+        
+        if self.upstreamPipeline and pipelinePolicy != ConfigConst.BLOCK_POLICY:
+            logging.warning(f"Predictive filter enabled, but the upstream pipeline overflow policy is {pipelinePolicy}. " \
+                "Readings dropped after the analyze stage leave the receiver's predictions behind.")
+            
+        if self.egressLanes and alertLanePolicy != ConfigConst.BLOCK_POLICY:
+            logging.warning(f"Predictive filter enabled, but the alert lane overflow policy is {alertLanePolicy}. " \
+                "Readings dropped from the lane leave the receiver's predictions behind.")
+            
+        if self.sinkFanout:
+            logging.warning("Predictive filter enabled with the sink fan-out. Readings are dropped for a sink " \
+                "with sinkMaxPending control and alert messages pending, leaving its receiver's predictions behind.")
+        
+    def _createEgressLanes(self) -> PriorityLanes:
+        blockTimeout = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.PIPELINE_BLOCK_TIMEOUT_KEY,
+            defaultVal=ConfigConst.DEFAULT_PIPELINE_BLOCK_TIMEOUT
+        )
+        
+        # highest priority first
+        lanes = [
+            (ConfigConst.CONTROL_LANE, ConfigConst.CONTROL_LANE_QUEUE_SIZE_KEY, ConfigConst.DEFAULT_CONTROL_LANE_QUEUE_SIZE, \
+                ConfigConst.CONTROL_LANE_OVERFLOW_POLICY_KEY, ConfigConst.DEFAULT_CONTROL_LANE_OVERFLOW_POLICY),
+            (ConfigConst.ALERT_LANE, ConfigConst.ALERT_LANE_QUEUE_SIZE_KEY, ConfigConst.DEFAULT_ALERT_LANE_QUEUE_SIZE, \
+                ConfigConst.ALERT_LANE_OVERFLOW_POLICY_KEY, ConfigConst.DEFAULT_ALERT_LANE_OVERFLOW_POLICY),
+            (ConfigConst.TELEMETRY_LANE, ConfigConst.TELEMETRY_LANE_QUEUE_SIZE_KEY, ConfigConst.DEFAULT_TELEMETRY_LANE_QUEUE_SIZE, \
+                ConfigConst.TELEMETRY_LANE_OVERFLOW_POLICY_KEY, ConfigConst.DEFAULT_TELEMETRY_LANE_OVERFLOW_POLICY),
+            (ConfigConst.BULK_LANE, ConfigConst.BULK_LANE_QUEUE_SIZE_KEY, ConfigConst.DEFAULT_BULK_LANE_QUEUE_SIZE, \
+                ConfigConst.BULK_LANE_OVERFLOW_POLICY_KEY, ConfigConst.DEFAULT_BULK_LANE_OVERFLOW_POLICY)
+        ]
+        
+        egressLanes = PriorityLanes(
+            handler=self._sendEgressMessage,
+            workerCount=self.configUtil.getInteger(
+                section=ConfigConst.CONSTRAINED_DEVICE,
+                key=ConfigConst.EGRESS_WORKERS_KEY,
+                defaultVal=ConfigConst.DEFAULT_EGRESS_WORKERS
+            ),
+            name="EgressLanes"
+        )
+        
+        for name, queueSizeKey, defaultQueueSize, overflowPolicyKey, defaultOverflowPolicy in lanes:
+            egressLanes.addLane(
+                name=name,
+                queueSize=self.configUtil.getInteger(
+                    section=ConfigConst.CONSTRAINED_DEVICE, key=queueSizeKey, defaultVal=defaultQueueSize),
+                overflowPolicy=self.configUtil.getProperty(
+                    section=ConfigConst.CONSTRAINED_DEVICE, key=overflowPolicyKey, defaultVal=defaultOverflowPolicy),
+                blockTimeout=blockTimeout
+            )
+            
+        return egressLanes
+    
+    def _createSinkFanout(self) -> SinkFanout:
+        sinkFanout = SinkFanout(
+            maxPending=self.configUtil.getInteger(
+                section=ConfigConst.CONSTRAINED_DEVICE,
+                key=ConfigConst.SINK_MAX_PENDING_KEY,
+                defaultVal=ConfigConst.DEFAULT_SINK_MAX_PENDING
+            )
+        )
+        
+        mqttTimeout = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.MQTT_SINK_TIMEOUT_KEY,
+            defaultVal=ConfigConst.DEFAULT_SINK_TIMEOUT
+        )
+        coapTimeout = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.COAP_SINK_TIMEOUT_KEY,
+            defaultVal=ConfigConst.DEFAULT_SINK_TIMEOUT
+        )
+        
+        # the clients are looked up on each send, so a sink is skipped while
+        # its client is disabled; the CoAP request gives up at the sink timeout
+        sinkFanout.addSink(
+            name=ConfigConst.MQTT_SINK,
+            sender=lambda resourceName, data, useSpool: \
+                self.mqttClient.publishData(resource=resourceName, data=data, useSpool=useSpool),
+            timeout=mqttTimeout,
+            isEnabled=lambda: self.mqttClient is not None
+        )
+        sinkFanout.addSink(
+            name=ConfigConst.COAP_SINK,
+            sender=lambda resourceName, data, useSpool: \
+                self.coapClient.sendPutData(resource=resourceName, data=data, timeout=coapTimeout, useSpool=useSpool),
+            timeout=coapTimeout,
+            isEnabled=lambda: self.coapClient is not None
+        )
+        
+        return sinkFanout
+    
+    def _ingestMessage(self, message: tuple) -> tuple:
+        """
+        Pipeline stage: wraps the data of a (resource, data) message in an
+        EncodedPayload, so it's encoded at most once per codec and shared by
+        all sinks.
+        """
+        resource, data = message
+        
+        return (resource, EncodedPayload.wrap(data))
+    
+    def _analyzeMessage(self, message: tuple) -> tuple:
+        """
+        Pipeline stage: runs local analysis and anomaly detection on sensor
+        messages and adds them to the window aggregator, publishing the
+        summaries of any windows they close. Anomalies are flagged with
+        ANOMALY_STATUS_CODE, which sends them on the alert lane, and always
+        passed on. Other readings are dropped (before they're encoded) if
+        the anomaly detector is holding back normal readings, all aggregated
+        readings are suppressed, or the deadband or predictive filter
+        suppresses them. The predictive filter sees anomalies too, as its
+        receiver's models are updated with every reading sent.
+        """
+        resource, payload = message
+        
+        if resource == ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE:
+            data = payload.getData()
+            isAnomaly = False
+            isForwarded = True
+            
+            self._handleSensorDataAnalysis(data=data)
+            
+            if self.anomalyDetector:
+                isAnomaly, isForwarded, zScore = self.anomalyDetector.detect(data)
+                
+                if isAnomaly:
+                    logging.warning(f"Anomalous sensor reading (z-score {zScore:.1f}): {data}")
+                    data.setStatusCode(ConfigConst.ANOMALY_STATUS_CODE)
+            
+            if self.windowAggregator:
+                self._publishSummaries(self.windowAggregator.add(data))
+            
+            if not isAnomaly:
+                if not isForwarded:
+                    return None
+                
+                if self.suppressAggregatedReadings and self.windowAggregator and self.windowAggregator.isAggregated(data.getTypeID()):
+                    return None
+                
+                if self.deadbandFilter and not self.deadbandFilter.accept(data):
+                    logging.debug(f"Suppressed by deadband filter: {data}")
+                    return None
+                
+            if self.predictiveFilter:
+                sentData = self.predictiveFilter.filter(data)
+                
+                if sentData is None:
+                    logging.debug(f"Suppressed by predictive filter: {data}")
+                    return None
+                
+                if sentData is not data:
+                    return (resource, EncodedPayload.wrap(sentData))
+            
+        return message
+    
+    def _publishSummaries(self, summaries: list):
+        """
+        Sends window summaries upstream on the sensor message resource,
+        skipping the deadband filter, which would compare their means with
+        raw readings.
+        """
+        for summary in summaries:
+            logging.debug(f"Publishing window summary: {summary}")
+            message = (ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, EncodedPayload.wrap(summary))
+            
+            if self.upstreamPipeline:
+                self.upstreamPipeline.submit(message, ConfigConst.ENCODE_STAGE)
+            else:
+                self._transmitMessage(message)
+    
+    def _encodeMessage(self, message: tuple) -> tuple:
+        """
+        Pipeline stage: encodes the payload with each sink's codec ahead of
+        the transmit stage, so transmit workers only spend time on I/O.
+        """
+        resource, payload = message
+        
+        for client in (self.redisClient, self.mqttClient, self.coapClient):
+            if client:
+                payload.getPayload(client.getCodec())
+                
+        return message
+    
+    def _transmitMessage(self, message: tuple):
+        """
+        Pipeline stage: stores sensor messages in Redis and sends all
+        messages upstream.
+        """
+        resource, payload = message
+        
+        if self.redisClient and resource == ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE:
+            self.redisClient.storePayload(resource, payload)
+            
+        self._handleUpstreamTransmission(resourceName=resource, data=payload)
+        
     def _handleIncomingDataAnalysis(self, msg: str):
         """
         Call this from handleIncomeMessage() to determine if there's
@@ -314,48 +871,109 @@ class DeviceDataManager(IDataMessageListener):
         any action to take on the message. Steps to take:
         1) Check config: Is there a rule or flag that requires immediate processing of data?
         2) Act on data: If # 1 is true, determine what - if any - action is required, and execute.
+        
+        The rule engine only returns commands when a rule's state changes,
+        so readings that don't change anything don't create ActuatorData.
         """
+        logging.debug(f"Handling sensor data analysis: {data}")
         
-        # this is the current 'model' step
-        # right now, we only handle temperature changes and print warning for other sensor types
-        # should be more later
+        if not data:
+            logging.warning("Sensor data is invalid (None). Ignoring.")
+            return
         
-        logging.debug(f"Handling sensor data analysis: {data}")
-        if data and data.getTypeID()==ConfigConst.TEMP_SENSOR_TYPE:
-            logging.debug("Analyzing sensor data...")
-            if self.handleTemperatureChangeOnDevice:
-                actuatorData = ActuatorData(typeID=ConfigConst.HVAC_ACTUATOR_TYPE)
-                
-                if data.getValue() > self.triggerHvacTemperatureCeiling:
-                    actuatorData.setCommand(ConfigConst.COMMAND_ON)
-                    actuatorData.setValue(self.triggerHvacTemperatureCeiling)
-                elif data.getValue() < self.triggerHvacTemperatureFloor:
-                    actuatorData.setCommand(ConfigConst.COMMAND_ON)
-                    actuatorData.setValue(self.triggerHvacTemperatureFloor)
-                else:
-                    actuatorData.setCommand(ConfigConst.COMMAND_OFF)
-                    
-                self.handleActuatorCommandMessage(actuatorData)
-            else:
-                logging.debug("Device is not configured to handle locally. Ignoring.")
-        else:
-            logging.warning("Sensor data is invalid (null or type mismatch). Ignoring.")
+        for actuatorData in self.ruleEngine.evaluate(data):
+            self.handleActuatorCommandMessage(actuatorData)
         
-    def _handleUpstreamTransmission(self, resourceName: ResourceNameEnum, msg: str):
+    def _handleUpstreamTransmission(self, resourceName: ResourceNameEnum, data: EncodedPayload):
         """
         Call this from handleActuatorCommandResponse(), handlesensorMessage(), and handleSystemPerformanceMessage()
         to determine if the message should be sent upstream. Steps to take:
         1) Check connection: Is there a client connection configured (and valid) to a remote MQTT or CoAP server?
         2) Act on msg: If # 1 is true, send message upstream using one (or both) client connections.
+        
+        'data' is an EncodedPayload, so clients that share a payload codec
+        also share a single encoding of the message. If batching is enabled,
+        telemetry and bulk messages are held by the batcher and sent as part
+        of an array payload; control and alert messages are sent immediately.
         """
         logging.info(f"Handling upstream transmission: {resourceName}")
+        lane = self._getEgressLane(resourceName, data)
+        
+        if self.upstreamBatcher and lane in (ConfigConst.TELEMETRY_LANE, ConfigConst.BULK_LANE):
+            self.upstreamBatcher.add(resourceName, data)
+        else:
+            self._dispatchUpstream(resourceName, data, lane)
+            
+    def _getEgressLane(self, resourceName: ResourceNameEnum, data: EncodedPayload) -> str:
+        if resourceName == ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE:
+            return ConfigConst.CONTROL_LANE
+        
+        if resourceName in (ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE, ResourceNameEnum.CDA_UPDATE_NOTIFICATIONS_RESOURCE):
+            return ConfigConst.ALERT_LANE
+        
+        if resourceName == ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE:
+            sensorData = data.getData()
+            
+            # readings flagged as errors are alerts (batches are always telemetry)
+            if isinstance(sensorData, SensorData) and (sensorData.hasErrorFlag() or sensorData.getStatusCode() != 0):
+                return ConfigConst.ALERT_LANE
+            
+            # the receiver's predictions need every reading the predictive
+            # filter lets through, so they go on the alert lane, which blocks
+            # rather than drops (summaries skip the filter)
+            if self.predictiveFilter and isinstance(sensorData, SensorData) and not isinstance(sensorData, SensorDataSummary) \
+                and self.predictiveFilter.hasModel(sensorData.getTypeID()):
+                return ConfigConst.ALERT_LANE
+            
+            return ConfigConst.TELEMETRY_LANE
+        
+        return ConfigConst.BULK_LANE
+    
+    def _dispatchUpstream(self, resourceName: ResourceNameEnum, data: EncodedPayload, lane: str = None):
+        # queues the message in its egress lane if the lanes are enabled;
+        # otherwise sends it on the caller's thread
+        if not lane:
+            lane = self._getEgressLane(resourceName, data)
+            
+        if self.egressLanes:
+            if not self.egressLanes.offer(lane, (resourceName, data, lane)):
+                logging.warning(f"Egress lane {lane} is full. Dropped message for {resourceName}.")
+        else:
+            self._sendEgressMessage((resourceName, data, lane))
+            
+    def _sendEgressMessage(self, message: tuple):
+        resourceName, data, lane = message
+        
+        # control and alert messages bypass the spool while connected, so
+        # they don't wait behind spooled telemetry
+        self._sendUpstream(resourceName, data, useSpool=lane not in (ConfigConst.CONTROL_LANE, ConfigConst.ALERT_LANE), lane=lane)
+        
+    def _sendUpstream(self, resourceName: ResourceNameEnum, data: EncodedPayload, useSpool: bool = True, lane: str = None):
+        # with fan-out, the clients send in parallel, each within its own
+        # timeout, and a busy client sends its queued messages in lane
+        # priority order; otherwise they send one after the other
+        if self.sinkFanout:
+            priority = ConfigConst.EGRESS_LANES.index(lane) if lane in ConfigConst.EGRESS_LANES else len(ConfigConst.EGRESS_LANES)
+            
+            for sinkName, result in self.sinkFanout.send(resourceName, data, useSpool, priority=priority).items():
+                if result == SinkFanout.SENT:
+                    logging.debug(f"Sent {resourceName} to {sinkName}")
+                elif result == SinkFanout.QUEUED:
+                    logging.debug(f"Queued {resourceName} for {sinkName}, which is busy")
+                elif result == SinkFanout.DROPPED:
+                    logging.warning(f"Dropped {resourceName} for {sinkName}, which has too many pending sends")
+                else:
+                    logging.error(f"Failed to send {resourceName} to {sinkName} ({result})")
+                    
+            return
+        
         if self.mqttClient:
-            if self.mqttClient.publishMessage(resource=resourceName, msg=msg):
+            if self.mqttClient.publishData(resource=resourceName, data=data, useSpool=useSpool):
                 logging.debug("Published to MQTT")
             else:
                 logging.error("Failed to publish to MQTT")
         if self.coapClient:
-            if self.coapClient.sendPutRequest(resource=resourceName, payload=msg):
+            if self.coapClient.sendPutData(resource=resourceName, data=data, useSpool=useSpool):
                 logging.debug("PUT to CoAP")
             else:
                 logging.error("Failed to PUT to CoAP")
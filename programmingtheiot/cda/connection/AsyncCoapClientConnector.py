@@ -0,0 +1,353 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import asyncio
+import logging
+import os
+
+import aiocoap
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+
+from programmingtheiot.common.IDataMessageListener import IDataMessageListener
+from programmingtheiot.cda.connection.IRequestResponseClient import IRequestResponseClient
+from programmingtheiot.cda.pipeline.MessageSpool import MessageSpool
+
+class AsyncCoapClientConnector(IRequestResponseClient):
+    """
+    The CoAP client of the asyncio runtime, built on aiocoap: requests and
+    observations run on the asyncio event loop, rather than on CoAPthon's
+    threads as with CoapClientConnector.
+
+    It must be created on the event loop. The request methods can be
+    called from any thread: they start the request on the loop and return
+    without waiting for the response, which is handled on the loop (e.g.
+    an actuator command from a GET is passed to the data message
+    listener). The spool's forwarder, on its own thread, does wait for the
+    server's response. closeClient() waits for the requests still in
+    flight, so those made while stopping aren't lost with the loop.
+
+    """
+
+    def __init__(self, dataMsgListener: IDataMessageListener = None):
+        config = ConfigUtil()
+
+        self.dataMsgListener = dataMsgListener
+        self.eventLoop = asyncio.get_running_loop()
+
+        self.host = config.getProperty( \
+            ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.HOST_KEY, ConfigConst.DEFAULT_HOST)
+        self.codec = DataUtil.getCodec(config.getProperty( \
+            ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PAYLOAD_CODEC_KEY, ConfigConst.DEFAULT_PAYLOAD_CODEC))
+        self.port = config.getInteger( \
+            ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PORT_KEY, ConfigConst.DEFAULT_COAP_PORT)
+
+        self.uriPath = f"coap://{self.host}:{self.port}/"
+
+        # resource -> Future of its observation
+        self.observeRequests = {}
+
+        # requests in flight, kept until done so they aren't garbage
+        # collected while pending, and can be waited for when closing
+        self.pendingRequests = set()
+
+        # created once, on the loop
+        self.contextTask = self.eventLoop.create_task(aiocoap.Context.create_client_context())
+
+        # optional disk-backed spool, so PUTs made while the server is
+        # unreachable are delivered once it's back
+        self.spool = None
+
+        if config.getBoolean(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.ENABLE_SPOOL_KEY):
+            self.spool = MessageSpool(
+                path=os.path.join(config.getProperty( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_PATH_KEY, ConfigConst.DEFAULT_SPOOL_PATH), ConfigConst.COAP.lower()),
+                segmentSize=config.getInteger( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_SEGMENT_SIZE_KEY, ConfigConst.DEFAULT_SPOOL_SEGMENT_SIZE),
+                maxSegments=config.getInteger( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_MAX_SEGMENTS_KEY, ConfigConst.DEFAULT_SPOOL_MAX_SEGMENTS),
+                replayRate=config.getFloat( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_REPLAY_RATE_KEY, ConfigConst.DEFAULT_SPOOL_REPLAY_RATE),
+                retryDelay=config.getFloat( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_RETRY_DELAY_KEY, ConfigConst.DEFAULT_SPOOL_RETRY_DELAY))
+
+            self.spool.start(self._forwardPayload)
+
+        logging.info(f"Async CoAP client will send requests to {self.uriPath}")
+
+    def sendDiscoveryRequest(self, timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT) -> bool:
+        self._submit(self._sendRequest(aiocoap.Code.GET, '.well-known/core', timeout=timeout))
+
+        return True
+
+    def sendDeleteRequest(
+        self,
+        resource: ResourceNameEnum = None,
+        name: str = None,
+        enableCON: bool = False,
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT
+    ) -> bool:
+
+        if not resource and not name:
+            return False
+
+        self._submit(self._sendRequest(aiocoap.Code.DELETE, self._createResourcePath(resource, name), \
+            enableCON=enableCON, timeout=timeout))
+
+        return True
+
+    def sendGetRequest(
+        self,
+        resource: ResourceNameEnum = None,
+        name: str = None,
+        enableCON: bool = False,
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT
+    ) -> bool:
+
+        if not resource and not name:
+            return False
+
+        path = self._createResourcePath(resource, name)
+
+        self._submit(self._sendRequest(aiocoap.Code.GET, path, enableCON=enableCON, timeout=timeout, \
+            responseHandler=lambda response: self._onGetResponse(response, path)))
+
+        return True
+
+    def sendPostRequest(
+        self,
+        resource: ResourceNameEnum = None,
+        name: str = None,
+        enableCON: bool = False,
+        payload: str = None,
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT
+    ) -> bool:
+
+        if not resource and not name:
+            return False
+
+        self._submit(self._sendRequest(aiocoap.Code.POST, self._createResourcePath(resource, name), \
+            payload=payload, enableCON=enableCON, timeout=timeout))
+
+        return True
+
+    async def closeClient(self, timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT):
+        """
+        Stops the observations, waits up to timeout seconds for the requests
+        still in flight, then shuts down the aiocoap context. Must be awaited
+        on the event loop.
+        
+        @param timeout The number of seconds to wait for pending requests.
+        """
+        for future in self.observeRequests.values():
+            future.cancel()
+
+        self.observeRequests.clear()
+
+        if self.pendingRequests:
+            await asyncio.wait(set(self.pendingRequests), timeout=timeout)
+
+        context = await self.contextTask
+        await context.shutdown()
+
+    def getCodec(self):
+        return self.codec
+
+    def getSpool(self) -> MessageSpool:
+        return self.spool
+
+    def sendPutData(
+        self,
+        resource: ResourceNameEnum = None,
+        name: str = None,
+        enableCON: bool = False,
+        data = None,
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT,
+        useSpool: bool = True
+    ) -> bool:
+
+        if not data:
+            return False
+
+        # as with CoapClientConnector: data the configured codec can't
+        # represent is sent as JSON, and a shared EncodedPayload is only
+        # encoded once
+        encodedPayload = EncodedPayload.wrap(data)
+        codec = encodedPayload.resolveCodec(self.codec)
+
+        if self.spool and useSpool:
+            return self.spool.append(channel=self._createResourcePath(resource, name), \
+                payload=encodedPayload.getPayload(codec), tag=codec.getContentFormat())
+
+        return self.sendPutRequest(resource=resource, name=name, enableCON=enableCON, \
+            payload=encodedPayload.getPayload(codec), timeout=timeout, contentFormat=codec.getContentFormat())
+
+    def sendPutRequest(
+        self,
+        resource: ResourceNameEnum = None,
+        name: str = None,
+        enableCON: bool = False,
+        payload: str = None,
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT,
+        contentFormat: int = None
+    ) -> bool:
+
+        if not resource and not name:
+            return False
+
+        self._submit(self._sendRequest(aiocoap.Code.PUT, self._createResourcePath(resource, name), \
+            payload=payload, contentFormat=contentFormat, enableCON=enableCON, timeout=timeout))
+
+        return True
+
+    def setDataMessageListener(self, listener: IDataMessageListener = None) -> bool:
+        if listener:
+            self.dataMsgListener = listener
+            return True
+        return False
+
+    def startObserver(self, resource: ResourceNameEnum = None, \
+        name: str = None, ttl: int = IRequestResponseClient.DEFAULT_TTL
+    ) -> bool:
+
+        if not resource and not name:
+            return False
+
+        key = resource if resource else name
+
+        if key in self.observeRequests:
+            return False
+
+        self.observeRequests[key] = self._submit(self._observe(self._createResourcePath(resource, name), ttl))
+
+        return True
+
+    def stopObserver(self, resource: ResourceNameEnum = None, \
+        name: str = None, timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT
+    ) -> bool:
+
+        future = self.observeRequests.pop(resource if resource else name, None)
+
+        if not future:
+            return False
+
+        self.eventLoop.call_soon_threadsafe(future.cancel)
+
+        return True
+
+    def _submit(self, coroutine):
+        # starts a coroutine on the loop; returns its Task if called on the
+        # loop, or a concurrent Future otherwise
+        try:
+            isOnLoop = asyncio.get_running_loop() is self.eventLoop
+        except RuntimeError:
+            isOnLoop = False
+
+        if not isOnLoop:
+            return asyncio.run_coroutine_threadsafe(coroutine, self.eventLoop)
+
+        return self.eventLoop.create_task(coroutine)
+
+    async def _sendRequest(self, code, path: str, payload = None, contentFormat: int = None, \
+        enableCON: bool = False, timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT, responseHandler = None):
+
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        request = aiocoap.Message(code=code, uri=self.uriPath + path, payload=payload or b'', \
+            transport_tuning=aiocoap.Reliable if enableCON else aiocoap.Unreliable)
+
+        if contentFormat is not None:
+            request.opt.content_format = contentFormat
+
+        # tracked here, as a request started from another thread runs in a
+        # task created by run_coroutine_threadsafe()
+        task = asyncio.current_task()
+        self.pendingRequests.add(task)
+
+        try:
+            context = await self.contextTask
+            response = await asyncio.wait_for(context.request(request).response, timeout)
+        except Exception as e:
+            logging.warning(f"CoAP {code} {path} failed: {e!r}")
+            return None
+        finally:
+            self.pendingRequests.discard(task)
+
+        logging.debug(f"CoAP {code} {path} response: {response.code}")
+
+        if responseHandler:
+            responseHandler(response)
+
+        return response
+
+    async def _observe(self, path: str, ttl: int):
+        context = await self.contextTask
+        request = context.request(aiocoap.Message(code=aiocoap.Code.GET, uri=self.uriPath + path, observe=0))
+
+        # with a ttl, the observation stops after ttl seconds
+        timer = self.eventLoop.call_later(ttl, request.observation.cancel) if ttl and ttl > 0 else None
+
+        try:
+            self._onGetResponse(await request.response, path)
+
+            async for response in request.observation:
+                self._onGetResponse(response, path)
+
+        except Exception as e:
+            logging.warning(f"CoAP observation of {path} stopped: {e!r}")
+
+        finally:
+            if timer:
+                timer.cancel()
+
+            if not request.observation.cancelled:
+                request.observation.cancel()
+
+    def _forwardPayload(self, path: str, payload: bytes, contentFormat: int) -> bool:
+        # spool sender, on the spool's thread - a PUT only counts as
+        # delivered once the server responds
+        future = asyncio.run_coroutine_threadsafe( \
+            self._sendRequest(aiocoap.Code.PUT, path, payload=payload, contentFormat=contentFormat), self.eventLoop)
+
+        try:
+            return future.result() is not None
+        except Exception:
+            return False
+
+    def _createResourcePath(self, resource: ResourceNameEnum, name: str = None) -> str:
+        path = resource.value if resource else ""
+
+        if name:
+            path = path + "/" + name if path else name
+
+        return path
+
+    def _onGetResponse(self, response, resourcePath: str):
+        if not response or not response.code.is_successful():
+            return
+
+        # as with CoapClientConnector, an actuator command is passed on
+        locationPath = resourcePath.split('/')
+
+        if len(locationPath) > 2 and locationPath[2] == ConfigConst.ACTUATOR_CMD and self.dataMsgListener:
+            try:
+                self.dataMsgListener.handleActuatorCommandMessage( \
+                    DataUtil().jsonToActuatorData(response.payload.decode('utf-8')))
+            except Exception as e:
+                logging.warning(f"Failed to decode actuator data from {resourcePath}: {e}")
@@ -0,0 +1,155 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import asyncio
+import logging
+import paho.mqtt.client as mqttClient
+
+from programmingtheiot.cda.connection.MqttClientConnector import MqttClientConnector
+
+class AsyncMqttClientConnector(MqttClientConnector):
+    """
+    The MQTT client of the asyncio runtime: the same client as
+    MqttClientConnector, but its network I/O runs on the asyncio event
+    loop instead of paho's network thread, using paho's external loop
+    callbacks (the socket is watched with the loop's add_reader() and
+    add_writer(), and loop_misc() runs every second for keepalives).
+
+    It must be connected from the event loop, which then has to keep
+    running for messages to be sent and received. Messages can still be
+    published from other threads (e.g. the spool's forwarder); they're
+    written by the loop. While the connection is down, reconnects are
+    attempted every RECONNECT_DELAY_SECS, on the loop's default executor
+    so the loop isn't blocked by the TCP connect.
+
+    """
+
+    MISC_LOOP_SECS = 1.0
+    RECONNECT_DELAY_SECS = 5.0
+
+    def __init__(self, clientID: str = None):
+        """
+        Constructor. See MqttClientConnector.
+
+        @param clientID Defaults to None. See MqttClientConnector.
+        """
+        super().__init__(clientID)
+
+        self.eventLoop = None
+        self.miscTask = None
+
+    def connectClient(self, cleanSession: bool = True) -> bool:
+        """
+        Connects to the broker. Must be called from the event loop.
+
+        @param cleanSession Whether the broker should discard any previous
+        session of the client.
+        @return bool True if connecting; False if already connected.
+        """
+        self.eventLoop = asyncio.get_running_loop()
+
+        return super().connectClient(cleanSession)
+
+    def disconnectClient(self) -> bool:
+        isDisconnected = super().disconnectClient()
+
+        # the DISCONNECT is written now, as the loop may not run much longer
+        if isDisconnected:
+            self.mqttClient.loop_write()
+
+        return isDisconnected
+
+    def _createClient(self, cleanSession: bool):
+        super()._createClient(cleanSession)
+
+        self.mqttClient.on_socket_open = self._onSocketOpen
+        self.mqttClient.on_socket_close = self._onSocketClose
+        self.mqttClient.on_socket_register_write = self._onSocketRegisterWrite
+        self.mqttClient.on_socket_unregister_write = self._onSocketUnregisterWrite
+
+    def _startNetworkLoop(self):
+        if not self.miscTask:
+            self.miscTask = self.eventLoop.create_task(self._runMiscLoop())
+
+    def _stopNetworkLoop(self):
+        if self.miscTask:
+            self.miscTask.cancel()
+            self.miscTask = None
+
+    async def _runMiscLoop(self):
+        while True:
+            await asyncio.sleep(self.MISC_LOOP_SECS)
+
+            if self.mqttClient.loop_misc() != mqttClient.MQTT_ERR_NO_CONN:
+                continue
+
+            await asyncio.sleep(self.RECONNECT_DELAY_SECS)
+
+            try:
+                logging.info(f"MQTT client reconnecting to broker (host={self.host}, port={self.port})")
+                await self.eventLoop.run_in_executor(None, self.mqttClient.reconnect)
+            except OSError as e:
+                logging.warning(f"MQTT client failed to reconnect: {e}")
+
+    # paho calls these from whichever thread opens, writes to or closes the
+    # socket, while the loop's readers and writers may only be changed on the
+    # loop; they're watched by file descriptor, as the socket may be closed
+    # by the time a change from another thread is made
+
+    def _onSocketOpen(self, client, userdata, sock):
+        self._callOnLoop(self._watchSocket, sock.fileno(), False)
+
+    def _onSocketClose(self, client, userdata, sock):
+        self._callOnLoop(self.eventLoop.remove_reader, sock.fileno())
+
+    def _onSocketRegisterWrite(self, client, userdata, sock):
+        self._callOnLoop(self._watchSocket, sock.fileno(), True)
+
+    def _onSocketUnregisterWrite(self, client, userdata, sock):
+        self._callOnLoop(self.eventLoop.remove_writer, sock.fileno())
+
+    def _callOnLoop(self, func, *args):
+        try:
+            isOnLoop = asyncio.get_running_loop() is self.eventLoop
+        except RuntimeError:
+            isOnLoop = False
+
+        if isOnLoop:
+            func(*args)
+        else:
+            self.eventLoop.call_soon_threadsafe(func, *args)
+
+    def _watchSocket(self, fd: int, isWrite: bool):
+        # skipped if the socket has been closed since
+        sock = self.mqttClient.socket()
+
+        if not sock or sock.fileno() != fd:
+            return
+
+        if isWrite:
+            self.eventLoop.add_writer(fd, self._onSocketWritable)
+        else:
+            self.eventLoop.add_reader(fd, self._onSocketReadable)
+
+    def _onSocketReadable(self):
+        self.mqttClient.loop_read()
+
+        # with TLS, records already read from the socket don't make it
+        # readable again
+        sock = self.mqttClient.socket()
+
+        while sock and hasattr(sock, 'pending') and sock.pending() > 0:
+            self.mqttClient.loop_read()
+            sock = self.mqttClient.socket()
+
+    def _onSocketWritable(self):
+        self.mqttClient.loop_write()
@@ -11,6 +11,7 @@
 # 
 
 # import logging
+import os
 import socket
 
 from coapthon import defines
@@ -23,11 +24,13 @@ import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
 
 from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
 
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 from programmingtheiot.cda.connection.IRequestResponseClient import IRequestResponseClient
+from programmingtheiot.cda.pipeline.MessageSpool import MessageSpool
 
 # logging.basicConfig(format = '%(asctime)s:%(filename)s:%(levelname)s:%(message)s', level = logging.DEBUG)
 
@@ -80,10 +83,29 @@ class CoapClientConnector(IRequestResponseClient):
         
         self.host = config.getProperty( \
             ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.HOST_KEY, ConfigConst.DEFAULT_HOST)
+        self.codec = DataUtil.getCodec(config.getProperty( \
+            ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PAYLOAD_CODEC_KEY, ConfigConst.DEFAULT_PAYLOAD_CODEC))
         self.port = config.getInteger( \
             ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PORT_KEY, ConfigConst.DEFAULT_COAP_PORT)
                 
         self.includeDebugLogDetail = True
+        
+        # optional disk-backed spool, so PUTs made while the server is
+        # unreachable are delivered once it's back
+        self.spool = None
+        
+        if config.getBoolean(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.ENABLE_SPOOL_KEY):
+            self.spool = MessageSpool(
+                path=os.path.join(config.getProperty( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_PATH_KEY, ConfigConst.DEFAULT_SPOOL_PATH), ConfigConst.COAP.lower()),
+                segmentSize=config.getInteger( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_SEGMENT_SIZE_KEY, ConfigConst.DEFAULT_SPOOL_SEGMENT_SIZE),
+                maxSegments=config.getInteger( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_MAX_SEGMENTS_KEY, ConfigConst.DEFAULT_SPOOL_MAX_SEGMENTS),
+                replayRate=config.getFloat( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_REPLAY_RATE_KEY, ConfigConst.DEFAULT_SPOOL_REPLAY_RATE),
+                retryDelay=config.getFloat( \
+                    ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.SPOOL_RETRY_DELAY_KEY, ConfigConst.DEFAULT_SPOOL_RETRY_DELAY))
   
         try:
             tmp = socket.gethostbyname(self.host)
@@ -92,6 +114,9 @@ class CoapClientConnector(IRequestResponseClient):
                 self.uriPath = f"coap://{self.host}:{self.port}/"
                 # logging.info(f"CoAP client will connect to {self.host}")
                 self._initClient()
+                
+                if self.spool:
+                    self.spool.start(self._forwardPayload)
             else:
                 # logging.error(f"Could not resolve host {self.host}")
                 raise
@@ -228,13 +253,55 @@ class CoapClientConnector(IRequestResponseClient):
         
         return False
 
+    def getCodec(self):
+        return self.codec
+    
+    def getSpool(self) -> MessageSpool:
+        return self.spool
+    
+    def sendPutData(
+        self, 
+        resource: ResourceNameEnum = None, 
+        name: str = None, 
+        enableCON: bool = False, 
+        data = None, 
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT,
+        useSpool: bool = True
+    ) -> bool:
+        
+        if not data:
+            return False
+        
+        # data the configured codec can't represent is sent as JSON, and an
+        # EncodedPayload shared with other sinks is only encoded once
+        encodedPayload = EncodedPayload.wrap(data)
+        codec = encodedPayload.resolveCodec(self.codec)
+        
+        # with the spool enabled, the PUT is made by the spool's forwarder,
+        # which keeps the payload until the server responds; without
+        # 'useSpool', the PUT is made now and only spooled if it fails
+        if self.spool and useSpool:
+            return self.spool.append(channel=self._createResourcePath(resource, name), \
+                payload=encodedPayload.getPayload(codec), tag=codec.getContentFormat())
+        
+        try:
+            return self.sendPutRequest(resource=resource, name=name, enableCON=enableCON, \
+                payload=encodedPayload.getPayload(codec), timeout=timeout, contentFormat=codec.getContentFormat())
+        except Exception as e:
+            if not self.spool:
+                raise e
+            
+            return self.spool.append(channel=self._createResourcePath(resource, name), \
+                payload=encodedPayload.getPayload(codec), tag=codec.getContentFormat())
+
     def sendPutRequest(
         self, 
         resource: ResourceNameEnum = None, 
         name: str = None, 
         enableCON: bool = False, 
         payload: str = None, 
-        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT
+        timeout: int = IRequestResponseClient.DEFAULT_TIMEOUT,
+        contentFormat: int = None
     ) -> bool:
         
         if resource or name:
@@ -245,6 +312,9 @@ class CoapClientConnector(IRequestResponseClient):
             request.token = generate_random_token(2)
             request.payload = payload
             
+            if contentFormat is not None:
+                request.content_type = contentFormat
+            
             try:
                 if enableCON:
                     self.coapClient.send_request(request=request, timeout=timeout, \
@@ -349,6 +419,23 @@ class CoapClientConnector(IRequestResponseClient):
             # logging.error(f"Failed to create CoAP client to {self.uriPath}")
             raise e # just throw
         
+    def _forwardPayload(self, path: str, payload: bytes, contentFormat: int) -> bool:
+        # spool sender - a PUT only counts as delivered once the server responds
+        request = self.coapClient.mk_request(defines.Codes.PUT, path=path)
+        request.token = generate_random_token(2)
+        request.type = defines.Types["NON"]
+        request.payload = payload
+        request.content_type = contentFormat
+        
+        try:
+            response = self.coapClient.send_request(request=request, timeout=IRequestResponseClient.DEFAULT_TIMEOUT)
+        except Exception:
+            return False
+        
+        self._onPutResponse(response=response)
+        
+        return response is not None
+    
     def _createResourcePath(self, resource: ResourceNameEnum, name: str = None) -> str:
         
         path = ""
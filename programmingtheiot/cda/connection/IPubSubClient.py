@@ -50,6 +50,19 @@ class IPubSubClient():
 		"""
 		pass
 
+	def publishData(self, resource: ResourceNameEnum = None, data = None, qos: int = ConfigConst.DEFAULT_QOS, useSpool: bool = True) -> bool:
+		"""
+		Encodes 'data' with the configured payload codec and publishes it to
+		the given topic, with the codec's topic suffix appended.
+		
+		@param resource The topic Enum containing the topic value to publish the message to.
+		@param data The data container (or a shared EncodedPayload) to encode and publish.
+		@param qos The QoS level. This is expected to be 0 - 2. Default is DEFAULT_QOS.
+		@param useSpool If False, a message that can be sent right away bypasses the store-and-forward spool (if enabled).
+		@return bool True on success; False otherwise.
+		"""
+		pass
+
 	def subscribeToTopic(self, resource: ResourceNameEnum = None, callback = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
 		"""
 		Attempts to subscribe to a topic with the given qos hosted by the
@@ -80,6 +80,20 @@ class IRequestResponseClient():
 		"""
 		pass
 
+	def sendPutData(self, resource: ResourceNameEnum = None, name: str = None, enableCON: bool = False, data = None, timeout: int = ConfigConst.DEFAULT_TIMEOUT, useSpool: bool = True) -> bool:
+		"""
+		Encodes 'data' with the configured payload codec and sends it as a PUT
+		request for resource at path, with the codec's Content-Format set.
+		
+		@param resource The resource enum containing the resource path string.
+		@param enableCON If true, CON (confirmed) messaging will be used; otherwise use NON (non-confirmed).
+		@param data The data container (or a shared EncodedPayload) to encode and send.
+		@param timeout The number of seconds to wait for a response before returning (default is DEFAULT_TIMEOUT).
+		@param useSpool If False, the request is sent right away, bypassing the store-and-forward spool (if enabled) unless it fails.
+		@return bool True on success; False otherwise.
+		"""
+		pass
+
 	def setDataMessageListener(self, listener: IDataMessageListener = None) -> bool:
 		"""
 		Sets the data message listener reference, assuming listener is non-null.
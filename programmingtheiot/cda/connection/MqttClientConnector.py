@@ -11,6 +11,7 @@
 # 
 
 import logging
+import os
 import paho.mqtt.client as mqttClient
 import ssl
 
@@ -18,10 +19,12 @@ import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
 
 from programmingtheiot.cda.connection.IPubSubClient import IPubSubClient
+from programmingtheiot.cda.pipeline.MessageSpool import MessageSpool
 
 class MqttClientConnector(IPubSubClient):
     """
@@ -91,6 +94,40 @@ class MqttClientConnector(IPubSubClient):
             ConfigConst.DEFAULT_CRED_FILE_NAME
         )
         
+        # payload codec for outgoing data - JSON unless configured otherwise
+        self.codec = DataUtil.getCodec(
+            self.config.getProperty(
+                ConfigConst.MQTT_GATEWAY_SERVICE,
+                ConfigConst.PAYLOAD_CODEC_KEY,
+                ConfigConst.DEFAULT_PAYLOAD_CODEC
+            )
+        )
+        
+        # optional disk-backed spool, so messages published while the broker
+        # is unreachable are delivered once it's back
+        self.spool = None
+        self.spoolAckTimeout = self.config.getFloat(
+            ConfigConst.MQTT_GATEWAY_SERVICE,
+            ConfigConst.SPOOL_ACK_TIMEOUT_KEY,
+            ConfigConst.DEFAULT_SPOOL_ACK_TIMEOUT
+        )
+        
+        if self.config.getBoolean(ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.ENABLE_SPOOL_KEY):
+            self.spool = MessageSpool(
+                path=os.path.join(
+                    self.config.getProperty(ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SPOOL_PATH_KEY, ConfigConst.DEFAULT_SPOOL_PATH),
+                    ConfigConst.MQTT.lower()
+                ),
+                segmentSize=self.config.getInteger(
+                    ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SPOOL_SEGMENT_SIZE_KEY, ConfigConst.DEFAULT_SPOOL_SEGMENT_SIZE),
+                maxSegments=self.config.getInteger(
+                    ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SPOOL_MAX_SEGMENTS_KEY, ConfigConst.DEFAULT_SPOOL_MAX_SEGMENTS),
+                replayRate=self.config.getFloat(
+                    ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SPOOL_REPLAY_RATE_KEY, ConfigConst.DEFAULT_SPOOL_REPLAY_RATE),
+                retryDelay=self.config.getFloat(
+                    ConfigConst.MQTT_GATEWAY_SERVICE, ConfigConst.SPOOL_RETRY_DELAY_KEY, ConfigConst.DEFAULT_SPOOL_RETRY_DELAY)
+            )
+        
         self.mqttClient = None
         
         logging.info(
@@ -101,6 +138,8 @@ f"""
     MQTT Keep Alive:    {self.keepAlive}                     
     MQTT Encryption:    {self.enableCrypt}
     MQTT CA File Name:  {self.caFileName}     
+    MQTT Payload Codec: {self.codec.getName()}
+    MQTT Spool Path:    {self.spool.path if self.spool else None}
 """
         )
         
@@ -108,33 +147,16 @@ f"""
 
     def connectClient(self, cleanSession: bool = True) -> bool:
         if not self.mqttClient:
-            self.mqttClient = mqttClient.Client(client_id=self.clientID, clean_session=cleanSession)
-            
-            try:
-                if self.enableCrypt:
-                    logging.info("Enabling TLS Encryption...")
-                    self.port = self.config.getInteger(
-                        ConfigConst.MQTT_GATEWAY_SERVICE,
-                        ConfigConst.SECURE_PORT_KEY,
-                        ConfigConst.DEFAULT_MQTT_SECURE_PORT
-                    )
-                    self.mqttClient.tls_set(self.caFileName, tls_version=ssl.PROTOCOL_TLS_CLIENT, cert_reqs=ssl.CERT_NONE)
-                    # self.mqttClient.tls_insecure_set(self.caFileName)
-                    
-            except Exception as e:
-                logging.error("TLS Encryption failed.")
-                raise e
-            
-            self.mqttClient.on_connect = self.onConnect
-            self.mqttClient.on_disconnect = self.onDisconnect
-            self.mqttClient.on_message = self.onMessage
-            self.mqttClient.on_publish = self.onPublish
-            self.mqttClient.on_subscribe = self.onSubscribe
+            self._createClient(cleanSession)
             
         if not self.mqttClient.is_connected():
             logging.info(f"MQTT client connecting to broker (host={self.host}, port={self.port})")
             self.mqttClient.connect(self.host, self.port, self.keepAlive)
-            self.mqttClient.loop_start()
+            self._startNetworkLoop()
+            
+            if self.spool:
+                self.spool.start(self._forwardPayload)
+                
             return True
             
         else:
@@ -142,9 +164,13 @@ f"""
             return False
         
     def disconnectClient(self) -> bool:
+        # undelivered messages stay in the spool until the next connect
+        if self.spool:
+            self.spool.stop()
+            
         if self.mqttClient.is_connected():
             logging.info(f"MQTT client disconnecting from broker (host={self.host}, port={self.port})")
-            self.mqttClient.loop_stop()
+            self._stopNetworkLoop()
             self.mqttClient.disconnect()
             return True
         else:
@@ -162,6 +188,9 @@ f"""
             callback=self.onActuatorCommandMessage
         )
         
+        if self.spool:
+            self.spool.resume()
+        
     def onDisconnect(self, client, userdata, rc):
         logging.debug(f"[Callback] Client disconnected from broker: {str(client)}, code={rc}")
         
@@ -199,21 +228,95 @@ f"""
             except:
                 logging.exception("Failed to deserialize payload: ")
     
+    def getCodec(self):
+        return self.codec
+    
+    def getSpool(self) -> MessageSpool:
+        return self.spool
+    
+    def publishData(self, resource: ResourceNameEnum = None, data = None, qos: int = ConfigConst.DEFAULT_QOS, useSpool: bool = True) -> bool:
+        """
+        Encodes 'data' with the configured payload codec and publishes it. The
+        codec's topic suffix is appended to the resource topic so subscribers
+        can tell how to decode it. Data the codec can't represent is sent as
+        JSON on the plain topic.
+        
+        If 'data' is an EncodedPayload shared with other sinks, its cached
+        payload is reused rather than encoding the data again.
+        
+        If the spool is enabled, the payload is appended to it and published
+        in order by the spool's forwarder, which keeps it until the broker
+        has it (for QoS 0, until it's handed to the client).
+        
+        @param resource The topic Enum to publish to.
+        @param data The data container or EncodedPayload to publish.
+        @param qos The QoS level.
+        @param useSpool If False, the payload is published right away while
+        connected, ahead of any spooled messages, and only spooled otherwise.
+        @return bool True on success, or if spooled; False otherwise.
+        """
+        if not resource or not data:
+            return False
+        
+        encodedPayload = EncodedPayload.wrap(data)
+        codec = encodedPayload.resolveCodec(self.codec)
+        topic = resource.value + codec.getTopicSuffix()
+        
+        if self.spool and (useSpool or not self.connected):
+            return self.spool.append(channel=topic, payload=encodedPayload.getPayload(codec), tag=qos)
+        
+        return self._publishPayload(topic=topic, payload=encodedPayload.getPayload(codec), qos=qos)
+    
     def publishMessage(self, resource: ResourceNameEnum = None, msg: str = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
         
         # validations
         if not resource:
             # logging.warning("No topic specified to publish to.")
             return False
-        if not msg:
-            # logging.warning(f"Cannot publish empty message to topic {resource}")
+        
+        return self._publishPayload(topic=resource.value, payload=msg, qos=qos)
+    
+    def _createClient(self, cleanSession: bool):
+        self.mqttClient = mqttClient.Client(client_id=self.clientID, clean_session=cleanSession)
+        
+        try:
+            if self.enableCrypt:
+                logging.info("Enabling TLS Encryption...")
+                self.port = self.config.getInteger(
+                    ConfigConst.MQTT_GATEWAY_SERVICE,
+                    ConfigConst.SECURE_PORT_KEY,
+                    ConfigConst.DEFAULT_MQTT_SECURE_PORT
+                )
+                self.mqttClient.tls_set(self.caFileName, tls_version=ssl.PROTOCOL_TLS_CLIENT, cert_reqs=ssl.CERT_NONE)
+                # self.mqttClient.tls_insecure_set(self.caFileName)
+                
+        except Exception as e:
+            logging.error("TLS Encryption failed.")
+            raise e
+        
+        self.mqttClient.on_connect = self.onConnect
+        self.mqttClient.on_disconnect = self.onDisconnect
+        self.mqttClient.on_message = self.onMessage
+        self.mqttClient.on_publish = self.onPublish
+        self.mqttClient.on_subscribe = self.onSubscribe
+        
+    def _startNetworkLoop(self):
+        # paho's network thread
+        self.mqttClient.loop_start()
+        
+    def _stopNetworkLoop(self):
+        self.mqttClient.loop_stop()
+        
+    def _publishPayload(self, topic: str, payload, qos: int) -> bool:
+        if not payload:
+            # logging.warning(f"Cannot publish empty message to topic {topic}")
             return False
         if not 0 <= qos <= 2:
             qos = ConfigConst.DEFAULT_QOS
             
         # publish
         try:
-            info = self.mqttClient.publish(topic=resource.value, payload=msg, qos=qos)
+            info = self.mqttClient.publish(topic=topic, payload=payload, qos=qos)
             # TODO start a thread to get if pub succeeded
             # info.wait_for_publish()
             return True
@@ -221,6 +324,22 @@ f"""
             # logging.error(f"Publish failed: {str(e)}")
             return False
     
+    def _forwardPayload(self, topic: str, payload: bytes, qos: int) -> bool:
+        # spool sender - at QoS 1 and 2, a message only counts as delivered
+        # once the broker acknowledges it
+        if not self.connected:
+            return False
+        
+        info = self.mqttClient.publish(topic=topic, payload=payload, qos=qos)
+        
+        if info.rc != mqttClient.MQTT_ERR_SUCCESS:
+            return False
+        
+        if qos > 0:
+            info.wait_for_publish(timeout=self.spoolAckTimeout)
+            
+        return info.is_published() or qos == 0
+    
     def subscribeToTopic(self, resource: ResourceNameEnum = None, callback = None, qos: int = ConfigConst.DEFAULT_QOS) -> bool:
         
         # validations
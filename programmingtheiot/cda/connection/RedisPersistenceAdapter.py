@@ -7,6 +7,7 @@ from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
 from programmingtheiot.data.SensorData import SensorData
 from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
 
 class RedisPersistenceAdapter:
     """
@@ -25,6 +26,8 @@ class RedisPersistenceAdapter:
             key=ConfigConst.PORT_KEY
         )
         
+        self.codec = DataUtil.getCodec(ConfigConst.JSON_CODEC)
+        
         self.client = None
         self.connected = False
         
@@ -65,7 +68,18 @@ class RedisPersistenceAdapter:
             logging.error(f"Failed to disconnect from Redis server: {e}")
             return False
         
+    def getCodec(self):
+        return self.codec
+    
     def storeSensorData(self, resource: ResourceNameEnum, data: SensorData) -> bool:
+        return self.storePayload(resource, EncodedPayload.wrap(data))
+    
+    def storePayload(self, resource: ResourceNameEnum, payload: EncodedPayload) -> bool:
+        """
+        Stores the JSON form of 'payload' under the resource key. If the
+        payload is shared with the MQTT and CoAP clients, its cached JSON
+        encoding is reused.
+        """
         if not self.connected:
             logging.error("Redis client is not connected. Cannot store data.")
             return False
@@ -73,9 +87,9 @@ class RedisPersistenceAdapter:
         # publish data to redis server
         try:
             key = resource.value
-            value = DataUtil().sensorDataToJson(data)
+            value = payload.getPayloadView(self.codec)
             self.client.set(key, value)
-            logging.info(f"Stored data under key '{key}': {value}")
+            logging.info(f"Stored data under key '{key}': {payload.getData()}")
             return True
         except Exception as e:
             logging.error(f"Failed to store data in Redis: {e}")
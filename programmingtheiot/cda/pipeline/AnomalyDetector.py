@@ -0,0 +1,314 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import threading
+import time
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.sim.SensorDataGenerator import SensorDataGenerator
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataBatch import SensorDataBatch
+
+class AnomalyDetector(object):
+    """
+    Flags anomalous sensor readings with a per-sensor exponentially
+    weighted moving average (EWMA) model, and decides which normal readings
+    are forwarded upstream.
+
+    Each reading's residual - its value less the seasonal baseline of its
+    sensor type at that point in the season - is compared with the EWMA
+    mean and variance of the sensor's earlier residuals. The reading is an
+    anomaly if its z-score exceeds 'zThreshold', once the sensor has had
+    'warmupCount' readings. Anomalies are clipped to the threshold before
+    updating the model, so a spike doesn't widen the band that detects the
+    next one, while a lasting level shift is still learned.
+
+    Seasonal baselines are the daily curves of SensorDataGenerator (without
+    noise) for temperature, humidity and pressure, between the simulator's
+    configured floor and ceiling, stretched over 'seasonPeriodSecs' from
+    each sensor's first reading. Other sensor types have no baseline.
+
+    Normal readings are forwarded at most once per 'normalForwardSecs' per
+    sensor; anomalies are always forwarded, and don't count towards that
+    rate.
+
+    Model state is kept in NumPy arrays indexed by sensor, so a batch of
+    readings from many sensors is scored and the models updated with a few
+    array operations rather than a loop per reading.
+
+    """
+
+    NS_IN_SECS = 1000000000
+
+    SEASON_POINTS = 1440
+    MIN_STDDEV = 1e-9
+
+    DEFAULT_CAPACITY = 64
+
+    def __init__(self):
+        """
+        Constructor. Loads the model settings from the ConstrainedDevice
+        section of the configuration, and builds the seasonal baselines
+        from the simulator floor and ceiling settings.
+
+        """
+        configUtil = ConfigUtil()
+
+        self.alpha = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_EWMA_ALPHA_KEY, ConfigConst.DEFAULT_ANOMALY_EWMA_ALPHA)
+        self.zThreshold = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_Z_THRESHOLD_KEY, ConfigConst.DEFAULT_ANOMALY_Z_THRESHOLD)
+        self.warmupCount = configUtil.getInteger(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_WARMUP_COUNT_KEY, ConfigConst.DEFAULT_ANOMALY_WARMUP_COUNT)
+        self.normalForwardSecs = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_NORMAL_FORWARD_KEY, ConfigConst.DEFAULT_ANOMALY_NORMAL_FORWARD)
+        self.seasonPeriodSecs = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_SEASON_PERIOD_KEY, ConfigConst.DEFAULT_ANOMALY_SEASON_PERIOD)
+
+        # (typeID, name) -> index into the model arrays
+        self.sensorIndexes = {}
+
+        self.means            = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.float64)
+        self.variances        = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.float64)
+        self.counts           = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.int64)
+        self.originNanos      = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.int64)
+        self.lastForwardNanos = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.int64)
+        self.baselineRows     = calcLib.zeros(self.DEFAULT_CAPACITY, dtype = calcLib.int32)
+
+        # row 0 is the zero baseline of sensor types without one
+        self.baselineTable = calcLib.zeros((1, self.SEASON_POINTS), dtype = calcLib.float64)
+        self.baselineTypeRows = {}
+
+        self.readingCount = 0
+        self.anomalyCount = 0
+        self.forwardCount = 0
+
+        self._lock = threading.Lock()
+
+        dataGenerator = SensorDataGenerator()
+
+        baselines = [
+            (ConfigConst.HUMIDITY_SENSOR_TYPE, dataGenerator.generateDailyEnvironmentHumidityDataSet, \
+                ConfigConst.HUMIDITY_SIM_FLOOR_KEY, SensorDataGenerator.LOW_NORMAL_ENV_HUMIDITY, \
+                ConfigConst.HUMIDITY_SIM_CEILING_KEY, SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY),
+            (ConfigConst.PRESSURE_SENSOR_TYPE, dataGenerator.generateDailyEnvironmentPressureDataSet, \
+                ConfigConst.PRESSURE_SIM_FLOOR_KEY, SensorDataGenerator.LOW_NORMAL_ENV_PRESSURE, \
+                ConfigConst.PRESSURE_SIM_CEILING_KEY, SensorDataGenerator.HI_NORMAL_ENV_PRESSURE),
+            (ConfigConst.TEMP_SENSOR_TYPE, dataGenerator.generateDailyIndoorTemperatureDataSet, \
+                ConfigConst.TEMP_SIM_FLOOR_KEY, SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, \
+                ConfigConst.TEMP_SIM_CEILING_KEY, SensorDataGenerator.HI_NORMAL_INDOOR_TEMP)
+        ]
+
+        if configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ANOMALY_SEASONAL_BASELINE_KEY):
+            for typeID, generate, floorKey, floorDefault, ceilingKey, ceilingDefault in baselines:
+                dataSet = generate( \
+                    noiseLevel = SensorDataGenerator.NO_NOISE, \
+                    minValue = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, floorKey, floorDefault), \
+                    maxValue = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ceilingKey, ceilingDefault))
+
+                self.setBaseline(typeID, dataSet.getDataEntries())
+
+    def setBaseline(self, typeID: int, curve = None):
+        """
+        Sets the seasonal baseline of a sensor type, replacing any set
+        before, or removes it.
+
+        @param typeID The sensor type ID.
+        @param curve Array of baseline values evenly spaced over one
+        season, or None to remove the baseline.
+        """
+        with self._lock:
+            row = self.baselineTypeRows.get(typeID, 0)
+
+            if curve is None:
+                if row:
+                    self.baselineTable[row] = 0.0
+                return
+
+            curve = calcLib.asarray(curve, dtype = calcLib.float64)
+            resampled = calcLib.interp( \
+                calcLib.linspace(0, len(curve) - 1, self.SEASON_POINTS), calcLib.arange(len(curve)), curve)
+
+            if not row:
+                row = len(self.baselineTable)
+                self.baselineTable = calcLib.vstack((self.baselineTable, resampled))
+                self.baselineTypeRows[typeID] = row
+
+                for (sensorTypeID, name), index in self.sensorIndexes.items():
+                    if sensorTypeID == typeID:
+                        self.baselineRows[index] = row
+            else:
+                self.baselineTable[row] = resampled
+
+    def detect(self, data: SensorData) -> tuple:
+        """
+        Scores a reading and updates its sensor's model.
+
+        @param data The sensor reading.
+        @return tuple (isAnomaly, isForwarded, zScore)
+        """
+        timeStampNanos = data.getTimeStampNanos()
+
+        with self._lock:
+            index = self._getSensorIndex(data.getTypeID(), data.getName())
+
+        zScores, anomalies, forwarded = self.detectArrays( \
+            calcLib.array([index]), \
+            calcLib.array([timeStampNanos if timeStampNanos is not None else time.time_ns()], dtype = calcLib.int64), \
+            calcLib.array([data.getValue()], dtype = calcLib.float64))
+
+        return (bool(anomalies[0]), bool(forwarded[0]), float(zScores[0]))
+
+    def detectBatch(self, batch: SensorDataBatch) -> tuple:
+        """
+        Scores a batch of readings, e.g. from many simulated sensors, and
+        updates their sensors' models in time order.
+
+        @param batch The readings.
+        @return tuple (zScores, isAnomaly, isForwarded) arrays, one entry
+        per reading.
+        """
+        typeIDs = batch.getTypeIDs()
+        nameIndexes = batch.getNameIndexes()
+        names = batch.getNames()
+
+        # look up each distinct sensor once, not each reading
+        keys, inverse = calcLib.unique(typeIDs.astype(calcLib.int64) << 32 | nameIndexes, return_inverse = True)
+
+        with self._lock:
+            sensorIndexes = calcLib.array([self._getSensorIndex(int(key >> 32), names[int(key & 0xFFFFFFFF)]) for key in keys])
+
+        return self.detectArrays(sensorIndexes[inverse.ravel()], batch.getTimeStamps(), batch.getValues())
+
+    def detectArrays(self, sensorIndexes, timeStamps, values) -> tuple:
+        """
+        Scores readings given as arrays of sensor indexes (from
+        getSensorIndex()), time stamps and values.
+
+        Readings of the same sensor are applied in array order. Each round
+        updates every sensor with a pending reading at once, so a batch
+        with one reading per sensor takes a single round.
+
+        @return tuple (zScores, isAnomaly, isForwarded) arrays.
+        """
+        count = len(values)
+        zScores = calcLib.zeros(count, dtype = calcLib.float64)
+        anomalies = calcLib.zeros(count, dtype = bool)
+        forwarded = calcLib.zeros(count, dtype = bool)
+
+        if count == 0:
+            return (zScores, anomalies, forwarded)
+
+        # rank of each reading among the readings of its sensor
+        order = calcLib.argsort(sensorIndexes, kind = 'stable')
+        isFirst = calcLib.ones(count, dtype = bool)
+        isFirst[1:] = sensorIndexes[order][1:] != sensorIndexes[order][:-1]
+        ranks = calcLib.empty(count, dtype = calcLib.int64)
+        ranks[order] = calcLib.arange(count) - calcLib.maximum.accumulate(calcLib.where(isFirst, calcLib.arange(count), 0))
+
+        periodNanos = max(int(self.seasonPeriodSecs * self.NS_IN_SECS), 1)
+        forwardNanos = int(self.normalForwardSecs * self.NS_IN_SECS)
+
+        with self._lock:
+            for rank in range(0, int(ranks.max()) + 1):
+                rows = calcLib.flatnonzero(ranks == rank)
+                sensors = sensorIndexes[rows]
+                times = timeStamps[rows]
+
+                sensorCounts = self.counts[sensors]
+                isNew = sensorCounts == 0
+                self.originNanos[sensors[isNew]] = times[isNew]
+
+                phases = ((times - self.originNanos[sensors]) % periodNanos) * self.SEASON_POINTS // periodNanos
+                residuals = values[rows] - self.baselineTable[self.baselineRows[sensors], phases]
+
+                means = calcLib.where(isNew, residuals, self.means[sensors])
+                variances = self.variances[sensors]
+                stddevs = calcLib.maximum(calcLib.sqrt(variances), self.MIN_STDDEV)
+
+                scores = calcLib.where(isNew, 0.0, (residuals - means) / stddevs)
+                isAnomaly = (sensorCounts >= self.warmupCount) & (calcLib.abs(scores) > self.zThreshold)
+
+                # clip anomalies to the threshold so they don't swamp the model
+                limits = self.zThreshold * stddevs
+                clipped = calcLib.where(isAnomaly, calcLib.clip(residuals, means - limits, means + limits), residuals)
+
+                diffs = clipped - means
+                increments = self.alpha * diffs
+                self.means[sensors] = means + increments
+                self.variances[sensors] = (1.0 - self.alpha) * (variances + diffs * increments)
+                self.counts[sensors] = sensorCounts + 1
+
+                isNormalForwarded = ~isAnomaly & (isNew | (times - self.lastForwardNanos[sensors] >= forwardNanos))
+                self.lastForwardNanos[sensors[isNormalForwarded]] = times[isNormalForwarded]
+                isForwarded = isAnomaly | isNormalForwarded
+
+                zScores[rows] = scores
+                anomalies[rows] = isAnomaly
+                forwarded[rows] = isForwarded
+
+            self.readingCount += count
+            self.anomalyCount += int(anomalies.sum())
+            self.forwardCount += int(forwarded.sum())
+
+        return (zScores, anomalies, forwarded)
+
+    def getSensorIndex(self, typeID: int, name: str) -> int:
+        """
+        Returns the model index of a sensor, adding the sensor if needed.
+
+        @param typeID The sensor type ID.
+        @param name The sensor name.
+        @return int
+        """
+        with self._lock:
+            return self._getSensorIndex(typeID, name)
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the counts of sensors, readings scored, anomalies, and
+        readings forwarded and suppressed.
+
+        @return dict
+        """
+        with self._lock:
+            return {
+                'sensors': len(self.sensorIndexes),
+                'readings': self.readingCount,
+                'anomalies': self.anomalyCount,
+                'forwarded': self.forwardCount,
+                'suppressed': self.readingCount - self.forwardCount
+            }
+
+    def _getSensorIndex(self, typeID: int, name: str) -> int:
+        # must be called while holding the lock
+        index = self.sensorIndexes.get((typeID, name))
+
+        if index is None:
+            index = len(self.sensorIndexes)
+
+            if index == len(self.means):
+                self._resize(index * 2)
+
+            self.sensorIndexes[(typeID, name)] = index
+            self.baselineRows[index] = self.baselineTypeRows.get(typeID, 0)
+
+            logging.debug(f"Added anomaly model for sensor {name} (type {typeID}).")
+
+        return index
+
+    def _resize(self, capacity: int):
+        for attr in ('means', 'variances', 'counts', 'originNanos', 'lastForwardNanos', 'baselineRows'):
+            array = getattr(self, attr)
+            resized = calcLib.zeros(capacity, dtype = array.dtype)
+            resized[:len(array)] = array
+            setattr(self, attr, resized)
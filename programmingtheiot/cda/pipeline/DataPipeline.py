@@ -0,0 +1,129 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.PipelineStage import PipelineStage
+
+class DataPipeline(object):
+    """
+    A chain of PipelineStage instances connected by bounded queues. Items
+    submitted to the pipeline are processed by each stage in the order the
+    stages were added, on the stages' own worker threads, so the caller of
+    submit() never waits on a slow stage (unless the first stage uses the
+    'block' overflow policy).
+
+    """
+
+    def __init__(self, name: str = "DataPipeline"):
+        """
+        Constructor.
+
+        @param name The pipeline name, used for logging.
+        """
+        self.name = name
+        self.stages = []
+        self.stageLookup = {}
+
+    def addStage(
+        self,
+        name: str,
+        handler,
+        workerCount: int = ConfigConst.DEFAULT_PIPELINE_WORKERS,
+        queueSize: int = ConfigConst.DEFAULT_PIPELINE_QUEUE_SIZE,
+        overflowPolicy: str = ConfigConst.DEFAULT_OVERFLOW_POLICY,
+        blockTimeout: float = ConfigConst.DEFAULT_PIPELINE_BLOCK_TIMEOUT
+    ) -> PipelineStage:
+        """
+        Appends a new stage to the end of the pipeline. See PipelineStage
+        for a description of the parameters.
+
+        @return PipelineStage The new stage.
+        """
+        stage = PipelineStage( \
+            name = name, handler = handler, workerCount = workerCount, queueSize = queueSize, \
+            overflowPolicy = overflowPolicy, blockTimeout = blockTimeout)
+
+        if self.stages:
+            self.stages[-1].setNextStage(stage)
+
+        self.stages.append(stage)
+        self.stageLookup[name] = stage
+
+        return stage
+
+    def getStage(self, name: str) -> PipelineStage:
+        return self.stageLookup.get(name)
+
+    def submit(self, item, stageName: str = None) -> bool:
+        """
+        Queues 'item' at the first stage, or at the named stage to skip the
+        ones before it.
+
+        @param item The item to process.
+        @param stageName Optional name of the stage to start at.
+        @return bool True if the item was queued; False if it was dropped.
+        """
+        stage = self.stageLookup.get(stageName) if stageName else (self.stages[0] if self.stages else None)
+
+        if not stage:
+            logging.warning(f"{self.name} has no stage named {stageName}. Dropping item.")
+            return False
+
+        return stage.offer(item)
+
+    def start(self):
+        logging.info(f"Starting {self.name} with stages: {[stage.getName() for stage in self.stages]}")
+
+        for stage in self.stages:
+            stage.start()
+
+    def stop(self, timeout: float = ConfigConst.DEFAULT_TIMEOUT):
+        logging.info(f"Stopping {self.name}. Metrics: {self.getMetrics()}")
+
+        for stage in self.stages:
+            stage.stop(timeout = timeout)
+
+    def isIdle(self) -> bool:
+        return all(stage.isIdle() for stage in self.stages)
+
+    def waitUntilIdle(self, timeout: float = ConfigConst.DEFAULT_TIMEOUT) -> bool:
+        """
+        Waits for all queued items to pass through the pipeline.
+
+        @param timeout The maximum number of seconds to wait.
+        @return bool True if the pipeline is idle; False on timeout.
+        """
+        endTime = time.monotonic() + timeout
+
+        while not self.isIdle():
+            if time.monotonic() >= endTime:
+                return False
+
+            time.sleep(0.01)
+
+        return True
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the metrics of each stage, keyed by stage name.
+
+        @return dict
+        """
+        return {stage.getName(): stage.getMetrics() for stage in self.stages}
+
+    def resetMetrics(self):
+        for stage in self.stages:
+            stage.resetMetrics()
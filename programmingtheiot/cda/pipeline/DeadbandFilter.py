@@ -0,0 +1,174 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DeadbandFilter(object):
+    """
+    Report-by-exception filter for sensor telemetry. A reading is reported
+    only if its value has moved outside the deadband around the last
+    reported value of the same sensor, or if the sensor has been silent for
+    longer than its maximum silence interval (a heartbeat). Readings with a
+    non-zero status code or error flag are always reported.
+
+    The deadband is set per sensor type, as an absolute value, a percentage
+    of the last reported value, or both - in which case the wider of the two
+    applies. Types without a deadband are always reported.
+
+    Time is taken from the reading's time stamp, so recorded data sets can
+    be replayed through the filter.
+
+    """
+
+    NS_IN_SECS = 1000000000
+
+    def __init__(self):
+        """
+        Constructor. Loads the temperature, humidity and pressure deadbands
+        from the ConstrainedDevice section of the configuration.
+
+        """
+        self.thresholds = {}
+        self.lastReported = {}
+        self.readingCounts = {}
+        self.suppressedCounts = {}
+
+        self._lock = threading.Lock()
+
+        configUtil = ConfigUtil()
+
+        sensorKeys = [
+            (ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.TEMP_DEADBAND_ABS_KEY, ConfigConst.TEMP_DEADBAND_PCT_KEY, ConfigConst.TEMP_MAX_SILENCE_KEY),
+            (ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.HUMIDITY_DEADBAND_ABS_KEY, ConfigConst.HUMIDITY_DEADBAND_PCT_KEY, ConfigConst.HUMIDITY_MAX_SILENCE_KEY),
+            (ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.PRESSURE_DEADBAND_ABS_KEY, ConfigConst.PRESSURE_DEADBAND_PCT_KEY, ConfigConst.PRESSURE_MAX_SILENCE_KEY)
+        ]
+
+        for typeID, absKey, pctKey, maxSilenceKey in sensorKeys:
+            self.setThresholds(
+                typeID = typeID,
+                absolute = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, absKey),
+                percent = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, pctKey),
+                maxSilenceSecs = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, maxSilenceKey, ConfigConst.DEFAULT_MAX_SILENCE_SECS))
+
+    def setThresholds(self, typeID: int, absolute: float = 0.0, percent: float = 0.0, maxSilenceSecs: float = ConfigConst.DEFAULT_MAX_SILENCE_SECS):
+        """
+        Sets the deadband for a sensor type. If both 'absolute' and 'percent'
+        are 0 or less, readings of that type are never suppressed.
+
+        @param typeID The sensor type ID.
+        @param absolute The absolute deadband, in the sensor's units.
+        @param percent The deadband as a percentage of the last reported value.
+        @param maxSilenceSecs The longest a sensor may go unreported. If 0 or
+        less, there is no heartbeat.
+        """
+        with self._lock:
+            if absolute > 0.0 or percent > 0.0:
+                self.thresholds[typeID] = (max(absolute, 0.0), max(percent, 0.0) / 100.0, int(maxSilenceSecs * self.NS_IN_SECS))
+            else:
+                self.thresholds.pop(typeID, None)
+
+    def accept(self, data: SensorData) -> bool:
+        """
+        Checks if 'data' should be reported, and if so, records it as the last
+        reported reading of its sensor.
+
+        @param data The sensor reading.
+        @return bool True if the reading should be reported; False if it's suppressed.
+        """
+        typeID = data.getTypeID()
+        key = (typeID, data.getName())
+        value = data.getValue()
+        timeStampNanos = data.getTimeStampNanos()
+
+        if timeStampNanos is None:
+            timeStampNanos = time.time_ns()
+
+        with self._lock:
+            self.readingCounts[typeID] = self.readingCounts.get(typeID, 0) + 1
+
+            threshold = self.thresholds.get(typeID)
+            last = self.lastReported.get(key)
+
+            if threshold and last and data.getStatusCode() == 0 and not data.hasErrorFlag():
+                absolute, fraction, maxSilenceNanos = threshold
+                lastValue, lastTimeStampNanos = last
+                deadband = max(absolute, fraction * abs(lastValue))
+
+                isSilent = maxSilenceNanos > 0 and timeStampNanos - lastTimeStampNanos >= maxSilenceNanos
+
+                if abs(value - lastValue) <= deadband and not isSilent:
+                    self.suppressedCounts[typeID] = self.suppressedCounts.get(typeID, 0) + 1
+                    return False
+
+            self.lastReported[key] = (value, timeStampNanos)
+
+            return True
+
+    def reset(self):
+        """
+        Clears the last reported readings and the metrics.
+
+        """
+        with self._lock:
+            self.lastReported.clear()
+            self.readingCounts.clear()
+            self.suppressedCounts.clear()
+
+    def getSuppressionRatio(self, typeID: int = None) -> float:
+        """
+        Returns the fraction of readings suppressed, for one sensor type or
+        for all of them.
+
+        @param typeID Optional sensor type ID.
+        @return float A value from 0.0 to 1.0.
+        """
+        with self._lock:
+            if typeID is None:
+                readings = sum(self.readingCounts.values())
+                suppressed = sum(self.suppressedCounts.values())
+            else:
+                readings = self.readingCounts.get(typeID, 0)
+                suppressed = self.suppressedCounts.get(typeID, 0)
+
+        return suppressed / readings if readings else 0.0
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the reading and suppression counts and the suppression ratio,
+        overall and per sensor type ID.
+
+        @return dict
+        """
+        with self._lock:
+            byType = {
+                typeID: {
+                    'readings': readings,
+                    'suppressed': self.suppressedCounts.get(typeID, 0),
+                    'suppressionRatio': self.suppressedCounts.get(typeID, 0) / readings
+                } for typeID, readings in self.readingCounts.items()
+            }
+
+        readings = sum(entry['readings'] for entry in byType.values())
+        suppressed = sum(entry['suppressed'] for entry in byType.values())
+
+        return {
+            'readings': readings,
+            'suppressed': suppressed,
+            'suppressionRatio': suppressed / readings if readings else 0.0,
+            'byType': byType
+        }
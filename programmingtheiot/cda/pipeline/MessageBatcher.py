@@ -0,0 +1,165 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import threading
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+from programmingtheiot.data.EncodedPayloadBatch import EncodedPayloadBatch
+
+class MessageBatcher(object):
+    """
+    Groups outgoing messages per resource and passes each group to
+    'flushHandler' as a single EncodedPayloadBatch. A group is flushed
+    when it reaches 'maxBatchSize' messages, or 'maxBatchDelay' seconds
+    after its first message arrived, whichever comes first.
+
+    Size-triggered flushes run on the thread that called add(); time-
+    triggered flushes run on a timer thread. Each timer is tagged with the
+    generation of the batch it was armed for, so a timer that fires as its
+    batch is flushed by size doesn't flush the next batch early.
+
+    """
+
+    def __init__(
+        self,
+        flushHandler,
+        maxBatchSize: int = ConfigConst.DEFAULT_BATCH_MAX_SIZE,
+        maxBatchDelay: float = ConfigConst.DEFAULT_BATCH_MAX_DELAY
+    ):
+        """
+        Constructor.
+
+        @param flushHandler Callable taking (ResourceNameEnum, EncodedPayloadBatch).
+        @param maxBatchSize The maximum number of messages per batch.
+        @param maxBatchDelay The maximum number of seconds a message waits
+        in a batch. If 0 or less, batches are flushed by size only.
+        """
+        self.flushHandler = flushHandler
+        self.maxBatchSize = max(maxBatchSize, 1)
+        self.maxBatchDelay = maxBatchDelay
+
+        self.buffers = {}
+        self.timers = {}
+
+        # resource -> number of batches taken, i.e. the current batch's generation
+        self.generations = {}
+
+        self.messageCount = 0
+        self.batchCount = 0
+
+        self._lock = threading.Lock()
+
+    def add(self, resource: ResourceNameEnum, payload: EncodedPayload):
+        """
+        Adds 'payload' to the batch for 'resource', flushing the batch if
+        it's full.
+
+        @param resource The resource the message is sent to.
+        @param payload The message.
+        """
+        batch = None
+
+        with self._lock:
+            buffer = self.buffers.setdefault(resource, [])
+            buffer.append(payload)
+            self.messageCount += 1
+
+            if len(buffer) >= self.maxBatchSize:
+                batch = self._takeBatch(resource)
+            elif len(buffer) == 1 and self.maxBatchDelay > 0:
+                timer = threading.Timer(self.maxBatchDelay, self._flushOnTimer, args = (resource, self.generations.get(resource, 0)))
+                timer.daemon = True
+                self.timers[resource] = timer
+                timer.start()
+
+        if batch:
+            self._emitBatch(resource, batch)
+
+    def flush(self, resource: ResourceNameEnum) -> bool:
+        """
+        Flushes the pending batch for 'resource', if there is one.
+
+        @param resource The resource to flush.
+        @return bool True if a batch was flushed; False otherwise.
+        """
+        with self._lock:
+            batch = self._takeBatch(resource)
+
+        if batch:
+            self._emitBatch(resource, batch)
+            return True
+
+        return False
+
+    def flushAll(self):
+        with self._lock:
+            resources = list(self.buffers.keys())
+
+        for resource in resources:
+            self.flush(resource)
+
+    def getPendingCount(self) -> int:
+        with self._lock:
+            return sum(len(buffer) for buffer in self.buffers.values())
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the number of messages added, batches flushed and messages
+        still pending, plus the average batch size.
+
+        @return dict
+        """
+        with self._lock:
+            pending = sum(len(buffer) for buffer in self.buffers.values())
+            flushed = self.messageCount - pending
+
+            return {
+                'messages': self.messageCount,
+                'batches': self.batchCount,
+                'pending': pending,
+                'avgBatchSize': flushed / self.batchCount if self.batchCount else 0.0
+            }
+
+    def _flushOnTimer(self, resource: ResourceNameEnum, generation: int):
+        with self._lock:
+            # the batch the timer was armed for was already taken
+            if self.generations.get(resource, 0) != generation:
+                return
+
+            batch = self._takeBatch(resource)
+
+        if batch:
+            self._emitBatch(resource, batch)
+
+    def _takeBatch(self, resource: ResourceNameEnum) -> list:
+        timer = self.timers.pop(resource, None)
+
+        if timer:
+            timer.cancel()
+
+        batch = self.buffers.pop(resource, None)
+
+        if batch:
+            self.batchCount += 1
+            self.generations[resource] = self.generations.get(resource, 0) + 1
+
+        return batch
+
+    def _emitBatch(self, resource: ResourceNameEnum, batch: list):
+        try:
+            self.flushHandler(resource, EncodedPayloadBatch(batch))
+        except Exception:
+            logging.exception(f"Failed to flush batch of {len(batch)} messages for {resource}")
@@ -0,0 +1,370 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.SpoolSegment import SpoolSegment
+
+class MessageSpool(object):
+    """
+    Persistent store-and-forward queue for outgoing messages. Messages are
+    appended to memory-mapped SpoolSegment files in a directory, and a
+    forwarder thread passes them, in order, to a sender callable. A message
+    is removed only after the sender reports it delivered, so messages sent
+    while the remote end is unreachable - or still queued when the process
+    stops - are delivered once it's reachable again.
+
+    The spool holds at most 'maxSegments' segment files. When it's full, the
+    oldest segment is discarded to make room, and its undelivered messages
+    are counted as dropped.
+
+    The forwarder sends at most 'replayRate' messages per second, so a
+    backlog built up during an outage doesn't flood the remote end when it
+    comes back. After a failed send it waits 'retryDelay' seconds, or until
+    resume() is called - for instance on reconnect - then tries again.
+
+    Delivery is at-least-once: if the process stops between a send and the
+    read position being updated, that message is sent again on restart.
+
+    """
+
+    CURSOR_FORMAT = struct.Struct('!qq')
+    CURSOR_FILE_NAME = 'cursor'
+
+    def __init__(
+        self,
+        path: str,
+        segmentSize: int = ConfigConst.DEFAULT_SPOOL_SEGMENT_SIZE,
+        maxSegments: int = ConfigConst.DEFAULT_SPOOL_MAX_SEGMENTS,
+        replayRate: float = ConfigConst.DEFAULT_SPOOL_REPLAY_RATE,
+        retryDelay: float = ConfigConst.DEFAULT_SPOOL_RETRY_DELAY
+    ):
+        """
+        Constructor. Opens the spool in directory 'path', creating it if
+        needed, and restores any messages left undelivered by a previous run.
+
+        @param path The spool directory. Use one directory per spool.
+        @param segmentSize The size of each segment file, in bytes.
+        @param maxSegments The maximum number of segment files.
+        @param replayRate The maximum number of messages forwarded per
+        second. If 0 or less, there is no limit.
+        @param retryDelay The number of seconds to wait after a failed send.
+        """
+        self.path = path
+        self.segmentSize = max(segmentSize, mmap.PAGESIZE)
+        self.maxSegments = max(maxSegments, 2)
+        self.replayInterval = 1.0 / replayRate if replayRate > 0 else 0.0
+        self.retryDelay = retryDelay
+
+        self.segments = []
+        self.sender = None
+
+        self.appendCount = 0
+        self.deliverCount = 0
+        self.dropCount = 0
+        self.failCount = 0
+
+        self._lock = threading.Lock()
+        self._dataEvent = threading.Event()
+        self._retryEvent = threading.Event()
+        self._stopEvent = threading.Event()
+        self._forwarder = None
+        self._nextSendTime = 0.0
+
+        os.makedirs(path, exist_ok = True)
+
+        self._openCursor()
+        self._openSegments()
+
+        self.pendingCount = self._countPending()
+
+        if self.pendingCount > 0:
+            logging.info(f"Restored {self.pendingCount} undelivered messages from spool {self.path}")
+
+    def append(self, channel: str, payload, tag: int = 0) -> bool:
+        """
+        Appends a message to the spool, and wakes the forwarder.
+
+        @param channel The channel name, such as a topic or resource path.
+        @param payload The payload, as bytes or str.
+        @param tag A 16-bit value passed back to the sender, such as a QoS level.
+        @return bool True if the message was stored; False if it's empty or
+        larger than a segment.
+        """
+        if not payload:
+            return False
+
+        if isinstance(payload, str):
+            payload = payload.encode('utf-8')
+
+        if len(payload) > SpoolSegment.getMaxPayloadSize(self.segmentSize, channel):
+            logging.warning(f"Message of {len(payload)} bytes for {channel} is larger than a spool segment. Dropping.")
+
+            with self._lock:
+                self.dropCount += 1
+
+            return False
+
+        with self._lock:
+            if not self.segments[-1].append(channel, payload, tag):
+                self._addSegment().append(channel, payload, tag)
+
+            self.appendCount += 1
+            self.pendingCount += 1
+
+        self._dataEvent.set()
+
+        return True
+
+    def peek(self) -> tuple:
+        """
+        Returns the oldest undelivered message, without removing it.
+
+        @return tuple (position, channel, payload, tag), or None if the spool
+        is empty. Pass 'position' to commit() once the message is delivered.
+        """
+        with self._lock:
+            while True:
+                segment = self.segments[0]
+                record = segment.read(self.cursorOffset)
+
+                if record:
+                    nextOffset, channel, payload, tag = record
+                    return ((segment.getSeqNum(), self.cursorOffset, nextOffset), channel, payload, tag)
+
+                if len(self.segments) == 1:
+                    return None
+
+                # the oldest segment is fully delivered
+                self.segments.pop(0).delete()
+                self._writeCursor(self.segments[0].getSeqNum(), 0)
+
+    def commit(self, position: tuple) -> bool:
+        """
+        Removes a message returned by peek() from the spool.
+
+        @param position The message's position, as returned by peek().
+        @return bool True if the message was removed; False if it's no longer
+        the oldest message - for instance, if its segment was discarded.
+        """
+        seqNum, offset, nextOffset = position
+
+        with self._lock:
+            if self.segments[0].getSeqNum() != seqNum or self.cursorOffset != offset:
+                return False
+
+            self._writeCursor(seqNum, nextOffset)
+            self.pendingCount -= 1
+            self.deliverCount += 1
+
+            return True
+
+    def start(self, sender) -> bool:
+        """
+        Starts forwarding spooled messages to 'sender'.
+
+        @param sender Callable taking (channel, payload, tag) and returning
+        True if the message was delivered.
+        @return bool True if the forwarder was started; False if it's running.
+        """
+        with self._lock:
+            if self._forwarder and self._forwarder.is_alive():
+                return False
+
+            self.sender = sender
+            self._stopEvent.clear()
+            self._forwarder = threading.Thread(target = self._runForwarder, name = f"MessageSpool-{os.path.basename(self.path)}", daemon = True)
+            self._forwarder.start()
+
+            return True
+
+    def stop(self, timeout: float = None) -> bool:
+        """
+        Stops the forwarder. Undelivered messages stay in the spool.
+
+        @param timeout The maximum number of seconds to wait for the forwarder
+        to finish a send in progress.
+        @return bool True if the forwarder was stopped; False if it wasn't running.
+        """
+        with self._lock:
+            forwarder = self._forwarder
+            self._forwarder = None
+
+        if not forwarder:
+            return False
+
+        self._stopEvent.set()
+        self._dataEvent.set()
+        self._retryEvent.set()
+
+        forwarder.join(timeout)
+
+        return True
+
+    def resume(self):
+        """
+        Ends a wait after a failed send, so the forwarder retries right away.
+        Call this when the connection to the remote end is re-established.
+
+        """
+        self._retryEvent.set()
+
+    def close(self):
+        """
+        Stops the forwarder, flushes the segments and the read position to
+        disk, and closes the files.
+
+        """
+        self.stop()
+
+        with self._lock:
+            for segment in self.segments:
+                segment.flush()
+                segment.close()
+
+            self.cursorFile.flush()
+            self.cursorFile.close()
+
+    def getPendingCount(self) -> int:
+        with self._lock:
+            return self.pendingCount
+
+    def getSegmentCount(self) -> int:
+        with self._lock:
+            return len(self.segments)
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the number of messages appended, delivered, dropped and still
+        pending, the number of failed sends, and the number of segment files.
+
+        @return dict
+        """
+        with self._lock:
+            return {
+                'appended': self.appendCount,
+                'delivered': self.deliverCount,
+                'dropped': self.dropCount,
+                'failed': self.failCount,
+                'pending': self.pendingCount,
+                'segments': len(self.segments)
+            }
+
+    def _runForwarder(self):
+        while not self._stopEvent.is_set():
+            message = self.peek()
+
+            if not message:
+                self._dataEvent.wait(self.retryDelay)
+                self._dataEvent.clear()
+                continue
+
+            position, channel, payload, tag = message
+
+            self._throttle()
+
+            if self._stopEvent.is_set():
+                break
+
+            try:
+                isDelivered = self.sender(channel, payload, tag)
+            except Exception:
+                logging.exception(f"Failed to forward spooled message for {channel}")
+                isDelivered = False
+
+            if isDelivered:
+                self.commit(position)
+            else:
+                with self._lock:
+                    self.failCount += 1
+
+                self._retryEvent.wait(self.retryDelay)
+                self._retryEvent.clear()
+
+    def _throttle(self):
+        if self.replayInterval > 0.0:
+            now = time.monotonic()
+            self._nextSendTime = max(self._nextSendTime + self.replayInterval, now)
+
+            if self._nextSendTime > now:
+                self._stopEvent.wait(self._nextSendTime - now)
+
+    def _openCursor(self):
+        cursorPath = os.path.join(self.path, self.CURSOR_FILE_NAME)
+
+        with open(cursorPath, 'a+b') as cursorFile:
+            if os.path.getsize(cursorPath) < self.CURSOR_FORMAT.size:
+                cursorFile.truncate(self.CURSOR_FORMAT.size)
+
+            self.cursorFile = mmap.mmap(cursorFile.fileno(), self.CURSOR_FORMAT.size)
+
+        self.cursorSeqNum, self.cursorOffset = self.CURSOR_FORMAT.unpack_from(self.cursorFile, 0)
+
+    def _writeCursor(self, seqNum: int, offset: int):
+        self.CURSOR_FORMAT.pack_into(self.cursorFile, 0, seqNum, offset)
+        self.cursorSeqNum = seqNum
+        self.cursorOffset = offset
+
+    def _openSegments(self):
+        seqNums = sorted(
+            int(fileName[:-len(SpoolSegment.FILE_EXT)]) for fileName in os.listdir(self.path) \
+                if fileName.endswith(SpoolSegment.FILE_EXT) and fileName[:-len(SpoolSegment.FILE_EXT)].isdigit())
+
+        for seqNum in seqNums:
+            segmentPath = os.path.join(self.path, SpoolSegment.getFileName(seqNum))
+
+            if seqNum < self.cursorSeqNum:
+                # fully delivered before the last run stopped
+                os.remove(segmentPath)
+            else:
+                self.segments.append(SpoolSegment(segmentPath, seqNum, self.segmentSize))
+
+        if not self.segments:
+            self._addSegment(self.cursorSeqNum)
+
+        if self.segments[0].getSeqNum() != self.cursorSeqNum:
+            self._writeCursor(self.segments[0].getSeqNum(), 0)
+
+    def _addSegment(self, seqNum: int = None) -> SpoolSegment:
+        if seqNum is None:
+            seqNum = self.segments[-1].getSeqNum() + 1
+
+        if len(self.segments) >= self.maxSegments:
+            oldest = self.segments.pop(0)
+            dropped = oldest.countRecordsFrom(self.cursorOffset)
+
+            logging.warning(f"Spool {self.path} is full. Dropping {dropped} undelivered messages.")
+
+            oldest.delete()
+            self.dropCount += dropped
+            self.pendingCount -= dropped
+            self._writeCursor(self.segments[0].getSeqNum(), 0)
+
+        segment = SpoolSegment(os.path.join(self.path, SpoolSegment.getFileName(seqNum)), seqNum, self.segmentSize)
+        self.segments.append(segment)
+
+        return segment
+
+    def _countPending(self) -> int:
+        count = self.segments[0].countRecordsFrom(self.cursorOffset)
+
+        for segment in self.segments[1:]:
+            count += segment.getRecordCount()
+
+        return count
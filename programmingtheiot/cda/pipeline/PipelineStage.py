@@ -0,0 +1,255 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import queue
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+class PipelineStage(object):
+    """
+    A single stage of a DataPipeline: a bounded queue drained by one or more
+    worker threads, each of which passes items to 'handler' and forwards the
+    result to the next stage. A handler that returns None ends processing
+    of that item.
+
+    When the queue is full, the overflow policy decides what happens to a
+    new item (see ConfigConst.BLOCK_POLICY, DROP_NEWEST_POLICY and
+    DROP_OLDEST_POLICY). With the 'block' policy, a full downstream queue
+    holds up the workers of the stage feeding it, so backpressure travels
+    back towards the first stage.
+
+    """
+
+    NS_IN_MILLIS = 1000000
+
+    # how often idle workers check if the stage has been stopped
+    POLL_SECS = 0.1
+
+    def __init__(
+        self,
+        name: str,
+        handler,
+        workerCount: int = ConfigConst.DEFAULT_PIPELINE_WORKERS,
+        queueSize: int = ConfigConst.DEFAULT_PIPELINE_QUEUE_SIZE,
+        overflowPolicy: str = ConfigConst.DEFAULT_OVERFLOW_POLICY,
+        blockTimeout: float = ConfigConst.DEFAULT_PIPELINE_BLOCK_TIMEOUT
+    ):
+        """
+        Constructor.
+
+        @param name The stage name, used for metrics and worker thread names.
+        @param handler The callable that processes each item.
+        @param workerCount The number of worker threads.
+        @param queueSize The maximum number of queued items.
+        @param overflowPolicy What to do with new items when the queue is full.
+        @param blockTimeout The number of seconds to wait for room in the queue
+        with the 'block' policy.
+        """
+        if overflowPolicy not in (ConfigConst.BLOCK_POLICY, ConfigConst.DROP_NEWEST_POLICY, ConfigConst.DROP_OLDEST_POLICY):
+            logging.warning(f"Unknown overflow policy '{overflowPolicy}' for stage {name}. Using {ConfigConst.DEFAULT_OVERFLOW_POLICY}.")
+            overflowPolicy = ConfigConst.DEFAULT_OVERFLOW_POLICY
+
+        self.name = name
+        self.handler = handler
+        self.workerCount = max(workerCount, 1)
+        self.overflowPolicy = overflowPolicy
+        self.blockTimeout = blockTimeout
+
+        self.nextStage = None
+        self.queue = queue.Queue(maxsize = max(queueSize, 1))
+        self.workers = []
+        self.stopEvent = threading.Event()
+
+        self._lock = threading.Lock()
+        self._resetMetrics()
+
+    def setNextStage(self, stage: "PipelineStage"):
+        self.nextStage = stage
+
+    def getName(self) -> str:
+        return self.name
+
+    def getQueueDepth(self) -> int:
+        return self.queue.qsize()
+
+    def getDropCount(self) -> int:
+        return self.dropCount
+
+    def isIdle(self) -> bool:
+        """
+        Returns True if no items are queued or being handled by this stage.
+
+        @return bool
+        """
+        return self.queue.unfinished_tasks == 0
+
+    def isRunning(self) -> bool:
+        return len(self.workers) > 0
+
+    def offer(self, item) -> bool:
+        """
+        Queues 'item' for this stage, applying the overflow policy if the
+        queue is full.
+
+        @param item The item to queue.
+        @return bool True if 'item' was queued; False if it was dropped.
+        """
+        entry = (time.perf_counter_ns(), item)
+
+        try:
+            if self.overflowPolicy == ConfigConst.BLOCK_POLICY:
+                self.queue.put(entry, timeout = self.blockTimeout)
+            else:
+                self.queue.put_nowait(entry)
+        except queue.Full:
+            if self.overflowPolicy != ConfigConst.DROP_OLDEST_POLICY:
+                self._countDrop()
+                return False
+
+            return self._replaceOldest(entry)
+
+        self._updateMaxQueueDepth()
+
+        return True
+
+    def start(self):
+        if self.workers:
+            return
+
+        self.stopEvent.clear()
+
+        for i in range(0, self.workerCount):
+            worker = threading.Thread(target = self._runWorker, name = f"{self.name}-{i}", daemon = True)
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self, timeout: float = ConfigConst.DEFAULT_TIMEOUT):
+        """
+        Stops the workers once they've finished their current item. Items
+        still queued are left in place.
+
+        @param timeout The number of seconds to wait for each worker.
+        """
+        self.stopEvent.set()
+
+        for worker in self.workers:
+            worker.join(timeout = timeout)
+
+        self.workers = []
+
+    def getMetrics(self) -> dict:
+        """
+        Returns a snapshot of this stage's metrics. Times are in milliseconds;
+        'wait' is the time spent queued, 'service' the time spent in the
+        handler.
+
+        @return dict
+        """
+        with self._lock:
+            processed = self.processedCount
+
+            return {
+                'queueDepth': self.queue.qsize(),
+                'maxQueueDepth': self.maxQueueDepth,
+                'processed': processed,
+                'dropped': self.dropCount,
+                'errors': self.errorCount,
+                'avgWaitMillis': self.totalWaitNanos / processed / self.NS_IN_MILLIS if processed else 0.0,
+                'avgServiceMillis': self.totalServiceNanos / processed / self.NS_IN_MILLIS if processed else 0.0,
+                'maxServiceMillis': self.maxServiceNanos / self.NS_IN_MILLIS
+            }
+
+    def resetMetrics(self):
+        with self._lock:
+            self._resetMetrics()
+
+    def _runWorker(self):
+        while not self.stopEvent.is_set():
+            try:
+                enqueuedNanos, item = self.queue.get(timeout = self.POLL_SECS)
+            except queue.Empty:
+                continue
+
+            startNanos = time.perf_counter_ns()
+            result = None
+            hasError = False
+
+            try:
+                result = self.handler(item)
+            except Exception:
+                logging.exception(f"Pipeline stage {self.name} failed to handle item: {item}")
+                hasError = True
+
+            endNanos = time.perf_counter_ns()
+
+            self._recordItem(startNanos - enqueuedNanos, endNanos - startNanos, hasError)
+
+            try:
+                if result is not None and self.nextStage:
+                    self.nextStage.offer(result)
+            finally:
+                self.queue.task_done()
+
+    def _replaceOldest(self, entry) -> bool:
+        # other producers may refill the queue between the two calls, so retry
+        # a few times before giving up on the new entry
+        for attempt in range(0, 3):
+            try:
+                self.queue.get_nowait()
+                self.queue.task_done()
+                self._countDrop()
+            except queue.Empty:
+                pass
+
+            try:
+                self.queue.put_nowait(entry)
+                return True
+            except queue.Full:
+                continue
+
+        self._countDrop()
+
+        return False
+
+    def _countDrop(self):
+        with self._lock:
+            self.dropCount += 1
+
+    def _recordItem(self, waitNanos: int, serviceNanos: int, hasError: bool):
+        with self._lock:
+            self.processedCount += 1
+            self.totalWaitNanos += waitNanos
+            self.totalServiceNanos += serviceNanos
+
+            if serviceNanos > self.maxServiceNanos:
+                self.maxServiceNanos = serviceNanos
+            if hasError:
+                self.errorCount += 1
+
+    def _updateMaxQueueDepth(self):
+        depth = self.queue.qsize()
+
+        if depth > self.maxQueueDepth:
+            with self._lock:
+                self.maxQueueDepth = max(self.maxQueueDepth, depth)
+
+    def _resetMetrics(self):
+        self.processedCount = 0
+        self.dropCount = 0
+        self.errorCount = 0
+        self.maxQueueDepth = 0
+        self.totalWaitNanos = 0
+        self.totalServiceNanos = 0
+        self.maxServiceNanos = 0
@@ -0,0 +1,218 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataPredictor import SensorDataPredictor
+
+class PredictiveFilter(object):
+    """
+    Model-based filter for sensor telemetry. Each sensor has a
+    SensorDataPredictor that the receiver keeps in step with, and a reading
+    is sent only if it differs from the model's prediction by more than the
+    tolerance of its sensor type, or the sensor has been silent for longer
+    than its maximum silence interval (a heartbeat). Readings with a
+    non-zero status code or error flag are always sent. The model is
+    updated with each reading sent, and only those.
+
+    A sensor's first reading, and its first reading sent after the model
+    parameters of its type change, are sent as a SensorDataModel, so the
+    receiver gets the parameters along with the reading. Types without a
+    tolerance are always sent as plain readings.
+
+    Unlike DeadbandFilter, which holds the last value, the receiver can
+    fill in the readings not sent, within the tolerance, from its own
+    predictions - e.g. along a daily temperature curve.
+
+    Time is taken from the reading's time stamp, so recorded data sets can
+    be replayed through the filter.
+
+    A reading sent but lost on its way leaves the receiver's model behind
+    the sender's until the sensor's next reading sent, so readings of types
+    with a model must be sent over a path that doesn't drop them.
+
+    """
+
+    NS_IN_SECS = 1000000000
+
+    class SensorState(object):
+        __slots__ = ('predictor', 'lastSentNanos', 'modelVersion')
+
+        def __init__(self, predictor: SensorDataPredictor):
+            self.predictor = predictor
+            self.lastSentNanos = 0
+            self.modelVersion = -1
+
+    def __init__(self):
+        """
+        Constructor. Loads the model parameters and the temperature,
+        humidity and pressure tolerances from the ConstrainedDevice section
+        of the configuration.
+
+        """
+        # typeID -> (tolerance, alpha, beta, maxSilenceNanos, version)
+        self.models = {}
+
+        # (typeID, name) -> SensorState
+        self.sensorStates = {}
+
+        self.readingCount = 0
+        self.sentCount = 0
+        self.modelUpdateCount = 0
+
+        self._lock = threading.Lock()
+
+        configUtil = ConfigUtil()
+
+        alpha = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.PREDICTION_ALPHA_KEY, ConfigConst.DEFAULT_PREDICTION_ALPHA)
+        beta = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.PREDICTION_BETA_KEY, ConfigConst.DEFAULT_PREDICTION_BETA)
+
+        sensorKeys = [
+            (ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.TEMP_PREDICTION_TOLERANCE_KEY, ConfigConst.TEMP_MAX_SILENCE_KEY),
+            (ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.HUMIDITY_PREDICTION_TOLERANCE_KEY, ConfigConst.HUMIDITY_MAX_SILENCE_KEY),
+            (ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.PRESSURE_PREDICTION_TOLERANCE_KEY, ConfigConst.PRESSURE_MAX_SILENCE_KEY)
+        ]
+
+        for typeID, toleranceKey, maxSilenceKey in sensorKeys:
+            self.setModel(
+                typeID = typeID,
+                tolerance = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, toleranceKey),
+                alpha = alpha,
+                beta = beta,
+                maxSilenceSecs = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, maxSilenceKey, ConfigConst.DEFAULT_MAX_SILENCE_SECS))
+
+    def setModel(self, typeID: int, tolerance: float = 0.0, alpha: float = ConfigConst.DEFAULT_PREDICTION_ALPHA, beta: float = ConfigConst.DEFAULT_PREDICTION_BETA, maxSilenceSecs: float = ConfigConst.DEFAULT_MAX_SILENCE_SECS):
+        """
+        Sets the model parameters for a sensor type. Sensors of the type
+        send the new parameters with their next reading sent. If 'tolerance'
+        is 0 or less, readings of that type are never suppressed.
+
+        @param typeID The sensor type ID.
+        @param tolerance The largest difference from the prediction that is
+        suppressed, in the sensor's units.
+        @param alpha The level smoothing factor, from 0.0 (exclusive) to 1.0.
+        @param beta The trend smoothing factor, from 0.0 to 1.0.
+        @param maxSilenceSecs The longest a sensor may go without sending a
+        reading. If 0 or less, there is no heartbeat.
+        """
+        with self._lock:
+            if tolerance > 0.0:
+                version = self.models[typeID][4] + 1 if typeID in self.models else 0
+                self.models[typeID] = (tolerance, alpha, beta, int(maxSilenceSecs * self.NS_IN_SECS), version)
+            else:
+                self.models.pop(typeID, None)
+
+    def hasModel(self, typeID: int) -> bool:
+        """
+        Returns True if readings of the sensor type can be suppressed, so
+        the receiver depends on getting every one of them that is sent.
+
+        @param typeID The sensor type ID.
+        @return bool
+        """
+        with self._lock:
+            return typeID in self.models
+
+    def filter(self, data: SensorData) -> SensorData:
+        """
+        Checks if 'data' should be sent, and if so, updates its sensor's
+        model with it.
+
+        @param data The sensor reading.
+        @return SensorData The reading to send: 'data' itself, or a
+        SensorDataModel copy of it; None if it's suppressed.
+        """
+        typeID = data.getTypeID()
+        timeStampNanos = data.getTimeStampNanos()
+
+        if timeStampNanos is None:
+            timeStampNanos = time.time_ns()
+
+        with self._lock:
+            self.readingCount += 1
+
+            model = self.models.get(typeID)
+
+            if not model:
+                self.sentCount += 1
+                return data
+
+            tolerance, alpha, beta, maxSilenceNanos, version = model
+
+            key = (typeID, data.getName())
+            state = self.sensorStates.get(key)
+
+            if state is None:
+                state = self.SensorState(SensorDataPredictor(alpha, beta))
+                self.sensorStates[key] = state
+
+            predictor = state.predictor
+
+            if state.modelVersion == version and data.getStatusCode() == 0 and not data.hasErrorFlag():
+                isSilent = maxSilenceNanos > 0 and timeStampNanos - state.lastSentNanos >= maxSilenceNanos
+
+                if abs(data.getValue() - predictor.predict(timeStampNanos)) <= tolerance and not isSilent:
+                    return None
+
+            isModelChanged = state.modelVersion != version
+
+            if isModelChanged:
+                predictor.alpha = alpha
+                predictor.beta = beta
+                state.modelVersion = version
+
+            predictor.update(timeStampNanos, data.getValue())
+            state.lastSentNanos = timeStampNanos
+
+            self.sentCount += 1
+
+            if isModelChanged:
+                self.modelUpdateCount += 1
+                return predictor.toModel(data, tolerance)
+
+            return data
+
+    def getPredictor(self, typeID: int, name: str) -> SensorDataPredictor:
+        """
+        Returns the model of a sensor, or None if it hasn't sent a reading.
+
+        @param typeID The sensor type ID.
+        @param name The sensor name.
+        @return SensorDataPredictor
+        """
+        state = self.sensorStates.get((typeID, name))
+
+        return state.predictor if state else None
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the counts of readings, readings sent (including model
+        updates), model updates and readings suppressed, and the
+        suppression ratio.
+
+        @return dict
+        """
+        with self._lock:
+            suppressed = self.readingCount - self.sentCount
+
+            return {
+                'readings': self.readingCount,
+                'sent': self.sentCount,
+                'modelUpdates': self.modelUpdateCount,
+                'suppressed': suppressed,
+                'suppressionRatio': suppressed / self.readingCount if self.readingCount else 0.0
+            }
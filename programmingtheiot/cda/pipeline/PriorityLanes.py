@@ -0,0 +1,266 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import collections
+import logging
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+class PriorityLanes(object):
+    """
+    A set of bounded queues ('lanes') drained by shared worker threads in
+    strict priority order: a worker always takes the oldest item of the
+    highest-priority lane that isn't empty, and passes it to 'handler'.
+    Lanes are ranked in the order they're added.
+
+    Each lane has its own queue size and overflow policy (see
+    ConfigConst.BLOCK_POLICY, DROP_NEWEST_POLICY and DROP_OLDEST_POLICY),
+    so a flood of low-priority items is shed in its own lane without
+    taking room from the others.
+
+    With a single worker, a high-priority item waits at most for the item
+    being handled when it arrives.
+
+    """
+
+    NS_IN_MILLIS = 1000000
+
+    # how often idle workers check if the lanes have been stopped
+    POLL_SECS = 0.1
+
+    class Lane(object):
+        __slots__ = ('name', 'queue', 'queueSize', 'overflowPolicy', 'blockTimeout', \
+            'processedCount', 'dropCount', 'errorCount', 'maxQueueDepth', 'totalWaitNanos', 'maxWaitNanos', 'totalServiceNanos')
+
+        def __init__(self, name: str, queueSize: int, overflowPolicy: str, blockTimeout: float):
+            self.name = name
+            self.queue = collections.deque()
+            self.queueSize = max(queueSize, 1)
+            self.overflowPolicy = overflowPolicy
+            self.blockTimeout = blockTimeout
+            self.resetMetrics()
+
+        def resetMetrics(self):
+            self.processedCount = 0
+            self.dropCount = 0
+            self.errorCount = 0
+            self.maxQueueDepth = 0
+            self.totalWaitNanos = 0
+            self.maxWaitNanos = 0
+            self.totalServiceNanos = 0
+
+    def __init__(self, handler, workerCount: int = ConfigConst.DEFAULT_EGRESS_WORKERS, name: str = "PriorityLanes"):
+        """
+        Constructor.
+
+        @param handler The callable that processes each item.
+        @param workerCount The number of worker threads shared by all lanes.
+        @param name The name used for logging and worker thread names.
+        """
+        self.handler = handler
+        self.workerCount = max(workerCount, 1)
+        self.name = name
+
+        self.lanes = []
+        self.laneLookup = {}
+        self.workers = []
+        self.stopEvent = threading.Event()
+
+        self.activeCount = 0
+
+        self._condition = threading.Condition()
+
+    def addLane(
+        self,
+        name: str,
+        queueSize: int = ConfigConst.DEFAULT_PIPELINE_QUEUE_SIZE,
+        overflowPolicy: str = ConfigConst.DEFAULT_OVERFLOW_POLICY,
+        blockTimeout: float = ConfigConst.DEFAULT_PIPELINE_BLOCK_TIMEOUT
+    ):
+        """
+        Adds a lane with a lower priority than the lanes already added.
+
+        @param name The lane name.
+        @param queueSize The maximum number of queued items.
+        @param overflowPolicy What to do with new items when the lane is full.
+        @param blockTimeout The number of seconds to wait for room in the lane
+        with the 'block' policy.
+        """
+        if overflowPolicy not in (ConfigConst.BLOCK_POLICY, ConfigConst.DROP_NEWEST_POLICY, ConfigConst.DROP_OLDEST_POLICY):
+            logging.warning(f"Unknown overflow policy '{overflowPolicy}' for lane {name}. Using {ConfigConst.DEFAULT_OVERFLOW_POLICY}.")
+            overflowPolicy = ConfigConst.DEFAULT_OVERFLOW_POLICY
+
+        lane = self.Lane(name, queueSize, overflowPolicy, blockTimeout)
+
+        with self._condition:
+            self.lanes.append(lane)
+            self.laneLookup[name] = lane
+
+    def getLaneNames(self) -> list:
+        return [lane.name for lane in self.lanes]
+
+    def offer(self, laneName: str, item) -> bool:
+        """
+        Queues 'item' in the named lane, applying the lane's overflow policy
+        if it's full.
+
+        @param laneName The lane name.
+        @param item The item to queue.
+        @return bool True if 'item' was queued; False if it was dropped.
+        """
+        lane = self.laneLookup.get(laneName)
+
+        if not lane:
+            logging.warning(f"{self.name} has no lane named {laneName}. Dropping item.")
+            return False
+
+        with self._condition:
+            if len(lane.queue) >= lane.queueSize:
+                if lane.overflowPolicy == ConfigConst.BLOCK_POLICY:
+                    self._condition.wait_for(lambda: len(lane.queue) < lane.queueSize, timeout = lane.blockTimeout)
+
+                    if len(lane.queue) >= lane.queueSize:
+                        lane.dropCount += 1
+                        return False
+
+                elif lane.overflowPolicy == ConfigConst.DROP_NEWEST_POLICY:
+                    lane.dropCount += 1
+                    return False
+
+                else:
+                    lane.queue.popleft()
+                    lane.dropCount += 1
+
+            lane.queue.append((time.perf_counter_ns(), item))
+            lane.maxQueueDepth = max(lane.maxQueueDepth, len(lane.queue))
+
+            self._condition.notify_all()
+
+        return True
+
+    def start(self):
+        if self.workers:
+            return
+
+        self.stopEvent.clear()
+
+        for i in range(0, self.workerCount):
+            worker = threading.Thread(target = self._runWorker, name = f"{self.name}-{i}", daemon = True)
+            worker.start()
+            self.workers.append(worker)
+
+    def stop(self, timeout: float = ConfigConst.DEFAULT_TIMEOUT):
+        """
+        Stops the workers once they've finished their current item. Items
+        still queued are left in place.
+
+        @param timeout The number of seconds to wait for each worker.
+        """
+        logging.info(f"Stopping {self.name}. Metrics: {self.getMetrics()}")
+
+        self.stopEvent.set()
+
+        with self._condition:
+            self._condition.notify_all()
+
+        for worker in self.workers:
+            worker.join(timeout = timeout)
+
+        self.workers = []
+
+    def isIdle(self) -> bool:
+        """
+        Returns True if no items are queued or being handled.
+
+        @return bool
+        """
+        with self._condition:
+            return self.activeCount == 0 and not any(lane.queue for lane in self.lanes)
+
+    def waitUntilIdle(self, timeout: float = ConfigConst.DEFAULT_TIMEOUT) -> bool:
+        """
+        Waits for all queued items to be handled.
+
+        @param timeout The maximum number of seconds to wait.
+        @return bool True if idle; False on timeout.
+        """
+        with self._condition:
+            return self._condition.wait_for( \
+                lambda: self.activeCount == 0 and not any(lane.queue for lane in self.lanes), timeout = timeout)
+
+    def getMetrics(self) -> dict:
+        """
+        Returns a snapshot of each lane's metrics, keyed by lane name. Times
+        are in milliseconds; 'wait' is the time spent queued, 'service' the
+        time spent in the handler.
+
+        @return dict
+        """
+        with self._condition:
+            return {
+                lane.name: {
+                    'queueDepth': len(lane.queue),
+                    'maxQueueDepth': lane.maxQueueDepth,
+                    'processed': lane.processedCount,
+                    'dropped': lane.dropCount,
+                    'errors': lane.errorCount,
+                    'avgWaitMillis': lane.totalWaitNanos / lane.processedCount / self.NS_IN_MILLIS if lane.processedCount else 0.0,
+                    'maxWaitMillis': lane.maxWaitNanos / self.NS_IN_MILLIS,
+                    'avgServiceMillis': lane.totalServiceNanos / lane.processedCount / self.NS_IN_MILLIS if lane.processedCount else 0.0
+                } for lane in self.lanes
+            }
+
+    def resetMetrics(self):
+        with self._condition:
+            for lane in self.lanes:
+                lane.resetMetrics()
+
+    def _runWorker(self):
+        while not self.stopEvent.is_set():
+            with self._condition:
+                lane = next((lane for lane in self.lanes if lane.queue), None)
+
+                if not lane:
+                    self._condition.wait(self.POLL_SECS)
+                    continue
+
+                enqueuedNanos, item = lane.queue.popleft()
+                self.activeCount += 1
+
+                # wake producers blocked on a full lane
+                self._condition.notify_all()
+
+            startNanos = time.perf_counter_ns()
+            hasError = False
+
+            try:
+                self.handler(item)
+            except Exception:
+                logging.exception(f"{self.name} failed to handle item in lane {lane.name}: {item}")
+                hasError = True
+
+            endNanos = time.perf_counter_ns()
+
+            with self._condition:
+                self.activeCount -= 1
+
+                lane.processedCount += 1
+                lane.totalWaitNanos += startNanos - enqueuedNanos
+                lane.maxWaitNanos = max(lane.maxWaitNanos, startNanos - enqueuedNanos)
+                lane.totalServiceNanos += endNanos - startNanos
+
+                if hasError:
+                    lane.errorCount += 1
+
+                self._condition.notify_all()
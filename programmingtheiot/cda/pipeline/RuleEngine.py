@@ -0,0 +1,390 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import bisect
+import logging
+import math
+import operator
+import re
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+
+class RuleEngine(object):
+    """
+    Evaluates declarative actuation rules against sensor readings and
+    returns an actuator command each time a rule's state changes.
+
+    A rule's condition is one or more clauses joined by 'and', each
+    comparing a sensor type's latest value, or its rate of change per
+    second, with a threshold:
+
+        temp > 20.0
+        humidity < 30 and temp > 18
+        rate(pressure) < -0.05
+
+    Sensor types are given by name (temp, humidity, pressure) or type ID.
+    A clause on another sensor type uses that type's latest reading, and is
+    false until there is one. With a hysteresis, an active rule stays active
+    until its value falls back past the threshold by the hysteresis, so a
+    value hovering around the threshold doesn't toggle the actuator.
+
+    When a rule becomes active an ON command (with the rule's actuator
+    value) is returned for its actuator, and when it clears an OFF command.
+    Nothing is returned while the state is unchanged. The OFF commands of
+    a reading come before its ON commands, so when a reading clears one
+    rule and activates another on the same actuator (e.g. a jump from
+    above the cooling threshold to below the heating one), the actuator
+    ends up on.
+
+    Rules are compiled to closures and indexed by the sensor types in their
+    conditions, so a reading is only checked against rules that use its
+    type. Where a rule only compares a type's value (not its rate), it's
+    also indexed by its thresholds on that type: once checked, a reading
+    can only change its state by moving across one of them since the last
+    reading of the type, so only the rules with a threshold in between are
+    checked.
+
+    Latest values and rates are kept per sensor type, not per sensor name.
+
+    """
+
+    NS_IN_SECS = 1000000000
+
+    SENSOR_TYPES = {
+        'temp': ConfigConst.TEMP_SENSOR_TYPE,
+        'humidity': ConfigConst.HUMIDITY_SENSOR_TYPE,
+        'pressure': ConfigConst.PRESSURE_SENSOR_TYPE
+    }
+
+    ACTUATOR_TYPES = {
+        'hvac': ConfigConst.HVAC_ACTUATOR_TYPE,
+        'humidifier': ConfigConst.HUMIDIFIER_ACTUATOR_TYPE,
+        'led': ConfigConst.LED_DISPLAY_ACTUATOR_TYPE
+    }
+
+    COMPARISONS = {
+        '>': operator.gt,
+        '>=': operator.ge,
+        '<': operator.lt,
+        '<=': operator.le
+    }
+
+    CLAUSE_PATTERN = re.compile(r'^(?:(rate)\(\s*(\w+)\s*\)|(\w+))\s*(>=|<=|>|<)\s*([-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)$')
+
+    class Rule(object):
+        __slots__ = ('name', 'condition', 'boundaries', 'check', 'actuatorTypeID', 'actuatorValue', 'isActive', 'transitionCount')
+
+        def __init__(self, name: str, condition: str, boundaries: dict, check, actuatorTypeID: int, actuatorValue: float):
+            self.name = name
+            self.condition = condition
+            self.boundaries = boundaries
+            self.check = check
+            self.actuatorTypeID = actuatorTypeID
+            self.actuatorValue = actuatorValue
+            self.isActive = False
+            self.transitionCount = 0
+
+    def __init__(self):
+        """
+        Constructor. Loads the rules named by the 'rules' key of the
+        ConstrainedDevice section of the configuration, each from its own
+        'Rule.<name>' section, and the HVAC rules set by the
+        handleTempChangeOnDevice, triggerHvacTempFloor and
+        triggerHvacTempCeiling keys.
+
+        """
+        self.rules = {}
+
+        # typeID -> rules that are checked on every reading of the type
+        self.rulesByType = {}
+
+        # typeID -> (sorted thresholds, rule per threshold) of rules with
+        # only value clauses on the type
+        self.thresholdIndex = {}
+        self.isIndexStale = False
+
+        # typeID -> indexed rules not checked since they were added
+        self.uncheckedRules = {}
+
+        # typeID -> latest value, time stamp and rate of change per second
+        self.values = {}
+        self.timeStamps = {}
+        self.rates = {}
+
+        self.readingCount = 0
+        self.checkCount = 0
+        self.commandCount = 0
+
+        self._lock = threading.RLock()
+
+        configUtil = ConfigUtil()
+
+        if configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.HANDLE_TEMP_CHANGE_ON_DEVICE_KEY):
+            floor = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.TRIGGER_HVAC_TEMP_FLOOR_KEY)
+            ceiling = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.TRIGGER_HVAC_TEMP_CEILING_KEY)
+
+            self.addRule('HvacHeat', f"temp < {floor}", ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = floor)
+            self.addRule('HvacCool', f"temp > {ceiling}", ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = ceiling)
+
+        ruleNames = configUtil.getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.RULES_KEY)
+
+        for name in (ruleNames.split(',') if ruleNames else []):
+            name = name.strip()
+            section = ConfigConst.RULE_SECTION_PREFIX + name
+
+            if not name:
+                continue
+
+            if not configUtil.hasSection(section):
+                logging.warning(f"No config section for rule {name}. Ignoring.")
+                continue
+
+            try:
+                self.addRule( \
+                    name, \
+                    configUtil.getProperty(section, ConfigConst.RULE_CONDITION_KEY), \
+                    self._parseType(configUtil.getProperty(section, ConfigConst.RULE_ACTUATOR_TYPE_KEY), self.ACTUATOR_TYPES), \
+                    actuatorValue = configUtil.getFloat(section, ConfigConst.RULE_ACTUATOR_VALUE_KEY), \
+                    hysteresis = configUtil.getFloat(section, ConfigConst.RULE_HYSTERESIS_KEY))
+            except ValueError as e:
+                logging.warning(f"Invalid rule {name}: {e}. Ignoring.")
+
+    def addRule(self, name: str, condition: str, actuatorTypeID: int, actuatorValue: float = ConfigConst.DEFAULT_VAL, hysteresis: float = 0.0):
+        """
+        Compiles and adds a rule, replacing any rule with the same name.
+
+        @param name The rule name.
+        @param condition The condition, e.g. 'temp > 20.0 and humidity < 60'.
+        @param actuatorTypeID The type ID of the actuator commanded.
+        @param actuatorValue The value sent with the ON command.
+        @param hysteresis How far past a threshold the value must fall back
+        before an active rule clears.
+        @raise ValueError If the condition can't be parsed.
+        """
+        if not condition or not condition.strip():
+            raise ValueError("empty condition")
+
+        check = None
+        rateTypeIDs = set()
+
+        # typeID -> thresholds of the rule's value clauses on the type
+        boundaries = {}
+
+        for clauseStr in re.split(r'\s+and\s+', condition.strip(), flags = re.IGNORECASE):
+            match = self.CLAUSE_PATTERN.match(clauseStr.strip())
+
+            if not match:
+                raise ValueError(f"can't parse clause '{clauseStr}'")
+
+            isRate = bool(match.group(1))
+            typeID = self._parseType(match.group(2) if isRate else match.group(3), self.SENSOR_TYPES)
+            opStr = match.group(4)
+            threshold = float(match.group(5))
+
+            # the threshold an active rule is held to, offset by the hysteresis
+            holdThreshold = threshold - hysteresis if opStr[0] == '>' else threshold + hysteresis
+
+            clause = self._compileClause(self.rates if isRate else self.values, typeID, self.COMPARISONS[opStr], threshold, holdThreshold)
+            check = clause if check is None else self._compileAnd(check, clause)
+
+            if isRate:
+                rateTypeIDs.add(typeID)
+                boundaries.setdefault(typeID, [])
+            else:
+                boundaries.setdefault(typeID, []).extend({threshold, holdThreshold})
+
+        # a rate changes with every reading, so rules with a rate clause on
+        # a type are checked on every reading of it rather than indexed
+        for typeID in rateTypeIDs:
+            boundaries[typeID] = None
+
+        rule = self.Rule(name, condition, boundaries, check, actuatorTypeID, actuatorValue)
+
+        with self._lock:
+            self.removeRule(name)
+            self.rules[name] = rule
+
+            for typeID, thresholds in boundaries.items():
+                if thresholds is None:
+                    self.rulesByType.setdefault(typeID, []).append(rule)
+                else:
+                    self.uncheckedRules.setdefault(typeID, []).append(rule)
+                    self.isIndexStale = True
+
+    def removeRule(self, name: str) -> bool:
+        """
+        Removes a rule. Its actuator isn't commanded.
+
+        @param name The rule name.
+        @return bool True if the rule existed.
+        """
+        with self._lock:
+            rule = self.rules.pop(name, None)
+
+            if not rule:
+                return False
+
+            for typeID, thresholds in rule.boundaries.items():
+                if thresholds is None:
+                    self.rulesByType[typeID].remove(rule)
+                else:
+                    uncheckedRules = self.uncheckedRules.get(typeID, [])
+
+                    if rule in uncheckedRules:
+                        uncheckedRules.remove(rule)
+
+                    self.isIndexStale = True
+
+            return True
+
+    def evaluate(self, data: SensorData) -> list:
+        """
+        Updates the latest value and rate of change of the reading's sensor
+        type, then checks the rules that use the type.
+
+        @param data The sensor reading.
+        @return list An ActuatorData command for each rule that cleared
+        (OFF), then for each that became active (ON); empty if no rule
+        changed state.
+        """
+        typeID = data.getTypeID()
+        value = data.getValue()
+        timeStampNanos = data.getTimeStampNanos()
+
+        if timeStampNanos is None:
+            timeStampNanos = time.time_ns()
+
+        commands = []
+
+        with self._lock:
+            if self.isIndexStale:
+                self._buildThresholdIndex()
+
+            self.readingCount += 1
+
+            lastValue = self.values.get(typeID)
+            lastTimeStampNanos = self.timeStamps.get(typeID)
+
+            if lastValue is not None and timeStampNanos > lastTimeStampNanos:
+                self.rates[typeID] = (value - lastValue) * self.NS_IN_SECS / (timeStampNanos - lastTimeStampNanos)
+
+            self.values[typeID] = value
+            self.timeStamps[typeID] = timeStampNanos
+
+            rules = self.rulesByType.get(typeID, []) + self.uncheckedRules.pop(typeID, [])
+            index = self.thresholdIndex.get(typeID)
+
+            if index:
+                thresholds, indexedRules = index
+
+                if lastValue is None or math.isnan(lastValue):
+                    rules = rules + indexedRules
+                else:
+                    low, high = (lastValue, value) if lastValue <= value else (value, lastValue)
+                    rules = rules + indexedRules[bisect.bisect_left(thresholds, low):bisect.bisect_right(thresholds, high)]
+
+            self.checkCount += len(rules)
+
+            for rule in rules:
+                isActive = rule.check(rule.isActive)
+
+                if isActive != rule.isActive:
+                    rule.isActive = isActive
+                    rule.transitionCount += 1
+                    commands.append(self._createCommand(rule))
+
+            # OFF before ON, keeping the rule order within each
+            commands.sort(key = lambda command: command.getCommand() == ConfigConst.COMMAND_ON)
+
+            self.commandCount += len(commands)
+
+        return commands
+
+    def getRuleNames(self) -> list:
+        return list(self.rules.keys())
+
+    def isRuleActive(self, name: str) -> bool:
+        rule = self.rules.get(name)
+
+        return rule.isActive if rule else False
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the counts of rules, readings evaluated, rule checks and
+        commands issued, and the average number of rules checked per reading.
+
+        @return dict
+        """
+        with self._lock:
+            return {
+                'rules': len(self.rules),
+                'activeRules': sum(1 for rule in self.rules.values() if rule.isActive),
+                'readings': self.readingCount,
+                'checks': self.checkCount,
+                'commands': self.commandCount,
+                'checksPerReading': self.checkCount / self.readingCount if self.readingCount else 0.0
+            }
+
+    def _buildThresholdIndex(self):
+        # must be called while holding the lock
+        entries = {}
+
+        for rule in self.rules.values():
+            for typeID, thresholds in rule.boundaries.items():
+                if thresholds is not None:
+                    entries.setdefault(typeID, []).extend((threshold, rule) for threshold in thresholds)
+
+        self.thresholdIndex = {}
+
+        for typeID, typeEntries in entries.items():
+            typeEntries.sort(key = lambda entry: entry[0])
+            self.thresholdIndex[typeID] = ([entry[0] for entry in typeEntries], [entry[1] for entry in typeEntries])
+
+        self.isIndexStale = False
+
+    def _compileAnd(self, first, second):
+        return lambda isActive: first(isActive) and second(isActive)
+
+    def _compileClause(self, source: dict, typeID: int, compare, threshold: float, holdThreshold: float):
+        # NaN (no reading yet) compares false
+        return lambda isActive: compare(source.get(typeID, math.nan), holdThreshold if isActive else threshold)
+
+    def _createCommand(self, rule: Rule) -> ActuatorData:
+        actuatorData = ActuatorData(typeID = rule.actuatorTypeID)
+
+        if rule.isActive:
+            actuatorData.setCommand(ConfigConst.COMMAND_ON)
+            actuatorData.setValue(rule.actuatorValue)
+        else:
+            actuatorData.setCommand(ConfigConst.COMMAND_OFF)
+
+        # not an f-string: this runs for every transition, and is rarely logged
+        logging.debug("Rule %s (%s) is now %s.", rule.name, rule.condition, 'active' if rule.isActive else 'clear')
+
+        return actuatorData
+
+    def _parseType(self, val: str, names: dict) -> int:
+        if val is None:
+            raise ValueError("missing type")
+
+        val = val.strip()
+
+        if val.lower() in names:
+            return names[val.lower()]
+
+        return int(val)
@@ -0,0 +1,272 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import heapq
+import itertools
+import logging
+import threading
+import time
+
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+class SinkFanout(object):
+    """
+    Sends each message to several upstream sinks (such as the MQTT and CoAP
+    clients) in parallel. Every sink has its own sender thread, a bounded
+    number of pending sends and a timeout, so a slow or unreachable sink
+    can't hold up the others:
+
+    - send() waits for the sinks concurrently, each for at most its own
+      timeout, so it takes as long as the slowest sink rather than the sum
+      of all of them.
+    - A sink still busy with an earlier send isn't waited for; the message
+      is queued for that sink, ahead of any queued messages with a lower
+      priority, so an egress lane's priority holds within the sink too.
+    - Once a sink has 'maxPending' sends, a new message evicts its
+      lowest-priority queued message if that has a lower priority than the
+      new one; otherwise the new message is dropped for that sink.
+
+    A send that outlasts its timeout keeps running on the sink's thread;
+    it's counted as timed out, and its latency is recorded when it ends.
+
+    """
+
+    NS_IN_MILLIS = 1000000
+
+    # send() results per sink
+    SENT      = 'sent'
+    FAILED    = 'failed'
+    TIMED_OUT = 'timedOut'
+    QUEUED    = 'queued'
+    DROPPED   = 'dropped'
+
+    class Sink(object):
+        __slots__ = ('name', 'sender', 'timeout', 'isEnabled', 'queue', 'condition', 'worker', 'isStopped', 'pendingCount', \
+            'sendCount', 'successCount', 'failureCount', 'timeoutCount', 'dropCount', 'totalLatencyNanos', 'maxLatencyNanos')
+
+        def __init__(self, name: str, sender, timeout: float, isEnabled, lock: threading.Lock):
+            self.name = name
+            self.sender = sender
+            self.timeout = timeout
+            self.isEnabled = isEnabled
+            self.queue = []
+            self.condition = threading.Condition(lock)
+            self.worker = None
+            self.isStopped = False
+            self.pendingCount = 0
+            self.resetMetrics()
+
+        def resetMetrics(self):
+            self.sendCount = 0
+            self.successCount = 0
+            self.failureCount = 0
+            self.timeoutCount = 0
+            self.dropCount = 0
+            self.totalLatencyNanos = 0
+            self.maxLatencyNanos = 0
+
+    def __init__(self, maxPending: int = ConfigConst.DEFAULT_SINK_MAX_PENDING):
+        """
+        Constructor.
+
+        @param maxPending The maximum number of sends queued or running per sink.
+        """
+        self.maxPending = max(maxPending, 1)
+        self.sinks = []
+
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+
+    def addSink(self, name: str, sender, timeout: float = ConfigConst.DEFAULT_SINK_TIMEOUT, isEnabled = None):
+        """
+        Adds a sink.
+
+        @param name The sink name, used for metrics.
+        @param sender Callable taking the arguments passed to send() and
+        returning True if the message was sent.
+        @param timeout The number of seconds send() waits for this sink.
+        @param isEnabled Optional callable returning False while the sink
+        should be skipped, such as when its client isn't configured.
+        """
+        sink = self.Sink(name, sender, timeout, isEnabled, self._lock)
+        sink.worker = threading.Thread(target = self._runSink, args = (sink,), name = f"Sink-{name}", daemon = True)
+        sink.worker.start()
+
+        self.sinks.append(sink)
+
+    def getSinkNames(self) -> list:
+        return [sink.name for sink in self.sinks]
+
+    def send(self, *args, priority: int = 0, **kwargs) -> dict:
+        """
+        Passes the arguments to every enabled sink's sender, in parallel,
+        and waits for the results of the sinks that weren't busy.
+
+        @param priority The message priority; lower values are sent first
+        by a busy sink, and equal values in the order they were sent.
+        @return dict The result per sink name: SENT, or FAILED if the
+        sender failed or raised an exception, TIMED_OUT, QUEUED behind
+        earlier sends, or DROPPED as the sink had too many pending sends.
+        """
+        startNanos = time.perf_counter_ns()
+        futures = []
+        results = {}
+
+        for sink in self.sinks:
+            if sink.isEnabled and not sink.isEnabled():
+                continue
+
+            future = Future()
+
+            with self._lock:
+                isBusy = sink.pendingCount > 0
+
+                if sink.pendingCount >= self.maxPending and not self._evictQueued(sink, priority):
+                    sink.dropCount += 1
+                    results[sink.name] = self.DROPPED
+                    continue
+
+                sink.pendingCount += 1
+                sink.sendCount += 1
+
+                heapq.heappush(sink.queue, (priority, next(self._sequence), startNanos, args, kwargs, future))
+                sink.condition.notify()
+
+            if isBusy:
+                # already behind; don't let it hold up this message too
+                results[sink.name] = self.QUEUED
+            else:
+                futures.append((sink, future))
+
+        for sink, future in futures:
+            remaining = sink.timeout - (time.perf_counter_ns() - startNanos) / 1000000000
+
+            try:
+                results[sink.name] = self.SENT if future.result(timeout = max(remaining, 0)) else self.FAILED
+            except FutureTimeoutError:
+                with self._lock:
+                    sink.timeoutCount += 1
+
+                logging.warning(f"Sink {sink.name} didn't finish within {sink.timeout} s.")
+                results[sink.name] = self.TIMED_OUT
+
+        return results
+
+    def shutdown(self, wait: bool = True, timeout: float = ConfigConst.DEFAULT_TIMEOUT):
+        """
+        Stops the sinks' threads once they've sent the messages still queued.
+        A sink that's stuck in a send is left behind after 'timeout'.
+
+        @param wait If True, waits for the threads to finish.
+        @param timeout The number of seconds to wait for each sink's thread.
+        """
+        for sink in self.sinks:
+            with self._lock:
+                sink.isStopped = True
+                sink.condition.notify()
+
+        if wait:
+            for sink in self.sinks:
+                sink.worker.join(timeout = timeout)
+
+                if sink.worker.is_alive():
+                    logging.warning(f"Sink {sink.name} didn't stop within {timeout} s.")
+
+    def getMetrics(self) -> dict:
+        """
+        Returns each sink's counts of sends, successes, failures, timeouts,
+        drops and pending sends, and its send latency in milliseconds.
+        Latency runs from the call to send() to the end of the sink's send,
+        so it includes time spent queued behind earlier sends.
+
+        @return dict Metrics keyed by sink name.
+        """
+        with self._lock:
+            return {
+                sink.name: {
+                    'sent': sink.sendCount,
+                    'succeeded': sink.successCount,
+                    'failed': sink.failureCount,
+                    'timedOut': sink.timeoutCount,
+                    'dropped': sink.dropCount,
+                    'pending': sink.pendingCount,
+                    'avgLatencyMillis': sink.totalLatencyNanos / (sink.successCount + sink.failureCount) / self.NS_IN_MILLIS \
+                        if sink.successCount + sink.failureCount else 0.0,
+                    'maxLatencyMillis': sink.maxLatencyNanos / self.NS_IN_MILLIS
+                } for sink in self.sinks
+            }
+
+    def resetMetrics(self):
+        with self._lock:
+            for sink in self.sinks:
+                sink.resetMetrics()
+
+    def _evictQueued(self, sink: Sink, priority: int) -> bool:
+        # called with the lock held: makes room for a message by dropping
+        # the newest of the lowest-priority queued messages, if they have
+        # a lower priority than it
+        if not sink.queue:
+            return False
+
+        victim = max(sink.queue, key = lambda entry: (entry[0], entry[1]))
+
+        if victim[0] <= priority:
+            return False
+
+        sink.queue.remove(victim)
+        heapq.heapify(sink.queue)
+
+        sink.pendingCount -= 1
+        sink.sendCount -= 1
+        sink.dropCount += 1
+
+        victim[5].set_result(False)
+
+        return True
+
+    def _runSink(self, sink: Sink):
+        while True:
+            with self._lock:
+                while not sink.queue and not sink.isStopped:
+                    sink.condition.wait()
+
+                if not sink.queue:
+                    return
+
+                priority, sequence, startNanos, args, kwargs, future = heapq.heappop(sink.queue)
+
+            future.set_result(self._runSend(sink, startNanos, args, kwargs))
+
+    def _runSend(self, sink: Sink, startNanos: int, args: tuple, kwargs: dict) -> bool:
+        isSent = False
+
+        try:
+            isSent = bool(sink.sender(*args, **kwargs))
+        except Exception:
+            logging.exception(f"Sink {sink.name} failed to send message.")
+
+        latencyNanos = time.perf_counter_ns() - startNanos
+
+        with self._lock:
+            sink.pendingCount -= 1
+            sink.totalLatencyNanos += latencyNanos
+            sink.maxLatencyNanos = max(sink.maxLatencyNanos, latencyNanos)
+
+            if isSent:
+                sink.successCount += 1
+            else:
+                sink.failureCount += 1
+
+        return isSent
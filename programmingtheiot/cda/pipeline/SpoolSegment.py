@@ -0,0 +1,168 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import mmap
+import os
+import struct
+import zlib
+
+class SpoolSegment(object):
+    """
+    A fixed-size, memory-mapped spool file holding a sequence of records.
+    Each record is a header - CRC-32, payload length, channel length and
+    tag - followed by the UTF-8 channel name and the payload.
+
+    The file is pre-sized when created, so unused space reads as zeros; a
+    zero payload length marks the end of the records. A record whose CRC
+    doesn't match (a write torn by a crash) is treated as the end too, and
+    is overwritten by the next append.
+
+    """
+
+    RECORD_HEADER = struct.Struct('!IIHH')
+    FILE_EXT = '.spool'
+
+    def __init__(self, path: str, seqNum: int, size: int):
+        """
+        Constructor. Opens the segment file at 'path', creating it if it
+        doesn't exist, and finds the end of its records.
+
+        @param path The segment file name.
+        @param seqNum The segment's sequence number.
+        @param size The size of a new segment file, in bytes. Existing
+        files keep their size.
+        """
+        self.path = path
+        self.seqNum = seqNum
+
+        with open(path, 'a+b') as segmentFile:
+            if os.path.getsize(path) < self.RECORD_HEADER.size:
+                segmentFile.truncate(size)
+
+            self.mappedFile = mmap.mmap(segmentFile.fileno(), 0)
+
+        self.size = len(self.mappedFile)
+        self.writeOffset = 0
+        self.recordCount = 0
+
+        offset = 0
+
+        while True:
+            record = self.read(offset)
+
+            if not record:
+                break
+
+            offset = record[0]
+            self.recordCount += 1
+
+        self.writeOffset = offset
+
+    @classmethod
+    def getFileName(cls, seqNum: int) -> str:
+        return f"{seqNum:010d}{cls.FILE_EXT}"
+
+    @classmethod
+    def getMaxPayloadSize(cls, size: int, channel: str) -> int:
+        return size - cls.RECORD_HEADER.size - len(channel.encode('utf-8'))
+
+    def getSeqNum(self) -> int:
+        return self.seqNum
+
+    def getRecordCount(self) -> int:
+        return self.recordCount
+
+    def getWriteOffset(self) -> int:
+        return self.writeOffset
+
+    def append(self, channel: str, payload: bytes, tag: int = 0) -> bool:
+        """
+        Appends a record after the last one.
+
+        @param channel The channel name, such as a topic or resource path.
+        @param payload The payload bytes. Must not be empty.
+        @param tag A 16-bit value stored with the record, such as a QoS level.
+        @return bool True if the record was written; False if it doesn't fit.
+        """
+        channelBytes = channel.encode('utf-8')
+        recordSize = self.RECORD_HEADER.size + len(channelBytes) + len(payload)
+
+        if self.writeOffset + recordSize > self.size:
+            return False
+
+        body = channelBytes + payload
+        fields = (len(payload), len(channelBytes), tag)
+        crc = zlib.crc32(body, zlib.crc32(self.RECORD_HEADER.pack(0, *fields)))
+
+        end = self.writeOffset + recordSize
+        self.mappedFile[self.writeOffset:end] = self.RECORD_HEADER.pack(crc, *fields) + body
+
+        # terminate the records, in case this overwrote a torn record
+        if end + self.RECORD_HEADER.size <= self.size:
+            self.mappedFile[end:end + self.RECORD_HEADER.size] = bytes(self.RECORD_HEADER.size)
+
+        self.writeOffset = end
+        self.recordCount += 1
+
+        return True
+
+    def read(self, offset: int) -> tuple:
+        """
+        Reads the record at 'offset'.
+
+        @param offset The record's byte offset in the segment.
+        @return tuple (nextOffset, channel, payload, tag), or None if there
+        is no valid record at 'offset'.
+        """
+        if offset + self.RECORD_HEADER.size > self.size:
+            return None
+
+        crc, payloadLength, channelLength, tag = self.RECORD_HEADER.unpack_from(self.mappedFile, offset)
+        bodyOffset = offset + self.RECORD_HEADER.size
+        end = bodyOffset + channelLength + payloadLength
+
+        if payloadLength == 0 or end > self.size:
+            return None
+
+        body = self.mappedFile[bodyOffset:end]
+
+        if zlib.crc32(body, zlib.crc32(self.RECORD_HEADER.pack(0, payloadLength, channelLength, tag))) != crc:
+            return None
+
+        return (end, body[:channelLength].decode('utf-8'), body[channelLength:], tag)
+
+    def countRecordsFrom(self, offset: int) -> int:
+        count = 0
+
+        while True:
+            record = self.read(offset)
+
+            if not record:
+                return count
+
+            offset = record[0]
+            count += 1
+
+    def flush(self):
+        self.mappedFile.flush()
+
+    def close(self):
+        if not self.mappedFile.closed:
+            self.mappedFile.close()
+
+    def delete(self):
+        self.close()
+
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
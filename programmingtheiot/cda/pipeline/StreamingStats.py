@@ -0,0 +1,155 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import math
+
+class StreamingStats(object):
+    """
+    Summary statistics of a stream of values, updated in constant time and
+    space per value: count, min, max, mean and (population) standard
+    deviation using Welford's algorithm, and percentiles estimated with the
+    P-Square algorithm (Jain and Chlamtac, 1985), which keeps five markers
+    per percentile instead of the values themselves.
+
+    Percentiles are exact, using linear interpolation as NumPy does by
+    default, for up to five values.
+
+    """
+
+    class P2Quantile(object):
+        __slots__ = ('quantile', 'heights', 'positions', 'desired', 'increments')
+
+        def __init__(self, quantile: float):
+            self.quantile = quantile
+            self.heights = []
+            self.positions = [1, 2, 3, 4, 5]
+            self.desired = [1.0, 1.0 + 2.0 * quantile, 1.0 + 4.0 * quantile, 3.0 + 2.0 * quantile, 5.0]
+            self.increments = [0.0, quantile / 2.0, quantile, (1.0 + quantile) / 2.0, 1.0]
+
+        def add(self, value: float):
+            q = self.heights
+
+            if len(q) < 5:
+                q.append(value)
+
+                if len(q) == 5:
+                    q.sort()
+
+                return
+
+            n = self.positions
+
+            # find the cell holding 'value', stretching the end markers if needed
+            if value < q[0]:
+                q[0] = value
+                cell = 0
+            elif value >= q[4]:
+                q[4] = value
+                cell = 3
+            else:
+                cell = 0
+
+                while value >= q[cell + 1]:
+                    cell += 1
+
+            for i in range(cell + 1, 5):
+                n[i] += 1
+
+            for i in range(0, 5):
+                self.desired[i] += self.increments[i]
+
+            # move the middle markers towards their desired positions
+            for i in range(1, 4):
+                offset = self.desired[i] - n[i]
+
+                if (offset >= 1.0 and n[i + 1] - n[i] > 1) or (offset <= -1.0 and n[i - 1] - n[i] < -1):
+                    step = 1 if offset > 0 else -1
+                    height = q[i] + step / (n[i + 1] - n[i - 1]) * ( \
+                        (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i]) + \
+                        (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+                    if not q[i - 1] < height < q[i + 1]:
+                        height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+
+                    q[i] = height
+                    n[i] += step
+
+        def getValue(self) -> float:
+            q = self.heights
+
+            # the markers only estimate once a sixth value has been added
+            if self.positions[4] > 5:
+                return q[2]
+
+            if not q:
+                return math.nan
+
+            ordered = sorted(q)
+            rank = self.quantile * (len(ordered) - 1)
+            lower = int(rank)
+            upper = min(lower + 1, len(ordered) - 1)
+
+            return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+    __slots__ = ('count', 'mean', 'm2', 'minValue', 'maxValue', 'quantiles')
+
+    def __init__(self, percentiles: list = None):
+        """
+        Constructor.
+
+        @param percentiles The percentiles to estimate, from 0 to 100.
+        """
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.minValue = math.inf
+        self.maxValue = -math.inf
+        self.quantiles = [self.P2Quantile(percentile / 100.0) for percentile in percentiles] if percentiles else []
+
+    def add(self, value: float):
+        self.count += 1
+
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+
+        if value < self.minValue:
+            self.minValue = value
+
+        if value > self.maxValue:
+            self.maxValue = value
+
+        for quantile in self.quantiles:
+            quantile.add(value)
+
+    def getCount(self) -> int:
+        return self.count
+
+    def getMax(self) -> float:
+        return self.maxValue
+
+    def getMean(self) -> float:
+        return self.mean
+
+    def getMin(self) -> float:
+        return self.minValue
+
+    def getStddev(self) -> float:
+        return math.sqrt(self.m2 / self.count) if self.count else 0.0
+
+    def getPercentiles(self) -> dict:
+        """
+        Returns the estimated percentiles.
+
+        @return dict Keyed by percentile (e.g. 90.0).
+        """
+        return {quantile.quantile * 100.0: quantile.getValue() for quantile in self.quantiles}
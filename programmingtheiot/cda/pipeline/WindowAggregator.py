@@ -0,0 +1,241 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import logging
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.StreamingStats import StreamingStats
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataSummary import SensorDataSummary
+
+class WindowAggregator(object):
+    """
+    Aggregates sensor readings over time windows and returns a
+    SensorDataSummary for each window as it closes.
+
+    Windows are set per sensor type. A tumbling window of 60 seconds covers
+    [0, 60), [60, 120), and so on. A sliding window of 900 seconds that
+    slides every 60 seconds covers [0, 900), [60, 960), and so on. Every
+    window is aligned to multiples of its slide since Epoch.
+
+    Each reading updates the StreamingStats of every window it falls in.
+    That is one window per tumbling size, and size / slide windows per
+    sliding size, so the cost per reading doesn't grow with the window
+    length.
+
+    Time is taken from each reading's time stamp, so recorded data sets
+    can be replayed. A window closes when a reading at or after its end
+    arrives, or when flush() is called. A reading that arrives after its
+    windows have closed isn't counted.
+
+    """
+
+    NS_IN_SECS = 1000000000
+
+    def __init__(self):
+        """
+        Constructor. Loads the temperature, humidity and pressure windows and
+        the percentiles from the ConstrainedDevice section of the
+        configuration.
+
+        """
+        # typeID -> list of (windowNanos, slideNanos)
+        self.windows = {}
+
+        # (typeID, name, windowNanos, slideNanos) -> {startNanos: StreamingStats}
+        self.openWindows = {}
+
+        # (typeID, name, windowNanos, slideNanos) -> end of the latest closed window
+        self.closedUntil = {}
+
+        self.readingCount = 0
+        self.summaryCount = 0
+        self.lateCount = 0
+
+        self._lock = threading.Lock()
+
+        configUtil = ConfigUtil()
+
+        self.percentiles = self._parseList( \
+            configUtil.getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.AGGREGATION_PERCENTILES_KEY, ConfigConst.DEFAULT_AGGREGATION_PERCENTILES))
+
+        sensorKeys = [
+            (ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.TEMP_AGGREGATION_WINDOWS_KEY),
+            (ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.HUMIDITY_AGGREGATION_WINDOWS_KEY),
+            (ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.PRESSURE_AGGREGATION_WINDOWS_KEY)
+        ]
+
+        for typeID, windowsKey in sensorKeys:
+            self.setWindows(typeID, self._parseWindows(configUtil.getProperty(ConfigConst.CONSTRAINED_DEVICE, windowsKey)))
+
+    def setWindows(self, typeID: int, windows: list = None):
+        """
+        Sets the windows for a sensor type, replacing any set before. Open
+        windows of the type are discarded.
+
+        @param typeID The sensor type ID.
+        @param windows List of (windowSecs, slideSecs) tuples; a slide of
+        0 or None, or equal to the window, makes the window tumbling. If
+        empty, readings of the type aren't aggregated.
+        """
+        specs = []
+
+        for windowSecs, slideSecs in (windows or []):
+            if not slideSecs or slideSecs <= 0 or slideSecs > windowSecs:
+                slideSecs = windowSecs
+
+            specs.append((int(windowSecs * self.NS_IN_SECS), int(slideSecs * self.NS_IN_SECS)))
+
+        with self._lock:
+            for key in [key for key in self.openWindows.keys() if key[0] == typeID]:
+                del self.openWindows[key]
+
+            if specs:
+                self.windows[typeID] = specs
+            else:
+                self.windows.pop(typeID, None)
+
+    def setPercentiles(self, percentiles: list = None):
+        """
+        Sets the percentiles estimated for windows opened after this call.
+
+        @param percentiles The percentiles, from 0 to 100.
+        """
+        self.percentiles = list(percentiles) if percentiles else []
+
+    def isAggregated(self, typeID: int) -> bool:
+        return typeID in self.windows
+
+    def add(self, data: SensorData) -> list:
+        """
+        Adds a reading to the windows it falls in, first closing any of its
+        sensor's windows that end at or before the reading.
+
+        @param data The sensor reading.
+        @return list The SensorDataSummary of each window closed, oldest
+        first; empty if none closed or the type isn't aggregated.
+        """
+        specs = self.windows.get(data.getTypeID())
+
+        if not specs:
+            return []
+
+        timeStampNanos = data.getTimeStampNanos()
+
+        if timeStampNanos is None:
+            timeStampNanos = time.time_ns()
+
+        value = data.getValue()
+        summaries = []
+
+        with self._lock:
+            self.readingCount += 1
+            isLate = False
+
+            for windowNanos, slideNanos in specs:
+                key = (data.getTypeID(), data.getName(), windowNanos, slideNanos)
+                openWindows = self.openWindows.setdefault(key, {})
+
+                for startNanos in sorted(start for start in openWindows.keys() if start + windowNanos <= timeStampNanos):
+                    summaries.append(self._createSummary(key, startNanos, openWindows.pop(startNanos)))
+                    self.closedUntil[key] = startNanos + windowNanos
+
+                closedUntil = self.closedUntil.get(key, 0)
+                firstStart = ((timeStampNanos - windowNanos) // slideNanos + 1) * slideNanos
+
+                for startNanos in range(firstStart, timeStampNanos + 1, slideNanos):
+                    if startNanos + windowNanos <= closedUntil:
+                        isLate = True
+                        continue
+
+                    stats = openWindows.get(startNanos)
+
+                    if stats is None:
+                        stats = StreamingStats(self.percentiles)
+                        openWindows[startNanos] = stats
+
+                    stats.add(value)
+
+            if isLate:
+                self.lateCount += 1
+
+            self.summaryCount += len(summaries)
+
+        return summaries
+
+    def flush(self) -> list:
+        """
+        Closes all open windows, e.g. when stopping.
+
+        @return list The SensorDataSummary of each window closed.
+        """
+        summaries = []
+
+        with self._lock:
+            for key, openWindows in self.openWindows.items():
+                for startNanos in sorted(openWindows.keys()):
+                    summaries.append(self._createSummary(key, startNanos, openWindows[startNanos]))
+
+                openWindows.clear()
+
+            self.summaryCount += len(summaries)
+
+        return summaries
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the counts of readings aggregated, summaries produced, late
+        readings and windows open.
+
+        @return dict
+        """
+        with self._lock:
+            return {
+                'readings': self.readingCount,
+                'summaries': self.summaryCount,
+                'late': self.lateCount,
+                'openWindows': sum(len(openWindows) for openWindows in self.openWindows.values())
+            }
+
+    def _createSummary(self, key: tuple, startNanos: int, stats: StreamingStats) -> SensorDataSummary:
+        typeID, name, windowNanos, slideNanos = key
+
+        summary = SensorDataSummary(typeID = typeID, name = name)
+        summary.setWindow(windowNanos / self.NS_IN_SECS, slideNanos / self.NS_IN_SECS, stats.getCount())
+        summary.setStats(stats.getMean(), stats.getMin(), stats.getMax(), stats.getStddev(), stats.getPercentiles())
+        summary.setTimeStampNanos(startNanos + windowNanos)
+
+        return summary
+
+    def _parseList(self, val: str) -> list:
+        return [float(entry) for entry in val.split(',') if entry.strip()] if val else []
+
+    def _parseWindows(self, val: str) -> list:
+        # e.g. "60, 900/300": a 60 s tumbling window and a 900 s window
+        # sliding every 300 s
+        windows = []
+
+        for entry in (val.split(',') if val else []):
+            if not entry.strip():
+                continue
+
+            try:
+                windowSecs, _, slideSecs = entry.partition('/')
+                windows.append((float(windowSecs), float(slideSecs) if slideSecs.strip() else None))
+            except ValueError:
+                logging.warning(f"Ignoring invalid aggregation window '{entry.strip()}'.")
+
+        return windows
@@ -50,6 +50,7 @@ class SensorDataGenerator(object):
 	MAX_MONITOR_PRESSURE = 50000.0
 	
 	DEFAULT_DATA_POINTS = 60 * MAX_HOURS
+	DEFAULT_CHUNK_SIZE = 60 * 60
 	
 	NO_NOISE = 0
 	MIN_NOISE = 1
@@ -86,7 +87,7 @@ class SensorDataGenerator(object):
 		self.alignGeneratorToDay = alignGeneratorToDay
 		self.dayDenominator = (1 - (calcLib.pi / 10)) + calcLib.pi
 		
-	def generateDailyEnvironmentHumidityDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_HUMIDITY, maxValue: float = MAX_ENV_HUMIDITY, useSeconds: bool = False):
+	def generateDailyEnvironmentHumidityDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_HUMIDITY, maxValue: float = MAX_ENV_HUMIDITY, useSeconds: bool = False, streamData: bool = False):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -101,15 +102,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: streamData Defaults to False. If True, a SensorDataStream is returned
+		instead. See generateDailySensorDataSet().
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_HUMIDITY or maxValue > self.MAX_ENV_HUMIDITY: maxValue = self.MAX_ENV_HUMIDITY
 		if minValue < self.MIN_ENV_HUMIDITY or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_HUMIDITY_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_HUMIDITY_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, streamData = streamData)
 		
-	def generateDailyEnvironmentPressureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_PRESSURE, maxValue: float = MAX_ENV_PRESSURE, useSeconds: bool = False):
+	def generateDailyEnvironmentPressureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_ENV_PRESSURE, maxValue: float = MAX_ENV_PRESSURE, useSeconds: bool = False, streamData: bool = False):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -124,15 +127,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: streamData Defaults to False. If True, a SensorDataStream is returned
+		instead. See generateDailySensorDataSet().
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_PRESSURE or maxValue > self.MAX_ENV_PRESSURE: maxValue = self.MAX_ENV_PRESSURE
 		if minValue < self.MIN_ENV_PRESSURE or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_PRESSURE_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_PRESSURE_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, streamData = streamData)
 		
-	def generateDailyIndoorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_INDOOR_TEMP, maxValue: float = MAX_INDOOR_TEMP, useSeconds: bool = False):
+	def generateDailyIndoorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_INDOOR_TEMP, maxValue: float = MAX_INDOOR_TEMP, useSeconds: bool = False, streamData: bool = False):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -147,15 +152,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: streamData Defaults to False. If True, a SensorDataStream is returned
+		instead. See generateDailySensorDataSet().
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_ENV_TEMP or maxValue > self.MAX_ENV_TEMP: maxValue = self.MAX_ENV_TEMP
 		if minValue < self.MIN_ENV_TEMP or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, streamData = streamData)
 		
-	def generateDailyMonitorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_MONITOR_TEMP, maxValue: float = MAX_MONITOR_TEMP, useSeconds: bool = False):
+	def generateDailyMonitorTemperatureDataSet(self, noiseLevel: int = DEFAULT_NOISE, minValue: float = MIN_MONITOR_TEMP, maxValue: float = MAX_MONITOR_TEMP, useSeconds: bool = False, streamData: bool = False):
 		"""
 		Generates a time-series data set for indoor temperature simulation over a 24-hour period.
 		
@@ -170,15 +177,17 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: streamData Defaults to False. If True, a SensorDataStream is returned
+		instead. See generateDailySensorDataSet().
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
 		if maxValue < self.MIN_MONITOR_TEMP or maxValue > self.MAX_MONITOR_TEMP: maxValue = self.MAX_MONITOR_TEMP
 		if minValue < self.MIN_MONITOR_TEMP or minValue >= maxValue: minValue = maxValue - 1
 		
-		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds)
+		return self.generateDailySensorDataSet(curveType = self.DEFAULT_TEMP_CURVE, noiseLevel = noiseLevel, minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = useSeconds, streamData = streamData)
 		
-	def generateDailySensorDataSet(self, curveType: int = FULL_WAVE, noiseLevel: int = DEFAULT_NOISE, minValue: float = DEFAULT_MIN_VALUE, maxValue: float = DEFAULT_MAX_VALUE, startHour: int = MIN_HOURS, endHour: int = MAX_HOURS, useSeconds = False):
+	def generateDailySensorDataSet(self, curveType: int = FULL_WAVE, noiseLevel: int = DEFAULT_NOISE, minValue: float = DEFAULT_MIN_VALUE, maxValue: float = DEFAULT_MAX_VALUE, startHour: int = MIN_HOURS, endHour: int = MAX_HOURS, useSeconds = False, streamData: bool = False, chunkSize: int = DEFAULT_CHUNK_SIZE):
 		"""
 		Generates a time-series data set. This call will use the parameters to generate
 		time-series data that includes the ordered time points and their values stored
@@ -188,6 +197,11 @@ class SensorDataGenerator(object):
 		minute between startHour and stopHour. If startHour and stopHour are the same, a
 		single data pair will be generated.
 		
+		With streamData, nothing is generated up front: a SensorDataStream is returned,
+		which computes each time point from its index and generates the values (and
+		their noise) chunkSize at a time, as they're read. At second granularity this
+		saves storing 2 x 86,400 floats per day per sensor.
+		
 		@param curveType The type of curve to implement - FULL_WAVE, CURVE_UP, CURVE_DOWN,
 		BELL_CURVE, INVERSE_CURVE. Defaults to FULL_WAVE.
 		@param: noiseLevel Any positive integer between 0 (no noise) and 100 (max noise).
@@ -205,6 +219,10 @@ class SensorDataGenerator(object):
 		@param: useSeconds Defaults to False. If True, the data set will be generated using
 		second-level granularity; that is, one data pair for every second between
 		startHour and endHour.
+		@param: streamData Defaults to False. If True, a SensorDataStream is returned
+		instead of a SensorDataSet.
+		@param: chunkSize The number of values a SensorDataStream generates at a time.
+		Defaults to DEFAULT_CHUNK_SIZE.
 		@return SensorDataSet The sensor data set containing both time entries and data
 		values for those time entries.
 		"""
@@ -226,29 +244,18 @@ class SensorDataGenerator(object):
 		if useSeconds: totalDataPoints = totalDataPoints * 60
 		if totalDataPoints == 0: totalDataPoints = 1
 		
+		denominator = self._calcDenominator(curveType)
+		
+		if streamData:
+			return SensorDataStream( \
+				epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+				startHour = startHour, endHour = endHour, entryCount = totalDataPoints, denominator = denominator, \
+				minValue = minValue, maxValue = maxValue, noiseLevel = noiseLevel, chunkSize = chunkSize)
+			
 		# create evenly spaced number of 'totalDataPoints' between 'startHour' and 'endHour'
 		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = totalDataPoints)
 		
-		# generate the distribution data for each point - quick ramp up curve
-		# followed by a more gradual ramp down
-		if self.alignGeneratorToDay:
-			if curveType > 0:
-				denominator = (curveType + self.dayDenominator)
-			elif curveType == 0:
-				denominator = self.dayDenominator
-			else:
-				denominator = abs(curveType) * self.dayDenominator
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
-		else:
-			if curveType > 0:
-				denominator = curveType
-			elif curveType == 0:
-				denominator = 1
-			else:
-				denominator = 1 / abs(curveType)
-				
-			dataValuesClean = calcLib.sin(timeEntries / denominator)
+		dataValuesClean = calcLib.sin(timeEntries / denominator)
 		
 		# re-scale array with 'minValue' as floor and 'maxValue' as ceiling
 		scaledValuesClean = calcLib.interp(dataValuesClean, (dataValuesClean.min(), dataValuesClean.max()), (minValue, maxValue))
@@ -256,17 +263,9 @@ class SensorDataGenerator(object):
 		
 		# check if noise should be added
 		if noiseLevel != self.NO_NOISE:
-			# get the mean value, generate base10 log and calculate noise numerator
-			meanValue = calcLib.mean(scaledValuesClean)
-			
-			# calc order of magnitude of mean value - this is necessary to ensure
-			# the generated noisyness aligns with the magnitude of the values
-			meanMag = int(math.log10(meanValue))
-			noiseScale = ((noiseLevel / 100) * ((10 ** meanMag) / 10))
+			noiseScale = calcNoiseScale(noiseLevel, calcLib.mean(scaledValuesClean))
 			noisyTemp = calcLib.random.normal(0, noiseScale, len(scaledValuesClean))
 			
-			logging.debug("Noise=%f; Noise Scale=%f; Mean Magnitude=%f" % (noiseLevel, noiseScale, meanMag))
-			
 			# update the data set to add in noise with clean values
 			scaledValuesNoisy = (scaledValuesClean + noisyTemp)
 			
@@ -276,6 +275,103 @@ class SensorDataGenerator(object):
 		
 		return dataSet
 		
+	def generateSensorDataMatrix(self, curveTypes = FULL_WAVE, noiseLevels = DEFAULT_NOISE, minValues = DEFAULT_MIN_VALUE, maxValues = DEFAULT_MAX_VALUE, startHour: int = MIN_HOURS, endHour: int = 24, useSeconds: bool = False, dtype = calcLib.float64, seed: int = None):
+		"""
+		Generates the time-series data of many sensors in one vectorized pass,
+		e.g. for load testing with thousands of virtual sensors. Each row is
+		what generateDailySensorDataSet() generates with that sensor's
+		parameters, all over the same time axis, which isn't stored (see
+		createSensorDataSets()).
+		
+		The curve types, noise levels, min values and max values can each be
+		a single value or one value per sensor; they're broadcast together,
+		and validated as by generateDailySensorDataSet(). The noise is drawn
+		from a generator of its own, which can be seeded.
+		
+		@param curveTypes The curve type(s). Defaults to FULL_WAVE.
+		@param noiseLevels The noise level(s). Defaults to DEFAULT_NOISE.
+		@param minValues The floor(s) of the data. Defaults to DEFAULT_MIN_VALUE.
+		@param maxValues The ceiling(s) of the data. Defaults to DEFAULT_MAX_VALUE.
+		@param startHour The beginning hour. Defaults to MIN_HOURS.
+		@param endHour The ending hour. Defaults to 24.
+		@param useSeconds Defaults to False. If True, one value for every second
+		between startHour and endHour, rather than for every minute.
+		@param dtype The dtype of the matrix. Defaults to float64; float32 halves
+		its size.
+		@param seed The seed of the noise, or None (default) for a random seed.
+		@return ndarray The (sensors x time entries) matrix of data values.
+		"""
+		curveTypes, noiseLevels, minValues, maxValues = calcLib.broadcast_arrays( \
+			*(calcLib.atleast_1d(param) for param in (curveTypes, noiseLevels, minValues, maxValues)))
+		
+		noiseLevels = calcLib.clip(noiseLevels, self.NO_NOISE, self.MAX_NOISE)
+		minValues = minValues.astype(calcLib.float64)
+		maxValues = calcLib.maximum(maxValues, minValues)
+		
+		startHour = min(max(startHour, self.MIN_HOURS), self.MAX_HOURS)
+		endHour = min(max(endHour, startHour), self.MAX_HOURS)
+		
+		totalDataPoints = max((endHour - startHour) * (3600 if useSeconds else 60), 1)
+		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = totalDataPoints)
+		denominators = calcLib.array([self._calcDenominator(curveType) for curveType in curveTypes])
+		
+		dataMatrix = calcLib.empty((len(curveTypes), totalDataPoints), dtype = dtype)
+		
+		# the matrix is filled a block of columns at a time, of about 64
+		# chunks' worth of values, so the temporaries stay small
+		chunkColumns = max(self.DEFAULT_CHUNK_SIZE * 64 // len(curveTypes), 1)
+		columnChunks = [slice(start, start + chunkColumns) for start in range(0, totalDataPoints, chunkColumns)]
+		
+		# the clean curves
+		for columns in columnChunks:
+			calcLib.sin(timeEntries[columns] / denominators[:, None], out = dataMatrix[:, columns])
+			
+		curveMin = dataMatrix.min(axis = 1).astype(calcLib.float64)
+		curveMax = dataMatrix.max(axis = 1).astype(calcLib.float64)
+		curveMean = dataMatrix.mean(axis = 1, dtype = calcLib.float64)
+		
+		# re-scaled as calcLib.interp() does, with 'minValue' as floor and
+		# 'maxValue' as ceiling (and a flat curve at 'maxValue')
+		curveSpan = curveMax - curveMin
+		slopes = calcLib.divide(maxValues - minValues, curveSpan, out = calcLib.zeros_like(curveSpan), where = curveSpan > 0)
+		offsets = calcLib.where(curveSpan > 0, minValues, maxValues)
+		
+		noiseScales = calcLib.array([calcNoiseScale(noiseLevel, offset + slope * (mean - low)) if noiseLevel != self.NO_NOISE else 0.0 \
+			for noiseLevel, offset, slope, mean, low in zip(noiseLevels, offsets, slopes, curveMean, curveMin)])
+		
+		noiseGenerator = calcLib.random.default_rng(seed)
+		
+		for columns in columnChunks:
+			values = dataMatrix[:, columns]
+			values -= curveMin[:, None].astype(dtype)
+			values *= slopes[:, None].astype(dtype)
+			values += offsets[:, None].astype(dtype)
+			
+			if noiseScales.any():
+				values += noiseGenerator.standard_normal(values.shape, dtype = dtype) * noiseScales[:, None].astype(dtype)
+				
+		return dataMatrix
+		
+	def createSensorDataSets(self, dataMatrix, startHour: int = MIN_HOURS, endHour: int = 24) -> list:
+		"""
+		Returns a SensorDataSet for each row of a matrix generated by
+		generateSensorDataMatrix(). The data sets hold views of the matrix
+		and share one array of time entries, so sensor sim tasks given them
+		don't copy any data.
+		
+		@param dataMatrix The (sensors x time entries) matrix.
+		@param startHour The startHour the matrix was generated with.
+		@param endHour The endHour the matrix was generated with.
+		@return list The SensorDataSet of each row, in order.
+		"""
+		startHour = min(max(startHour, self.MIN_HOURS), self.MAX_HOURS)
+		endHour = min(max(endHour, startHour), self.MAX_HOURS)
+		
+		timeEntries = calcLib.linspace(start = startHour, stop = endHour, num = dataMatrix.shape[1])
+		
+		return [SensorDataSet(epochOffsetSeconds = self.epochOffsetSeconds, useCurrentTime = self.useCurrentTime, \
+			timeEntries = timeEntries, dataEntries = dataEntries) for dataEntries in dataMatrix]
+		
 	def generateOnScreenGraph(self, dataSet = None, chartTitle: str = "Sample Data", chartXLabel: str = "X Axis", chartYLabel: str = "Y Axis"):
 		"""
 		A simple graph generator using the title info passed in
@@ -301,9 +397,45 @@ class SensorDataGenerator(object):
 		plotter.grid(True, which = 'both')
 		plotter.show()
 		
+	def _calcDenominator(self, curveType: int) -> float:
+		# generate the distribution data for each point - quick ramp up curve
+		# followed by a more gradual ramp down
+		if self.alignGeneratorToDay:
+			if curveType > 0:
+				return (curveType + self.dayDenominator)
+			elif curveType == 0:
+				return self.dayDenominator
+			else:
+				return abs(curveType) * self.dayDenominator
+		else:
+			if curveType > 0:
+				return curveType
+			elif curveType == 0:
+				return 1
+			else:
+				return 1 / abs(curveType)
+				
 
 from time import time, ctime
 
+def calcNoiseScale(noiseLevel: int, meanValue: float) -> float:
+	"""
+	Returns the standard deviation of the noise added to generated values.
+	
+	@param noiseLevel The noise level, between NO_NOISE and MAX_NOISE.
+	@param meanValue The mean of the clean values.
+	@return float
+	"""
+	# calc order of magnitude of mean value - this is necessary to ensure
+	# the generated noisyness aligns with the magnitude of the values
+	meanMag = int(math.log10(meanValue))
+	noiseScale = ((noiseLevel / 100) * ((10 ** meanMag) / 10))
+	
+	logging.debug("Noise=%f; Noise Scale=%f; Mean Magnitude=%f" % (noiseLevel, noiseScale, meanMag))
+	
+	return noiseScale
+	
+
 class SensorDataSet():
 	"""
 	Class definition of the data structure that will hold the time entries and
@@ -401,7 +533,8 @@ class SensorDataSet():
 		if index < 0 or index > self.dataEntries.size - 1:
 			index = 0
 		
-		return self.dataEntries[index]
+		# a float, as the entries may be float32 (which SensorData can't encode)
+		return float(self.dataEntries[index])
 	
 	def getDataEntryCount(self) -> int:
 		"""
@@ -419,8 +552,9 @@ class SensorDataSet():
 		(evenly spaced from start to end) that should correspond to dataEntries - element by element.
 		"""
 		if not timeEntries is None:
-			# data generator uses a single dimension array, so it's safe to flatten
-			self.timeEntries = timeEntries.flatten()
+			# data generator uses a single dimension array, so it's safe to flatten;
+			# ravel() keeps a view of an array shared with other data sets
+			self.timeEntries = timeEntries.ravel()
 			logging.info("timeEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.timeEntries.size, timeEntries.size, timeEntries.ndim, timeEntries.shape, timeEntries.dtype)
 		
 	def setDataEntries(self, dataEntries):
@@ -431,10 +565,168 @@ class SensorDataSet():
 		that should correspond to timeEntries - element by element.
 		"""
 		if not dataEntries is None:
-			# data generator uses a single dimension array, so it's safe to flatten
-			self.dataEntries = dataEntries.flatten()
+			# data generator uses a single dimension array, so it's safe to flatten;
+			# ravel() keeps a view of a row of a generateSensorDataMatrix() matrix
+			self.dataEntries = dataEntries.ravel()
 			logging.info("dataEntries tuple. Array Size: %s  ND Size: %s  Dimensions: %s  Shape: %s  Type: %s", self.dataEntries.size, dataEntries.size, dataEntries.ndim, dataEntries.shape, dataEntries.dtype)
 		
+class SensorDataStream(SensorDataSet):
+	"""
+	A lazily generated SensorDataSet, as returned by
+	SensorDataGenerator.generateDailySensorDataSet() with streamData. No time
+	entries are stored: the time of entry 'index' is computed from the index.
+	The data entries are generated chunkSize at a time, as they're read, and
+	only the chunk last read is kept, so reading the entries in order (as the
+	sensor sim tasks do) generates each chunk once. Noise is drawn per chunk,
+	so a chunk generated again gets new noise.
+	
+	The values are those of a SensorDataSet generated with the same
+	parameters, less the noise: the curve's min and max (which its values
+	are scaled by) and mean (which the noise scale depends on) are found
+	without generating it.
+	"""
+	
+	def __init__(self, epochOffsetSeconds: float = 0.0, useCurrentTime: bool = True, \
+		startHour: int = 0, endHour: int = 24, entryCount: int = 1, denominator: float = 1.0, \
+		minValue: float = 0.0, maxValue: float = 100.0, noiseLevel: int = 0, chunkSize: int = 3600):
+		"""
+		Constructor. See SensorDataGenerator.generateDailySensorDataSet(), which
+		validates the parameters.
+		
+		@param epochOffsetSeconds See SensorDataSet.
+		@param useCurrentTime See SensorDataSet.
+		@param startHour The time of the first entry.
+		@param endHour The time of the last entry.
+		@param entryCount The number of entries, evenly spaced from startHour to endHour.
+		@param denominator The entries are sin(time / denominator), scaled.
+		@param minValue The floor the curve is scaled to.
+		@param maxValue The ceiling the curve is scaled to.
+		@param noiseLevel The noise level, or 0 for none.
+		@param chunkSize The number of entries generated at a time.
+		"""
+		super().__init__(epochOffsetSeconds = epochOffsetSeconds, useCurrentTime = useCurrentTime)
+		
+		self.startHour = startHour
+		self.entryCount = max(entryCount, 1)
+		self.timeStep = (endHour - startHour) / (self.entryCount - 1) if self.entryCount > 1 else 0.0
+		self.denominator = denominator
+		self.minValue = minValue
+		self.maxValue = maxValue
+		self.chunkSize = max(chunkSize, 1)
+		
+		self.curveMin, self.curveMax = self._calcCurveRange()
+		self.noiseScale = calcNoiseScale(noiseLevel, self._scale(self._calcCurveMean())) if noiseLevel > 0 else 0.0
+		
+		# the chunk last read, and the index of its first entry
+		self.chunk = None
+		self.chunkStart = 0
+		
+	def getChunks(self):
+		"""
+		Generates the data entries in order, a chunk at a time.
+		
+		@return Generator of ndarray
+		"""
+		for chunkStart in range(0, self.entryCount, self.chunkSize):
+			yield self._generateChunk(chunkStart)
+			
+	def getTimeEntries(self):
+		"""
+		Returns all the time entries. Note these are computed, and stored in
+		the returned array.
+		"""
+		return self._calcTimes(calcLib.arange(self.entryCount))
+	
+	def getTimeEntry(self, index: int = 0) -> float:
+		"""
+		Returns the time of the entry at 'index'. If index is < 0 or >
+		getDataEntryCount() - 1, 0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.entryCount - 1:
+			index = 0
+			
+		return self.startHour + index * self.timeStep
+	
+	def getDataEntries(self):
+		"""
+		Returns all the data entries. Note these are generated, and stored in
+		the returned array.
+		"""
+		return calcLib.concatenate(list(self.getChunks()))
+	
+	def getDataEntry(self, index = 0) -> float:
+		"""
+		Returns the value of the entry at 'index', generating its chunk if it
+		isn't the one last read. If index is < 0 or > getDataEntryCount() - 1,
+		0 will be used.
+		
+		@return float
+		"""
+		if index < 0 or index > self.entryCount - 1:
+			index = 0
+			
+		if self.chunk is None or not self.chunkStart <= index < self.chunkStart + len(self.chunk):
+			self.chunkStart = index - index % self.chunkSize
+			self.chunk = self._generateChunk(self.chunkStart)
+			
+		return self.chunk[index - self.chunkStart]
+	
+	def getDataEntryCount(self) -> int:
+		"""
+		Returns the number of data entries.
+		
+		@return int
+		"""
+		return self.entryCount
+	
+	def _calcTimes(self, indexes):
+		return self.startHour + indexes * self.timeStep
+	
+	def _calcCurve(self, indexes):
+		return calcLib.sin(self._calcTimes(indexes) / self.denominator)
+	
+	def _calcCurveRange(self) -> tuple:
+		# the curve's extremes are at its ends, or at the entries either side
+		# of a peak or trough (where time / denominator = pi / 2 + k * pi)
+		candidates = [0, self.entryCount - 1]
+		
+		if self.timeStep > 0:
+			firstAngle = self.startHour / self.denominator
+			lastAngle = self._calcTimes(self.entryCount - 1) / self.denominator
+			
+			for k in range(math.ceil(firstAngle / math.pi - 0.5), math.floor(lastAngle / math.pi - 0.5) + 1):
+				index = ((math.pi / 2 + k * math.pi) * self.denominator - self.startHour) / self.timeStep
+				candidates.extend((math.floor(index), math.ceil(index)))
+				
+		curve = self._calcCurve(calcLib.clip(calcLib.array(candidates), 0, self.entryCount - 1))
+		
+		return curve.min(), curve.max()
+	
+	def _calcCurveMean(self) -> float:
+		# the closed form of the sum of sin(a + i * h) for i < n
+		firstAngle = self.startHour / self.denominator
+		angleStep = self.timeStep / self.denominator
+		
+		if self.entryCount == 1 or math.sin(angleStep / 2) == 0:
+			return math.sin(firstAngle)
+		
+		return math.sin(self.entryCount * angleStep / 2) / math.sin(angleStep / 2) * \
+			math.sin(firstAngle + (self.entryCount - 1) * angleStep / 2) / self.entryCount
+	
+	def _scale(self, curveValues):
+		# as SensorDataGenerator, re-scales with 'minValue' as floor and 'maxValue' as ceiling
+		return calcLib.interp(curveValues, (self.curveMin, self.curveMax), (self.minValue, self.maxValue))
+	
+	def _generateChunk(self, chunkStart: int):
+		values = self._scale(self._calcCurve(calcLib.arange(chunkStart, min(chunkStart + self.chunkSize, self.entryCount))))
+		
+		if self.noiseScale > 0:
+			values = values + calcLib.random.normal(0, self.noiseScale, len(values))
+			
+		return values
+	
 def main():
 	"""
 	Main function definition for running as an application.
@@ -12,16 +12,14 @@
 
 import logging
 
-from importlib import import_module
-
 import programmingtheiot.common.ConfigConst as ConfigConst
 from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 
 from programmingtheiot.data.ActuatorData import ActuatorData
 
-from programmingtheiot.cda.sim.HvacActuatorSimTask import HvacActuatorSimTask
-from programmingtheiot.cda.sim.HumidifierActuatorSimTask import HumidifierActuatorSimTask
+from programmingtheiot.cda.system.AdapterRegistry import AdapterRegistry
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
 
 class ActuatorAdapterManager(object):
     """
@@ -46,56 +44,42 @@ class ActuatorAdapterManager(object):
         
         self.dataMessageListener = dml
         
+        # if set, each actuator's latest response is resent at this interval
+        self.heartbeatSecs = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ACTUATOR_HEARTBEAT_KEY,
+            defaultVal=ConfigConst.DEFAULT_ACTUATOR_HEARTBEAT
+        )
+        
+        self.scheduler = SchedulerService()
+        self.isStarted = False
+        
         logging.info(f"The ActuatorAdapaterManager is configured to use {'simulators' if self.useSimulator else 'emulators' if self.useEmulator else 'hardware'}.")
          
-        self._initEnvironmentalActuationTasks()
-        
-    def _initEnvironmentalActuationTasks(self):
-        if self.useSimulator:
-            self.humidifierActuator = HumidifierActuatorSimTask()
-            self.hvacActuator = HvacActuatorSimTask()
-            self.ledActuator = None
-        elif self.useEmulator:
-            hueModule = import_module('programmingtheiot.cda.emulated.HumidifierEmulatorTask', 'HumidiferEmulatorTask')
-            hueClazz = getattr(hueModule, 'HumidifierEmulatorTask')
-            self.humidifierActuator = hueClazz()
-            
-            # create the HVAC actuator emulator
-            hveModule = import_module('programmingtheiot.cda.emulated.HvacEmulatorTask', 'HvacEmulatorTask')
-            hveClazz = getattr(hveModule, 'HvacEmulatorTask')
-            self.hvacActuator = hveClazz()
-            
-            # create the LED display actuator emulator
-            leDisplayModule = import_module('programmingtheiot.cda.emulated.LedDisplayEmulatorTask', 'LedDisplayEmulatorTask')
-            leClazz = getattr(leDisplayModule, 'LedDisplayEmulatorTask')
-            self.ledActuator = leClazz()
-        else: # hw should be the same, assuming i set up my shi right...
-            hueModule = import_module('programmingtheiot.cda.emulated.HumidifierEmulatorTask', 'HumidiferEmulatorTask')
-            hueClazz = getattr(hueModule, 'HumidifierEmulatorTask')
-            self.humidifierActuator = hueClazz()
-            
-            # create the HVAC actuator emulator
-            hveModule = import_module('programmingtheiot.cda.emulated.HvacEmulatorTask', 'HvacEmulatorTask')
-            hveClazz = getattr(hveModule, 'HvacEmulatorTask')
-            self.hvacActuator = hveClazz()
+        # typeID -> actuators of the type; the actuators are declared in the
+        # config, and their adapter classes imported only when created
+        self.actuators = {}
+        self.adapterRegistry = AdapterRegistry()
+        
+        self._initActuators()
+        
+    def _initActuators(self):
+        for entry in self.adapterRegistry.getActuatorEntries():
+            actuator = self.adapterRegistry.createAdapter(entry)
             
-            # create the LED display actuator emulator
-            leDisplayModule = import_module('programmingtheiot.cda.emulated.LedDisplayEmulatorTask', 'LedDisplayEmulatorTask')
-            leClazz = getattr(leDisplayModule, 'LedDisplayEmulatorTask')
-            self.ledActuator = leClazz()
-
+            if actuator:
+                self.actuators.setdefault(entry.typeID, []).append(actuator)
+                
     def sendActuatorCommand(self, data: ActuatorData) -> ActuatorData:
         responseData = None
         
         if data and not data.isResponseFlagEnabled():
             if data.getLocationID()==self.locationID:
                 
-                if data.getTypeID() == ConfigConst.HUMIDIFIER_ACTUATOR_TYPE and self.humidifierActuator:
-                    responseData = self.humidifierActuator.updateActuator(data)
-                elif data.getTypeID() == ConfigConst.HVAC_ACTUATOR_TYPE and self.hvacActuator:
-                    responseData = self.hvacActuator.updateActuator(data)
-                elif data.getTypeID() == ConfigConst.LED_DISPLAY_ACTUATOR_TYPE and self.ledActuator:
-                    responseData = self.ledActuator.updateActuator(data)
+                actuator = self._getActuator(data)
+                
+                if actuator:
+                    responseData = actuator.updateActuator(data)
                 else:
                     logging.warning(f"No valid actuator type. Ignoring actuation for type: {data.getTypeID()}")
                     
@@ -109,8 +93,67 @@ class ActuatorAdapterManager(object):
             
         return responseData
     
+    def handleHeartbeat(self, actuator):
+        """
+        Resends an actuator's latest response, so the listener knows the
+        actuator's state even if no command was sent for a while.
+        
+        @param actuator The actuator task.
+        """
+        if self.dataMessageListener:
+            self.dataMessageListener.handleActuatorCommandResponse(actuator.getLatestActuatorResponse())
+            
+    def startManager(self) -> bool:
+        if self.isStarted:
+            logging.info("ActuatorAdapterManager already started. Ignoring.")
+            return False
+        
+        self.isStarted = True
+        
+        if self.heartbeatSecs > 0:
+            for actuator in self._getActuators():
+                self.scheduler.addJob(self._getJobID(actuator), self.handleHeartbeat, self.heartbeatSecs, args=[actuator])
+                
+        logging.info("Started ActuatorAdapterManager.")
+        
+        return True
+    
+    def stopManager(self) -> bool:
+        if not self.isStarted:
+            logging.info("ActuatorAdapterManager already stopped. Ignoring.")
+            return False
+        
+        self.isStarted = False
+        
+        for actuator in self._getActuators():
+            self.scheduler.removeJob(self._getJobID(actuator))
+            
+        logging.info("Stopped ActuatorAdapterManager.")
+        
+        return True
+    
     def setDataMessageListener(self, listener: IDataMessageListener) -> bool:
         if listener:
             self.dataMessageListener = listener
             return True
         return False
+    
+    def _getActuator(self, data: ActuatorData):
+        # the actuator of the command's type with the command's name, or
+        # the type's first actuator
+        actuators = self.actuators.get(data.getTypeID())
+        
+        if not actuators:
+            return None
+        
+        for actuator in actuators:
+            if actuator.getLatestActuatorResponse().getName() == data.getName():
+                return actuator
+            
+        return actuators[0]
+    
+    def _getActuators(self) -> list:
+        return [actuator for actuators in self.actuators.values() for actuator in actuators]
+    
+    def _getJobID(self, actuator) -> str:
+        return f"actuator.{actuator.getLatestActuatorResponse().getName()}"
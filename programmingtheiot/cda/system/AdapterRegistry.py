@@ -0,0 +1,184 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import inspect
+import logging
+
+from importlib import import_module
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+
+class AdapterRegistry(object):
+    """
+    The sensor and actuator adapters of the CDA, declared in the
+    configuration: the 'sensors' and 'actuators' keys of the
+    ConstrainedDevice section name them, and each has its own
+    'Sensor.<name>' or 'Actuator.<name>' section giving its type ID and
+    its adapter class for each mode (simClass, emulatorClass and
+    hardwareClass), e.g.:
+
+        [Sensor.TempSensor]
+        typeID        = 1013
+        simClass      = programmingtheiot.cda.sim.TemperatureSensorSimTask
+        emulatorClass = programmingtheiot.cda.emulated.TemperatureSensorEmulatorTask
+
+    Each class is given by its module, which holds a class of the same
+    name, as in the rest of the project. A module is only imported when an
+    adapter of the class is created, so the libraries of adapters that
+    aren't listed, or aren't used in the current mode, are never loaded.
+
+    Without a 'sensors' or 'actuators' key, the humidity, pressure and
+    temperature sensors and the humidifier, HVAC and LED actuators are
+    registered, as before the registry.
+
+    """
+
+    SIM_MODE = 'sim'
+    EMULATOR_MODE = 'emulator'
+    HARDWARE_MODE = 'hardware'
+
+    CLASS_KEYS = {
+        SIM_MODE: ConfigConst.ADAPTER_SIM_CLASS_KEY,
+        EMULATOR_MODE: ConfigConst.ADAPTER_EMULATOR_CLASS_KEY,
+        HARDWARE_MODE: ConfigConst.ADAPTER_HARDWARE_CLASS_KEY
+    }
+
+    class Entry(object):
+        __slots__ = ('name', 'typeID', 'classNames', 'pollSecs', 'minVal', 'maxVal')
+
+        def __init__(self, name: str, typeID: int, classNames: dict, pollSecs: float = 0.0, minVal: float = None, maxVal: float = None):
+            self.name = name
+            self.typeID = typeID
+            self.classNames = classNames
+            self.pollSecs = pollSecs
+            self.minVal = minVal
+            self.maxVal = maxVal
+
+    # sim class, emulator class (also used for hardware) per default adapter
+    DEFAULT_SENSORS = [
+        (ConfigConst.HUMIDITY_SENSOR_NAME, ConfigConst.HUMIDITY_SENSOR_TYPE, 'programmingtheiot.cda.sim.HumiditySensorSimTask', 'programmingtheiot.cda.emulated.HumiditySensorEmulatorTask'),
+        (ConfigConst.PRESSURE_SENSOR_NAME, ConfigConst.PRESSURE_SENSOR_TYPE, 'programmingtheiot.cda.sim.PressureSensorSimTask', 'programmingtheiot.cda.emulated.PressureSensorEmulatorTask'),
+        (ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE, 'programmingtheiot.cda.sim.TemperatureSensorSimTask', 'programmingtheiot.cda.emulated.TemperatureSensorEmulatorTask')
+    ]
+
+    DEFAULT_ACTUATORS = [
+        (ConfigConst.HUMIDIFIER_ACTUATOR_NAME, ConfigConst.HUMIDIFIER_ACTUATOR_TYPE, 'programmingtheiot.cda.sim.HumidifierActuatorSimTask', 'programmingtheiot.cda.emulated.HumidifierEmulatorTask'),
+        (ConfigConst.HVAC_ACTUATOR_NAME, ConfigConst.HVAC_ACTUATOR_TYPE, 'programmingtheiot.cda.sim.HvacActuatorSimTask', 'programmingtheiot.cda.emulated.HvacEmulatorTask'),
+        (ConfigConst.LED_ACTUATOR_NAME, ConfigConst.LED_DISPLAY_ACTUATOR_TYPE, None, 'programmingtheiot.cda.emulated.LedDisplayEmulatorTask')
+    ]
+
+    def __init__(self):
+        """
+        Constructor. Loads the registered sensors and actuators, and the
+        mode (simulator, emulator or hardware) as the adapter managers
+        always have: simulators unless 'enableEmulator' is set, then
+        emulators unless SENSE_HAT_EMULATE is false.
+
+        """
+        configUtil = ConfigUtil()
+
+        if not configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY):
+            self.mode = self.SIM_MODE
+        elif configUtil.getUseEmulator():
+            self.mode = self.EMULATOR_MODE
+        else:
+            self.mode = self.HARDWARE_MODE
+
+        # class name -> class, for the classes imported so far
+        self.classes = {}
+
+        self.sensorEntries = self._loadEntries(configUtil, ConfigConst.SENSORS_KEY, ConfigConst.SENSOR_SECTION_PREFIX, self.DEFAULT_SENSORS)
+        self.actuatorEntries = self._loadEntries(configUtil, ConfigConst.ACTUATORS_KEY, ConfigConst.ACTUATOR_SECTION_PREFIX, self.DEFAULT_ACTUATORS)
+
+    def getMode(self) -> str:
+        return self.mode
+
+    def getSensorEntries(self) -> list:
+        return list(self.sensorEntries)
+
+    def getActuatorEntries(self) -> list:
+        return list(self.actuatorEntries)
+
+    def getImportedClassNames(self) -> list:
+        return list(self.classes.keys())
+
+    def createAdapter(self, entry: Entry, **kwargs):
+        """
+        Creates the adapter of an entry for the current mode, importing its
+        class if needed. The class's constructor is passed those of the
+        entry's name, typeID, minVal and maxVal (if set), and of 'kwargs'
+        (e.g. dataSet), that it takes; 'kwargs' take precedence.
+
+        @param entry The registry entry.
+        @param kwargs Further constructor arguments, if the class takes them.
+        @return The adapter, or None if the entry has no class for the mode,
+        or the class can't be imported or created.
+        """
+        className = entry.classNames.get(self.mode)
+
+        if not className:
+            logging.info(f"No {self.mode} adapter for {entry.name}. Skipping.")
+            return None
+
+        try:
+            clazz = self.classes.get(className)
+
+            if clazz is None:
+                clazz = getattr(import_module(className), className.rpartition('.')[2])
+                self.classes[className] = clazz
+
+            kwargs = dict({'name': entry.name, 'typeID': entry.typeID, 'minVal': entry.minVal, 'maxVal': entry.maxVal}, **kwargs)
+
+            params = inspect.signature(clazz.__init__).parameters
+
+            return clazz(**{key: val for key, val in kwargs.items() if key in params and val is not None})
+        except Exception as e:
+            logging.error(f"Can't create {self.mode} adapter {className} for {entry.name}: {e}")
+            return None
+
+    def _loadEntries(self, configUtil: ConfigUtil, namesKey: str, sectionPrefix: str, defaults: list) -> list:
+        names = configUtil.getProperty(ConfigConst.CONSTRAINED_DEVICE, namesKey)
+
+        if names is None:
+            return [ \
+                self.Entry(name, typeID, {self.SIM_MODE: simClass, self.EMULATOR_MODE: emulatorClass, self.HARDWARE_MODE: emulatorClass}) \
+                for name, typeID, simClass, emulatorClass in defaults]
+
+        entries = []
+
+        for name in names.split(','):
+            name = name.strip()
+            section = sectionPrefix + name
+
+            if not name:
+                continue
+
+            if not configUtil.hasSection(section):
+                logging.warning(f"No config section for adapter {name}. Ignoring.")
+                continue
+
+            classNames = {mode: configUtil.getProperty(section, key) for mode, key in self.CLASS_KEYS.items()}
+
+            entries.append(self.Entry( \
+                name, \
+                configUtil.getInteger(section, ConfigConst.ADAPTER_TYPE_ID_KEY, ConfigConst.DEFAULT_TYPE_ID), \
+                {mode: className.strip() for mode, className in classNames.items() if className and className.strip()}, \
+                pollSecs = configUtil.getFloat(section, ConfigConst.ADAPTER_POLL_SECS_KEY), \
+                minVal = self._getOptionalFloat(configUtil, section, ConfigConst.ADAPTER_MIN_VAL_KEY), \
+                maxVal = self._getOptionalFloat(configUtil, section, ConfigConst.ADAPTER_MAX_VAL_KEY)))
+
+        return entries
+
+    def _getOptionalFloat(self, configUtil: ConfigUtil, section: str, key: str) -> float:
+        return configUtil.getFloat(section, key) if configUtil.hasProperty(section, key) else None
@@ -0,0 +1,304 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import asyncio
+import functools
+import logging
+import threading
+
+from datetime import datetime, timedelta, timezone
+
+from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MAX_INSTANCES, EVENT_JOB_MISSED, EVENT_JOB_SUBMITTED
+from apscheduler.executors.asyncio import AsyncIOExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.Singleton import Singleton
+
+class SchedulerService(metaclass = Singleton):
+    """
+    The one scheduler of the CDA process, shared by the sensor, actuator
+    and system performance managers, so they don't each run a scheduler
+    thread and a thread pool. Implemented as a Singleton using the
+    Singleton metaclass.
+
+    Each job (e.g. a sensor poll) has its own interval. Unless a job is
+    given a phase, jobs are staggered across their interval in steps of
+    'schedulerStaggerSecs', so polls don't all fire at the same instant,
+    while jobs that land in the same step still share a wakeup. Phases are
+    relative to a fixed anchor, so they hold regardless of when each job
+    is added.
+
+    The scheduler starts with the first job added and shuts down when the
+    last one is removed, so there are no scheduler threads while idle.
+
+    If the first job is added from a running asyncio event loop (the
+    asyncio runtime), the scheduler runs on that loop, with no threads of
+    its own: every job then runs on the loop, so jobs must not block.
+
+    Per job, the service counts runs, misfires (runs skipped for starting
+    more than the misfire grace time late), overruns (runs skipped as the
+    previous run was still going) and errors, and tracks the largest delay
+    from the scheduled time to the end of a run.
+
+    """
+
+    class JobStats(object):
+        __slots__ = ('intervalSecs', 'phaseSecs', 'runs', 'misfires', 'overruns', 'errors', 'maxDelaySecs')
+
+        def __init__(self, intervalSecs: float, phaseSecs: float):
+            self.intervalSecs = intervalSecs
+            self.phaseSecs = phaseSecs
+            self.runs = 0
+            self.misfires = 0
+            self.overruns = 0
+            self.errors = 0
+            self.maxDelaySecs = 0.0
+
+        def toDict(self) -> dict:
+            return {
+                'intervalSecs': self.intervalSecs,
+                'phaseSecs': self.phaseSecs,
+                'runs': self.runs,
+                'misfires': self.misfires,
+                'overruns': self.overruns,
+                'errors': self.errors,
+                'maxDelayMillis': self.maxDelaySecs * 1000.0
+            }
+
+    def __init__(self):
+        """
+        Constructor. Loads the worker count, stagger step and misfire grace
+        time from the ConstrainedDevice section of the configuration.
+
+        """
+        configUtil = ConfigUtil()
+
+        self.workerCount = max(configUtil.getInteger(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SCHEDULER_WORKERS_KEY, ConfigConst.DEFAULT_SCHEDULER_WORKERS), 1)
+        self.staggerSecs = configUtil.getFloat(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SCHEDULER_STAGGER_KEY, ConfigConst.DEFAULT_SCHEDULER_STAGGER)
+        self.misfireGraceSecs = configUtil.getInteger(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SCHEDULER_MISFIRE_GRACE_KEY, ConfigConst.DEFAULT_SCHEDULER_MISFIRE_GRACE)
+
+        self.anchor = datetime.now(timezone.utc).replace(microsecond = 0)
+
+        self.scheduler = None
+
+        # the loop the scheduler runs on, or None if it runs on its own thread
+        self.eventLoop = None
+
+        # job ID -> JobStats
+        self.jobStats = {}
+
+        # interval -> number of jobs staggered over it so far
+        self.staggerCounts = {}
+
+        self.wakeupCount = 0
+        self.lastWakeup = None
+
+        self._lock = threading.RLock()
+
+    def addJob(self, jobID: str, func, intervalSecs: float, phaseSecs: float = None, args: list = None, runNow: bool = False) -> bool:
+        """
+        Schedules 'func' to run every 'intervalSecs', replacing any job with
+        the same ID, and starts the scheduler if needed.
+
+        @param jobID The job ID, e.g. 'sensor.TempSensor'.
+        @param func The function to run.
+        @param intervalSecs The interval, in seconds.
+        @param phaseSecs The offset of the runs within the interval, or None
+        to stagger the job after those already added with this interval.
+        @param args Optional arguments for 'func'.
+        @param runNow If True, the job also runs once right away, e.g. so
+        the first readings don't wait for the job's phase.
+        @return bool True if the job was added; False if the interval isn't
+        positive.
+        """
+        if intervalSecs <= 0:
+            logging.warning(f"Not scheduling job {jobID}: invalid interval {intervalSecs}.")
+            return False
+
+        with self._lock:
+            if phaseSecs is None:
+                phaseSecs = self._nextPhase(intervalSecs)
+
+            if self.scheduler is None:
+                self._createScheduler()
+
+            if self.eventLoop:
+                func = self._wrapCoroutine(func)
+
+            self.scheduler.add_job(
+                func,
+                'interval',
+                args=args,
+                id=jobID,
+                seconds=intervalSecs,
+                start_date=self.anchor + timedelta(seconds=phaseSecs % intervalSecs),
+                replace_existing=True
+            )
+
+            # a separate one-off run, as moving the interval job's next run
+            # time would shift its later runs off its phase
+            if runNow:
+                self.scheduler.add_job(func, 'date', args=args)
+
+            self.jobStats[jobID] = self.JobStats(intervalSecs, phaseSecs % intervalSecs)
+
+        logging.debug(f"Scheduled job {jobID} every {intervalSecs} s at phase {phaseSecs % intervalSecs} s.")
+
+        return True
+
+    def removeJob(self, jobID: str) -> bool:
+        """
+        Removes a job, and shuts the scheduler down if it was the last one.
+
+        @param jobID The job ID.
+        @return bool True if the job was removed; False if there was no such job.
+        """
+        with self._lock:
+            if jobID not in self.jobStats:
+                return False
+
+            del self.jobStats[jobID]
+
+            if self.scheduler:
+                if self.scheduler.get_job(jobID):
+                    self.scheduler.remove_job(jobID)
+
+                if not self.jobStats:
+                    self.scheduler.shutdown(wait = False)
+                    self.scheduler = None
+                    self.eventLoop = None
+                    self.staggerCounts.clear()
+
+                    logging.info("Scheduler stopped: no jobs left.")
+
+        return True
+
+    def getJobIDs(self) -> list:
+        with self._lock:
+            return list(self.jobStats.keys())
+
+    def isRunning(self) -> bool:
+        with self._lock:
+            return self.scheduler is not None and self.scheduler.running
+
+    def isAsync(self) -> bool:
+        with self._lock:
+            return self.eventLoop is not None
+
+    def getMetrics(self) -> dict:
+        """
+        Returns the job count, the number of wakeups that ran at least one
+        job, the totals of runs, misfires, overruns and errors, and the same
+        counts per job ID.
+
+        @return dict
+        """
+        with self._lock:
+            byJob = {jobID: stats.toDict() for jobID, stats in self.jobStats.items()}
+
+            return {
+                'jobs': len(byJob),
+                'wakeups': self.wakeupCount,
+                'runs': sum(stats['runs'] for stats in byJob.values()),
+                'misfires': sum(stats['misfires'] for stats in byJob.values()),
+                'overruns': sum(stats['overruns'] for stats in byJob.values()),
+                'errors': sum(stats['errors'] for stats in byJob.values()),
+                'byJob': byJob
+            }
+
+    def _createScheduler(self):
+        # must be called while holding the lock
+        jobDefaults = {'coalesce': True, 'max_instances': 1, 'misfire_grace_time': self.misfireGraceSecs}
+
+        try:
+            self.eventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.eventLoop = None
+
+        if self.eventLoop:
+            self.scheduler = AsyncIOScheduler(
+                event_loop=self.eventLoop,
+                executors={'default': AsyncIOExecutor()},
+                job_defaults=jobDefaults,
+                timezone=timezone.utc
+            )
+        else:
+            self.scheduler = BackgroundScheduler(
+                executors={'default': ThreadPoolExecutor(self.workerCount)},
+                job_defaults=jobDefaults,
+                timezone=timezone.utc
+            )
+
+        self.scheduler.add_listener(self._handleJobEvent, \
+            EVENT_JOB_SUBMITTED | EVENT_JOB_EXECUTED | EVENT_JOB_ERROR | EVENT_JOB_MISSED | EVENT_JOB_MAX_INSTANCES)
+        self.scheduler.start()
+
+        if self.eventLoop:
+            logging.info("Scheduler started on the event loop.")
+        else:
+            logging.info(f"Scheduler started with {self.workerCount} worker(s).")
+
+    def _handleJobEvent(self, event):
+        with self._lock:
+            stats = self.jobStats.get(event.job_id)
+
+            if event.code == EVENT_JOB_SUBMITTED:
+                # jobs due at the same time are submitted in the same wakeup
+                scheduledTime = max(event.scheduled_run_times)
+
+                if scheduledTime != self.lastWakeup:
+                    self.lastWakeup = scheduledTime
+                    self.wakeupCount += 1
+
+                return
+
+            if not stats:
+                return
+
+            if event.code == EVENT_JOB_MISSED:
+                stats.misfires += 1
+                logging.warning(f"Scheduled job {event.job_id} misfired: it was due at {event.scheduled_run_time}.")
+
+            elif event.code == EVENT_JOB_MAX_INSTANCES:
+                stats.overruns += 1
+                logging.warning(f"Scheduled job {event.job_id} skipped: its previous run is still going.")
+
+            else:
+                stats.runs += 1
+                stats.maxDelaySecs = max(stats.maxDelaySecs, (datetime.now(timezone.utc) - event.scheduled_run_time).total_seconds())
+
+                if event.code == EVENT_JOB_ERROR:
+                    stats.errors += 1
+                    logging.error(f"Scheduled job {event.job_id} failed: {event.exception}")
+
+    def _wrapCoroutine(self, func):
+        # the asyncio executor runs plain functions on the loop's default
+        # thread pool, and coroutines on the loop itself
+        @functools.wraps(func)
+        async def runJob(*args):
+            return func(*args)
+
+        return runJob
+
+    def _nextPhase(self, intervalSecs: float) -> float:
+        # must be called while holding the lock
+        slots = max(int(intervalSecs / self.staggerSecs), 1) if self.staggerSecs > 0 else 1
+        count = self.staggerCounts.get(intervalSecs, 0)
+
+        self.staggerCounts[intervalSecs] = count + 1
+
+        return (count % slots) * self.staggerSecs
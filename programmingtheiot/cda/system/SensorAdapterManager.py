@@ -10,21 +10,25 @@
 # Programming the Internet of Things project.
 # 
 
+import asyncio
 import logging
+import threading
+import time
 
-from importlib import import_module
-
-from apscheduler.schedulers.background import BackgroundScheduler
+from concurrent.futures import ThreadPoolExecutor, wait
 
 import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 
+from programmingtheiot.cda.system.AdapterRegistry import AdapterRegistry
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
+
 from programmingtheiot.cda.sim.SensorDataGenerator import SensorDataGenerator
-from programmingtheiot.cda.sim.HumiditySensorSimTask import HumiditySensorSimTask
-from programmingtheiot.cda.sim.TemperatureSensorSimTask import TemperatureSensorSimTask
-from programmingtheiot.cda.sim.PressureSensorSimTask import PressureSensorSimTask
+
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataHistory import SensorDataHistory
 
 class SensorAdapterManager(object):
     """
@@ -56,129 +60,267 @@ class SensorAdapterManager(object):
             defaultVal = ConfigConst.NOT_SET
         )
         
-            
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.add_job(
-            self.handleTelemetry,
-            'interval',
-            seconds=self.pollRate,
-            max_instances=2,
-            coalesce=True,
-            misfire_grace_time=15,
+        
+        # each sensor is polled at its own interval by the shared scheduler
+        self.scheduler = SchedulerService()
+        self.isStarted = False
+        
+        # sensors are read concurrently, each read bounded by a timeout
+        self.readWorkers = max(self.configUtil.getInteger(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.SENSOR_READ_WORKERS_KEY,
+            defaultVal=ConfigConst.DEFAULT_SENSOR_READ_WORKERS
+        ), 1)
+        self.readTimeout = self.configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.SENSOR_READ_TIMEOUT_KEY,
+            defaultVal=ConfigConst.DEFAULT_SENSOR_READ_TIMEOUT
         )
         
-        self.dataMessageListener = dml
-        self.humidityAdapter = None
-        self.pressureAdapter = None
-        self.temperatureAdapter = None
+        self.readExecutor = None
         
-        self._initEnvironmentalSensorTasks()
+        # in the threaded runtime, scheduled readings are handled on this
+        # executor's one thread, as they are on the event loop in the asyncio
+        # runtime, so the read workers only take readings
+        self.handlerExecutor = None
         
-    def _initEnvironmentalSensorTasks(self):
-        humidityFloor = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.HUMIDITY_SIM_FLOOR_KEY, 
-            defaultVal=SensorDataGenerator.LOW_NORMAL_ENV_HUMIDITY
-        )
-        humidityCeiling = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.HUMIDITY_SIM_CEILING_KEY, 
-            defaultVal=SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY
-        )
+        # sensor name -> Future of a read still going
+        self.pendingReads = {}
+        self.readMetrics = {'reads': 0, 'notReady': 0, 'timeouts': 0, 'busy': 0, 'errors': 0}
         
-        pressureFloor = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.PRESSURE_SIM_FLOOR_KEY, 
-            defaultVal=SensorDataGenerator.LOW_NORMAL_ENV_PRESSURE
-        )
-        pressureCeiling = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.PRESSURE_SIM_CEILING_KEY, 
-            defaultVal=SensorDataGenerator.HI_NORMAL_ENV_PRESSURE
-        )
+        self._readLock = threading.Lock()
         
-        temperatureFloor = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.TEMP_SIM_FLOOR_KEY, 
-            defaultVal=SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP
+        self.enableSensorHistory = self.configUtil.getBoolean(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.ENABLE_SENSOR_HISTORY_KEY
         )
-        temperatureCeiling = self.configUtil.getFloat(
-            section=ConfigConst.CONSTRAINED_DEVICE, 
-            key=ConfigConst.TEMP_SIM_CEILING_KEY, 
-            defaultVal=SensorDataGenerator.HI_NORMAL_INDOOR_TEMP
+        self.sensorHistoryCapacity = self.configUtil.getInteger(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.SENSOR_HISTORY_CAPACITY_KEY,
+            defaultVal=ConfigConst.DEFAULT_HISTORY_CAPACITY
         )
         
-        if self.useSimulator:
+        # sensor name -> SensorDataHistory, created on a sensor's first reading
+        self.sensorHistories = {}
+        
+        self.dataMessageListener = dml
+        
+        # list of (adapter, pollSecs)
+        self.sensorAdapters = []
+        
+        # the sensors are declared in the config, and their adapter classes
+        # imported only when created
+        self.adapterRegistry = AdapterRegistry()
+        
+        self._initSensorAdapters()
+        
+    def _initSensorAdapters(self):
+        # typeID -> (poll interval key, sim floor key, sim ceiling key,
+        # default floor, default ceiling) of the built in sensor types
+        typeKeys = {
+            ConfigConst.HUMIDITY_SENSOR_TYPE: ( \
+                ConfigConst.HUMIDITY_POLL_SECS_KEY, ConfigConst.HUMIDITY_SIM_FLOOR_KEY, ConfigConst.HUMIDITY_SIM_CEILING_KEY, \
+                SensorDataGenerator.LOW_NORMAL_ENV_HUMIDITY, SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY),
+            ConfigConst.PRESSURE_SENSOR_TYPE: ( \
+                ConfigConst.PRESSURE_POLL_SECS_KEY, ConfigConst.PRESSURE_SIM_FLOOR_KEY, ConfigConst.PRESSURE_SIM_CEILING_KEY, \
+                SensorDataGenerator.LOW_NORMAL_ENV_PRESSURE, SensorDataGenerator.HI_NORMAL_ENV_PRESSURE),
+            ConfigConst.TEMP_SENSOR_TYPE: ( \
+                ConfigConst.TEMP_POLL_SECS_KEY, ConfigConst.TEMP_SIM_FLOOR_KEY, ConfigConst.TEMP_SIM_CEILING_KEY, \
+                SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, SensorDataGenerator.HI_NORMAL_INDOOR_TEMP)
+        }
+        
+        # simulated sensors of the built in types replay a daily curve:
+        # typeID -> curve type, and typeID -> (lowest floor, highest ceiling)
+        dataCurves = {}
+        dataBounds = {}
+        useSeconds = self.configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SIM_DATA_USE_SECONDS_KEY)
+        streamData = self.configUtil.getBoolean(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.STREAM_SIM_DATA_KEY)
+        
+        if self.adapterRegistry.getMode() == AdapterRegistry.SIM_MODE:
             self.dataGenerator = SensorDataGenerator()
             
-            humidityData = self.dataGenerator.generateDailyEnvironmentHumidityDataSet(
-                minValue=humidityFloor, 
-                maxValue=humidityCeiling,
-                useSeconds=False
-            )
-            pressureData = self.dataGenerator.generateDailyEnvironmentPressureDataSet(
-                minValue=pressureFloor, 
-                maxValue=pressureCeiling,
-                useSeconds=False
-            )
-            temperatureData = self.dataGenerator.generateDailyIndoorTemperatureDataSet(
-                minValue=temperatureFloor, 
-                maxValue=temperatureCeiling,
-                useSeconds=False
-            )
-            
-            self.humidityAdapter = HumiditySensorSimTask(dataSet=humidityData)
-            self.pressureAdapter = PressureSensorSimTask(dataSet=pressureData)
-            self.temperatureAdapter = TemperatureSensorSimTask(dataSet=temperatureData)
-            
-        elif self.useEmulator:
-            
-            heModule = import_module('programmingtheiot.cda.emulated.HumiditySensorEmulatorTask', 'HumiditySensorEmulatorTask')
-            heClazz = getattr(heModule, 'HumiditySensorEmulatorTask')
-            self.humidityAdapter = heClazz()
-            
-            peModule = import_module('programmingtheiot.cda.emulated.PressureSensorEmulatorTask', 'PressureSensorEmulatorTask')
-            peClazz = getattr(peModule, 'PressureSensorEmulatorTask')
-            self.pressureAdapter = peClazz()
-            
-            teModule = import_module('programmingtheiot.cda.emulated.TemperatureSensorEmulatorTask', 'TemperatureSensorEmulatorTask')
-            teClazz = getattr(teModule, 'TemperatureSensorEmulatorTask')
-            self.temperatureAdapter = teClazz()
+            dataCurves = {
+                ConfigConst.HUMIDITY_SENSOR_TYPE: SensorDataGenerator.DEFAULT_HUMIDITY_CURVE,
+                ConfigConst.PRESSURE_SENSOR_TYPE: SensorDataGenerator.DEFAULT_PRESSURE_CURVE,
+                ConfigConst.TEMP_SENSOR_TYPE: SensorDataGenerator.DEFAULT_TEMP_CURVE
+            }
+            dataBounds = {
+                ConfigConst.HUMIDITY_SENSOR_TYPE: (SensorDataGenerator.MIN_ENV_HUMIDITY, SensorDataGenerator.MAX_ENV_HUMIDITY),
+                ConfigConst.PRESSURE_SENSOR_TYPE: (SensorDataGenerator.MIN_ENV_PRESSURE, SensorDataGenerator.MAX_ENV_PRESSURE),
+                ConfigConst.TEMP_SENSOR_TYPE: (SensorDataGenerator.MIN_ENV_TEMP, SensorDataGenerator.MAX_ENV_TEMP)
+            }
+            
+        # list of (entry, pollSecs, kwargs)
+        sensors = []
         
-        else:
+        for entry in self.adapterRegistry.getSensorEntries():
+            pollSecs = entry.pollSecs
+            minVal = entry.minVal
+            maxVal = entry.maxVal
             
-            heModule = import_module('programmingtheiot.cda.emulated.HumiditySensorEmulatorTask', 'HumiditySensorEmulatorTask')
-            heClazz = getattr(heModule, 'HumiditySensorEmulatorTask')
-            self.humidityAdapter = heClazz()
+            if entry.typeID in typeKeys:
+                pollSecsKey, floorKey, ceilingKey, floor, ceiling = typeKeys[entry.typeID]
+                
+                if not pollSecs:
+                    pollSecs = self.configUtil.getFloat(
+                        section=ConfigConst.CONSTRAINED_DEVICE,
+                        key=pollSecsKey,
+                        defaultVal=self.pollRate
+                    )
+                if minVal is None:
+                    minVal = self.configUtil.getFloat(section=ConfigConst.CONSTRAINED_DEVICE, key=floorKey, defaultVal=floor)
+                if maxVal is None:
+                    maxVal = self.configUtil.getFloat(section=ConfigConst.CONSTRAINED_DEVICE, key=ceilingKey, defaultVal=ceiling)
+                    
+            kwargs = {key: val for key, val in (('minVal', minVal), ('maxVal', maxVal)) if val is not None}
             
-            peModule = import_module('programmingtheiot.cda.emulated.PressureSensorEmulatorTask', 'PressureSensorEmulatorTask')
-            peClazz = getattr(peModule, 'PressureSensorEmulatorTask')
-            self.pressureAdapter = peClazz()
+            sensors.append((entry, pollSecs, kwargs))
             
-            teModule = import_module('programmingtheiot.cda.emulated.TemperatureSensorEmulatorTask', 'TemperatureSensorEmulatorTask')
-            teClazz = getattr(teModule, 'TemperatureSensorEmulatorTask')
-            self.temperatureAdapter = teClazz()
+        simSensors = [(entry, kwargs) for entry, pollSecs, kwargs in sensors if entry.typeID in dataCurves]
+        
+        if simSensors:
+            curveTypes = [dataCurves[entry.typeID] for entry, kwargs in simSensors]
+            minValues = []
+            maxValues = []
+            
+            # kept within each type's range, as by the generator's per-type
+            # methods (e.g. generateDailyEnvironmentHumidityDataSet())
+            for entry, kwargs in simSensors:
+                minBound, maxBound = dataBounds[entry.typeID]
+                minValue = kwargs['minVal']
+                maxValue = kwargs['maxVal']
+                
+                if maxValue < minBound or maxValue > maxBound: maxValue = maxBound
+                if minValue < minBound or minValue >= maxValue: minValue = maxValue - 1
+                
+                minValues.append(minValue)
+                maxValues.append(maxValue)
+                
+            if streamData:
+                dataSets = [ \
+                    self.dataGenerator.generateDailySensorDataSet( \
+                        curveType=curveType, minValue=minValue, maxValue=maxValue, startHour=0, endHour=24, useSeconds=useSeconds, streamData=True) \
+                    for curveType, minValue, maxValue in zip(curveTypes, minValues, maxValues)]
+            else:
+                # generated in one pass, each sim task holding a view of its row
+                dataSets = self.dataGenerator.createSensorDataSets(self.dataGenerator.generateSensorDataMatrix( \
+                    curveTypes=curveTypes, minValues=minValues, maxValues=maxValues, useSeconds=useSeconds))
+                
+            for (entry, kwargs), dataSet in zip(simSensors, dataSets):
+                kwargs['dataSet'] = dataSet
+                
+        for entry, pollSecs, kwargs in sensors:
+            adapter = self.adapterRegistry.createAdapter(entry, **kwargs)
             
+            if adapter:
+                self.addSensorAdapter(adapter, pollSecs)
+                
+    def addSensorAdapter(self, adapter, pollSecs: float = None):
+        """
+        Adds a sensor to poll, e.g. an additional simulated sensor. Sensor
+        names must be unique. If the manager is started, the sensor's
+        polling starts right away.
         
-
+        @param adapter The sensor task, with generateTelemetry() and getName().
+        @param pollSecs The poll interval, or None (or 0) for pollCycleSecs.
+        """
+        if not pollSecs or pollSecs <= 0:
+            pollSecs = self.pollRate
+            
+        self.sensorAdapters.append((adapter, pollSecs))
+        
+        if self.isStarted:
+            self.scheduler.addJob(self._getJobID(adapter), self.handleSensorTelemetry, pollSecs, args=[adapter])
+            
+    def handleSensorTelemetry(self, adapter):
+        """
+        Starts a read of one sensor, without waiting for it, so the
+        scheduler's worker isn't held up by the sensor. The reading is
+        passed to the history and the data message listener when it's in,
+        unless it took longer than 'sensorReadTimeoutSecs'.
+        
+        The reading is handled on the running asyncio event loop if called
+        on one (the asyncio runtime), or else on the manager's handler
+        thread, never on the read thread: a slow listener (e.g. a slow
+        upstream sink) can't hold up the read workers and make other
+        sensors' reads time out.
+        
+        @param adapter The sensor task.
+        """
+        future = self._submitRead(adapter)
+        
+        if not future:
+            return
+        
+        startTime = time.perf_counter()
+        
+        try:
+            eventLoop = asyncio.get_running_loop()
+        except RuntimeError:
+            eventLoop = None
+            
+        # the read time is taken on the read thread, so time spent queued
+        # for handling doesn't count towards the read timeout
+        if eventLoop:
+            future.add_done_callback(lambda future: \
+                self._callOnLoop(eventLoop, self._handleReadResult, adapter, future, self._isInTime(startTime)))
+        else:
+            handlerExecutor = self._getHandlerExecutor()
+            future.add_done_callback(lambda future: \
+                self._callOnHandler(handlerExecutor, self._handleReadResult, adapter, future, self._isInTime(startTime)))
+            
     def handleTelemetry(self):
-        humidityData = self.humidityAdapter.generateTelemetry()
-        pressureData = self.pressureAdapter.generateTelemetry()
-        temperatureData = self.temperatureAdapter.generateTelemetry()
+        """
+        Polls every sensor once, reading them concurrently.
         
-        humidityData.setLocationID(self.locationID)
-        pressureData.setLocationID(self.locationID)
-        temperatureData.setLocationID(self.locationID)
+        """
+        for sensorData in self.readSensors([adapter for adapter, pollSecs in self.sensorAdapters]):
+            self._handleSensorData(sensorData)
+            
+    def readSensors(self, adapters: list) -> list:
+        """
+        Reads the given sensors concurrently, on up to 'sensorReadWorkers'
+        threads, and waits up to 'sensorReadTimeoutSecs' for the readings.
         
-        logging.debug(f"Generated Humidity Data: {humidityData}")
-        logging.debug(f"Generated Pressure Data: {pressureData}")
-        logging.debug(f"Generated Temperature Data: {temperatureData}")
+        A sensor is skipped if it returns None (e.g. its data isn't ready),
+        raises an error, or is still being read at the timeout. A read that
+        times out is left to finish, and the sensor is skipped until it has,
+        so a hung sensor holds at most one worker.
         
-        if self.dataMessageListener:
-            self.dataMessageListener.handleSensorMessage(humidityData)
-            self.dataMessageListener.handleSensorMessage(pressureData)
-            self.dataMessageListener.handleSensorMessage(temperatureData)
+        @param adapters The sensor tasks.
+        @return list The SensorData of each sensor read in time.
+        """
+        futures = [(adapter, self._submitRead(adapter)) for adapter in adapters]
+        futures = [(adapter, future) for adapter, future in futures if future]
+        
+        done, notDone = wait([future for adapter, future in futures], timeout=self.readTimeout)
+        readings = [self._getReading(adapter, future, future in done) for adapter, future in futures]
+        
+        return [sensorData for sensorData in readings if sensorData]
+    
+    def getReadMetrics(self) -> dict:
+        """
+        Returns the counts of sensor reads, and of those skipped as the
+        sensor wasn't ready, timed out, was still busy or failed.
+        
+        @return dict
+        """
+        with self._readLock:
+            return dict(self.readMetrics)
+        
+    def getSensorHistory(self, name: str) -> SensorDataHistory:
+        """
+        Returns the reading history of the named sensor.
         
+        @param name The sensor name.
+        @return SensorDataHistory The history, or None if history is disabled
+        or the sensor hasn't produced a reading yet.
+        """
+        return self.sensorHistories.get(name)
+    
+    def getSensorHistoryNames(self) -> list:
+        return list(self.sensorHistories.keys())
+    
     def setDataMessageListener(self, listener: IDataMessageListener) -> bool:
         if listener:
             self.dataMessageListener = listener
@@ -188,19 +330,134 @@ class SensorAdapterManager(object):
     def startManager(self) -> bool:
         logging.info("Started SensorAdapterManager.")
         
-        if not self.scheduler.running:
-            self.scheduler.start()
+        if not self.isStarted:
+            self.isStarted = True
+            
+            # the first readings are taken right away, not at each sensor's phase
+            for adapter, pollSecs in self.sensorAdapters:
+                self.scheduler.addJob(self._getJobID(adapter), self.handleSensorTelemetry, pollSecs, args=[adapter], runNow=True)
+                
             return True
         else:
-            logging.info("SensorAdapterManager scheduler already started. Ignoring.")
+            logging.info("SensorAdapterManager already started. Ignoring.")
             return False
         
     def stopManager(self) -> bool:
         logging.info("Stopped SensorAdapterManager.")
         
-        try:
-            self.scheduler.shutdown()
+        if self.isStarted:
+            self.isStarted = False
+            
+            for adapter, pollSecs in self.sensorAdapters:
+                self.scheduler.removeJob(self._getJobID(adapter))
+                
+            with self._readLock:
+                if self.readExecutor:
+                    # don't wait for hung reads
+                    self.readExecutor.shutdown(wait=False)
+                    self.readExecutor = None
+                    
+                if self.handlerExecutor:
+                    # readings already queued are still handled
+                    self.handlerExecutor.shutdown(wait=False)
+                    self.handlerExecutor = None
+                    
             return True
-        except:
-            logging.info("SensorAdapterManager scheduler already stopped. Ignoring.")
+        else:
+            logging.info("SensorAdapterManager already stopped. Ignoring.")
             return False
+        
+    def _getJobID(self, adapter) -> str:
+        return f"sensor.{adapter.getName()}"
+    
+    def _handleSensorData(self, sensorData: SensorData):
+        sensorData.setLocationID(self.locationID)
+        
+        logging.debug(f"Generated {sensorData.getName()} data: {sensorData}")
+        
+        if self.enableSensorHistory:
+            self._addToHistory(sensorData)
+            
+        if self.dataMessageListener:
+            self.dataMessageListener.handleSensorMessage(sensorData)
+            
+    def _submitRead(self, adapter):
+        # returns the Future of the read, or None if the sensor's previous
+        # read is still going
+        with self._readLock:
+            if self.readExecutor is None:
+                self.readExecutor = ThreadPoolExecutor(max_workers=self.readWorkers, thread_name_prefix='SensorRead')
+                
+            if adapter.getName() in self.pendingReads:
+                self.readMetrics['busy'] += 1
+                logging.warning(f"Skipping {adapter.getName()}: its previous read is still going.")
+                return None
+            
+            future = self.readExecutor.submit(adapter.generateTelemetry)
+            self.pendingReads[adapter.getName()] = future
+            
+        future.add_done_callback(lambda future: self._removePendingRead(adapter.getName(), future))
+        
+        return future
+    
+    def _getReading(self, adapter, future, isInTime: bool) -> SensorData:
+        with self._readLock:
+            self.readMetrics['reads'] += 1
+            
+            if not isInTime:
+                self.readMetrics['timeouts'] += 1
+                logging.warning(f"Skipping {adapter.getName()}: no reading within {self.readTimeout} s.")
+            elif future.exception():
+                self.readMetrics['errors'] += 1
+                logging.warning(f"Skipping {adapter.getName()}: reading failed: {future.exception()}")
+            elif future.result() is None:
+                self.readMetrics['notReady'] += 1
+                logging.debug(f"Skipping {adapter.getName()}: no data ready.")
+            else:
+                return future.result()
+            
+        return None
+    
+    def _isInTime(self, startTime: float) -> bool:
+        return time.perf_counter() - startTime <= self.readTimeout
+    
+    def _handleReadResult(self, adapter, future, isInTime: bool):
+        sensorData = self._getReading(adapter, future, isInTime)
+        
+        if sensorData:
+            self._handleSensorData(sensorData)
+            
+    def _getHandlerExecutor(self) -> ThreadPoolExecutor:
+        with self._readLock:
+            if self.handlerExecutor is None:
+                self.handlerExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='SensorHandler')
+                
+            return self.handlerExecutor
+        
+    def _callOnLoop(self, eventLoop, func, *args):
+        try:
+            eventLoop.call_soon_threadsafe(func, *args)
+        except RuntimeError:
+            # the loop closed while a hung read was still going
+            logging.debug("Dropping a reading: the event loop is closed.")
+            
+    def _callOnHandler(self, handlerExecutor: ThreadPoolExecutor, func, *args):
+        try:
+            handlerExecutor.submit(func, *args)
+        except RuntimeError:
+            # the manager stopped while a hung read was still going
+            logging.debug("Dropping a reading: the handler thread is stopped.")
+            
+    def _removePendingRead(self, name: str, future):
+        with self._readLock:
+            if self.pendingReads.get(name) is future:
+                del self.pendingReads[name]
+        
+    def _addToHistory(self, data: SensorData):
+        history = self.sensorHistories.get(data.getName())
+        
+        if history is None:
+            history = SensorDataHistory(capacity=self.sensorHistoryCapacity, name=data.getName(), typeID=data.getTypeID())
+            self.sensorHistories[data.getName()] = history
+            
+        history.add(data)
@@ -12,13 +12,12 @@
 
 import logging
 
-from apscheduler.schedulers.background import BackgroundScheduler
-
 import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.common.ConfigUtil import ConfigUtil
 from programmingtheiot.common.IDataMessageListener import IDataMessageListener
 
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
 from programmingtheiot.cda.system.SystemCpuUtilTask import SystemCpuUtilTask
 from programmingtheiot.cda.system.SystemMemUtilTask import SystemMemUtilTask
 
@@ -29,6 +28,9 @@ class SystemPerformanceManager(object):
     Shell representation of class for student implementation.
     
     """
+    
+    CPU_UTIL_JOB_ID = 'system.cpuUtil'
+    MEM_UTIL_JOB_ID = 'system.memUtil'
 
     def __init__(self):
         configUtil = ConfigUtil()
@@ -49,22 +51,66 @@ class SystemPerformanceManager(object):
    
         self.dataMsgListener = None
   
-        self.scheduler = BackgroundScheduler()
-        self.scheduler.add_job(self.handleTelemetry, 'interval', seconds=self.pollRate)
+        # each metric is sampled at its own interval by the shared scheduler
+        self.scheduler = SchedulerService()
+        self.isStarted = False
   
         self.cpuUtilTask = SystemCpuUtilTask()
         self.memUtilTask = SystemMemUtilTask()
+        
+        self.cpuUtilPct = None
+        self.memUtilPct = None
+        
+        self.cpuUtilPollSecs = configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.CPU_UTIL_POLL_SECS_KEY,
+            defaultVal=self.pollRate
+        )
+        self.memUtilPollSecs = configUtil.getFloat(
+            section=ConfigConst.CONSTRAINED_DEVICE,
+            key=ConfigConst.MEM_UTIL_POLL_SECS_KEY,
+            defaultVal=self.pollRate
+        )
 
     def handleTelemetry(self):
-        cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
-        memUtilPct = self.memUtilTask.getTelemetryValue()
+        self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+        self.memUtilPct = self.memUtilTask.getTelemetryValue()
         
-        logging.debug(f"CPU utilization is {cpuUtilPct} percent, and memory utilization is {memUtilPct} percent.")
+        self._sendTelemetry()
+        
+    def handleCpuUtilTelemetry(self):
+        """
+        Samples CPU utilization, and sends it with the latest memory
+        utilization (sampled now if it hasn't been yet).
+        
+        """
+        self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+        
+        if self.memUtilPct is None:
+            self.memUtilPct = self.memUtilTask.getTelemetryValue()
+            
+        self._sendTelemetry()
+        
+    def handleMemUtilTelemetry(self):
+        """
+        Samples memory utilization, and sends it with the latest CPU
+        utilization (sampled now if it hasn't been yet).
+        
+        """
+        self.memUtilPct = self.memUtilTask.getTelemetryValue()
+        
+        if self.cpuUtilPct is None:
+            self.cpuUtilPct = self.cpuUtilTask.getTelemetryValue()
+            
+        self._sendTelemetry()
+        
+    def _sendTelemetry(self):
+        logging.debug(f"CPU utilization is {self.cpuUtilPct} percent, and memory utilization is {self.memUtilPct} percent.")
         
         spd = SystemPerformanceData()
         spd.setLocationID(self.locationID)
-        spd.setCpuUtilization(cpuUtilPct)
-        spd.setMemoryUtilization(memUtilPct)
+        spd.setCpuUtilization(self.cpuUtilPct)
+        spd.setMemoryUtilization(self.memUtilPct)
         
         if self.dataMsgListener:
             self.dataMsgListener.handleSystemPerformanceMessage(data = spd)
@@ -77,17 +123,21 @@ class SystemPerformanceManager(object):
     def startManager(self):
         logging.info("Starting SystemPerformanceManager...")
   
-        if not self.scheduler.running:
-            self.scheduler.start()
+        if not self.isStarted:
+            self.isStarted = True
+            self.scheduler.addJob(self.CPU_UTIL_JOB_ID, self.handleCpuUtilTelemetry, self.cpuUtilPollSecs)
+            self.scheduler.addJob(self.MEM_UTIL_JOB_ID, self.handleMemUtilTelemetry, self.memUtilPollSecs)
             logging.info("Started SystemPerformanceManager.")
         else:
-            logging.warning("SystemPerformanceManager scheduler already started.")
+            logging.warning("SystemPerformanceManager already started.")
         
     def stopManager(self):
         logging.info("Stopping SystemPerformanceManager...")
     
-        try:
-            self.scheduler.shutdown()
+        if self.isStarted:
+            self.isStarted = False
+            self.scheduler.removeJob(self.CPU_UTIL_JOB_ID)
+            self.scheduler.removeJob(self.MEM_UTIL_JOB_ID)
             logging.info("Stopped SystemPerformanceManager.")
-        except:
-            logging.warning("SystemPerformanceManager scheduler already stopped.")
+        else:
+            logging.warning("SystemPerformanceManager already stopped.")
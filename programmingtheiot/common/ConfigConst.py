@@ -86,6 +86,10 @@ STATE_DATA_PROP  = 'stateData'
 VALUE_PROP       = 'value'
 IS_RESPONSE_PROP = 'isResponse'
 
+NAMES_PROP           = 'names'
+NAME_INDEX_PROP      = 'nameIndex'
+TIMESTAMP_NANOS_PROP = 'timeStampNanos'
+
 CPU_UTIL_PROP    = 'cpuUtil'
 DISK_UTIL_PROP   = 'diskUtil'
 MEM_UTIL_PROP    = 'memUtil'
@@ -170,6 +174,169 @@ CPU_UTIL_NAME  = 'DeviceCpuUtil'
 DISK_UTIL_NAME = 'DeviceDiskUtil'
 MEM_UTIL_NAME  = 'DeviceMemUtil'
 
+#####
+# Payload codec names, CoAP Content-Format IDs and MQTT topic suffixes
+#
+# NOTE: application/json (50) and application/cbor (60) are registered
+# CoAP Content-Formats; MessagePack and the packed struct layout have
+# no registration, so they use IDs from the experimental range.
+#
+
+JSON_CODEC         = 'json'
+JSON_COMPACT_CODEC = 'jsonCompact'
+CBOR_CODEC         = 'cbor'
+MSGPACK_CODEC      = 'msgpack'
+STRUCT_CODEC       = 'struct'
+
+DEFAULT_PAYLOAD_CODEC = JSON_CODEC
+
+JSON_CONTENT_FORMAT    = 50
+CBOR_CONTENT_FORMAT    = 60
+MSGPACK_CONTENT_FORMAT = 65001
+STRUCT_CONTENT_FORMAT  = 65002
+
+CBOR_TOPIC_SUFFIX    = '/cbor'
+MSGPACK_TOPIC_SUFFIX = '/msgpack'
+STRUCT_TOPIC_SUFFIX  = '/struct'
+
+#####
+# Upstream pipeline stage names and overflow policies
+#
+# NOTE: 'block' waits up to the configured timeout for room in a full
+# queue, then drops the new message; 'dropNewest' drops it immediately;
+# 'dropOldest' discards the oldest queued message to make room.
+#
+
+INGEST_STAGE   = 'ingest'
+ANALYZE_STAGE  = 'analyze'
+ENCODE_STAGE   = 'encode'
+TRANSMIT_STAGE = 'transmit'
+
+BLOCK_POLICY       = 'block'
+DROP_NEWEST_POLICY = 'dropNewest'
+DROP_OLDEST_POLICY = 'dropOldest'
+
+DEFAULT_OVERFLOW_POLICY      = DROP_OLDEST_POLICY
+DEFAULT_PIPELINE_QUEUE_SIZE  = 64
+DEFAULT_PIPELINE_WORKERS     = 1
+DEFAULT_PIPELINE_BLOCK_TIMEOUT = 0.5
+
+DEFAULT_BATCH_MAX_SIZE  = 10
+DEFAULT_BATCH_MAX_DELAY = 1.0
+
+DEFAULT_MAX_SILENCE_SECS = 300.0
+
+DEFAULT_PREDICTION_ALPHA = 0.3
+DEFAULT_PREDICTION_BETA  = 0.3
+
+DEFAULT_SCHEDULER_WORKERS       = 1
+DEFAULT_SCHEDULER_STAGGER       = 0.5
+DEFAULT_SCHEDULER_MISFIRE_GRACE = 15
+DEFAULT_ACTUATOR_HEARTBEAT      = 0.0
+DEFAULT_SENSOR_READ_WORKERS     = 4
+DEFAULT_SENSOR_READ_TIMEOUT     = 2.0
+
+THREADED_RUNTIME_MODE = 'threaded'
+ASYNCIO_RUNTIME_MODE  = 'asyncio'
+DEFAULT_RUNTIME_MODE  = THREADED_RUNTIME_MODE
+
+#####
+# Upstream egress lanes, highest priority first
+#
+# NOTE: a lane is only served when every lane above it is empty. Control
+# and alert messages bypass the connectors' store-and-forward spools
+# while the connection is up, so they don't wait behind a backlog.
+#
+
+CONTROL_LANE   = 'control'
+ALERT_LANE     = 'alert'
+TELEMETRY_LANE = 'telemetry'
+BULK_LANE      = 'bulk'
+
+EGRESS_LANES = [CONTROL_LANE, ALERT_LANE, TELEMETRY_LANE, BULK_LANE]
+
+DEFAULT_EGRESS_WORKERS = 1
+
+DEFAULT_CONTROL_LANE_QUEUE_SIZE   = 16
+DEFAULT_ALERT_LANE_QUEUE_SIZE     = 32
+DEFAULT_TELEMETRY_LANE_QUEUE_SIZE = 64
+DEFAULT_BULK_LANE_QUEUE_SIZE      = 32
+
+DEFAULT_CONTROL_LANE_OVERFLOW_POLICY   = BLOCK_POLICY
+DEFAULT_ALERT_LANE_OVERFLOW_POLICY     = BLOCK_POLICY
+DEFAULT_TELEMETRY_LANE_OVERFLOW_POLICY = DROP_OLDEST_POLICY
+DEFAULT_BULK_LANE_OVERFLOW_POLICY      = DROP_NEWEST_POLICY
+
+#####
+# Upstream sink fan-out defaults
+#
+# NOTE: the sink timeout is how long a send waits for each sink; a sink
+# still busy when the next message arrives isn't waited for again.
+#
+
+MQTT_SINK = 'mqtt'
+COAP_SINK = 'coap'
+
+DEFAULT_SINK_TIMEOUT     = 1.0
+DEFAULT_SINK_MAX_PENDING = 16
+
+#####
+# Latest-value cache defaults
+#
+# NOTE: a TTL of 0 keeps cached items until they're replaced or evicted.
+#
+
+DEFAULT_CACHE_MAX_SIZE = 256
+DEFAULT_CACHE_TTL      = 0.0
+
+#####
+# Sensor history defaults
+#
+# NOTE: each reading takes 16 bytes, so the default capacity (one day at
+# 1 Hz) is about 1.4 MB per sensor.
+#
+
+DEFAULT_HISTORY_CAPACITY = 86400
+
+#####
+# Windowed aggregation defaults
+#
+# NOTE: windows are set per sensor type as a comma-separated list of
+# window lengths in seconds; 'window/slide' (e.g. '900/60') sets a
+# sliding window, and a window on its own a tumbling window.
+#
+
+DEFAULT_AGGREGATION_PERCENTILES = '50, 90, 99'
+
+#####
+# Anomaly detection defaults
+#
+# NOTE: the simulated sensors replay a 1440-point daily curve, one point
+# per poll cycle, so their season is 1440 * pollCycleSecs rather than a day.
+#
+
+ANOMALY_STATUS_CODE = 1
+
+DEFAULT_ANOMALY_EWMA_ALPHA     = 0.05
+DEFAULT_ANOMALY_Z_THRESHOLD    = 4.0
+DEFAULT_ANOMALY_WARMUP_COUNT   = 30
+DEFAULT_ANOMALY_NORMAL_FORWARD = 0.0
+DEFAULT_ANOMALY_SEASON_PERIOD  = 86400.0
+
+#####
+# Store-and-forward spool defaults
+#
+# NOTE: each connector spools to its own sub-directory of the spool
+# path, so the MQTT and CoAP spools are replayed independently.
+#
+
+DEFAULT_SPOOL_PATH          = '/tmp/cda-spool'
+DEFAULT_SPOOL_SEGMENT_SIZE  = 1048576
+DEFAULT_SPOOL_MAX_SEGMENTS  = 16
+DEFAULT_SPOOL_REPLAY_RATE   = 50.0
+DEFAULT_SPOOL_RETRY_DELAY   = 5.0
+DEFAULT_SPOOL_ACK_TIMEOUT   = 5.0
+
 #####
 # typical topic naming conventions
 #
@@ -221,6 +388,14 @@ OPCUA_GATEWAY_SERVICE = OPCUA   + '.' + GATEWAY_SERVICE
 SMTP_GATEWAY_SERVICE  = SMTP    + '.' + GATEWAY_SERVICE
 DATA_GATEWAY_SERVICE  = DATA    + '.' + GATEWAY_SERVICE
 
+# each actuation rule has its own section, e.g. [Rule.HumidifierOn]
+RULE_SECTION_PREFIX = 'Rule.'
+
+# each registered sensor and actuator has its own section, e.g.
+# [Sensor.TempSensor] and [Actuator.HvacActuator]
+SENSOR_SECTION_PREFIX   = 'Sensor.'
+ACTUATOR_SECTION_PREFIX = 'Actuator.'
+
 
 CRED_SECTION = "Credentials"
 
@@ -260,11 +435,100 @@ POLL_CYCLES_KEY      = 'pollCycleSecs'
 KEEP_ALIVE_KEY       = 'keepAlive'
 DEFAULT_QOS_KEY      = 'defaultQos'
 
+PAYLOAD_CODEC_KEY    = 'payloadCodec'
+
+ENABLE_SPOOL_KEY        = 'enableSpool'
+SPOOL_PATH_KEY          = 'spoolPath'
+SPOOL_SEGMENT_SIZE_KEY  = 'spoolSegmentSize'
+SPOOL_MAX_SEGMENTS_KEY  = 'spoolMaxSegments'
+SPOOL_REPLAY_RATE_KEY   = 'spoolReplayRate'
+SPOOL_RETRY_DELAY_KEY   = 'spoolRetryDelaySecs'
+SPOOL_ACK_TIMEOUT_KEY   = 'spoolAckTimeoutSecs'
+
 ENABLE_MQTT_CLIENT_KEY = 'enableMqttClient'
 ENABLE_COAP_CLIENT_KEY = 'enableCoapClient'
 ENABLE_COAP_SERVER_KEY = 'enableCoapServer'
 ENABLE_REDIS_KEY       = 'enableRedis'
 
+ENABLE_UPSTREAM_PIPELINE_KEY  = 'enableUpstreamPipeline'
+PIPELINE_QUEUE_SIZE_KEY       = 'pipelineQueueSize'
+PIPELINE_OVERFLOW_POLICY_KEY  = 'pipelineOverflowPolicy'
+PIPELINE_BLOCK_TIMEOUT_KEY    = 'pipelineBlockTimeoutSecs'
+PIPELINE_ANALYZE_WORKERS_KEY  = 'pipelineAnalyzeWorkers'
+PIPELINE_ENCODE_WORKERS_KEY   = 'pipelineEncodeWorkers'
+PIPELINE_TRANSMIT_WORKERS_KEY = 'pipelineTransmitWorkers'
+
+ENABLE_UPSTREAM_BATCHING_KEY  = 'enableUpstreamBatching'
+BATCH_MAX_SIZE_KEY            = 'batchMaxSize'
+BATCH_MAX_DELAY_KEY           = 'batchMaxDelaySecs'
+
+ENABLE_EGRESS_LANES_KEY = 'enableEgressLanes'
+EGRESS_WORKERS_KEY      = 'egressWorkers'
+CONTROL_LANE_QUEUE_SIZE_KEY        = 'controlLaneQueueSize'
+CONTROL_LANE_OVERFLOW_POLICY_KEY   = 'controlLaneOverflowPolicy'
+ALERT_LANE_QUEUE_SIZE_KEY          = 'alertLaneQueueSize'
+ALERT_LANE_OVERFLOW_POLICY_KEY     = 'alertLaneOverflowPolicy'
+TELEMETRY_LANE_QUEUE_SIZE_KEY      = 'telemetryLaneQueueSize'
+TELEMETRY_LANE_OVERFLOW_POLICY_KEY = 'telemetryLaneOverflowPolicy'
+BULK_LANE_QUEUE_SIZE_KEY           = 'bulkLaneQueueSize'
+BULK_LANE_OVERFLOW_POLICY_KEY      = 'bulkLaneOverflowPolicy'
+
+ENABLE_SINK_FANOUT_KEY  = 'enableSinkFanout'
+MQTT_SINK_TIMEOUT_KEY   = 'mqttSinkTimeoutSecs'
+COAP_SINK_TIMEOUT_KEY   = 'coapSinkTimeoutSecs'
+SINK_MAX_PENDING_KEY    = 'sinkMaxPending'
+
+CACHE_MAX_SIZE_KEY      = 'cacheMaxSize'
+CACHE_TTL_KEY           = 'cacheTtlSecs'
+
+SCHEDULER_WORKERS_KEY       = 'schedulerWorkers'
+SCHEDULER_STAGGER_KEY       = 'schedulerStaggerSecs'
+SCHEDULER_MISFIRE_GRACE_KEY = 'schedulerMisfireGraceSecs'
+HUMIDITY_POLL_SECS_KEY      = 'humidityPollSecs'
+PRESSURE_POLL_SECS_KEY      = 'pressurePollSecs'
+TEMP_POLL_SECS_KEY          = 'tempPollSecs'
+CPU_UTIL_POLL_SECS_KEY      = 'cpuUtilPollSecs'
+MEM_UTIL_POLL_SECS_KEY      = 'memUtilPollSecs'
+ACTUATOR_HEARTBEAT_KEY      = 'actuatorHeartbeatSecs'
+SENSOR_READ_WORKERS_KEY     = 'sensorReadWorkers'
+SENSOR_READ_TIMEOUT_KEY     = 'sensorReadTimeoutSecs'
+
+ENABLE_SENSOR_HISTORY_KEY   = 'enableSensorHistory'
+SENSOR_HISTORY_CAPACITY_KEY = 'sensorHistoryCapacity'
+
+ENABLE_WINDOW_AGGREGATION_KEY    = 'enableWindowAggregation'
+AGGREGATION_SUPPRESS_RAW_KEY     = 'aggregationSuppressRaw'
+AGGREGATION_PERCENTILES_KEY      = 'aggregationPercentiles'
+HUMIDITY_AGGREGATION_WINDOWS_KEY = 'humidityAggregationWindows'
+PRESSURE_AGGREGATION_WINDOWS_KEY = 'pressureAggregationWindows'
+TEMP_AGGREGATION_WINDOWS_KEY     = 'tempAggregationWindows'
+
+ENABLE_ANOMALY_DETECTION_KEY  = 'enableAnomalyDetection'
+ANOMALY_EWMA_ALPHA_KEY        = 'anomalyEwmaAlpha'
+ANOMALY_Z_THRESHOLD_KEY       = 'anomalyZThreshold'
+ANOMALY_WARMUP_COUNT_KEY      = 'anomalyWarmupCount'
+ANOMALY_NORMAL_FORWARD_KEY    = 'anomalyNormalForwardSecs'
+ANOMALY_SEASONAL_BASELINE_KEY = 'anomalySeasonalBaseline'
+ANOMALY_SEASON_PERIOD_KEY     = 'anomalySeasonPeriodSecs'
+
+ENABLE_DEADBAND_FILTER_KEY = 'enableDeadbandFilter'
+HUMIDITY_DEADBAND_ABS_KEY  = 'humidityDeadbandAbs'
+HUMIDITY_DEADBAND_PCT_KEY  = 'humidityDeadbandPct'
+HUMIDITY_MAX_SILENCE_KEY   = 'humidityMaxSilenceSecs'
+PRESSURE_DEADBAND_ABS_KEY  = 'pressureDeadbandAbs'
+PRESSURE_DEADBAND_PCT_KEY  = 'pressureDeadbandPct'
+PRESSURE_MAX_SILENCE_KEY   = 'pressureMaxSilenceSecs'
+TEMP_DEADBAND_ABS_KEY      = 'tempDeadbandAbs'
+TEMP_DEADBAND_PCT_KEY      = 'tempDeadbandPct'
+TEMP_MAX_SILENCE_KEY       = 'tempMaxSilenceSecs'
+
+ENABLE_PREDICTIVE_FILTER_KEY      = 'enablePredictiveFilter'
+PREDICTION_ALPHA_KEY              = 'predictionAlpha'
+PREDICTION_BETA_KEY               = 'predictionBeta'
+HUMIDITY_PREDICTION_TOLERANCE_KEY = 'humidityPredictionTolerance'
+PRESSURE_PREDICTION_TOLERANCE_KEY = 'pressurePredictionTolerance'
+TEMP_PREDICTION_TOLERANCE_KEY     = 'tempPredictionTolerance'
+
 ENABLE_SYSTEM_PERF_KEY = 'enableSystemPerformance'
 ENABLE_SENSING_KEY     = 'enableSensing'
 ENABLE_ACTUATION_KEY   = 'enableActuation'
@@ -275,12 +539,31 @@ PRESSURE_SIM_FLOOR_KEY   = 'pressureSimFloor'
 PRESSURE_SIM_CEILING_KEY = 'pressureSimCeiling'
 TEMP_SIM_FLOOR_KEY       = 'tempSimFloor'
 TEMP_SIM_CEILING_KEY     = 'tempSimCeiling'
+SIM_DATA_USE_SECONDS_KEY = 'simDataUseSeconds'
+STREAM_SIM_DATA_KEY      = 'streamSimData'
 
 HANDLE_TEMP_CHANGE_ON_DEVICE_KEY = 'handleTempChangeOnDevice'
 TRIGGER_HVAC_TEMP_FLOOR_KEY   = 'triggerHvacTempFloor'
 TRIGGER_HVAC_TEMP_CEILING_KEY = 'triggerHvacTempCeiling'
 
+RULES_KEY               = 'rules'
+RULE_CONDITION_KEY      = 'condition'
+RULE_HYSTERESIS_KEY     = 'hysteresis'
+RULE_ACTUATOR_TYPE_KEY  = 'actuatorType'
+RULE_ACTUATOR_VALUE_KEY = 'actuatorValue'
+
+SENSORS_KEY                = 'sensors'
+ACTUATORS_KEY              = 'actuators'
+ADAPTER_TYPE_ID_KEY        = 'typeID'
+ADAPTER_SIM_CLASS_KEY      = 'simClass'
+ADAPTER_EMULATOR_CLASS_KEY = 'emulatorClass'
+ADAPTER_HARDWARE_CLASS_KEY = 'hardwareClass'
+ADAPTER_POLL_SECS_KEY      = 'pollSecs'
+ADAPTER_MIN_VAL_KEY        = 'minVal'
+ADAPTER_MAX_VAL_KEY        = 'maxVal'
+
 RUN_FOREVER_KEY    = 'runForever'
+RUNTIME_MODE_KEY   = 'runtimeMode'
 TEST_EMPTY_APP_KEY = 'testEmptyApp'
 
 STREAM_HOST_ADDR_KEY       = 'streamHostAddr'
@@ -0,0 +1,158 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import threading
+import time
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+
+class LatestValueCache(object):
+    """
+    Holds the latest data item (SensorData, ActuatorData, etc.) for each
+    name and type ID, for threads that need the current value without
+    waiting for the next reading.
+
+    Each put() also indexes the item by name only, by type ID only and as
+    the latest overall, so every get() is a single dict lookup. Reads take
+    no lock: in CPython a dict lookup is atomic, and entries are replaced
+    rather than changed. Writers share a lock to keep the indexes and the
+    size bound consistent.
+
+    Once 'maxSize' name and type ID pairs are cached, the pair written least
+    recently is evicted. With a 'ttl', items older than 'ttl' seconds are
+    no longer returned.
+
+    """
+
+    def __init__(self, maxSize: int = ConfigConst.DEFAULT_CACHE_MAX_SIZE, ttl: float = ConfigConst.DEFAULT_CACHE_TTL):
+        """
+        Constructor.
+
+        @param maxSize The maximum number of name and type ID pairs cached.
+        @param ttl The number of seconds items are returned for after
+        they're cached, or 0 to return them until they're replaced.
+        """
+        self.maxSize = max(maxSize, 1)
+        self.ttl = ttl
+
+        # (name, typeID), (name, None), (None, typeID) and (None, None)
+        # keys -> (item, cacheTime)
+        self._entries = {}
+
+        # (name, typeID) keys, least recently written first
+        self._keys = {}
+
+        self._evictionCount = 0
+        self._lock = threading.Lock()
+
+    def put(self, data: BaseIotData) -> bool:
+        """
+        Caches 'data' as the latest item for its name and type ID.
+
+        @param data The item to cache.
+        @return bool True if cached; False if 'data' is None.
+        """
+        if data is None:
+            return False
+
+        name = data.getName()
+        typeID = data.getTypeID()
+        key = (name, typeID)
+        entry = (data, time.monotonic())
+
+        with self._lock:
+            self._keys.pop(key, None)
+            self._keys[key] = None
+
+            for indexKey in (key, (name, None), (None, typeID), (None, None)):
+                self._entries[indexKey] = entry
+
+            while len(self._keys) > self.maxSize:
+                self._evict(next(iter(self._keys)))
+
+        return True
+
+    def get(self, name: str = None, typeID: int = None) -> BaseIotData:
+        """
+        Returns the latest item with the given name and type ID. If only one
+        of them is given, returns the latest item matching it; if neither
+        is, returns the latest item cached.
+
+        @param name The item name, or None to match any name.
+        @param typeID The item type ID, or None to match any type ID.
+        @return BaseIotData The item, or None if none matches or it has expired.
+        """
+        entry = self._entries.get((name, typeID))
+
+        if entry is None:
+            return None
+
+        if self.ttl > 0 and time.monotonic() - entry[1] > self.ttl:
+            return None
+
+        return entry[0]
+
+    def remove(self, name: str, typeID: int) -> bool:
+        """
+        Removes the item with the given name and type ID.
+
+        @param name The item name.
+        @param typeID The item type ID.
+        @return bool True if it was cached.
+        """
+        with self._lock:
+            if (name, typeID) not in self._keys:
+                return False
+
+            self._evict((name, typeID), isEviction = False)
+
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._keys = {}
+
+    def getSize(self) -> int:
+        """
+        Returns the number of name and type ID pairs cached, including any
+        that have expired but not yet been replaced or evicted.
+
+        @return int
+        """
+        return len(self._keys)
+
+    def getEvictionCount(self) -> int:
+        return self._evictionCount
+
+    def _evict(self, key: tuple, isEviction: bool = True):
+        # must be called while holding the lock
+        name, typeID = key
+        entry = self._entries.pop(key)
+        del self._keys[key]
+
+        # partial keys that point at the removed item move to the latest
+        # item still cached that matches them, if any
+        for indexKey in ((name, None), (None, typeID), (None, None)):
+            if self._entries.get(indexKey) is entry:
+                matchKey = next((cachedKey for cachedKey in reversed(self._keys) \
+                    if indexKey[0] in (None, cachedKey[0]) and indexKey[1] in (None, cachedKey[1])), None)
+
+                if matchKey:
+                    self._entries[indexKey] = self._entries[matchKey]
+                else:
+                    del self._entries[indexKey]
+
+        if isEviction:
+            self._evictionCount += 1
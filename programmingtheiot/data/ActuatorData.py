@@ -19,6 +19,7 @@ class ActuatorData(BaseIotData):
     Shell representation of class for student implementation.
     
     """
+    __slots__ = ('value', 'command', 'stateData', 'isResponse')
 
     def __init__(self, typeID: int = ConfigConst.DEFAULT_ACTUATOR_TYPE, name = ConfigConst.NOT_SET, d = None):
         super(ActuatorData, self).__init__(name = name, typeID = typeID, d = d)
@@ -7,6 +7,8 @@
 # Copyright (c) 2020 - 2025 by Andrew D. King
 # 
 
+import time
+
 from datetime import datetime, timezone
 
 import programmingtheiot.common.ConfigConst as ConfigConst
@@ -21,7 +23,36 @@ class BaseIotData(object):
     
     Sub-classes add parameters and accessors specific to their needs.
     
+    Instances are slotted to keep the per-message footprint small, as a new
+    container is created for every sensor poll and actuator decision. Each
+    sub-class must declare its own __slots__ with the attributes it adds, in
+    the order they should be serialized.
+    
+    The time stamp is stored as integer nanoseconds since Epoch and is only
+    rendered as an ISO 8601 string when read (e.g. by getTimeStamp() or when
+    serialized), as most updates are never individually observed.
+    
     """
+    
+    __slots__ = (
+        '_timeStampNanos', '_timeStamp', 'hasError', 'timeStampMillis', 'name', 'typeID', 'statusCode',
+        'latitude', 'longitude', 'elevation', 'locationID'
+    )
+    
+    # ordered attribute names used for serialization - built per class
+    _fieldNames = (
+        'timeStamp', 'hasError', 'timeStampMillis', 'name', 'typeID', 'statusCode',
+        'latitude', 'longitude', 'elevation', 'locationID'
+    )
+    
+    # location ID from the configuration file - resolved once per process
+    _configLocationID = None
+    _isLocationIDResolved = False
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        
+        cls._fieldNames = cls._fieldNames + tuple(cls.__dict__.get('__slots__', ()))
 
     def __init__(self, name = ConfigConst.NOT_SET, typeID = ConfigConst.DEFAULT_TYPE_ID, d = None):
         """
@@ -31,10 +62,11 @@ class BaseIotData(object):
         It's provided here as a convenience - mostly for testing purposes. The utility
         in DataUtil should be used instead.
         """
-            
-        self.updateTimeStamp()
+        
+        # the time stamp remains unset until the first update
+        self._timeStampNanos = None
+        self._timeStamp = None
         self.hasError = False
-        self.timeStamp = None
         self.timeStampMillis = None
         
         useDefaults = True
@@ -64,7 +96,37 @@ class BaseIotData(object):
             self.name = ConfigConst.NOT_SET
             
         # always pull location ID from configuration file
-        self.locationID = ConfigUtil().getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_LOCATION_ID_KEY)
+        self.locationID = BaseIotData.getConfiguredLocationID()
+        
+    @classmethod
+    def getConfiguredLocationID(cls) -> str:
+        """
+        Returns the device location ID from the configuration file. The lookup
+        is made once per process and cached for all subsequent instances.
+        
+        @return The configured location ID as a string, or None if not set.
+        """
+        if not BaseIotData._isLocationIDResolved:
+            BaseIotData._configLocationID = ConfigUtil().getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_LOCATION_ID_KEY)
+            BaseIotData._isLocationIDResolved = True
+            
+        return BaseIotData._configLocationID
+    
+    def toDict(self) -> dict:
+        """
+        Returns the serializable attributes of this instance as a dict, in
+        declaration order. This replaces __dict__, which slotted instances
+        don't have; the attributes of a sub-class that doesn't declare
+        __slots__ are kept in __dict__, and follow the slotted ones.
+        
+        @return The dict of attribute names and values.
+        """
+        fields = {fieldName: getattr(self, fieldName) for fieldName in self._fieldNames}
+        
+        if hasattr(self, '__dict__'):
+            fields.update(vars(self))
+            
+        return fields
         
     def getElevation(self) -> float:
         """
@@ -123,6 +185,41 @@ class BaseIotData(object):
         """
         return self.timeStamp
     
+    def getTimeStampNanos(self) -> int:
+        """
+        Returns the time stamp as nanoseconds since Epoch. If the time stamp
+        was set from an ISO 8601 string (e.g. from JSON), it will be parsed
+        on first use, with microsecond precision.
+        
+        @return The time stamp as an integer, or None if not yet set.
+        """
+        if self._timeStampNanos is None and self._timeStamp:
+            self._timeStampNanos = _isoToNanos(self._timeStamp)
+            
+        return self._timeStampNanos
+    
+    def setTimeStampNanos(self, nanos: int):
+        """
+        Sets the time stamp from nanoseconds since Epoch. This is used when
+        rebuilding instances from columnar or binary representations.
+        
+        @param nanos The time stamp as an integer.
+        """
+        self._timeStampNanos = nanos
+        self._timeStamp = None
+        
+    @property
+    def timeStamp(self) -> str:
+        if self._timeStamp is None and self._timeStampNanos is not None:
+            self._timeStamp = _nanosToIso(self._timeStampNanos)
+            
+        return self._timeStamp
+    
+    @timeStamp.setter
+    def timeStamp(self, val: str):
+        self._timeStamp = val
+        self._timeStampNanos = None
+    
     def getTypeID(self) -> int:
         """
         Returns the type ID as an integer. This allows for additional granularity
@@ -237,8 +334,12 @@ class BaseIotData(object):
         NOTE: the '+00:00' is the offset from GMT, and can be replaced
         with 'Z' if desired. In testing, the format above is
         compatible with the GDA's parsing logic.
+        
+        NOTE: Only the Epoch time is captured here; the string is
+        rendered on demand.
         """
-        self.timeStamp = str(datetime.now(timezone.utc).isoformat())
+        self._timeStampNanos = time.time_ns()
+        self._timeStamp = None
     
     def __str__(self):
         """
@@ -264,3 +365,29 @@ class BaseIotData(object):
         @param data The BaseIotData data to apply to this instance.
         """
         pass
+
+def _nanosToIso(nanos: int) -> str:
+    """
+    Renders nanoseconds since Epoch in the same ISO 8601 format as
+    datetime.now(timezone.utc).isoformat().
+    """
+    secs, micros = divmod(nanos // 1000, 1000000)
+    
+    return datetime.fromtimestamp(secs, timezone.utc).replace(microsecond = micros).isoformat()
+
+def _isoToNanos(timeStamp: str) -> int:
+    """
+    Parses an ISO 8601 time stamp into nanoseconds since Epoch. Returns
+    None if the string can't be parsed.
+    """
+    try:
+        dt = datetime.fromisoformat(timeStamp.replace('Z', '+00:00'))
+        
+        if dt.tzinfo is None:
+            dt = dt.replace(tzinfo = timezone.utc)
+            
+        secs = int(dt.replace(microsecond = 0).timestamp())
+        
+        return (secs * 1000000 + dt.microsecond) * 1000
+    except (TypeError, ValueError):
+        return None
@@ -13,32 +13,166 @@
 import json
 import logging
 
+from importlib import import_module
 from json import JSONEncoder
+from operator import attrgetter
+
+# optional faster JSON backend - only used in compact mode
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.data.BaseIotData import BaseIotData
 from programmingtheiot.data.ActuatorData import ActuatorData
 from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataBatch import SensorDataBatch
 from programmingtheiot.data.SystemPerformanceData import SystemPerformanceData
 
 class DataUtil():
     """
     Util class for json conversion	
+    
+    The default format is indented JSON built through JsonDataEncoder. The
+    compact format skips indentation and whitespace, reads attributes
+    through a precomputed per-class field table instead of the encoder
+    callback, and uses orjson when it's installed. Compact payloads carry
+    the same keys, in the same order, as the default format.
+    
+    NOTE: orjson differs from the stdlib encoder for NaN / Infinity (encoded
+    as null) and for floats >= 1e16 (no '+' in the exponent). Neither occurs
+    in normal telemetry; set useFastBackend to False if it matters.
     """
+    
+    # per-class (field names, attribute getter, field name set)
+    _fieldTables = {}
+    
+    # codec name -> (module, class) - imported on first use, as the binary
+    # codecs depend on optional packages
+    CODECS = {
+        ConfigConst.JSON_CODEC: ('programmingtheiot.data.codecs.JsonDataCodec', 'JsonDataCodec'),
+        ConfigConst.JSON_COMPACT_CODEC: ('programmingtheiot.data.codecs.JsonDataCodec', 'JsonDataCodec'),
+        ConfigConst.CBOR_CODEC: ('programmingtheiot.data.codecs.CborDataCodec', 'CborDataCodec'),
+        ConfigConst.MSGPACK_CODEC: ('programmingtheiot.data.codecs.MsgPackDataCodec', 'MsgPackDataCodec'),
+        ConfigConst.STRUCT_CODEC: ('programmingtheiot.data.codecs.StructDataCodec', 'StructDataCodec')
+    }
+    
+    _codecInstances = {}
 
-    def __init__(self, encodeToUtf8 = False):
+    def __init__(self, encodeToUtf8 = False, useCompactFormat = False, useFastBackend = True):
         self.encodeToUtf8 = encodeToUtf8
+        self.useCompactFormat = useCompactFormat
+        self.useFastBackend = useFastBackend and orjson is not None
         
     def _objectToJson(self, data: BaseIotData) -> str:
+        if self.useCompactFormat:
+            return self._objectToCompactJson(data)
+        
         jsonData = json.dumps(data, indent=2, cls=JsonDataEncoder)
         if self.encodeToUtf8:
             jsonData = jsonData.encode('utf-8')
             
         return jsonData
     
+    def _objectToCompactJson(self, data) -> str:
+        if isinstance(data, BaseIotData):
+            fieldNames, getter, _ = self._getFieldTable(data.__class__)
+            fields = dict(zip(fieldNames, getter(data)))
+            
+            # as toDict(): unslotted sub-classes keep their own attributes in __dict__
+            if hasattr(data, '__dict__'):
+                fields.update(vars(data))
+                
+            data = fields
+            
+        if self.useFastBackend:
+            jsonData = orjson.dumps(data)
+            return jsonData if self.encodeToUtf8 else jsonData.decode('utf-8')
+        
+        jsonData = json.dumps(data, separators=(',', ':'), ensure_ascii=False)
+        return jsonData.encode('utf-8') if self.encodeToUtf8 else jsonData
+    
     def _jsonToDict(self, jsonData: str) -> dict:            
+        if self.useCompactFormat and self.useFastBackend:
+            return orjson.loads(jsonData)
+        
         return json.loads(jsonData)
     
+    @classmethod
+    def getCodec(cls, codecName: str = ConfigConst.DEFAULT_PAYLOAD_CODEC):
+        """
+        Returns the shared codec instance for 'codecName'. If the name is
+        unknown, or the codec's package isn't installed, the default JSON
+        codec is returned instead.
+        
+        @param codecName The codec name (e.g. from the 'payloadCodec' config key).
+        @return IDataCodec
+        """
+        codec = cls._codecInstances.get(codecName)
+        
+        if codec:
+            return codec
+        
+        if codecName not in cls.CODECS:
+            logging.warning(f"Unknown payload codec '{codecName}'. Using {ConfigConst.DEFAULT_PAYLOAD_CODEC}.")
+            return cls.getCodec(ConfigConst.DEFAULT_PAYLOAD_CODEC)
+        
+        moduleName, className = cls.CODECS[codecName]
+        
+        try:
+            clazz = getattr(import_module(moduleName), className)
+        except ImportError as e:
+            logging.error(f"Payload codec '{codecName}' is not available ({e}). Using {ConfigConst.DEFAULT_PAYLOAD_CODEC}.")
+            return cls.getCodec(ConfigConst.DEFAULT_PAYLOAD_CODEC)
+        
+        if codecName == ConfigConst.JSON_COMPACT_CODEC:
+            codec = clazz(useCompactFormat = True)
+        else:
+            codec = clazz()
+            
+        cls._codecInstances[codecName] = codec
+        
+        return codec
+    
+    def toFieldValues(self, data: BaseIotData) -> list:
+        """
+        Returns the attribute values of 'data' as a list, in the order of
+        its class's field table. This is the positional form used by the
+        binary codecs.
+        
+        @param data The data container.
+        @return list
+        """
+        return list(self._getFieldTable(data.__class__)[1](data))
+    
+    def fillFromFieldValues(self, data: BaseIotData, values: list):
+        """
+        Sets the attributes of 'data' from a list of values in field table
+        order, as produced by toFieldValues().
+        
+        @param data The data container to update.
+        @param values The list of values.
+        """
+        for fieldName, val in zip(self._getFieldTable(data.__class__)[0], values):
+            setattr(data, fieldName, val)
+    
+    def _getFieldTable(self, clazz) -> tuple:
+        fieldTable = DataUtil._fieldTables.get(clazz)
+        
+        if not fieldTable:
+            fieldNames = clazz._fieldNames
+            fieldTable = (fieldNames, attrgetter(*fieldNames), frozenset(fieldNames))
+            DataUtil._fieldTables[clazz] = fieldTable
+            
+        return fieldTable
+    
     def _fillIotDataFromDict(self, data: BaseIotData, dataDict: dict):
+        if self.useCompactFormat:
+            self._fillIotDataFromDictFast(data, dataDict)
+            return
+        
         for attr,val in dataDict.items():
             if hasattr(data, attr):
                 setattr(data, attr, val)   
@@ -46,6 +180,21 @@ class DataUtil():
                 logging.warning(f"'{attr}' is not a valid attribute of '{data.__class__.__name__}'")
                 # raise AttributeError(f"'{attr}' is not a valid attribute of '{data.__class__.__name__}'") # we should probably crash here
                 
+    def _fillIotDataFromDictFast(self, data: BaseIotData, dataDict: dict):
+        _, _, fieldSet = self._getFieldTable(data.__class__)
+        unknownAttrs = None
+        
+        for attr,val in dataDict.items():
+            if attr in fieldSet:
+                setattr(data, attr, val)
+            elif unknownAttrs is None:
+                unknownAttrs = [attr]
+            else:
+                unknownAttrs.append(attr)
+                
+        if unknownAttrs:
+            logging.debug(f"Ignoring attributes not valid for '{data.__class__.__name__}': {unknownAttrs}")
+                
     # all the pub methods are just callbacks
     
     def actuatorDataToJson(self, data: ActuatorData = None) -> str:
@@ -60,6 +209,12 @@ class DataUtil():
             return ""
         return self._objectToJson(data)
 
+    def sensorDataBatchToJson(self, data: SensorDataBatch = None) -> str:
+        if data is None:
+            logging.warning("SensorDataBatch is None, returning empty string")
+            return ""
+        return self._objectToJson(data.toDict())
+
     def systemPerformanceDataToJson(self, data: SystemPerformanceData = None) -> str:
         if not data:
             logging.warning("SystemPerformanceData is None, returning empty string")
@@ -84,6 +239,12 @@ class DataUtil():
         self._fillIotDataFromDict(sd, dict)
         return sd
     
+    def jsonToSensorDataBatch(self, jsonData: str = None) -> SensorDataBatch:
+        if not jsonData:
+            logging.warning("jsonData is None, returning None")
+            return None
+        return SensorDataBatch.fromDict(self._jsonToDict(jsonData))
+    
     def jsonToSystemPerformanceData(self, jsonData: str = None) -> SystemPerformanceData:
         if not jsonData:
             logging.warning("jsonData is None, returning None")
@@ -98,7 +259,12 @@ class JsonDataEncoder(JSONEncoder):
     Convenience class to facilitate JSON encoding of an object that
     can be converted to a dict.
     
+    NOTE: BaseIotData instances are slotted and have no __dict__, so
+    their ordered field table is used instead.
     """
     def default(self, o):
+        if isinstance(o, BaseIotData):
+            return o.toDict()
+        
         return o.__dict__
     
\ No newline at end of file
@@ -0,0 +1,116 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+from programmingtheiot.data.DataUtil import DataUtil
+
+class EncodedPayload(object):
+    """
+    Wraps a single outgoing data container and caches its encoded form per
+    codec, so a message that goes to several sinks (Redis, MQTT, CoAP) is
+    only serialized once per codec. The cached payload is immutable bytes
+    and is handed to every sink as-is.
+
+    The data container must not be modified once it has been wrapped, as
+    cached payloads would no longer match it.
+
+    """
+
+    __slots__ = ('data', '_payloads', '_encodeCount')
+
+    def __init__(self, data: BaseIotData = None):
+        """
+        Constructor.
+
+        @param data The data container to encode.
+        """
+        self.data = data
+        self._payloads = {}
+        self._encodeCount = 0
+
+    @classmethod
+    def wrap(cls, data) -> "EncodedPayload":
+        """
+        Returns 'data' if it's already an EncodedPayload; otherwise wraps it.
+
+        @param data The data container or EncodedPayload.
+        @return EncodedPayload
+        """
+        return data if isinstance(data, EncodedPayload) else cls(data)
+
+    def getData(self) -> BaseIotData:
+        return self.data
+
+    def getEncodeCount(self) -> int:
+        """
+        Returns the number of times the data container has been encoded.
+        This is one per distinct codec used, no matter how many sinks
+        requested the payload.
+
+        @return int
+        """
+        return self._encodeCount
+
+    def resolveCodec(self, codec = None):
+        """
+        Returns the codec that will actually be used for 'codec'. This is the
+        default JSON codec if 'codec' is not set or can't represent the data.
+
+        @param codec The preferred codec.
+        @return IDataCodec
+        """
+        if codec and codec.canEncode(self.data):
+            return codec
+
+        return DataUtil.getCodec(ConfigConst.DEFAULT_PAYLOAD_CODEC)
+
+    def getPayload(self, codec = None) -> bytes:
+        """
+        Returns the data encoded with 'codec' (see resolveCodec()), encoding
+        it on first request only.
+
+        @param codec The preferred codec.
+        @return bytes The encoded payload, or None if there's no data.
+        """
+        if self.data is None:
+            return None
+
+        codec = self.resolveCodec(codec)
+        codecName = codec.getName()
+        payload = self._payloads.get(codecName)
+
+        if payload is None:
+            payload = codec.encode(self.data)
+            self._payloads[codecName] = payload
+            self._encodeCount += 1
+
+        return payload
+
+    def getPayloadView(self, codec = None) -> memoryview:
+        """
+        Returns a read-only memoryview of getPayload(), for sinks that
+        accept buffers.
+
+        @param codec The preferred codec.
+        @return memoryview The view, or None if there's no data.
+        """
+        payload = self.getPayload(codec)
+
+        return memoryview(payload) if payload is not None else None
+
+    def __bool__(self) -> bool:
+        return self.data is not None
+
+    def __str__(self) -> str:
+        return '{}:data={},encodeCount={}'.format(self.__class__.__name__, self.data, self._encodeCount)
@@ -0,0 +1,82 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+
+class EncodedPayloadBatch(EncodedPayload):
+    """
+    A group of EncodedPayload instances sent upstream as a single array
+    payload. The array is built from each member's cached encoding using
+    the codec's joinPayloads(), so members are never encoded twice.
+
+    getData() returns the list of data containers.
+
+    """
+
+    __slots__ = ('payloads',)
+
+    def __init__(self, payloads: list = None):
+        """
+        Constructor.
+
+        @param payloads The list of EncodedPayload instances to send together.
+        """
+        self.payloads = payloads if payloads else []
+
+        super(EncodedPayloadBatch, self).__init__([payload.getData() for payload in self.payloads])
+
+    def getPayloads(self) -> list:
+        return self.payloads
+
+    def getEncodeCount(self) -> int:
+        """
+        Returns the number of encodes of the member data containers.
+
+        @return int
+        """
+        return sum(payload.getEncodeCount() for payload in self.payloads)
+
+    def resolveCodec(self, codec = None):
+        """
+        Returns 'codec' if it can represent every member; otherwise the
+        default JSON codec, so the array has a single format.
+
+        @param codec The preferred codec.
+        @return IDataCodec
+        """
+        if codec and all(codec.canEncode(data) for data in self.data):
+            return codec
+
+        return DataUtil.getCodec(ConfigConst.DEFAULT_PAYLOAD_CODEC)
+
+    def getPayload(self, codec = None) -> bytes:
+        if not self.payloads:
+            return None
+
+        codec = self.resolveCodec(codec)
+        codecName = codec.getName()
+        payload = self._payloads.get(codecName)
+
+        if payload is None:
+            payload = codec.joinPayloads([member.getPayload(codec) for member in self.payloads])
+            self._payloads[codecName] = payload
+
+        return payload
+
+    def __bool__(self) -> bool:
+        return len(self.payloads) > 0
+
+    def __len__(self) -> int:
+        return len(self.payloads)
@@ -19,7 +19,9 @@ class SensorData(BaseIotData):
     Shell representation of class for student implementation.
     
     """
-        
+    
+    __slots__ = ('value',)
+    
     def __init__(self, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, name = ConfigConst.NOT_SET, d = None):
         super(SensorData, self).__init__(name = name, typeID = typeID, d = d)
         
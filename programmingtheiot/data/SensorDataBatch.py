@@ -0,0 +1,329 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+from programmingtheiot.data.SensorData import SensorData
+
+class SensorDataBatch(object):
+    """
+    Columnar container for many SensorData readings. Each reading is stored
+    as one row across parallel NumPy arrays (type ID, value, time stamp in
+    Epoch nanoseconds, and status code), with names dictionary-encoded into
+    a small lookup table. This avoids the per-object overhead of SensorData
+    when handling large volumes of readings, such as during backfills.
+
+    The arrays grow by doubling as readings are appended. Accessors return
+    views trimmed to the current size, so callers should copy them if they
+    need to keep the data beyond the next append.
+
+    """
+
+    DEFAULT_CAPACITY = 64
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, locationID: str = None):
+        """
+        Constructor.
+
+        @param capacity The initial number of readings to allocate room for.
+        @param locationID The location ID shared by all readings in this batch.
+        Defaults to the configured device location ID.
+        """
+        if capacity < 1:
+            capacity = self.DEFAULT_CAPACITY
+
+        self.locationID = locationID if locationID else BaseIotData.getConfiguredLocationID()
+        self.size = 0
+
+        self.names = []
+        self.nameLookup = {}
+
+        self.typeIDs     = calcLib.zeros(capacity, dtype = calcLib.int32)
+        self.values      = calcLib.zeros(capacity, dtype = calcLib.float64)
+        self.timeStamps  = calcLib.zeros(capacity, dtype = calcLib.int64)
+        self.statusCodes = calcLib.zeros(capacity, dtype = calcLib.int32)
+        self.nameIndexes = calcLib.zeros(capacity, dtype = calcLib.int32)
+
+    @classmethod
+    def fromSensorDataList(cls, dataList: list, locationID: str = None) -> "SensorDataBatch":
+        """
+        Creates a new batch from a list of SensorData instances.
+
+        @param dataList The list of SensorData instances.
+        @param locationID Optional location ID. If not set, the location ID of
+        the first reading is used.
+        @return SensorDataBatch
+        """
+        if not locationID and dataList:
+            locationID = dataList[0].getLocationID()
+
+        batch = cls(capacity = max(len(dataList), 1), locationID = locationID)
+        batch.extend(dataList)
+
+        return batch
+
+    @classmethod
+    def fromArrays(cls, typeIDs, values, timeStamps = None, statusCodes = None, names: list = None, nameIndexes = None, locationID: str = None) -> "SensorDataBatch":
+        """
+        Creates a new batch from existing column arrays. All arrays must be
+        of equal length. Missing time stamps, status codes and name indexes
+        default to zero.
+
+        @return SensorDataBatch
+        """
+        count = len(values)
+        batch = cls(capacity = max(count, 1), locationID = locationID)
+
+        batch.typeIDs[:count] = typeIDs
+        batch.values[:count] = values
+
+        if timeStamps is not None:
+            batch.timeStamps[:count] = timeStamps
+        if statusCodes is not None:
+            batch.statusCodes[:count] = statusCodes
+
+        if names:
+            batch.names = list(names)
+            batch.nameLookup = {name: index for index, name in enumerate(batch.names)}
+
+            if nameIndexes is not None:
+                batch.nameIndexes[:count] = nameIndexes
+        else:
+            batch.nameIndexes[:count] = batch._getNameIndex(ConfigConst.NOT_SET)
+
+        batch.size = count
+
+        return batch
+
+    def __len__(self) -> int:
+        return self.size
+
+    def append(self, data: SensorData):
+        """
+        Appends a single SensorData reading to this batch.
+
+        @param data The SensorData instance to append.
+        """
+        if self.size == len(self.values):
+            self._resize(self.size * 2)
+
+        row = self.size
+        timeStampNanos = data.getTimeStampNanos()
+
+        self.typeIDs[row]     = data.getTypeID()
+        self.values[row]      = data.getValue()
+        self.timeStamps[row]  = timeStampNanos if timeStampNanos is not None else 0
+        self.statusCodes[row] = data.getStatusCode()
+        self.nameIndexes[row] = self._getNameIndex(data.getName())
+
+        self.size += 1
+
+    def extend(self, dataList: list):
+        """
+        Appends each SensorData reading in 'dataList' to this batch.
+
+        @param dataList The list of SensorData instances.
+        """
+        required = self.size + len(dataList)
+
+        if required > len(self.values):
+            self._resize(max(required, self.size * 2))
+
+        for data in dataList:
+            self.append(data)
+
+    def getLocationID(self) -> str:
+        return self.locationID
+
+    def getNames(self) -> list:
+        """
+        Returns the name lookup table. Entries in getNameIndexes() refer to
+        positions in this list.
+        """
+        return self.names
+
+    def getNameIndexes(self):
+        return self.nameIndexes[:self.size]
+
+    def getSize(self) -> int:
+        return self.size
+
+    def getStatusCodes(self):
+        return self.statusCodes[:self.size]
+
+    def getTimeStamps(self):
+        """
+        Returns the time stamps as nanoseconds since Epoch.
+        """
+        return self.timeStamps[:self.size]
+
+    def getTypeIDs(self):
+        return self.typeIDs[:self.size]
+
+    def getValues(self):
+        return self.values[:self.size]
+
+    def filter(self, mask) -> "SensorDataBatch":
+        """
+        Returns a new batch containing only the rows where 'mask' is True.
+
+        @param mask A boolean array with one entry per reading.
+        @return SensorDataBatch
+        """
+        return SensorDataBatch.fromArrays(
+            typeIDs = self.getTypeIDs()[mask],
+            values = self.getValues()[mask],
+            timeStamps = self.getTimeStamps()[mask],
+            statusCodes = self.getStatusCodes()[mask],
+            names = self.names,
+            nameIndexes = self.getNameIndexes()[mask],
+            locationID = self.locationID
+        )
+
+    def filterByTypeID(self, typeID: int) -> "SensorDataBatch":
+        return self.filter(self.getTypeIDs() == typeID)
+
+    def filterByValueRange(self, minVal: float, maxVal: float) -> "SensorDataBatch":
+        values = self.getValues()
+
+        return self.filter((values >= minVal) & (values <= maxVal))
+
+    def filterByTimeRange(self, startNanos: int, endNanos: int) -> "SensorDataBatch":
+        timeStamps = self.getTimeStamps()
+
+        return self.filter((timeStamps >= startNanos) & (timeStamps < endNanos))
+
+    def filterErrors(self) -> "SensorDataBatch":
+        """
+        Returns a new batch with only the rows that have a negative status code.
+        """
+        return self.filter(self.getStatusCodes() < 0)
+
+    def aggregateByTypeID(self) -> dict:
+        """
+        Computes count, min, max, mean and standard deviation of the values
+        for each type ID in this batch.
+
+        @return dict Keyed by type ID, with each entry being a dict of the
+        aggregate values.
+        """
+        typeIDs = self.getTypeIDs()
+        values = self.getValues()
+        aggregates = {}
+
+        if self.size == 0:
+            return aggregates
+
+        uniqueTypeIDs, inverse, counts = calcLib.unique(typeIDs, return_inverse = True, return_counts = True)
+        sums = calcLib.bincount(inverse, weights = values)
+        means = sums / counts
+        variances = calcLib.bincount(inverse, weights = (values - means[inverse]) ** 2) / counts
+
+        mins = calcLib.full(len(uniqueTypeIDs), calcLib.inf)
+        maxs = calcLib.full(len(uniqueTypeIDs), -calcLib.inf)
+        calcLib.minimum.at(mins, inverse, values)
+        calcLib.maximum.at(maxs, inverse, values)
+
+        for i, typeID in enumerate(uniqueTypeIDs.tolist()):
+            aggregates[typeID] = {
+                'count': int(counts[i]),
+                'min': float(mins[i]),
+                'max': float(maxs[i]),
+                'mean': float(means[i]),
+                'stddev': float(calcLib.sqrt(variances[i]))
+            }
+
+        return aggregates
+
+    def toSensorDataList(self) -> list:
+        """
+        Converts this batch back into a list of SensorData instances.
+
+        @return list
+        """
+        dataList = []
+
+        for typeID, value, timeStamp, statusCode, nameIndex in zip(
+            self.getTypeIDs().tolist(), self.getValues().tolist(), self.getTimeStamps().tolist(),
+            self.getStatusCodes().tolist(), self.getNameIndexes().tolist()):
+
+            sd = SensorData(typeID = typeID, name = self.names[nameIndex])
+            sd.value = value
+            sd.setStatusCode(statusCode)
+            sd.setLocationID(self.locationID)
+
+            if timeStamp:
+                sd.setTimeStampNanos(timeStamp)
+
+            dataList.append(sd)
+
+        return dataList
+
+    def toDict(self) -> dict:
+        """
+        Returns the batch as a dict of columns, suitable for serialization.
+
+        @return dict
+        """
+        return {
+            ConfigConst.LOCATION_ID_PROP: self.locationID,
+            ConfigConst.NAMES_PROP: self.names,
+            ConfigConst.NAME_INDEX_PROP: self.getNameIndexes().tolist(),
+            ConfigConst.TYPE_ID_PROP: self.getTypeIDs().tolist(),
+            ConfigConst.VALUE_PROP: self.getValues().tolist(),
+            ConfigConst.TIMESTAMP_NANOS_PROP: self.getTimeStamps().tolist(),
+            ConfigConst.STATUS_CODE_PROP: self.getStatusCodes().tolist()
+        }
+
+    @classmethod
+    def fromDict(cls, d: dict) -> "SensorDataBatch":
+        """
+        Creates a new batch from a dict of columns, as produced by toDict().
+
+        @param d The dict of columns.
+        @return SensorDataBatch
+        """
+        return cls.fromArrays(
+            typeIDs = d[ConfigConst.TYPE_ID_PROP],
+            values = d[ConfigConst.VALUE_PROP],
+            timeStamps = d.get(ConfigConst.TIMESTAMP_NANOS_PROP),
+            statusCodes = d.get(ConfigConst.STATUS_CODE_PROP),
+            names = d.get(ConfigConst.NAMES_PROP),
+            nameIndexes = d.get(ConfigConst.NAME_INDEX_PROP),
+            locationID = d.get(ConfigConst.LOCATION_ID_PROP)
+        )
+
+    def __str__(self) -> str:
+        return '{}={},size={},{}={}'.format(
+            ConfigConst.LOCATION_ID_PROP, self.locationID,
+            self.size,
+            ConfigConst.NAMES_PROP, self.names)
+
+    def _getNameIndex(self, name: str) -> int:
+        index = self.nameLookup.get(name)
+
+        if index is None:
+            index = len(self.names)
+            self.names.append(name)
+            self.nameLookup[name] = index
+
+        return index
+
+    def _resize(self, capacity: int):
+        self.typeIDs     = calcLib.resize(self.typeIDs, capacity)
+        self.values      = calcLib.resize(self.values, capacity)
+        self.timeStamps  = calcLib.resize(self.timeStamps, capacity)
+        self.statusCodes = calcLib.resize(self.statusCodes, capacity)
+        self.nameIndexes = calcLib.resize(self.nameIndexes, capacity)
@@ -0,0 +1,248 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import threading
+import time
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.TimeSeriesDecoder import TimeSeriesDecoder
+from programmingtheiot.data.TimeSeriesEncoder import TimeSeriesEncoder
+
+class SensorDataHistory(object):
+    """
+    Fixed-capacity ring buffer of one sensor's readings, stored as
+    preallocated NumPy arrays of time stamps (Epoch nanoseconds) and values.
+    Once full, each new reading overwrites the oldest, so adding a reading
+    never allocates.
+
+    Readings are expected in time stamp order, which lets time-range
+    queries use a binary search. Queries return NumPy views into the
+    buffer when the readings they cover don't wrap around its end, and
+    copies when they do. Views are overwritten by later readings, so
+    callers should copy them if they need the data beyond the next add.
+
+    """
+
+    MEAN = 'mean'
+    MIN  = 'min'
+    MAX  = 'max'
+
+    def __init__(self, capacity: int = ConfigConst.DEFAULT_HISTORY_CAPACITY, name: str = ConfigConst.NOT_SET, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE):
+        """
+        Constructor.
+
+        @param capacity The maximum number of readings kept.
+        @param name The sensor name.
+        @param typeID The sensor type ID.
+        """
+        self.capacity = max(capacity, 1)
+        self.name = name
+        self.typeID = typeID
+
+        self.timeStamps = calcLib.zeros(self.capacity, dtype = calcLib.int64)
+        self.values     = calcLib.zeros(self.capacity, dtype = calcLib.float64)
+
+        # index the next reading is written to
+        self.head = 0
+        self.size = 0
+
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, data: SensorData):
+        """
+        Adds a SensorData reading, using the current time if it has no
+        time stamp.
+
+        @param data The reading to add.
+        """
+        timeStampNanos = data.getTimeStampNanos()
+
+        self.append(timeStampNanos if timeStampNanos is not None else time.time_ns(), data.getValue())
+
+    def append(self, timeStampNanos: int, value: float):
+        """
+        Adds a reading, overwriting the oldest one if the buffer is full.
+
+        @param timeStampNanos The reading time stamp as nanoseconds since Epoch.
+        @param value The reading value.
+        """
+        with self._lock:
+            self.timeStamps[self.head] = timeStampNanos
+            self.values[self.head] = value
+
+            self.head = (self.head + 1) % self.capacity
+
+            if self.size < self.capacity:
+                self.size += 1
+
+    def addCompressed(self, block: bytes):
+        """
+        Adds the readings of a compressed block, e.g. one saved with
+        getCompressed() before a restart.
+
+        @param block The block, as written by TimeSeriesEncoder.
+        """
+        for timeStampNanos, value in TimeSeriesDecoder(block):
+            self.append(timeStampNanos, value)
+
+    def clear(self):
+        with self._lock:
+            self.head = 0
+            self.size = 0
+
+    def getCapacity(self) -> int:
+        return self.capacity
+
+    def getName(self) -> str:
+        return self.name
+
+    def getSize(self) -> int:
+        return self.size
+
+    def getTypeID(self) -> int:
+        return self.typeID
+
+    def getMemoryFootprint(self) -> int:
+        """
+        Returns the number of bytes allocated for readings, which is fixed
+        by the capacity.
+
+        @return int
+        """
+        return self.timeStamps.nbytes + self.values.nbytes
+
+    def getLatest(self) -> tuple:
+        """
+        Returns the latest reading.
+
+        @return tuple (timeStampNanos, value), or None if the buffer is empty.
+        """
+        with self._lock:
+            if self.size == 0:
+                return None
+
+            index = (self.head - 1) % self.capacity
+
+            return (int(self.timeStamps[index]), float(self.values[index]))
+
+    def getLast(self, count: int) -> tuple:
+        """
+        Returns the latest 'count' readings, oldest first.
+
+        @param count The number of readings.
+        @return tuple (timeStamps, values) arrays.
+        """
+        with self._lock:
+            count = min(max(count, 0), self.size)
+
+            return self._slice(self.size - count, count)
+
+    def getRange(self, startNanos: int = None, endNanos: int = None) -> tuple:
+        """
+        Returns the readings with time stamps from 'startNanos' up to but not
+        including 'endNanos', oldest first.
+
+        @param startNanos The start of the range, or None for the oldest reading.
+        @param endNanos The end of the range, or None for the latest reading.
+        @return tuple (timeStamps, values) arrays.
+        """
+        with self._lock:
+            first = self._countBefore(startNanos) if startNanos is not None else 0
+            last = self._countBefore(endNanos) if endNanos is not None else self.size
+
+            return self._slice(first, max(last - first, 0))
+
+    def getCompressed(self, startNanos: int = None, endNanos: int = None, resolutionNanos: int = TimeSeriesEncoder.DEFAULT_RESOLUTION_NANOS) -> bytes:
+        """
+        Returns the readings in a time range as a compressed block, e.g. to
+        send upstream as a backfill or to save locally. At the default
+        resolution, a reading takes about 7 bytes instead of 16 here.
+
+        @param startNanos The start of the range, or None for the oldest reading.
+        @param endNanos The end of the range, or None for the latest reading.
+        @param resolutionNanos The time stamp resolution kept, in nanoseconds.
+        @return bytes The block; see TimeSeriesEncoder for its layout.
+        """
+        timeStamps, values = self.getRange(startNanos, endNanos)
+
+        encoder = TimeSeriesEncoder(typeID = self.typeID, name = self.name, resolutionNanos = resolutionNanos)
+        encoder.appendAll(timeStamps.tolist(), values.tolist())
+
+        return encoder.getBytes()
+
+    def getDownsampled(self, intervalNanos: int, startNanos: int = None, endNanos: int = None, method: str = MEAN) -> tuple:
+        """
+        Returns the readings in a time range reduced to one value per
+        'intervalNanos' interval that has readings. Intervals are aligned to
+        multiples of 'intervalNanos' since Epoch.
+
+        @param intervalNanos The interval length in nanoseconds.
+        @param startNanos The start of the range, or None for the oldest reading.
+        @param endNanos The end of the range, or None for the latest reading.
+        @param method How each interval's readings are reduced: MEAN, MIN or MAX.
+        @return tuple (intervalStartNanos, values) arrays.
+        """
+        timeStamps, values = self.getRange(startNanos, endNanos)
+
+        if len(timeStamps) == 0:
+            return (timeStamps, values)
+
+        intervals = timeStamps // intervalNanos
+        starts = calcLib.flatnonzero(calcLib.diff(intervals, prepend = intervals[0] - 1))
+
+        if method == self.MIN:
+            reduced = calcLib.minimum.reduceat(values, starts)
+        elif method == self.MAX:
+            reduced = calcLib.maximum.reduceat(values, starts)
+        else:
+            reduced = calcLib.add.reduceat(values, starts) / calcLib.diff(starts, append = len(values))
+
+        return (intervals[starts] * intervalNanos, reduced)
+
+    def _countBefore(self, timeStampNanos: int) -> int:
+        # must be called while holding the lock; counts the readings with
+        # earlier time stamps, searching the oldest and newest runs of the
+        # buffer separately
+        oldest = (self.head - self.size) % self.capacity
+
+        if oldest + self.size <= self.capacity:
+            return int(calcLib.searchsorted(self.timeStamps[oldest:oldest + self.size], timeStampNanos))
+
+        count = int(calcLib.searchsorted(self.timeStamps[oldest:], timeStampNanos))
+
+        if count < self.capacity - oldest:
+            return count
+
+        return count + int(calcLib.searchsorted(self.timeStamps[:self.head], timeStampNanos))
+
+    def _slice(self, first: int, count: int) -> tuple:
+        # must be called while holding the lock; 'first' counts from the
+        # oldest reading
+        start = (self.head - self.size + first) % self.capacity
+        end = start + count
+
+        if end <= self.capacity:
+            return (self.timeStamps[start:end], self.values[start:end])
+
+        end -= self.capacity
+
+        return (
+            calcLib.concatenate((self.timeStamps[start:], self.timeStamps[:end])),
+            calcLib.concatenate((self.values[start:], self.values[:end]))
+        )
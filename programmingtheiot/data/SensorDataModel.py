@@ -0,0 +1,74 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.SensorData import SensorData
+
+class SensorDataModel(SensorData):
+    """
+    A sensor reading that also carries the parameters and state of the
+    sensor's prediction model (see SensorDataPredictor) after the reading
+    was applied. It's sent in place of the plain reading when the receiver
+    doesn't yet have the model, or its parameters have changed, so the
+    receiver can take over the model as is.
+
+    """
+
+    __slots__ = ('modelAlpha', 'modelBeta', 'modelLevel', 'modelTrend', 'tolerance')
+
+    def __init__(self, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, name = ConfigConst.NOT_SET, d = None):
+        super(SensorDataModel, self).__init__(typeID = typeID, name = name, d = d)
+
+        self.modelAlpha = 1.0
+        self.modelBeta = 1.0
+        self.modelLevel = ConfigConst.DEFAULT_VAL
+        self.modelTrend = ConfigConst.DEFAULT_VAL
+        self.tolerance = ConfigConst.DEFAULT_VAL
+
+    def getModelAlpha(self) -> float:
+        return self.modelAlpha
+
+    def getModelBeta(self) -> float:
+        return self.modelBeta
+
+    def getModelLevel(self) -> float:
+        return self.modelLevel
+
+    def getModelTrend(self) -> float:
+        """
+        Returns the model's trend, in units per second.
+
+        @return float
+        """
+        return self.modelTrend
+
+    def getTolerance(self) -> float:
+        """
+        Returns the largest difference between the model's predictions and
+        the readings not sent.
+
+        @return float
+        """
+        return self.tolerance
+
+    def setModel(self, alpha: float, beta: float, level: float, trend: float, tolerance: float):
+        self.modelAlpha = alpha
+        self.modelBeta = beta
+        self.modelLevel = level
+        self.modelTrend = trend
+        self.tolerance = tolerance
+
+    def __str__(self) -> str:
+        return '{},modelAlpha={},modelBeta={},modelLevel={},modelTrend={},tolerance={}'.format(
+            super(SensorDataModel, self).__str__(),
+            self.modelAlpha, self.modelBeta, self.modelLevel, self.modelTrend, self.tolerance)
@@ -0,0 +1,129 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataModel import SensorDataModel
+from programmingtheiot.data.SensorDataSummary import SensorDataSummary
+
+class SensorDataPredictor(object):
+    """
+    Holt linear trend model of one sensor, shared by the sender and the
+    receiver of its readings. The sender only sends readings that differ
+    from the model's prediction by more than a tolerance, and both sides
+    update their model with exactly the readings sent, so the receiver can
+    fill in the readings not sent from its own predictions.
+
+    With an alpha and beta of 1.0 the model is the last value sent plus
+    the slope between the last two; with a beta of 0.0, it's the last
+    value sent.
+
+    Time stamps are truncated to microseconds, the precision of the ISO
+    8601 time stamps in JSON payloads, so both sides compute the same
+    intervals.
+
+    """
+
+    MICROS_IN_SECS = 1000000.0
+
+    __slots__ = ('alpha', 'beta', 'level', 'trend', 'timeStampMicros')
+
+    def __init__(self, alpha: float = 1.0, beta: float = 1.0):
+        """
+        Constructor.
+
+        @param alpha The level smoothing factor, from 0.0 (exclusive) to 1.0.
+        @param beta The trend smoothing factor, from 0.0 to 1.0.
+        """
+        self.alpha = alpha
+        self.beta = beta
+        self.level = 0.0
+        self.trend = 0.0
+        self.timeStampMicros = None
+
+    def hasState(self) -> bool:
+        return self.timeStampMicros is not None
+
+    def predict(self, timeStampNanos: int) -> float:
+        """
+        Returns the predicted value at the given time, or None if the model
+        hasn't had a reading yet.
+
+        @param timeStampNanos The time, in nanoseconds since Epoch.
+        @return float
+        """
+        if self.timeStampMicros is None:
+            return None
+
+        return self.level + self.trend * (timeStampNanos // 1000 - self.timeStampMicros) / self.MICROS_IN_SECS
+
+    def update(self, timeStampNanos: int, value: float):
+        """
+        Updates the model with a reading sent.
+
+        @param timeStampNanos The reading's time, in nanoseconds since Epoch.
+        @param value The reading's value.
+        """
+        timeStampMicros = timeStampNanos // 1000
+
+        if self.timeStampMicros is None:
+            self.level = value
+            self.trend = 0.0
+            self.timeStampMicros = timeStampMicros
+            return
+
+        elapsedSecs = (timeStampMicros - self.timeStampMicros) / self.MICROS_IN_SECS
+
+        if elapsedSecs <= 0.0:
+            # same (or an earlier) time: there's no interval to take a slope over
+            self.level = self.alpha * value + (1.0 - self.alpha) * self.level
+            return
+
+        level = self.alpha * value + (1.0 - self.alpha) * (self.level + self.trend * elapsedSecs)
+
+        self.trend = self.beta * (level - self.level) / elapsedSecs + (1.0 - self.beta) * self.trend
+        self.level = level
+        self.timeStampMicros = timeStampMicros
+
+    def apply(self, data: SensorData):
+        """
+        Updates the model with a reading received. A SensorDataModel
+        replaces the model's parameters and state; window summaries aren't
+        readings and are ignored.
+
+        @param data The reading.
+        """
+        if isinstance(data, SensorDataModel):
+            self.alpha = data.getModelAlpha()
+            self.beta = data.getModelBeta()
+            self.level = data.getModelLevel()
+            self.trend = data.getModelTrend()
+            self.timeStampMicros = data.getTimeStampNanos() // 1000
+
+        elif not isinstance(data, SensorDataSummary):
+            self.update(data.getTimeStampNanos(), data.getValue())
+
+    def toModel(self, data: SensorData, tolerance: float) -> SensorDataModel:
+        """
+        Returns a copy of a reading that carries the model's parameters and
+        current state, which should already include the reading.
+
+        @param data The reading.
+        @param tolerance The tolerance the sender applies.
+        @return SensorDataModel
+        """
+        model = SensorDataModel(typeID = data.getTypeID(), name = data.getName())
+        model.updateData(data)
+        model.hasError = data.hasErrorFlag()
+        model.setTimeStampNanos(data.getTimeStampNanos())
+        model.setModel(self.alpha, self.beta, self.level, self.trend, tolerance)
+
+        return model
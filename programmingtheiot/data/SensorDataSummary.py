@@ -0,0 +1,100 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.SensorData import SensorData
+
+class SensorDataSummary(SensorData):
+    """
+    Summary of one sensor's readings over a time window, sent upstream in
+    place of (or alongside) the readings themselves. The value is the mean,
+    and the time stamp is the end of the window.
+
+    Percentiles are keyed 'p' plus the percentile, e.g. 'p90'.
+
+    """
+
+    __slots__ = ('windowSecs', 'slideSecs', 'sampleCount', 'minValue', 'maxValue', 'stddev', 'percentiles')
+
+    def __init__(self, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, name = ConfigConst.NOT_SET, d = None):
+        super(SensorDataSummary, self).__init__(typeID = typeID, name = name, d = d)
+
+        self.windowSecs = 0.0
+        self.slideSecs = 0.0
+        self.sampleCount = 0
+        self.minValue = ConfigConst.DEFAULT_VAL
+        self.maxValue = ConfigConst.DEFAULT_VAL
+        self.stddev = ConfigConst.DEFAULT_VAL
+        self.percentiles = {}
+
+    def getWindowSecs(self) -> float:
+        return self.windowSecs
+
+    def getSlideSecs(self) -> float:
+        """
+        Returns how often windows of this size start: the window size for
+        tumbling windows, or less for sliding windows.
+
+        @return float
+        """
+        return self.slideSecs
+
+    def getSampleCount(self) -> int:
+        return self.sampleCount
+
+    def getMinValue(self) -> float:
+        return self.minValue
+
+    def getMaxValue(self) -> float:
+        return self.maxValue
+
+    def getStddev(self) -> float:
+        return self.stddev
+
+    def getPercentiles(self) -> dict:
+        return self.percentiles
+
+    def getPercentile(self, percentile: float) -> float:
+        """
+        Returns the given percentile, or None if it wasn't computed.
+
+        @param percentile The percentile, e.g. 90.
+        @return float
+        """
+        return self.percentiles.get(self.getPercentileKey(percentile))
+
+    @staticmethod
+    def getPercentileKey(percentile: float) -> str:
+        return 'p' + format(percentile, 'g')
+
+    def setWindow(self, windowSecs: float, slideSecs: float, sampleCount: int):
+        self.windowSecs = windowSecs
+        self.slideSecs = slideSecs
+        self.sampleCount = sampleCount
+
+    def setStats(self, mean: float, minValue: float, maxValue: float, stddev: float, percentiles: dict = None):
+        """
+        Sets the window statistics. The mean becomes the value.
+
+        @param percentiles Optional dict of values keyed by percentile (e.g. 90.0).
+        """
+        self.value = mean
+        self.minValue = minValue
+        self.maxValue = maxValue
+        self.stddev = stddev
+        self.percentiles = {self.getPercentileKey(percentile): val for percentile, val in percentiles.items()} if percentiles else {}
+
+    def __str__(self) -> str:
+        return '{},windowSecs={},slideSecs={},sampleCount={},minValue={},maxValue={},stddev={},percentiles={}'.format(
+            super(SensorDataSummary, self).__str__(),
+            self.windowSecs, self.slideSecs, self.sampleCount, self.minValue, self.maxValue, self.stddev, self.percentiles)
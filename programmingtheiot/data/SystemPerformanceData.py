@@ -19,6 +19,8 @@ class SystemPerformanceData(BaseIotData):
 	Shell representation of class for student implementation.
 	
 	"""
+	__slots__ = ('cpuUtilization', 'memUtilization')
+	
 	DEFAULT_VAL = 0.0
 	
 	def __init__(self, d = None):
@@ -0,0 +1,156 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import struct
+
+import numpy as calcLib
+
+from programmingtheiot.data.TimeSeriesEncoder import TimeSeriesEncoder
+
+class TimeSeriesDecoder(object):
+    """
+    Streaming decoder of a block written by TimeSeriesEncoder. Iterating
+    over the decoder yields its readings one at a time, oldest first, as
+    (timeStampNanos, value) tuples; decodeAll() returns them as arrays.
+
+    """
+
+    def __init__(self, block: bytes):
+        """
+        Constructor. Reads the block header.
+
+        @param block The block, as returned by TimeSeriesEncoder.getBytes().
+        @exception ValueError If the block is truncated or of an unknown version.
+        """
+        headerFormat = TimeSeriesEncoder.HEADER_FORMAT
+
+        if len(block) < headerFormat.size:
+            raise ValueError(f"Time series block too short: {len(block)} bytes.")
+
+        version, self.typeID, self.count, self.resolutionNanos, nameLength = headerFormat.unpack_from(block)
+
+        if version != TimeSeriesEncoder.VERSION:
+            raise ValueError(f"Unsupported time series block version: {version}.")
+
+        self.name = bytes(block[headerFormat.size:headerFormat.size + nameLength]).decode('utf-8', errors = 'ignore')
+        self.block = block
+        self.dataOffset = headerFormat.size + nameLength
+
+    def __len__(self) -> int:
+        return self.count
+
+    def getCount(self) -> int:
+        return self.count
+
+    def getName(self) -> str:
+        return self.name
+
+    def getResolutionNanos(self) -> int:
+        return self.resolutionNanos
+
+    def getTypeID(self) -> int:
+        return self.typeID
+
+    def __iter__(self):
+        reader = self.BitReader(self.block, self.dataOffset)
+        read = reader.read
+
+        doubleFormat = TimeSeriesEncoder.DOUBLE_FORMAT
+        longFormat = TimeSeriesEncoder.LONG_FORMAT
+        resolutionNanos = self.resolutionNanos
+
+        if self.count == 0:
+            return
+
+        timeStamp = self._signed(read(64), 64)
+        valueBits = read(64)
+        delta = 0
+        leading = 0
+        trailing = 0
+
+        yield (timeStamp * resolutionNanos, doubleFormat.unpack(longFormat.pack(valueBits))[0])
+
+        for i in range(1, self.count):
+            if read(1) == 0:
+                deltaOfDelta = 0
+            elif read(1) == 0:
+                deltaOfDelta = self._signed(read(7), 7)
+            elif read(1) == 0:
+                deltaOfDelta = self._signed(read(9), 9)
+            elif read(1) == 0:
+                deltaOfDelta = self._signed(read(12), 12)
+            elif read(1) == 0:
+                deltaOfDelta = self._signed(read(32), 32)
+            else:
+                deltaOfDelta = self._signed(read(64), 64)
+
+            delta += deltaOfDelta
+            timeStamp += delta
+
+            if read(1) == 1:
+                if read(1) == 1:
+                    control = read(11)
+                    leading = control >> 6
+                    length = (control & 0x3F) or 64
+                    trailing = 64 - leading - length
+
+                valueBits ^= read(64 - leading - trailing) << trailing
+
+            yield (timeStamp * resolutionNanos, doubleFormat.unpack(longFormat.pack(valueBits))[0])
+
+    def decodeAll(self) -> tuple:
+        """
+        Decodes all readings.
+
+        @return tuple (timeStamps, values) arrays, oldest first.
+        """
+        timeStamps = calcLib.empty(self.count, dtype = calcLib.int64)
+        values = calcLib.empty(self.count, dtype = calcLib.float64)
+
+        for i, (timeStampNanos, value) in enumerate(self):
+            timeStamps[i] = timeStampNanos
+            values[i] = value
+
+        return (timeStamps, values)
+
+    def _signed(self, value: int, bitCount: int) -> int:
+        return value - (1 << bitCount) if value >> (bitCount - 1) else value
+
+    class BitReader(object):
+        __slots__ = ('block', 'offset', 'bits', 'bitCount')
+
+        def __init__(self, block: bytes, offset: int):
+            self.block = block
+            self.offset = offset
+            self.bits = 0
+            self.bitCount = 0
+
+        def read(self, bitCount: int) -> int:
+            if self.bitCount < bitCount:
+                # refill 8 bytes at a time, padding past the end with zeros
+                chunk = bytes(self.block[self.offset:self.offset + 8])
+
+                if len(chunk) < 8:
+                    if (self.bitCount + len(chunk) * 8) < bitCount:
+                        raise ValueError("Time series block truncated.")
+
+                    chunk += bytes(8 - len(chunk))
+
+                self.bits = (self.bits << 64) | int.from_bytes(chunk, 'big')
+                self.bitCount += 64
+                self.offset += 8
+
+            self.bitCount -= bitCount
+            value = self.bits >> self.bitCount
+            self.bits &= (1 << self.bitCount) - 1
+
+            return value
@@ -0,0 +1,215 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import struct
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+class TimeSeriesEncoder(object):
+    """
+    Streaming encoder of one sensor's readings into a compressed block, in
+    the style of Facebook's Gorilla (Pelkonen et al., 2015): time stamps as
+    delta-of-deltas, and values XOR'ed with the previous value, so regular
+    intervals and slowly changing values take a few bits per reading.
+
+    Block layout (big-endian):
+
+        version      1 byte
+        typeID       2 bytes
+        count        4 bytes   number of readings
+        resolution   4 bytes   time stamp resolution, in nanoseconds
+        nameLength   1 byte
+        name         nameLength bytes, UTF-8
+        bits         the readings, padded with 0 bits to a whole byte
+
+    Each time stamp is stored as its delta-of-delta, in multiples of the
+    resolution (microseconds by default, as in JSON payloads; finer
+    digits are dropped), as a two's complement field of the bucket's width
+    (so -64 to 63 rather than the Gorilla paper's -63 to 64):
+
+        0                        delta-of-delta of 0
+        10    + 7 bits           -64 to 63
+        110   + 9 bits           -256 to 255
+        1110  + 12 bits          -2048 to 2047
+        11110 + 32 bits          any other 32-bit value
+        11111 + 64 bits          anything else
+
+    The first value is stored as its 64 bits. Each later value is XOR'ed
+    with the one before it:
+
+        0                        the same value
+        10   + meaningful bits   within the previous leading / trailing zeros
+        11   + 5 bits leading zeros + 6 bits length (0 = 64) + meaningful bits
+
+    Values round-trip exactly, including NaN, infinities and -0.0.
+
+    Readings can be appended at any time, and getBytes() returns a complete
+    block of the readings so far, so the encoder can back a growing buffer.
+
+    """
+
+    VERSION = 1
+
+    HEADER_FORMAT = struct.Struct('!BhIIB')
+
+    DEFAULT_RESOLUTION_NANOS = 1000
+
+    DOUBLE_FORMAT = struct.Struct('!d')
+    LONG_FORMAT = struct.Struct('!Q')
+
+    def __init__(self, typeID: int = ConfigConst.DEFAULT_SENSOR_TYPE, name: str = ConfigConst.NOT_SET, resolutionNanos: int = DEFAULT_RESOLUTION_NANOS):
+        """
+        Constructor.
+
+        @param typeID The sensor type ID.
+        @param name The sensor name; up to 255 bytes as UTF-8.
+        @param resolutionNanos The time stamp resolution, in nanoseconds.
+        """
+        self.typeID = typeID
+        self.name = name
+        self.resolutionNanos = max(int(resolutionNanos), 1)
+
+        self.count = 0
+
+        # finished bytes, and up to 63 pending bits
+        self.buffer = bytearray()
+        self.bits = 0
+        self.bitCount = 0
+
+        self.prevTime = 0
+        self.prevDelta = 0
+        self.prevBits = 0
+        self.prevLeading = 65
+        self.prevTrailing = 0
+
+    def __len__(self) -> int:
+        return self.count
+
+    def getCount(self) -> int:
+        return self.count
+
+    def getSize(self) -> int:
+        """
+        Returns the size, in bytes, of the block getBytes() would return.
+
+        @return int
+        """
+        return self.HEADER_FORMAT.size + len(self._getNameBytes()) + len(self.buffer) + (self.bitCount + 7) // 8
+
+    def append(self, timeStampNanos: int, value: float):
+        """
+        Adds a reading. Time stamps are expected in order, but needn't be.
+
+        @param timeStampNanos The reading time stamp as nanoseconds since Epoch.
+        @param value The reading value.
+        """
+        timeStamp = int(timeStampNanos) // self.resolutionNanos
+        valueBits = self.LONG_FORMAT.unpack(self.DOUBLE_FORMAT.pack(value))[0]
+
+        if self.count == 0:
+            self._write(timeStamp & 0xFFFFFFFFFFFFFFFF, 64)
+            self._write(valueBits, 64)
+
+            self.prevTime = timeStamp
+            self.prevBits = valueBits
+            self.count = 1
+            return
+
+        delta = timeStamp - self.prevTime
+        deltaOfDelta = delta - self.prevDelta
+
+        if deltaOfDelta == 0:
+            self._write(0, 1)
+        elif -64 <= deltaOfDelta <= 63:
+            self._write((0b10 << 7) | (deltaOfDelta & 0x7F), 9)
+        elif -256 <= deltaOfDelta <= 255:
+            self._write((0b110 << 9) | (deltaOfDelta & 0x1FF), 12)
+        elif -2048 <= deltaOfDelta <= 2047:
+            self._write((0b1110 << 12) | (deltaOfDelta & 0xFFF), 16)
+        elif -0x80000000 <= deltaOfDelta <= 0x7FFFFFFF:
+            self._write((0b11110 << 32) | (deltaOfDelta & 0xFFFFFFFF), 37)
+        else:
+            self._write(0b11111, 5)
+            self._write(deltaOfDelta & 0xFFFFFFFFFFFFFFFF, 64)
+
+        self.prevTime = timeStamp
+        self.prevDelta = delta
+
+        xor = valueBits ^ self.prevBits
+
+        if xor == 0:
+            self._write(0, 1)
+        else:
+            leading = min(64 - xor.bit_length(), 31)
+            trailing = (xor & -xor).bit_length() - 1
+
+            if leading >= self.prevLeading and trailing >= self.prevTrailing:
+                length = 64 - self.prevLeading - self.prevTrailing
+                self._write((0b10 << length) | (xor >> self.prevTrailing), length + 2)
+            else:
+                length = 64 - leading - trailing
+                self._write((0b11 << 11) | (leading << 6) | (length & 0x3F), 13)
+                self._write(xor >> trailing, length)
+
+                self.prevLeading = leading
+                self.prevTrailing = trailing
+
+        self.prevBits = valueBits
+        self.count += 1
+
+    def appendAll(self, timeStamps, values):
+        """
+        Adds readings from sequences (e.g. NumPy arrays) of time stamps and
+        values.
+
+        @param timeStamps The time stamps as nanoseconds since Epoch.
+        @param values The values.
+        """
+        for timeStampNanos, value in zip(timeStamps, values):
+            self.append(timeStampNanos, value)
+
+    def getBytes(self) -> bytes:
+        """
+        Returns the block of the readings appended so far. More readings can
+        be appended afterwards.
+
+        @return bytes
+        """
+        nameBytes = self._getNameBytes()
+        header = self.HEADER_FORMAT.pack(self.VERSION, self.typeID, self.count, self.resolutionNanos, len(nameBytes))
+
+        pending = b''
+
+        if self.bitCount:
+            byteCount = (self.bitCount + 7) // 8
+            pending = (self.bits << (byteCount * 8 - self.bitCount)).to_bytes(byteCount, 'big')
+
+        return header + nameBytes + bytes(self.buffer) + pending
+
+    def _getNameBytes(self) -> bytes:
+        return (self.name or '').encode('utf-8')[:255]
+
+    def _write(self, value: int, bitCount: int):
+        bits = (self.bits << bitCount) | value
+        bitCount += self.bitCount
+
+        if bitCount >= 64:
+            byteCount = bitCount >> 3
+            remaining = bitCount & 7
+
+            self.buffer += (bits >> remaining).to_bytes(byteCount, 'big')
+
+            bits &= (1 << remaining) - 1
+            bitCount = remaining
+
+        self.bits = bits
+        self.bitCount = bitCount
@@ -0,0 +1,83 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import cbor2
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.codecs.IDataCodec import IDataCodec
+
+class CborDataCodec(IDataCodec):
+    """
+    CBOR payload codec (requires the 'cbor2' package). To avoid sending
+    the long attribute names with every message, the payload is a CBOR
+    array of values in the data class's field table order - see
+    DataUtil.toFieldValues().
+    
+    """
+    
+    def __init__(self):
+        self.dataUtil = DataUtil()
+        
+    def getName(self) -> str:
+        return ConfigConst.CBOR_CODEC
+    
+    def getContentFormat(self) -> int:
+        return ConfigConst.CBOR_CONTENT_FORMAT
+    
+    def getTopicSuffix(self) -> str:
+        return ConfigConst.CBOR_TOPIC_SUFFIX
+    
+    def canEncode(self, data: BaseIotData) -> bool:
+        return isinstance(data, BaseIotData)
+    
+    def encode(self, data: BaseIotData) -> bytes:
+        return cbor2.dumps(self.dataUtil.toFieldValues(data))
+    
+    def decode(self, payload: bytes, dataClass) -> BaseIotData:
+        if not payload:
+            return None
+        
+        data = dataClass()
+        self.dataUtil.fillFromFieldValues(data, cbor2.loads(payload))
+        
+        return data
+    
+    def joinPayloads(self, payloads: list) -> bytes:
+        # CBOR array header (major type 4) followed by the encoded items
+        count = len(payloads)
+        
+        if count < 24:
+            header = bytes([0x80 | count])
+        elif count < 0x100:
+            header = bytes([0x98, count])
+        elif count < 0x10000:
+            header = b'\x99' + count.to_bytes(2, 'big')
+        else:
+            header = b'\x9a' + count.to_bytes(4, 'big')
+            
+        return header + b''.join(payloads)
+    
+    def decodeBatch(self, payload: bytes, dataClass) -> list:
+        if not payload:
+            return []
+        
+        dataList = []
+        
+        for values in cbor2.loads(payload):
+            data = dataClass()
+            self.dataUtil.fillFromFieldValues(data, values)
+            dataList.append(data)
+            
+        return dataList
@@ -0,0 +1,97 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+
+class IDataCodec():
+	"""
+	Interface definition for payload codecs. A codec converts data
+	containers to and from wire payloads, and describes how its use
+	is signalled to the remote end (CoAP Content-Format and MQTT
+	topic suffix).
+	
+	"""
+	
+	def getName(self) -> str:
+		"""
+		Returns the codec name, as used in the 'payloadCodec' configuration key.
+		
+		@return str
+		"""
+		pass
+	
+	def getContentFormat(self) -> int:
+		"""
+		Returns the CoAP Content-Format ID for payloads produced by this codec.
+		
+		@return int
+		"""
+		pass
+	
+	def getTopicSuffix(self) -> str:
+		"""
+		Returns the suffix to append to MQTT topics for payloads produced by
+		this codec. The default JSON codec uses an empty suffix.
+		
+		@return str
+		"""
+		pass
+	
+	def canEncode(self, data: BaseIotData) -> bool:
+		"""
+		Checks if this codec can represent 'data'. Callers should fall back
+		to the JSON codec if not.
+		
+		@param data The data container to check.
+		@return bool True if supported; False otherwise.
+		"""
+		pass
+	
+	def encode(self, data: BaseIotData) -> bytes:
+		"""
+		Encodes 'data' into a wire payload.
+		
+		@param data The data container to encode.
+		@return bytes The encoded payload.
+		"""
+		pass
+	
+	def decode(self, payload: bytes, dataClass) -> BaseIotData:
+		"""
+		Decodes 'payload' into a new instance of 'dataClass'.
+		
+		@param payload The wire payload.
+		@param dataClass The BaseIotData sub-class to create.
+		@return BaseIotData The decoded instance, or None if the payload is empty.
+		"""
+		pass
+	
+	def joinPayloads(self, payloads: list) -> bytes:
+		"""
+		Combines payloads previously produced by encode() into a single
+		array payload, without decoding or re-encoding them.
+		
+		@param payloads The list of encoded payloads.
+		@return bytes The array payload.
+		"""
+		pass
+	
+	def decodeBatch(self, payload: bytes, dataClass) -> list:
+		"""
+		Decodes an array payload produced by joinPayloads() into a list of
+		new 'dataClass' instances.
+		
+		@param payload The array payload.
+		@param dataClass The BaseIotData sub-class to create.
+		@return list The decoded instances (empty if the payload is empty).
+		"""
+		pass
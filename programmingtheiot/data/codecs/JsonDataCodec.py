@@ -0,0 +1,69 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.codecs.IDataCodec import IDataCodec
+
+class JsonDataCodec(IDataCodec):
+    """
+    JSON payload codec. Uses the default (indented) DataUtil format, or
+    the compact format if 'useCompactFormat' is set. Both are readable
+    by the GDA, so neither changes the topic or Content-Format.
+    
+    """
+    
+    def __init__(self, useCompactFormat: bool = False):
+        self.useCompactFormat = useCompactFormat
+        self.dataUtil = DataUtil(encodeToUtf8 = True, useCompactFormat = useCompactFormat)
+        
+    def getName(self) -> str:
+        return ConfigConst.JSON_COMPACT_CODEC if self.useCompactFormat else ConfigConst.JSON_CODEC
+    
+    def getContentFormat(self) -> int:
+        return ConfigConst.JSON_CONTENT_FORMAT
+    
+    def getTopicSuffix(self) -> str:
+        return ''
+    
+    def canEncode(self, data: BaseIotData) -> bool:
+        return data is not None
+    
+    def encode(self, data: BaseIotData) -> bytes:
+        return self.dataUtil._objectToJson(data)
+    
+    def decode(self, payload: bytes, dataClass) -> BaseIotData:
+        if not payload:
+            return None
+        
+        data = dataClass()
+        self.dataUtil._fillIotDataFromDict(data, self.dataUtil._jsonToDict(payload))
+        
+        return data
+    
+    def joinPayloads(self, payloads: list) -> bytes:
+        return b'[' + b','.join(payloads) + b']'
+    
+    def decodeBatch(self, payload: bytes, dataClass) -> list:
+        if not payload:
+            return []
+        
+        dataList = []
+        
+        for entry in self.dataUtil._jsonToDict(payload):
+            data = dataClass()
+            self.dataUtil._fillIotDataFromDict(data, entry)
+            dataList.append(data)
+            
+        return dataList
@@ -0,0 +1,94 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# You may find it more helpful to your design to adjust the
+# functionality, constants and interfaces (if there are any)
+# provided within in order to meet the needs of your specific
+# Programming the Internet of Things project.
+# 
+
+import struct
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.BaseIotData import BaseIotData
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.codecs.IDataCodec import IDataCodec
+
+class StructDataCodec(IDataCodec):
+    """
+    Fixed-layout binary codec for SensorData only. Each payload is 20 bytes
+    in network byte order:
+    
+      typeID (uint16) | statusCode (int16) | timeStamp (int64, ns since Epoch) | value (float64)
+    
+    The name is not sent; it's restored from the type ID for the known
+    sensor types, and the location ID is implied by the connection. Other
+    data types aren't supported, so callers should fall back to JSON.
+    
+    Array payloads are a uint32 record count followed by the records.
+    
+    """
+    
+    SENSOR_DATA_FORMAT = struct.Struct('!Hhqd')
+    BATCH_COUNT_FORMAT = struct.Struct('!I')
+    
+    SENSOR_NAMES = {
+        ConfigConst.HUMIDITY_SENSOR_TYPE: ConfigConst.HUMIDITY_SENSOR_NAME,
+        ConfigConst.PRESSURE_SENSOR_TYPE: ConfigConst.PRESSURE_SENSOR_NAME,
+        ConfigConst.TEMP_SENSOR_TYPE: ConfigConst.TEMP_SENSOR_NAME
+    }
+    
+    def getName(self) -> str:
+        return ConfigConst.STRUCT_CODEC
+    
+    def getContentFormat(self) -> int:
+        return ConfigConst.STRUCT_CONTENT_FORMAT
+    
+    def getTopicSuffix(self) -> str:
+        return ConfigConst.STRUCT_TOPIC_SUFFIX
+    
+    def canEncode(self, data: BaseIotData) -> bool:
+        # sub-classes (e.g. SensorDataSummary) have fields the layout can't hold,
+        # and the type ID and status code must fit their 16-bit fields
+        return type(data) is SensorData and 0 <= data.getTypeID() <= 0xFFFF and -0x8000 <= data.getStatusCode() <= 0x7FFF
+    
+    def encode(self, data: BaseIotData) -> bytes:
+        timeStampNanos = data.getTimeStampNanos()
+        
+        return self.SENSOR_DATA_FORMAT.pack(
+            data.getTypeID(),
+            data.getStatusCode(),
+            timeStampNanos if timeStampNanos is not None else 0,
+            data.getValue())
+    
+    def decode(self, payload: bytes, dataClass = SensorData) -> BaseIotData:
+        if not payload:
+            return None
+        
+        typeID, statusCode, timeStampNanos, value = self.SENSOR_DATA_FORMAT.unpack(payload)
+        
+        data = SensorData(typeID = typeID, name = self.SENSOR_NAMES.get(typeID, ConfigConst.NOT_SET))
+        data.value = value
+        data.setStatusCode(statusCode)
+        
+        if timeStampNanos:
+            data.setTimeStampNanos(timeStampNanos)
+            
+        return data
+    
+    def joinPayloads(self, payloads: list) -> bytes:
+        return self.BATCH_COUNT_FORMAT.pack(len(payloads)) + b''.join(payloads)
+    
+    def decodeBatch(self, payload: bytes, dataClass = SensorData) -> list:
+        if not payload:
+            return []
+        
+        count, = self.BATCH_COUNT_FORMAT.unpack_from(payload)
+        offset = self.BATCH_COUNT_FORMAT.size
+        recordSize = self.SENSOR_DATA_FORMAT.size
+        
+        return [self.decode(payload[offset + i * recordSize : offset + (i + 1) * recordSize], dataClass) for i in range(0, count)]
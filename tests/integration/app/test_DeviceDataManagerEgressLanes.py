@@ -0,0 +1,183 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import statistics
+import threading
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DeviceDataManagerEgressLanesTest(unittest.TestCase):
+	"""
+	This test case class measures actuator round-trip latency - from an
+	incoming actuator command to its response reaching the upstream sink -
+	while humidity telemetry is offered faster than the sink can send it,
+	with and without the egress lanes (see 'enableEgressLanes' in
+	PiotConfig.props, which is turned on for the test). Batching, the deadband filter and anomaly detection
+	are turned off, so every reading is a send.
+
+	"""
+	NS_IN_MILLIS = 1000000
+
+	SINK_DELAY_SECS = 0.002
+	TELEMETRY_INTERVAL_SECS = 0.0005
+	COMMAND_INTERVAL_SECS = 0.05
+	COMMAND_COUNT = 40
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	class TimedSink():
+		"""
+		Stands in for the MQTT client, taking SINK_DELAY_SECS per send and
+		recording when each actuator response was sent.
+
+		"""
+		def __init__(self, delay: float):
+			self.delay = delay
+			self.sendCount = 0
+			self.responseTimes = {}
+
+		def getCodec(self):
+			return DataUtil.getCodec()
+
+		def publishData(self, resource = None, data = None, qos = ConfigConst.DEFAULT_QOS, useSpool = True) -> bool:
+			data.getPayload(self.getCodec())
+			time.sleep(self.delay)
+			self.sendCount += 1
+
+			if resource == ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE:
+				self.responseTimes[int(data.getData().getValue())] = time.perf_counter_ns()
+
+			return True
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		logging.info("Testing DeviceDataManager egress lanes...")
+
+		# the lanes, and the pipeline they're compared with, are opt-in, so
+		# they're turned on for these tests
+		self.config = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.savedConfig = {key: self.config.get(ConfigConst.CONSTRAINED_DEVICE, key, fallback = None) \
+			for key in (ConfigConst.ENABLE_UPSTREAM_PIPELINE_KEY, ConfigConst.ENABLE_EGRESS_LANES_KEY)}
+
+		for key in self.savedConfig:
+			self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, 'True')
+
+	@classmethod
+	def tearDownClass(self):
+		for key, val in self.savedConfig.items():
+			if val is None:
+				self.config.remove_option(ConfigConst.CONSTRAINED_DEVICE, key)
+			else:
+				self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, val)
+
+	def setUp(self):
+		self.ddMgr = DeviceDataManager(noComms = True)
+		self.sink = self.TimedSink(self.SINK_DELAY_SECS)
+		self.ddMgr.mqttClient = self.sink
+		self.ddMgr.upstreamBatcher = None
+		self.ddMgr.deadbandFilter = None
+		self.ddMgr.anomalyDetector = None
+
+		if not self.ddMgr.actuatorAdapterManager:
+			self.skipTest("Actuation is disabled in PiotConfig.props.")
+
+	def tearDown(self):
+		if self.ddMgr.egressLanes:
+			self.ddMgr.egressLanes.stop()
+
+		if self.ddMgr.upstreamPipeline:
+			self.ddMgr.upstreamPipeline.stop()
+
+	def testActuatorLatencyWithoutLanes(self):
+		# for comparison: responses share the pipeline queues with telemetry,
+		# so they wait behind it and can be dropped with it
+		self.ddMgr.egressLanes = None
+
+		self._execTestActuatorLatency("without lanes")
+
+	def testActuatorLatencyWithLanes(self):
+		latencies = self._execTestActuatorLatency("with lanes")
+
+		self.assertEqual(len(latencies), self.COMMAND_COUNT)
+
+		# a response waits at most for the send in progress when it arrives
+		self.assertLess(statistics.median(latencies), self.SINK_DELAY_SECS * 1000 * 5)
+
+	def _execTestActuatorLatency(self, label: str) -> list:
+		# only the upstream path is started, so sensing and system performance
+		# polling don't add their own messages
+		if self.ddMgr.upstreamPipeline:
+			self.ddMgr.upstreamPipeline.start()
+
+		if self.ddMgr.egressLanes:
+			self.ddMgr.egressLanes.start()
+
+		locationID = ConfigUtil().getProperty(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_LOCATION_ID_KEY, ConfigConst.NOT_SET)
+		isFlooding = threading.Event()
+		isFlooding.set()
+
+		def flood():
+			while isFlooding.is_set():
+				sd = SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, name = ConfigConst.HUMIDITY_SENSOR_NAME)
+				sd.setValue(40.0)
+				self.ddMgr.handleSensorMessage(sd)
+				time.sleep(self.TELEMETRY_INTERVAL_SECS)
+
+		floodThread = threading.Thread(target = flood, daemon = True)
+		floodThread.start()
+
+		# let the queues fill
+		time.sleep(0.5)
+
+		commandTimes = {}
+
+		for i in range(0, self.COMMAND_COUNT):
+			ad = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+			ad.setLocationID(locationID)
+			ad.setCommand(ConfigConst.COMMAND_ON)
+			ad.setValue(float(i))
+
+			commandTimes[i] = time.perf_counter_ns()
+			self.ddMgr.handleActuatorCommandMessage(ad)
+
+			time.sleep(self.COMMAND_INTERVAL_SECS)
+
+		# give the last responses time to arrive before the flood stops
+		time.sleep(1.0)
+		isFlooding.clear()
+		floodThread.join()
+
+		latencies = [(self.sink.responseTimes[i] - commandTimes[i]) / self.NS_IN_MILLIS \
+			for i in commandTimes.keys() if i in self.sink.responseTimes]
+		latencies.sort()
+
+		logging.info( \
+			"\n\tTesting actuator latency: %s | responses = %r/%r | median = %.2f ms | p95 = %.2f ms | max = %.2f ms | telemetry sent = %r | dropped = %r", \
+			label, len(latencies), self.COMMAND_COUNT, statistics.median(latencies) if latencies else 0.0, \
+			latencies[int(len(latencies) * 0.95) - 1] if latencies else 0.0, latencies[-1] if latencies else 0.0, \
+			self.sink.sendCount - len(latencies), \
+			sum(stage['dropped'] for stage in self.ddMgr.getUpstreamPipelineMetrics().values()) + \
+			sum(lane['dropped'] for lane in self.ddMgr.getEgressLaneMetrics().values()))
+
+		return latencies
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,175 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DeviceDataManagerPipelineTest(unittest.TestCase):
+	"""
+	This test case class checks that sensor polling keeps its cadence
+	while the upstream sink is slow, with the upstream pipeline enabled
+	(see 'enableUpstreamPipeline' in PiotConfig.props, which is turned on
+	for the test). The poll cycle
+	is shortened so the test completes quickly.
+
+	"""
+	NS_IN_MILLIS = 1000000
+
+	POLL_CYCLE_SECS = 0.1
+	POLL_CYCLES = 30
+	SINK_DELAY_SECS = 0.5
+	DRAIN_MESSAGE_COUNT = 10
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	class SlowSink():
+		"""
+		Stands in for the MQTT client, taking SINK_DELAY_SECS per send.
+
+		"""
+		def __init__(self, delay: float):
+			self.delay = delay
+			self.sendCount = 0
+
+		def getCodec(self):
+			return DataUtil.getCodec()
+
+		def publishData(self, resource = None, data = None, qos = ConfigConst.DEFAULT_QOS, useSpool = True) -> bool:
+			data.getPayload(self.getCodec())
+			time.sleep(self.delay)
+			self.sendCount += 1
+			return True
+
+		def unsubscribeFromTopic(self, resource = None) -> bool:
+			return True
+
+		def disconnectClient(self) -> bool:
+			return True
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		logging.info("Testing DeviceDataManager upstream pipeline...")
+
+		# the pipeline is opt-in, so it's turned on for these tests
+		self.config = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.savedConfig = {key: self.config.get(ConfigConst.CONSTRAINED_DEVICE, key, fallback = None) for key in (ConfigConst.ENABLE_UPSTREAM_PIPELINE_KEY,)}
+
+		for key in self.savedConfig:
+			self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, 'True')
+
+	@classmethod
+	def tearDownClass(self):
+		for key, val in self.savedConfig.items():
+			if val is None:
+				self.config.remove_option(ConfigConst.CONSTRAINED_DEVICE, key)
+			else:
+				self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, val)
+
+	def setUp(self):
+		self.ddMgr = DeviceDataManager(noComms = True)
+		self.sink = self.SlowSink(self.SINK_DELAY_SECS)
+		self.ddMgr.mqttClient = self.sink
+
+		# send each message on its own and from the transmit workers, so the
+		# sink sees every one
+		self.ddMgr.upstreamBatcher = None
+		self.ddMgr.egressLanes = None
+		self.ddMgr.anomalyDetector = None
+
+	def tearDown(self):
+		if self.ddMgr.upstreamPipeline:
+			self.ddMgr.upstreamPipeline.stop()
+
+	def testPollingCadenceWithSlowSink(self):
+		self.ddMgr.upstreamPipeline.start()
+
+		maxPollMillis, maxDriftMillis = self._execPollCycles(self.POLL_CYCLES)
+		metrics = self.ddMgr.getUpstreamPipelineMetrics()
+		transmitMetrics = metrics[ConfigConst.TRANSMIT_STAGE]
+
+		logging.info( \
+			"\n\tTesting pipeline: cycles = %r | max poll = %.3f ms | max drift = %.3f ms | sent = %r | dropped = %r | transmit queue max = %r | avg transmit = %.1f ms", \
+			self.POLL_CYCLES, maxPollMillis, maxDriftMillis, self.sink.sendCount, \
+			sum(stage['dropped'] for stage in metrics.values()), transmitMetrics['maxQueueDepth'], transmitMetrics['avgServiceMillis'])
+
+		# a poll cycle must never wait on the sink, and ticks must stay on schedule
+		self.assertLess(maxPollMillis, self.SINK_DELAY_SECS * 1000 / 10)
+		self.assertLess(maxDriftMillis, self.POLL_CYCLE_SECS * 1000)
+
+		# the sink can't keep up, so the pipeline has to shed load rather than grow
+		self.assertGreater(self.sink.sendCount, 0)
+		self.assertLessEqual(transmitMetrics['maxQueueDepth'], self.ddMgr.upstreamPipeline.getStage(ConfigConst.TRANSMIT_STAGE).queue.maxsize)
+
+	def testStopManagerDrainsPipeline(self):
+		# readings still in the pipeline are sent before the sink disconnects
+		self.sink.delay = self.SINK_DELAY_SECS / 10
+		self.ddMgr.upstreamPipeline.start()
+
+		for i in range(0, self.DRAIN_MESSAGE_COUNT):
+			sd = SensorData(typeID = ConfigConst.PRESSURE_SENSOR_TYPE)
+			sd.setValue(1000.0 + i)
+			self.ddMgr.handleSensorMessage(sd)
+
+		self.ddMgr.stopManager()
+
+		self.assertEqual(self.sink.sendCount, self.DRAIN_MESSAGE_COUNT)
+
+	def testPollingCadenceInline(self):
+		# for comparison: without the pipeline, each poll cycle waits on the sink
+		self.ddMgr.upstreamPipeline = None
+
+		maxPollMillis, maxDriftMillis = self._execPollCycles(2)
+
+		logging.info( \
+			"\n\tTesting inline: cycles = %r | max poll = %.3f ms | max drift = %.3f ms", \
+			2, maxPollMillis, maxDriftMillis)
+
+		self.assertGreaterEqual(maxPollMillis, self.SINK_DELAY_SECS * 1000)
+
+	def _execPollCycles(self, cycles: int) -> tuple:
+		# mirrors SensorAdapterManager.handleTelemetry(): three readings per cycle
+		maxPollNanos = 0
+		maxDriftNanos = 0
+
+		startTime = time.perf_counter_ns()
+		cycleNanos = int(self.POLL_CYCLE_SECS * 1000000000)
+
+		for cycle in range(0, cycles):
+			scheduledTime = startTime + cycle * cycleNanos
+			pollStartTime = time.perf_counter_ns()
+
+			for typeID in (ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.PRESSURE_SENSOR_TYPE, ConfigConst.TEMP_SENSOR_TYPE):
+				sd = SensorData(typeID = typeID)
+				sd.setValue(float(cycle))
+				self.ddMgr.handleSensorMessage(sd)
+
+			pollEndTime = time.perf_counter_ns()
+
+			maxPollNanos = max(maxPollNanos, pollEndTime - pollStartTime)
+			maxDriftNanos = max(maxDriftNanos, pollStartTime - scheduledTime)
+
+			sleepNanos = scheduledTime + cycleNanos - time.perf_counter_ns()
+
+			if sleepNanos > 0:
+				time.sleep(sleepNanos / 1000000000)
+
+		return (maxPollNanos / self.NS_IN_MILLIS, maxDriftNanos / self.NS_IN_MILLIS)
+
+if __name__ == "__main__":
+	unittest.main()
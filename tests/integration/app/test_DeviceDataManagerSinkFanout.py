@@ -0,0 +1,223 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import statistics
+import threading
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DeviceDataManagerSinkFanoutTest(unittest.TestCase):
+	"""
+	This test case class measures how long DeviceDataManager takes to send
+	each sensor message upstream to stand-ins for the MQTT and CoAP
+	clients, sending to one after the other and with the sinks fanned out
+	(see 'enableSinkFanout' in PiotConfig.props, which is turned on for the
+	test), and with a CoAP sink
+	that never responds. The pipeline, batching, deadband filter, anomaly
+	detection and egress lanes are turned off, so each message is sent on
+	the caller's thread. It also measures how long an actuator response
+	takes to reach sinks slower than their timeout, which have a backlog
+	of telemetry handed over by the egress lanes.
+
+	"""
+	NS_IN_MILLIS = 1000000
+
+	MQTT_DELAY_SECS = 0.02
+	COAP_DELAY_SECS = 0.03
+	MESSAGE_COUNT = 50
+
+	SLOW_DELAY_SECS = 0.3
+	SLOW_TIMEOUT_SECS = 0.1
+	SLOW_MESSAGE_COUNT = 12
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	class DelayedSink():
+		"""
+		Stands in for the MQTT or CoAP client, taking 'delay' seconds per
+		send, or never finishing while 'isDead' is set.
+
+		"""
+		def __init__(self, delay: float):
+			self.delay = delay
+			self.sendCount = 0
+			self.sentTimes = {}
+			self.isDead = threading.Event()
+
+		def getCodec(self):
+			return DataUtil.getCodec()
+
+		def publishData(self, resource = None, data = None, qos = ConfigConst.DEFAULT_QOS, useSpool = True) -> bool:
+			return self._send(resource, data)
+
+		def sendPutData(self, resource = None, name = None, enableCON = False, data = None, timeout = None, useSpool = True) -> bool:
+			return self._send(resource, data)
+
+		def _send(self, resource, data) -> bool:
+			data.getPayload(self.getCodec())
+
+			# a dead sink holds the sender until the test ends
+			while self.isDead.is_set():
+				time.sleep(0.1)
+
+			time.sleep(self.delay)
+
+			# actuator responses (e.g. from rules added to the config)
+			# aren't counted
+			if resource == ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE:
+				self.sendCount += 1
+
+			self.sentTimes[id(data.getData())] = time.perf_counter_ns()
+
+			return True
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		logging.info("Testing DeviceDataManager sink fan-out...")
+
+		# the fan-out is opt-in, so it's turned on for these tests
+		self.config = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.savedConfig = {key: self.config.get(ConfigConst.CONSTRAINED_DEVICE, key, fallback = None) \
+			for key in (ConfigConst.ENABLE_SINK_FANOUT_KEY,)}
+
+		for key in self.savedConfig:
+			self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, 'True')
+
+	@classmethod
+	def tearDownClass(self):
+		for key, val in self.savedConfig.items():
+			if val is None:
+				self.config.remove_option(ConfigConst.CONSTRAINED_DEVICE, key)
+			else:
+				self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, val)
+
+	def setUp(self):
+		self.ddMgr = DeviceDataManager(noComms = True)
+		self.mqttSink = self.DelayedSink(self.MQTT_DELAY_SECS)
+		self.coapSink = self.DelayedSink(self.COAP_DELAY_SECS)
+
+		self.ddMgr.mqttClient = self.mqttSink
+		self.ddMgr.coapClient = self.coapSink
+		self.ddMgr.upstreamPipeline = None
+		self.ddMgr.upstreamBatcher = None
+		self.ddMgr.deadbandFilter = None
+		self.ddMgr.anomalyDetector = None
+		self.ddMgr.egressLanes = None
+
+	def tearDown(self):
+		self.mqttSink.isDead.clear()
+		self.coapSink.isDead.clear()
+
+		if self.ddMgr.egressLanes:
+			self.ddMgr.egressLanes.stop()
+
+		if self.ddMgr.sinkFanout:
+			self.ddMgr.sinkFanout.shutdown()
+
+	def testSequentialSinks(self):
+		# for comparison: each send takes as long as both sinks together
+		self.ddMgr.sinkFanout = None
+
+		latencies = self._execTestSendLatency("sequential")
+
+		self.assertGreaterEqual(statistics.median(latencies), (self.MQTT_DELAY_SECS + self.COAP_DELAY_SECS) * 1000)
+
+	def testFannedOutSinks(self):
+		latencies = self._execTestSendLatency("fanned out")
+
+		# each send takes as long as the slower sink
+		self.assertLess(statistics.median(latencies), (self.MQTT_DELAY_SECS + self.COAP_DELAY_SECS) * 1000)
+		self.assertEqual(self.coapSink.sendCount, self.MESSAGE_COUNT)
+
+	def testFannedOutWithDeadCoapSink(self):
+		self.coapSink.isDead.set()
+
+		latencies = self._execTestSendLatency("fanned out, dead CoAP sink")
+
+		# only the first send waits for the CoAP sink's timeout
+		self.assertEqual(self.mqttSink.sendCount, self.MESSAGE_COUNT)
+		self.assertLess(statistics.median(latencies), self.COAP_DELAY_SECS * 1000)
+
+	def testSlowSinksSendControlFirst(self):
+		# each send outlasts the sink timeout, so the egress lane hands the
+		# sinks a backlog of readings; the actuator response sent after them
+		# waits for the send in progress, not for the backlog
+		self.mqttSink.delay = self.SLOW_DELAY_SECS
+		self.coapSink.delay = self.SLOW_DELAY_SECS
+
+		for sink in self.ddMgr.sinkFanout.sinks:
+			sink.timeout = self.SLOW_TIMEOUT_SECS
+
+		self.ddMgr.egressLanes = self.ddMgr._createEgressLanes()
+		self.ddMgr.egressLanes.start()
+
+		# pressure readings don't trigger any rules, so the response is the
+		# only control message
+		for i in range(0, self.SLOW_MESSAGE_COUNT):
+			sd = SensorData(typeID = ConfigConst.PRESSURE_SENSOR_TYPE, name = ConfigConst.PRESSURE_SENSOR_NAME)
+			sd.setValue(1000.0 + i)
+			self.ddMgr.handleSensorMessage(sd)
+
+		self.assertTrue(self.ddMgr.egressLanes.waitUntilIdle(timeout = 5.0))
+
+		response = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE, name = ConfigConst.HVAC_ACTUATOR_NAME)
+		response.setAsResponse()
+
+		startNanos = time.perf_counter_ns()
+		self.ddMgr.handleActuatorCommandResponse(response)
+
+		for sink in (self.mqttSink, self.coapSink):
+			deadline = time.monotonic() + self.SLOW_DELAY_SECS * (self.SLOW_MESSAGE_COUNT + 2)
+
+			while id(response) not in sink.sentTimes and time.monotonic() < deadline:
+				time.sleep(0.01)
+
+			latency = (sink.sentTimes.get(id(response), time.perf_counter_ns()) - startNanos) / self.NS_IN_MILLIS
+
+			logging.info( \
+				"\n\tTesting slow sink response latency: backlog = %r | delay = %.0f ms | latency = %.2f ms | sinks = %r", \
+				self.SLOW_MESSAGE_COUNT, self.SLOW_DELAY_SECS * 1000, latency, self.ddMgr.getUpstreamSinkMetrics())
+
+			self.assertLess(latency, self.SLOW_DELAY_SECS * 3 * 1000)
+			self.assertLess(sink.sendCount, self.SLOW_MESSAGE_COUNT)
+
+	def _execTestSendLatency(self, label: str) -> list:
+		latencies = []
+
+		for i in range(0, self.MESSAGE_COUNT):
+			sd = SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, name = ConfigConst.HUMIDITY_SENSOR_NAME)
+			sd.setValue(float(i))
+
+			startNanos = time.perf_counter_ns()
+			self.ddMgr.handleSensorMessage(sd)
+			latencies.append((time.perf_counter_ns() - startNanos) / self.NS_IN_MILLIS)
+
+		latencies.sort()
+
+		logging.info( \
+			"\n\tTesting sink send latency: %s | messages = %r | median = %.2f ms | p95 = %.2f ms | max = %.2f ms | sinks = %r", \
+			label, self.MESSAGE_COUNT, statistics.median(latencies), latencies[int(len(latencies) * 0.95) - 1], \
+			latencies[-1], self.ddMgr.getUpstreamSinkMetrics())
+
+		return latencies
+
+if __name__ == "__main__":
+	unittest.main()
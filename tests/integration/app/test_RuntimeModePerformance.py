@@ -0,0 +1,152 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import asyncio
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import threading
+import time
+import unittest
+
+from datetime import datetime
+
+import aiocoap
+import aiocoap.resource as resource
+
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.DataUtil import DataUtil
+
+class RuntimeModePerformanceTest(unittest.TestCase):
+	"""
+	This test case class compares the threaded and asyncio runtimes of the
+	CDA, each run in a fresh process for RUN_SECS: the peak thread count,
+	the peak RSS, and the end-to-end latency from each sensor reading's
+	time stamp to its CoAP PUT arriving at a server run by this test.
+
+	The processes use PiotConfig.props with simulated sensors polled every
+	second, the CoAP client (MQTT needs a broker), and without the upstream
+	pipeline, batching, egress lanes, sink fan-out and the deadband and
+	anomaly filters, so each reading is sent as it's taken, and the
+	threads counted are the runtime's own. These settings are changed in
+	the configuration loaded by each process, not in this test's.
+
+	"""
+
+	basePath = os.path.abspath(os.path.dirname(__file__) + "/../../..")
+	configFile = os.path.join(basePath, "config", "PiotConfig.props")
+
+	PORT = 5698
+	RUN_SECS = 10
+
+	RUN_SCRIPT = """
+import asyncio, os, resource, threading, time
+import programmingtheiot.common.ConfigConst as ConfigConst
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+config = ConfigUtil(configFile = {configFile!r})._getConfig()
+for key, val in [
+		(ConfigConst.RUNTIME_MODE_KEY, '{mode}'), (ConfigConst.ENABLE_EMULATOR_KEY, 'False'),
+		(ConfigConst.ENABLE_MQTT_CLIENT_KEY, 'False'), (ConfigConst.ENABLE_COAP_CLIENT_KEY, 'True'),
+		(ConfigConst.ENABLE_UPSTREAM_PIPELINE_KEY, 'False'), (ConfigConst.ENABLE_UPSTREAM_BATCHING_KEY, 'False'),
+		(ConfigConst.ENABLE_EGRESS_LANES_KEY, 'False'), (ConfigConst.ENABLE_SINK_FANOUT_KEY, 'False'),
+		(ConfigConst.ENABLE_DEADBAND_FILTER_KEY, 'False'), (ConfigConst.ENABLE_ANOMALY_DETECTION_KEY, 'False'),
+		(ConfigConst.HUMIDITY_POLL_SECS_KEY, '1'), (ConfigConst.PRESSURE_POLL_SECS_KEY, '1'), (ConfigConst.TEMP_POLL_SECS_KEY, '1')]:
+	config.set(ConfigConst.CONSTRAINED_DEVICE, key, val)
+config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.HOST_KEY, '127.0.0.1')
+config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PORT_KEY, '{port}')
+config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.ENABLE_SPOOL_KEY, 'False')
+from programmingtheiot.cda.app import ConstrainedDeviceApp
+peakThreads = [0]
+def sampleThreads():
+	while True:
+		peakThreads[0] = max(peakThreads[0], threading.active_count() - 1)
+		time.sleep(0.05)
+threading.Thread(target = sampleThreads, daemon = True).start()
+if '{mode}' == ConfigConst.ASYNCIO_RUNTIME_MODE:
+	asyncio.run(ConstrainedDeviceApp.runAppAsync({runSecs}))
+else:
+	cda = ConstrainedDeviceApp.ConstrainedDeviceApp()
+	cda.startApp()
+	time.sleep({runSecs})
+	cda.stopApp(0)
+print(peakThreads[0], resource.getrusage(resource.RUSAGE_SELF).ru_maxrss, flush = True)
+os._exit(0)
+"""
+
+	class SensorMsgResource(resource.Resource):
+		def __init__(self):
+			super().__init__()
+
+			self.latencies = []
+
+		async def render_put(self, request):
+			payload = request.payload.decode('utf-8')
+
+			# the window summaries flushed at stop aren't readings
+			if '"stddev"' not in payload:
+				data = DataUtil().jsonToSensorData(payload)
+				self.latencies.append(time.time() - datetime.fromisoformat(data.getTimeStamp()).timestamp())
+
+			return aiocoap.Message(code = aiocoap.Code.CHANGED)
+
+	class SinkResource(resource.Resource):
+		async def render_put(self, request):
+			return aiocoap.Message(code = aiocoap.Code.CHANGED)
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+
+		self.env = dict(os.environ, PYTHONPATH = self.basePath)
+		self.sensorMsgResource = self.SensorMsgResource()
+
+		site = resource.Site()
+		site.add_resource(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE.value.split('/'), self.sensorMsgResource)
+		site.add_resource(ResourceNameEnum.CDA_SYSTEM_PERF_MSG_RESOURCE.value.split('/'), self.SinkResource())
+		site.add_resource(ResourceNameEnum.CDA_ACTUATOR_RESPONSE_RESOURCE.value.split('/'), self.SinkResource())
+
+		self.serverLoop = asyncio.new_event_loop()
+
+		threading.Thread(target = self.serverLoop.run_forever, daemon = True).start()
+		asyncio.run_coroutine_threadsafe( \
+			aiocoap.Context.create_server_context(site, bind = ('127.0.0.1', self.PORT)), self.serverLoop).result(5)
+
+	def testThreadsMemoryAndLatency(self):
+		results = {mode: self._runCda(mode) for mode in ('threaded', 'asyncio')}
+
+		logging.info("".join( \
+			f"\n\t{mode}: {threads} threads, {rssKb / 1024.0:.1f} MB peak RSS, {len(latencies)} readings, " + \
+			f"latency {statistics.median(latencies) * 1000.0:.2f} ms median, " + \
+			f"{statistics.quantiles(latencies, n = 20)[-1] * 1000.0:.2f} ms p95, {max(latencies) * 1000.0:.2f} ms max" \
+			for mode, (threads, rssKb, latencies) in results.items()))
+
+		threadedThreads, threadedRssKb, threadedLatencies = results['threaded']
+		asyncThreads, asyncRssKb, asyncLatencies = results['asyncio']
+
+		self.assertLess(asyncThreads, threadedThreads)
+		# three sensors, each read every second
+		self.assertGreaterEqual(len(threadedLatencies), self.RUN_SECS * 2)
+		self.assertGreaterEqual(len(asyncLatencies), self.RUN_SECS * 2)
+		self.assertLess(statistics.median(asyncLatencies), 0.1)
+
+	def _runCda(self, mode: str) -> tuple:
+		self.sensorMsgResource.latencies = []
+
+		result = subprocess.run( \
+			[sys.executable, '-c', self.RUN_SCRIPT.format(mode = mode, port = self.PORT, runSecs = self.RUN_SECS, configFile = self.configFile)], \
+			cwd = self.basePath, env = self.env, capture_output = True, text = True, check = True, timeout = self.RUN_SECS + 60)
+
+		threads, rssKb = result.stdout.strip().splitlines()[-1].split()
+
+		return int(threads), int(rssKb), list(self.sensorMsgResource.latencies)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,153 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import statistics
+import subprocess
+import sys
+import unittest
+
+class StartupPerformanceTest(unittest.TestCase):
+	"""
+	This test case class measures the CDA's startup in fresh processes:
+	the import time of DeviceDataManager with 'python -X importtime', and
+	the wall-clock time from process start to the first sensor reading
+	reaching DeviceDataManager and to the first message handed to the
+	upstream clients. Each is measured with the connectors imported
+	lazily, as DeviceDataManager does, and with them imported up front,
+	as it used to.
+	
+	The first upstream message is either an actuator response, if a rule
+	fires on the first readings, or the first batch of readings, sent
+	after batchMaxDelaySecs, so it varies from run to run more than the
+	first reading does.
+	
+	The processes use PiotConfig.props with simulated sensors and no
+	network connections (DeviceDataManager's noComms flag).
+	
+	"""
+	
+	basePath = os.path.abspath(os.path.dirname(__file__) + "/../../..")
+	configFile = os.path.join(basePath, "config", "PiotConfig.props")
+	
+	RUN_COUNT = 5
+	
+	CONNECTOR_MODULES = [
+		'programmingtheiot.cda.connection.CoapClientConnector',
+		'programmingtheiot.cda.connection.MqttClientConnector',
+		'programmingtheiot.cda.connection.RedisPersistenceAdapter'
+	]
+	
+	FIRST_MESSAGE_SCRIPT = """
+import os, sys, threading, time
+startTime = time.perf_counter()
+import programmingtheiot.common.ConfigConst as ConfigConst
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+ConfigUtil(configFile = {configFile!r})._getConfig().set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, 'False')
+{imports}
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+deviceDataMgr = DeviceDataManager(noComms = True)
+times = {{}}
+isSent = threading.Event()
+handleSensorMessage = deviceDataMgr.handleSensorMessage
+def handleFirstReading(data):
+	times.setdefault('reading', time.perf_counter() - startTime)
+	return handleSensorMessage(data)
+def handleFirstMessage(*args, **kwargs):
+	times.setdefault('sent', time.perf_counter() - startTime)
+	isSent.set()
+deviceDataMgr.handleSensorMessage = handleFirstReading
+deviceDataMgr._sendUpstream = handleFirstMessage
+deviceDataMgr.startManager()
+isSent.wait(60)
+print(times['reading'], times['sent'], flush = True)
+os._exit(0)
+"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		self.env = dict(os.environ, PYTHONPATH = self.basePath)
+		
+	def testImportTime(self):
+		lazyMillis, topModules = self._measureImports(['programmingtheiot.cda.app.DeviceDataManager'])
+		eagerMillis, eagerModules = self._measureImports(self.CONNECTOR_MODULES + ['programmingtheiot.cda.app.DeviceDataManager'])
+		
+		logging.info( \
+			f"\n\tImport time: {lazyMillis:.0f} ms lazy, {eagerMillis:.0f} ms with the connectors up front" + \
+			f"\n\tSlowest imports (lazy): " + ", ".join(f"{name} {millis:.0f} ms" for name, millis in topModules))
+		
+		self.assertLess(lazyMillis, eagerMillis)
+		
+	def testTimeToFirstMessage(self):
+		lazyReadingSecs, lazySentSecs = self._measureFirstMessage("")
+		eagerReadingSecs, eagerSentSecs = self._measureFirstMessage("import " + ", ".join(self.CONNECTOR_MODULES))
+		
+		logging.info( \
+			f"\n\tTime to first reading: {lazyReadingSecs * 1000.0:.0f} ms lazy, {eagerReadingSecs * 1000.0:.0f} ms with the connectors up front" + \
+			f"\n\tTime to first upstream message: {lazySentSecs * 1000.0:.0f} ms lazy, {eagerSentSecs * 1000.0:.0f} ms with the connectors up front")
+		
+		self.assertLess(lazyReadingSecs, eagerReadingSecs)
+		
+		# sensors are read at start, so the first reading isn't held up by the poll interval
+		self.assertLess(lazyReadingSecs, 1.0)
+		
+	def _measureImports(self, modules: list) -> tuple:
+		# median total import time, and the slowest imports of the last run
+		totals = []
+		
+		for i in range(0, self.RUN_COUNT):
+			result = subprocess.run( \
+				[sys.executable, '-X', 'importtime', '-c', "import " + ", ".join(modules)], \
+				cwd = self.basePath, env = self.env, capture_output = True, text = True, check = True)
+			
+			total = 0
+			imports = []
+			
+			for line in result.stderr.splitlines():
+				fields = line.split('|')
+				
+				if len(fields) != 3 or not fields[1].strip().isdigit():
+					continue
+				
+				name = fields[2][1:]
+				millis = int(fields[1]) / 1000.0
+				
+				if not name.startswith(' '):
+					total += millis
+					
+				# the modules DeviceDataManager imports directly
+				if name.startswith('  ') and not name.startswith('   '):
+					imports.append((name.strip(), millis))
+					
+			totals.append(total)
+			
+		return statistics.median(totals), sorted(imports, key = lambda item: -item[1])[0:5]
+	
+	def _measureFirstMessage(self, imports: str) -> tuple:
+		# median times to the first reading and the first upstream message
+		readingTimes = []
+		sentTimes = []
+		
+		for i in range(0, self.RUN_COUNT):
+			result = subprocess.run( \
+				[sys.executable, '-c', self.FIRST_MESSAGE_SCRIPT.format(imports = imports, configFile = self.configFile)], \
+				cwd = self.basePath, env = self.env, capture_output = True, text = True, check = True, timeout = 90)
+			
+			readingSecs, sentSecs = result.stdout.strip().splitlines()[-1].split()
+			
+			readingTimes.append(float(readingSecs))
+			sentTimes.append(float(sentSecs))
+			
+		return statistics.median(readingTimes), statistics.median(sentTimes)
+
+if __name__ == "__main__":
+	unittest.main()
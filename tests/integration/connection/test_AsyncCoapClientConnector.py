@@ -0,0 +1,181 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import asyncio
+import logging
+import os
+import threading
+import unittest
+
+import aiocoap
+import aiocoap.resource as resource
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.connection.AsyncCoapClientConnector import AsyncCoapClientConnector
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class AsyncCoapClientConnectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic integration tests for
+	AsyncCoapClientConnector, against an aiocoap server run on the same
+	event loop, so no GDA is needed.
+
+	"""
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	PORT = 5697
+
+	class PutResource(resource.Resource):
+		def __init__(self):
+			super().__init__()
+
+			self.requests = []
+
+		async def render_put(self, request):
+			self.requests.append(request)
+			return aiocoap.Message(code = aiocoap.Code.CHANGED)
+
+	class ActuatorCmdResource(resource.ObservableResource):
+		def __init__(self):
+			super().__init__()
+
+			self.value = 20.0
+
+		def update(self, value: float):
+			self.value = value
+			self.updated_state()
+
+		async def render_get(self, request):
+			data = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+			data.setName(ConfigConst.HVAC_ACTUATOR_NAME)
+			data.setValue(self.value)
+
+			return aiocoap.Message(payload = DataUtil().actuatorDataToJson(data).encode('utf-8'))
+
+	class CommandListener(object):
+		def __init__(self):
+			self.values = []
+			self.threadIDs = []
+
+		def handleActuatorCommandMessage(self, data: ActuatorData) -> ActuatorData:
+			self.values.append(data.getValue())
+			self.threadIDs.append(threading.get_ident())
+			return None
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AsyncCoapClientConnector class...")
+
+		self.config = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.savedConfig = {key: self.config.get(ConfigConst.COAP_GATEWAY_SERVICE, key, fallback = None) \
+			for key in (ConfigConst.HOST_KEY, ConfigConst.PORT_KEY, ConfigConst.ENABLE_SPOOL_KEY)}
+
+		if not self.config.has_section(ConfigConst.COAP_GATEWAY_SERVICE):
+			self.config.add_section(ConfigConst.COAP_GATEWAY_SERVICE)
+
+		self.config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.HOST_KEY, '127.0.0.1')
+		self.config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.PORT_KEY, str(self.PORT))
+		self.config.set(ConfigConst.COAP_GATEWAY_SERVICE, ConfigConst.ENABLE_SPOOL_KEY, 'False')
+
+	@classmethod
+	def tearDownClass(self):
+		for key, val in self.savedConfig.items():
+			if val is None:
+				self.config.remove_option(ConfigConst.COAP_GATEWAY_SERVICE, key)
+			else:
+				self.config.set(ConfigConst.COAP_GATEWAY_SERVICE, key, val)
+
+	def testPutData(self):
+		asyncio.run(self._runWithServer(self._putData))
+
+	def testGetActuatorCommand(self):
+		asyncio.run(self._runWithServer(self._getActuatorCommand))
+
+	def testObserveActuatorCommands(self):
+		asyncio.run(self._runWithServer(self._observeActuatorCommands))
+
+	async def _putData(self, client: AsyncCoapClientConnector):
+		data = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		data.setValue(21.5)
+
+		# from the loop, and from another thread
+		self.assertTrue(client.sendPutData(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, data = data, useSpool = False))
+		await asyncio.get_running_loop().run_in_executor(None, lambda: \
+			client.sendPutData(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, data = data, useSpool = False))
+
+		await self._waitFor(lambda: len(self.sensorResource.requests) == 2)
+
+		for request in self.sensorResource.requests:
+			self.assertEqual(DataUtil().jsonToSensorData(request.payload.decode('utf-8')).getValue(), 21.5)
+			self.assertEqual(request.opt.content_format, client.getCodec().getContentFormat())
+
+	async def _getActuatorCommand(self, client: AsyncCoapClientConnector):
+		self.assertTrue(client.sendGetRequest(resource = ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE))
+
+		await self._waitFor(lambda: len(self.listener.values) == 1)
+
+		# the response is handled on the loop
+		self.assertEqual(self.listener.values, [20.0])
+		self.assertEqual(self.listener.threadIDs, [threading.get_ident()])
+
+	async def _observeActuatorCommands(self, client: AsyncCoapClientConnector):
+		self.assertTrue(client.startObserver(resource = ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE))
+		self.assertFalse(client.startObserver(resource = ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE))
+
+		await self._waitFor(lambda: len(self.listener.values) == 1)
+
+		self.actuatorResource.update(22.5)
+
+		await self._waitFor(lambda: len(self.listener.values) == 2)
+
+		self.assertTrue(client.stopObserver(resource = ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE))
+		self.assertFalse(client.stopObserver(resource = ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE))
+
+		await asyncio.sleep(0.2)
+		self.actuatorResource.update(23.0)
+		await asyncio.sleep(0.5)
+
+		self.assertEqual(self.listener.values, [20.0, 22.5])
+
+	async def _runWithServer(self, test):
+		self.sensorResource = self.PutResource()
+		self.actuatorResource = self.ActuatorCmdResource()
+		self.listener = self.CommandListener()
+
+		site = resource.Site()
+		site.add_resource(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE.value.split('/'), self.sensorResource)
+		site.add_resource(ResourceNameEnum.CDA_ACTUATOR_CMD_RESOURCE.value.split('/'), self.actuatorResource)
+
+		server = await aiocoap.Context.create_server_context(site, bind = ('127.0.0.1', self.PORT))
+
+		try:
+			client = AsyncCoapClientConnector()
+			client.setDataMessageListener(self.listener)
+
+			await test(client)
+
+		finally:
+			await server.shutdown()
+
+	async def _waitFor(self, condition, timeoutSecs: float = 5.0):
+		endTime = asyncio.get_running_loop().time() + timeoutSecs
+
+		while not condition():
+			self.assertLess(asyncio.get_running_loop().time(), endTime, "Timed out.")
+			await asyncio.sleep(0.05)
+
+if __name__ == "__main__":
+	unittest.main()
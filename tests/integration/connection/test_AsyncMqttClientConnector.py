@@ -0,0 +1,74 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import asyncio
+import logging
+import threading
+import unittest
+
+from programmingtheiot.cda.connection.AsyncMqttClientConnector import AsyncMqttClientConnector
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+
+class AsyncMqttClientConnectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic integration tests for
+	AsyncMqttClientConnector. As with MqttClientConnectorTest, they need
+	the MQTT broker configured in PiotConfig.props to be running.
+
+	"""
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AsyncMqttClientConnector class...")
+
+	def testConnectAndDisconnect(self):
+		async def connectAndDisconnect():
+			mcc = AsyncMqttClientConnector()
+
+			self.assertTrue(mcc.connectClient())
+			await asyncio.sleep(2)
+			self.assertTrue(mcc.connected)
+
+			self.assertTrue(mcc.disconnectClient())
+			await asyncio.sleep(1)
+			self.assertFalse(mcc.connected)
+
+		asyncio.run(connectAndDisconnect())
+
+	def testPubSubOnLoop(self):
+		threadCount = threading.active_count()
+
+		async def pubSub():
+			mcc = AsyncMqttClientConnector()
+			messages = []
+
+			mcc.connectClient()
+			await asyncio.sleep(1)
+
+			mcc.mqttClient.message_callback_add( \
+				ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE.value, lambda client, userdata, msg: messages.append(msg.payload))
+
+			self.assertTrue(mcc.subscribeToTopic(resource = ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE, qos = 1))
+			await asyncio.sleep(1)
+
+			self.assertTrue(mcc.publishMessage(resource = ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE, msg = "TEST: async CDA message.", qos = 1))
+			await asyncio.sleep(1)
+
+			# paho's network loop doesn't run on a thread of its own
+			self.assertLessEqual(threading.active_count(), threadCount)
+			self.assertEqual(messages, [b"TEST: async CDA message."])
+
+			mcc.unsubscribeFromTopic(resource = ResourceNameEnum.CDA_MGMT_STATUS_MSG_RESOURCE)
+			mcc.disconnectClient()
+
+		asyncio.run(pubSub())
+
+if __name__ == "__main__":
+	unittest.main()
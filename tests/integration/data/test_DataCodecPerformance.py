@@ -0,0 +1,105 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DataCodecPerformanceTest(unittest.TestCase):
+	"""
+	This test case class contains simple benchmarks comparing the
+	payload codecs on the simulated sensor data sets: the average
+	payload size and the encode / decode time per SensorData.
+	
+	"""
+	NS_IN_MICROS = 1000
+	MAX_TEST_RUNS = 10
+	
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	simDataFiles = [
+		"PIOT_SimulatedTestData_EnvironmentPressure.json",
+		"PIOT_SimulatedTestData_IndoorHumidity.json",
+		"PIOT_SimulatedTestData_IndoorTemperature.json"
+	]
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		dataUtil = DataUtil()
+		self.sensorDataList = []
+		
+		for fileName in self.simDataFiles:
+			with open(self.simDataPath + fileName, 'r') as simDataFile:
+				for entry in json.load(simDataFile)['sensorDataList']:
+					sd = SensorData()
+					dataUtil._fillIotDataFromDict(sd, entry)
+					self.sensorDataList.append(sd)
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testJsonCodec(self):
+		self._execTestCodec(ConfigConst.JSON_CODEC)
+		
+	def testJsonCompactCodec(self):
+		self._execTestCodec(ConfigConst.JSON_COMPACT_CODEC)
+		
+	def testCborCodec(self):
+		self._execTestCodec(ConfigConst.CBOR_CODEC)
+		
+	def testMsgPackCodec(self):
+		self._execTestCodec(ConfigConst.MSGPACK_CODEC)
+		
+	def testStructCodec(self):
+		self._execTestCodec(ConfigConst.STRUCT_CODEC)
+		
+	def _execTestCodec(self, codecName: str):
+		codec = DataUtil.getCodec(codecName)
+		
+		if codec.getName() != codecName:
+			self.skipTest(f"Codec '{codecName}' is not available.")
+			
+		payloads = [codec.encode(sd) for sd in self.sensorDataList]
+		count = len(payloads) * self.MAX_TEST_RUNS
+		
+		startTime = time.perf_counter_ns()
+		
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			for sd in self.sensorDataList:
+				codec.encode(sd)
+				
+		encodeMicros = (time.perf_counter_ns() - startTime) / self.NS_IN_MICROS / count
+		startTime = time.perf_counter_ns()
+		
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			for payload in payloads:
+				codec.decode(payload, SensorData)
+				
+		decodeMicros = (time.perf_counter_ns() - startTime) / self.NS_IN_MICROS / count
+		avgBytes = sum(len(payload) for payload in payloads) / len(payloads)
+		
+		self.assertEqual(codec.decode(payloads[-1], SensorData).getValue(), self.sensorDataList[-1].getValue())
+		
+		logging.info( \
+			"\n\tTesting SensorData codec: %s | messages = %r | avg payload = %.1f bytes | encode = %.3f us | decode = %.3f us", \
+			codecName, len(payloads), avgBytes, encodeMicros, decodeMicros)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,80 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DataUtilPerformanceTest(unittest.TestCase):
+	"""
+	This test case class contains simple benchmarks comparing the
+	DataUtil serialization modes: the default indented format, the
+	compact format using the stdlib encoder, and the compact format
+	using the optional fast backend (if installed).
+	
+	"""
+	NS_IN_MICROS = 1000
+	MAX_TEST_RUNS = 20000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		self.sensorData = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		self.sensorData.setValue(21.123456789)
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testDefaultFormat(self):
+		self._execTestConversions(DataUtil(), "default (indent=2)")
+		
+	def testCompactFormatStdlib(self):
+		self._execTestConversions(DataUtil(useCompactFormat = True, useFastBackend = False), "compact (stdlib json)")
+		
+	def testCompactFormatFastBackend(self):
+		dataUtil = DataUtil(useCompactFormat = True)
+		
+		if not dataUtil.useFastBackend:
+			self.skipTest("No fast JSON backend installed.")
+			
+		self._execTestConversions(dataUtil, "compact (fast backend)")
+		
+	def _execTestConversions(self, dataUtil: DataUtil, label: str):
+		payload = dataUtil.sensorDataToJson(self.sensorData)
+		
+		startTime = time.perf_counter_ns()
+		
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			dataUtil.sensorDataToJson(self.sensorData)
+			
+		encodeMicros = (time.perf_counter_ns() - startTime) / self.NS_IN_MICROS / self.MAX_TEST_RUNS
+		startTime = time.perf_counter_ns()
+		
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			dataUtil.jsonToSensorData(payload)
+			
+		decodeMicros = (time.perf_counter_ns() - startTime) / self.NS_IN_MICROS / self.MAX_TEST_RUNS
+		
+		self.assertEqual(dataUtil.jsonToSensorData(payload).getValue(), self.sensorData.getValue())
+		
+		logging.info( \
+			"\n\tTesting SensorData conversions: %s | payload = %r bytes | encode = %.3f us | decode = %.3f us", \
+			label, len(payload.encode('utf-8')), encodeMicros, decodeMicros)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,148 @@
+#####
+#
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+#
+# Copyright (c) 2020 - 2025 by Andrew D. King
+#
+
+import logging
+import os
+import time
+import tracemalloc
+import unittest
+
+from datetime import datetime, timezone
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SystemPerformanceData import SystemPerformanceData
+
+class IotDataPerformanceTest(unittest.TestCase):
+	"""
+	This test case class contains simple benchmarks for the
+	data container classes. It measures the construction time
+	and the per-instance memory footprint of SensorData,
+	ActuatorData and SystemPerformanceData.
+
+	"""
+	NS_IN_MICROS = 1000
+	MAX_TEST_RUNS = 20000
+	
+	# use the project config so the location ID lookup reflects a deployed CDA
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		ConfigUtil(configFile = self.configFile)
+
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testSensorDataConstruction(self):
+		self._execTestConstruction(lambda: SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE), "SensorData")
+
+	def testActuatorDataConstruction(self):
+		self._execTestConstruction(lambda: ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE), "ActuatorData")
+
+	def testSystemPerformanceDataConstruction(self):
+		self._execTestConstruction(lambda: SystemPerformanceData(), "SystemPerformanceData")
+
+	def testSensorDataMemory(self):
+		self._execTestMemory(lambda: SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE), "SensorData")
+
+	def testActuatorDataMemory(self):
+		self._execTestMemory(lambda: ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE), "ActuatorData")
+
+	def testTimeStampUpdate(self):
+		sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		
+		eagerMicros = self._execTestLoop(lambda: str(datetime.now(timezone.utc).isoformat()))
+		lazyMicros = self._execTestLoop(sd.updateTimeStamp)
+		
+		logging.info( \
+			"\n\tTesting time stamp update: eager ISO = %.3f us | lazy Epoch = %.3f us", \
+			eagerMicros, lazyMicros)
+		
+	def testActuatorResponseMessage(self):
+		# mirrors BaseActuatorSimTask.updateActuator() followed by a single read
+		# of the time stamp (as serialization would do) - JSON encoding itself
+		# is excluded so the time stamp cost isn't hidden by it
+		cmd = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		cmd.setCommand(ConfigConst.COMMAND_ON)
+		cmd.setValue(20.0)
+		
+		def _handleResponse():
+			actuatorResponse = ActuatorData()
+			actuatorResponse.updateData(cmd)
+			actuatorResponse.setStatusCode(0)
+			actuatorResponse.setAsResponse()
+			
+			return actuatorResponse.getTimeStamp()
+		
+		eagerFormatMicros = self._execTestLoop(lambda: [datetime.now(timezone.utc).isoformat() for i in range(4)])
+		messageMicros = self._execTestLoop(_handleResponse)
+		
+		logging.info( \
+			"\n\tTesting actuator response: per message = %.3f us | eager ISO formatting per message (4x) = %.3f us", \
+			messageMicros, eagerFormatMicros)
+	
+	def _execTestLoop(self, func) -> float:
+		func()
+		
+		startTime = time.perf_counter_ns()
+		
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			func()
+			
+		endTime = time.perf_counter_ns()
+		
+		return (endTime - startTime) / self.NS_IN_MICROS / self.MAX_TEST_RUNS
+		
+	def _execTestConstruction(self, factory, label: str):
+		# warm up
+		factory()
+
+		startTime = time.perf_counter_ns()
+
+		for seqNo in range(0, self.MAX_TEST_RUNS):
+			factory()
+
+		endTime = time.perf_counter_ns()
+		elapsedMicros = (endTime - startTime) / self.NS_IN_MICROS
+
+		logging.info( \
+			"\n\tTesting construction: %s | instances = %r | total = %.1f us | per instance = %.3f us", \
+			label, self.MAX_TEST_RUNS, elapsedMicros, elapsedMicros / self.MAX_TEST_RUNS)
+
+	def _execTestMemory(self, factory, label: str):
+		# warm up so any one-time lookups are not counted against the instances
+		factory()
+
+		tracemalloc.start()
+		baseline, _ = tracemalloc.get_traced_memory()
+
+		instances = [factory() for seqNo in range(0, self.MAX_TEST_RUNS)]
+
+		current, _ = tracemalloc.get_traced_memory()
+		tracemalloc.stop()
+
+		bytesPerInstance = (current - baseline) / len(instances)
+
+		self.assertGreater(bytesPerInstance, 0)
+
+		logging.info( \
+			"\n\tTesting memory: %s | instances = %r | per instance = %.1f bytes", \
+			label, len(instances), bytesPerInstance)
+
+if __name__ == "__main__":
+	unittest.main()
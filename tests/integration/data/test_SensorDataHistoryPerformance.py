@@ -0,0 +1,118 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import time
+import tracemalloc
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataHistory import SensorDataHistory
+
+class SensorDataHistoryPerformanceTest(unittest.TestCase):
+	"""
+	This test case class benchmarks SensorDataHistory holding one week
+	of 1 Hz readings for each of the three simulated sensors: the memory
+	footprint, compared with keeping the readings as SensorData instances,
+	and the cost of adding readings and of the time-range, last-N and
+	downsampled queries.
+
+	"""
+	NS_IN_SECS = 1000000000
+	NS_IN_MICROS = 1000
+	WEEK_SECS = 7 * 24 * 60 * 60
+	SENSOR_DATA_SAMPLE_COUNT = 10000
+	QUERY_RUNS = 100
+
+	SENSORS = [
+		(ConfigConst.HUMIDITY_SENSOR_NAME, ConfigConst.HUMIDITY_SENSOR_TYPE),
+		(ConfigConst.PRESSURE_SENSOR_NAME, ConfigConst.PRESSURE_SENSOR_TYPE),
+		(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE)
+	]
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+
+	def testWeekOfReadingsMemory(self):
+		tracemalloc.start()
+
+		histories = [SensorDataHistory(capacity = self.WEEK_SECS, name = name, typeID = typeID) for name, typeID in self.SENSORS]
+		allocatedBytes = tracemalloc.get_traced_memory()[0]
+
+		startNanos = time.perf_counter_ns()
+		self._fillWeek(histories)
+		elapsedNanos = time.perf_counter_ns() - startNanos
+
+		# appending allocates nothing beyond the preallocated arrays
+		growthBytes = tracemalloc.get_traced_memory()[0] - allocatedBytes
+		tracemalloc.stop()
+
+		footprintBytes = sum(history.getMemoryFootprint() for history in histories)
+
+		logging.info( \
+			"\n\tTesting history memory: sensors = %r | readings per sensor = %r | footprint = %.1f MB (%.1f MB per sensor) | growth while filling = %r bytes | %.2f us per append", \
+			len(histories), self.WEEK_SECS, footprintBytes / 1048576, footprintBytes / len(histories) / 1048576, \
+			growthBytes, elapsedNanos / (self.WEEK_SECS * len(histories)) / self.NS_IN_MICROS)
+
+		# for comparison: a week of readings kept as SensorData instances,
+		# extrapolated from a smaller sample
+		tracemalloc.start()
+		baseBytes = tracemalloc.get_traced_memory()[0]
+		dataList = [SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME) for i in range(0, self.SENSOR_DATA_SAMPLE_COUNT)]
+		bytesPerReading = (tracemalloc.get_traced_memory()[0] - baseBytes) / len(dataList)
+		tracemalloc.stop()
+
+		logging.info("\n\tTesting history memory: as SensorData = %.1f MB per sensor (%.0f bytes per reading)", \
+			bytesPerReading * self.WEEK_SECS / 1048576, bytesPerReading)
+
+		self.assertEqual(footprintBytes, self.WEEK_SECS * 16 * len(histories))
+		self.assertLess(growthBytes, 4096)
+
+	def testWeekOfReadingsQueries(self):
+		history = SensorDataHistory(capacity = self.WEEK_SECS, name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+
+		# a week and a half, so the buffer has wrapped
+		self._fillWeek([history], startSecs = 0, seconds = self.WEEK_SECS * 3 // 2)
+
+		endNanos = history.getLatest()[0]
+		dayNanos = 24 * 60 * 60 * self.NS_IN_SECS
+
+		queries = [
+			("last 3600", lambda: history.getLast(3600)),
+			("last hour by time", lambda: history.getRange(endNanos - 3600 * self.NS_IN_SECS)),
+			("last day by time", lambda: history.getRange(endNanos - dayNanos)),
+			("week at 1 min means", lambda: history.getDownsampled(60 * self.NS_IN_SECS)),
+			("week at 1 hour max", lambda: history.getDownsampled(3600 * self.NS_IN_SECS, method = SensorDataHistory.MAX))
+		]
+
+		for label, query in queries:
+			startNanos = time.perf_counter_ns()
+
+			for i in range(0, self.QUERY_RUNS):
+				timeStamps, values = query()
+
+			logging.info("\n\tTesting history query: %s | readings = %r | %.1f us per query", \
+				label, len(values), (time.perf_counter_ns() - startNanos) / self.QUERY_RUNS / self.NS_IN_MICROS)
+
+		self.assertEqual(len(history.getLast(3600)[1]), 3600)
+		self.assertEqual(len(history.getDownsampled(3600 * self.NS_IN_SECS)[1]), 7 * 24)
+
+	def _fillWeek(self, histories: list, startSecs: int = 0, seconds: int = WEEK_SECS):
+		for second in range(startSecs, startSecs + seconds):
+			timeStampNanos = second * self.NS_IN_SECS
+			value = float(second % 86400)
+
+			for history in histories:
+				history.append(timeStampNanos, value)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,102 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import time
+import unittest
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.TimeSeriesDecoder import TimeSeriesDecoder
+from programmingtheiot.data.TimeSeriesEncoder import TimeSeriesEncoder
+
+class TimeSeriesCompressionPerformanceTest(unittest.TestCase):
+	"""
+	This test case class benchmarks TimeSeriesEncoder and TimeSeriesDecoder
+	on the simulated sensor data sets: the compressed size per reading,
+	compared with JSON SensorData and with the 16 bytes per reading of
+	SensorDataHistory, and the encode and decode throughput.
+	
+	"""
+	
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	NS_IN_SECS = 1000000000
+	RUNS = 20
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+	def setUp(self):
+		self.dataUtil = DataUtil()
+		
+	def tearDown(self):
+		pass
+	
+	def testEnvironmentPressure(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_EnvironmentPressure.json")
+		
+	def testIndoorHumidity(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorHumidity.json")
+		
+	def testIndoorTemperature(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorTemperature.json")
+		
+	def _execTestDataSet(self, fileName: str):
+		readings = []
+		
+		with open(self.simDataPath + fileName, 'r') as simDataFile:
+			entries = json.load(simDataFile)['sensorDataList']
+			
+		for entry in entries:
+			sd = SensorData()
+			self.dataUtil._fillIotDataFromDict(sd, entry)
+			readings.append(sd)
+			
+		timeStamps = [sd.getTimeStampNanos() for sd in readings]
+		values = [sd.getValue() for sd in readings]
+		
+		jsonBytes = sum(len(self.dataUtil.sensorDataToJson(sd)) for sd in readings)
+		compactBytes = sum(len(DataUtil(useCompactFormat = True).sensorDataToJson(sd)) for sd in readings)
+		
+		startNanos = time.perf_counter_ns()
+		
+		for i in range(0, self.RUNS):
+			encoder = TimeSeriesEncoder(typeID = readings[0].getTypeID(), name = readings[0].getName())
+			encoder.appendAll(timeStamps, values)
+			block = encoder.getBytes()
+			
+		encodeNanos = (time.perf_counter_ns() - startNanos) / self.RUNS
+		startNanos = time.perf_counter_ns()
+		
+		for i in range(0, self.RUNS):
+			decodedTimeStamps, decodedValues = TimeSeriesDecoder(block).decodeAll()
+			
+		decodeNanos = (time.perf_counter_ns() - startNanos) / self.RUNS
+		
+		count = len(readings)
+		
+		logging.info( \
+			"\n\tTesting time series compression: %s | readings = %r | block = %r bytes (%.2f bytes per reading) | " \
+			"vs JSON = %.1fx (%.0f bytes per reading) | vs compact JSON = %.1fx | vs 16 byte arrays = %.2fx | " \
+			"encode = %.0f readings/s | decode = %.0f readings/s", \
+			fileName, count, len(block), len(block) / count, jsonBytes / len(block), jsonBytes / count, \
+			compactBytes / len(block), 16 * count / len(block), \
+			count * self.NS_IN_SECS / encodeNanos, count * self.NS_IN_SECS / decodeNanos)
+		
+		# values are exact; time stamps are kept to the microsecond
+		self.assertEqual(decodedValues.tolist(), values)
+		self.assertEqual(decodedTimeStamps.tolist(), [timeStamp // 1000 * 1000 for timeStamp in timeStamps])
+		self.assertLess(len(block), 8 * count)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,199 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import time
+import unittest
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.AnomalyDetector import AnomalyDetector
+from programmingtheiot.cda.sim.SensorDataGenerator import SensorDataGenerator
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataBatch import SensorDataBatch
+
+class AnomalyDetectorAccuracyTest(unittest.TestCase):
+	"""
+	This test case class injects spikes of 5 to 10 times the noise level
+	into the simulated sensor data sets, and measures the precision and
+	recall of AnomalyDetector with and without a seasonal baseline. It
+	also benchmarks scoring batches of readings from hundreds of simulated
+	sensors against scoring the same readings one by one.
+	
+	The data sets were generated from SensorDataGenerator's daily curves
+	between the 'normal' limits, so the baselines are built the same way,
+	and the season is the length of each data set.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	NS_IN_SECS = 1000000000
+	NS_IN_MICROS = 1000
+	
+	SPIKE_RATIO = 0.02
+	MIN_PRECISION = 0.9
+	MIN_RECALL = 0.9
+	
+	SENSOR_COUNT = 500
+	BATCH_COUNT = 200
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		ConfigUtil(configFile = self.configFile)
+		
+	def setUp(self):
+		self.dataGenerator = SensorDataGenerator()
+		
+	def tearDown(self):
+		pass
+	
+	def testEnvironmentPressure(self):
+		dataSet = self.dataGenerator.generateDailyEnvironmentPressureDataSet( \
+			noiseLevel = SensorDataGenerator.NO_NOISE, \
+			minValue = SensorDataGenerator.LOW_NORMAL_ENV_PRESSURE, maxValue = SensorDataGenerator.HI_NORMAL_ENV_PRESSURE)
+		
+		self._execTestDataSet("PIOT_SimulatedTestData_EnvironmentPressure.json", dataSet.getDataEntries())
+		
+	def testIndoorHumidity(self):
+		dataSet = self.dataGenerator.generateDailyEnvironmentHumidityDataSet( \
+			noiseLevel = SensorDataGenerator.NO_NOISE, \
+			minValue = SensorDataGenerator.LOW_NORMAL_ENV_HUMIDITY, maxValue = SensorDataGenerator.HI_NORMAL_ENV_HUMIDITY)
+		
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorHumidity.json", dataSet.getDataEntries())
+		
+	def testIndoorTemperature(self):
+		dataSet = self.dataGenerator.generateDailyIndoorTemperatureDataSet( \
+			noiseLevel = SensorDataGenerator.NO_NOISE, \
+			minValue = SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, maxValue = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP)
+		
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorTemperature.json", dataSet.getDataEntries())
+		
+	def testManySensorsBatchPerformance(self):
+		rng = calcLib.random.default_rng(3)
+		values = 40.0 + rng.normal(0.0, 0.5, (self.BATCH_COUNT, self.SENSOR_COUNT))
+		names = [f"Sensor{sensor}" for sensor in range(0, self.SENSOR_COUNT)]
+		
+		batches = []
+		
+		for step in range(0, self.BATCH_COUNT):
+			dataList = [self._createSensorData(ConfigConst.HUMIDITY_SENSOR_TYPE, names[sensor], values[step, sensor], step * self.NS_IN_SECS) \
+				for sensor in range(0, self.SENSOR_COUNT)]
+			batches.append(SensorDataBatch.fromSensorDataList(dataList))
+			
+		readingCount = self.BATCH_COUNT * self.SENSOR_COUNT
+		
+		detector = self._createDetector(1.0)
+		startNanos = time.perf_counter_ns()
+		
+		for batch in batches:
+			detector.detectBatch(batch)
+			
+		batchNanos = time.perf_counter_ns() - startNanos
+		
+		detector = self._createDetector(1.0)
+		startNanos = time.perf_counter_ns()
+		
+		for batch in batches:
+			for sd in batch.toSensorDataList():
+				detector.detect(sd)
+				
+		singleNanos = time.perf_counter_ns() - startNanos
+		
+		logging.info( \
+			"\n\tTesting anomaly detection with many sensors: sensors = %r | readings = %r | batched = %.2f us per reading | one by one = %.2f us per reading | speedup = %.1fx", \
+			self.SENSOR_COUNT, readingCount, batchNanos / readingCount / self.NS_IN_MICROS, \
+			singleNanos / readingCount / self.NS_IN_MICROS, singleNanos / batchNanos)
+		
+		self.assertEqual(detector.getMetrics()['sensors'], self.SENSOR_COUNT)
+		self.assertLess(batchNanos, singleNanos)
+		
+	def _execTestDataSet(self, fileName: str, baseline: list):
+		dataUtil = DataUtil()
+		
+		with open(self.simDataPath + fileName, 'r') as simDataFile:
+			entries = json.load(simDataFile)['sensorDataList']
+			
+		readings = []
+		
+		for entry in entries:
+			sd = SensorData()
+			dataUtil._fillIotDataFromDict(sd, entry)
+			readings.append(sd)
+			
+		typeID = readings[0].getTypeID()
+		name = readings[0].getName()
+		values = calcLib.array([sd.getValue() for sd in readings], dtype = calcLib.float64)
+		timeStamps = calcLib.array([sd.getTimeStampNanos() for sd in readings], dtype = calcLib.int64)
+		
+		# one season per data set, e.g. 1440 readings about 16.7 s apart
+		seasonSecs = (timeStamps[-1] - timeStamps[0]) / self.NS_IN_SECS * len(values) / (len(values) - 1)
+		
+		# the noise level, from the spread of differences between readings
+		noise = calcLib.std(calcLib.diff(values)) / calcLib.sqrt(2.0)
+		
+		rng = calcLib.random.default_rng(7)
+		spikeIndexes = rng.choice(calcLib.arange(60, len(values)), size = int(len(values) * self.SPIKE_RATIO), replace = False)
+		
+		spikedValues = values.copy()
+		spikedValues[spikeIndexes] += rng.choice([-1.0, 1.0], len(spikeIndexes)) * rng.uniform(5.0, 10.0, len(spikeIndexes)) * noise
+		
+		isSpike = calcLib.zeros(len(values), dtype = bool)
+		isSpike[spikeIndexes] = True
+		
+		results = {}
+		
+		for label, curve in (("no baseline", None), ("seasonal baseline", baseline)):
+			detector = self._createDetector(seasonSecs)
+			detector.setBaseline(typeID, curve)
+			
+			sensorIndexes = calcLib.full(len(values), detector.getSensorIndex(typeID, name))
+			zScores, isAnomaly, isForwarded = detector.detectArrays(sensorIndexes, timeStamps, spikedValues)
+			
+			truePositives = int((isAnomaly & isSpike).sum())
+			precision = truePositives / max(int(isAnomaly.sum()), 1)
+			recall = truePositives / len(spikeIndexes)
+			results[label] = (precision, recall)
+			
+			logging.info( \
+				"\n\tTesting anomaly detection: %s | %s | readings = %r | spikes = %r | flagged = %r | precision = %.3f | recall = %.3f", \
+				fileName, label, len(values), len(spikeIndexes), int(isAnomaly.sum()), precision, recall)
+			
+		precision, recall = results["seasonal baseline"]
+		
+		self.assertGreaterEqual(precision, self.MIN_PRECISION)
+		self.assertGreaterEqual(recall, self.MIN_RECALL)
+		
+	def _createDetector(self, seasonSecs: float) -> AnomalyDetector:
+		detector = AnomalyDetector()
+		detector.alpha = ConfigConst.DEFAULT_ANOMALY_EWMA_ALPHA
+		detector.zThreshold = ConfigConst.DEFAULT_ANOMALY_Z_THRESHOLD
+		detector.warmupCount = ConfigConst.DEFAULT_ANOMALY_WARMUP_COUNT
+		detector.seasonPeriodSecs = seasonSecs
+		
+		return detector
+		
+	def _createSensorData(self, typeID: int, name: str, value: float, timeStampNanos: int) -> SensorData:
+		sd = SensorData(typeID = typeID, name = name)
+		sd.setValue(float(value))
+		sd.setTimeStampNanos(timeStampNanos)
+		
+		return sd
+		
+if __name__ == "__main__":
+	unittest.main()
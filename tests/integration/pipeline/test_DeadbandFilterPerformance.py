@@ -0,0 +1,85 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.DeadbandFilter import DeadbandFilter
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class DeadbandFilterPerformanceTest(unittest.TestCase):
+	"""
+	This test case class replays the simulated sensor data sets through
+	DeadbandFilter, using the deadbands in PiotConfig.props, and logs the
+	suppression ratio and the upstream bytes saved for each data set.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		ConfigUtil(configFile = self.configFile)
+		
+	def setUp(self):
+		self.deadbandFilter = DeadbandFilter()
+		
+	def tearDown(self):
+		pass
+	
+	def testEnvironmentPressure(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_EnvironmentPressure.json")
+		
+	def testIndoorHumidity(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorHumidity.json")
+		
+	def testIndoorTemperature(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorTemperature.json")
+		
+	def _execTestDataSet(self, fileName: str):
+		dataUtil = DataUtil()
+		codec = DataUtil.getCodec(ConfigConst.JSON_CODEC)
+		
+		with open(self.simDataPath + fileName, 'r') as simDataFile:
+			entries = json.load(simDataFile)['sensorDataList']
+			
+		totalBytes = 0
+		sentBytes = 0
+		
+		for entry in entries:
+			sd = SensorData()
+			dataUtil._fillIotDataFromDict(sd, entry)
+			
+			payloadSize = len(codec.encode(sd))
+			totalBytes += payloadSize
+			
+			if self.deadbandFilter.accept(sd):
+				sentBytes += payloadSize
+				
+		metrics = self.deadbandFilter.getMetrics()
+		
+		self.assertEqual(metrics['readings'], len(entries))
+		self.assertLessEqual(sentBytes, totalBytes)
+		
+		logging.info( \
+			"\n\tTesting deadband: %s | readings = %r | suppressed = %r | suppression ratio = %.1f%% | bytes = %r -> %r (%.1f%% saved)", \
+			fileName, metrics['readings'], metrics['suppressed'], metrics['suppressionRatio'] * 100, \
+			totalBytes, sentBytes, (totalBytes - sentBytes) / totalBytes * 100)
+		
+if __name__ == "__main__":
+	unittest.main()
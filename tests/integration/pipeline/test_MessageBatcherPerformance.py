@@ -0,0 +1,121 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.connection.MqttClientConnector import MqttClientConnector
+from programmingtheiot.cda.pipeline.MessageBatcher import MessageBatcher
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+from programmingtheiot.data.SensorData import SensorData
+
+class MessageBatcherPerformanceTest(unittest.TestCase):
+	"""
+	This test case class contains simple benchmarks comparing upstream
+	MQTT publishing with and without batching, at 1, 10 and 100 sensors
+	per device. Each poll cycle samples every sensor once; with batching,
+	the end of the cycle stands in for the batch window expiring.
+
+	The MQTT client is replaced with one that only counts publishes, so
+	results show the CDA-side cost. Broker load isn't measured here, but
+	scales with the number of PUBLISH packets and bytes, which are logged.
+
+	"""
+	NS_IN_MICROS = 1000
+	POLL_CYCLES = 50
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	class CountingClient():
+		def __init__(self):
+			self.publishCount = 0
+			self.byteCount = 0
+
+		def publish(self, topic = None, payload = None, qos = 0):
+			self.publishCount += 1
+			self.byteCount += len(payload)
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+
+		ConfigUtil(configFile = self.configFile)
+
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testOneSensor(self):
+		self._execTestPublishing(1)
+
+	def testTenSensors(self):
+		self._execTestPublishing(10)
+
+	def testHundredSensors(self):
+		self._execTestPublishing(100)
+
+	def _execTestPublishing(self, sensorCount: int):
+		unbatched = self._execPollCycles(sensorCount, useBatching = False)
+		batched = self._execPollCycles(sensorCount, useBatching = True)
+
+		self.assertLessEqual(batched[0], unbatched[0])
+
+		for label, (publishCount, byteCount, wallNanos, cpuNanos) in (("unbatched", unbatched), ("batched", batched)):
+			readings = sensorCount * self.POLL_CYCLES
+
+			logging.info( \
+				"\n\tTesting publishing: sensors = %r | %s | readings = %r | publishes = %r | bytes = %r | readings/s = %.0f | publishes/s = %.0f | CPU per reading = %.2f us", \
+				sensorCount, label, readings, publishCount, byteCount, \
+				readings / (wallNanos / 1000000000), publishCount / (wallNanos / 1000000000), cpuNanos / self.NS_IN_MICROS / readings)
+
+	def _execPollCycles(self, sensorCount: int, useBatching: bool) -> tuple:
+		mqttClient = MqttClientConnector()
+		countingClient = self.CountingClient()
+		mqttClient.mqttClient = countingClient
+
+		# publish directly rather than through the store-and-forward spool
+		mqttClient.spool = None
+
+		resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE
+		batcher = MessageBatcher(
+			flushHandler = lambda resource, batch: mqttClient.publishData(resource = resource, data = batch),
+			maxBatchSize = ConfigConst.DEFAULT_BATCH_MAX_SIZE,
+			maxBatchDelay = 0)
+
+		startTime = time.perf_counter_ns()
+		startCpuTime = time.process_time_ns()
+
+		for cycle in range(0, self.POLL_CYCLES):
+			for sensor in range(0, sensorCount):
+				sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+				sd.setValue(20.0 + sensor / 10)
+				payload = EncodedPayload(sd)
+
+				if useBatching:
+					batcher.add(resource, payload)
+				else:
+					mqttClient.publishData(resource = resource, data = payload)
+
+			batcher.flushAll()
+
+		wallNanos = time.perf_counter_ns() - startTime
+		cpuNanos = time.process_time_ns() - startCpuTime
+
+		return (countingClient.publishCount, countingClient.byteCount, wallNanos, cpuNanos)
+
+if __name__ == "__main__":
+	unittest.main()
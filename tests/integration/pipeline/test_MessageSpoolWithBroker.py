@@ -0,0 +1,230 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import shutil
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.connection.MqttClientConnector import MqttClientConnector
+from programmingtheiot.cda.pipeline.MessageSpool import MessageSpool
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class MessageSpoolWithBrokerTest(unittest.TestCase):
+	"""
+	This test case class publishes a numbered stream of sensor messages
+	through MqttClientConnector and its store-and-forward spool to a
+	minimal local MQTT broker stand-in, which is stopped part way through
+	the stream and started again a few seconds later. It verifies that
+	every message reaches the broker, in order, once it's back.
+
+	Delivery is at-least-once, so a message in flight when the broker
+	stops may arrive twice; repeats are removed before comparing.
+
+	"""
+	MESSAGE_COUNT = 300
+	PUBLISH_INTERVAL = 0.005
+	OUTAGE_SECS = 2.0
+
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+
+	class BrokerStandIn():
+		"""
+		Accepts MQTT 3.1.1 connections and acknowledges CONNECT, SUBSCRIBE,
+		PINGREQ and QoS 1 PUBLISH packets, recording each PUBLISH payload.
+
+		"""
+		def __init__(self, port: int = 0):
+			self.payloads = []
+			self.connections = []
+			self.port = port
+			self.serverSocket = None
+			self._lock = threading.Lock()
+
+		def start(self):
+			self.serverSocket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+			self.serverSocket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+			self.serverSocket.bind(('127.0.0.1', self.port))
+			self.serverSocket.listen(4)
+			self.port = self.serverSocket.getsockname()[1]
+
+			threading.Thread(target = self._accept, args = (self.serverSocket,), daemon = True).start()
+
+		def kill(self):
+			self.serverSocket.close()
+
+			with self._lock:
+				for connection in self.connections:
+					try:
+						connection.shutdown(socket.SHUT_RDWR)
+					except OSError:
+						pass
+
+					connection.close()
+
+				self.connections.clear()
+
+		def getPayloads(self) -> list:
+			with self._lock:
+				return list(self.payloads)
+
+		def _accept(self, serverSocket):
+			while True:
+				try:
+					connection, address = serverSocket.accept()
+				except OSError:
+					return
+
+				with self._lock:
+					self.connections.append(connection)
+
+				threading.Thread(target = self._serve, args = (connection,), daemon = True).start()
+
+		def _serve(self, connection):
+			try:
+				while True:
+					header, body = self._readPacket(connection)
+					packetType = header >> 4
+
+					if packetType == 1:
+						connection.sendall(b'\x20\x02\x00\x00')
+					elif packetType == 3:
+						topicLength = int.from_bytes(body[0:2], 'big')
+						qos = (header >> 1) & 0x03
+						payloadOffset = 2 + topicLength + (2 if qos > 0 else 0)
+
+						with self._lock:
+							self.payloads.append(body[payloadOffset:])
+
+						if qos == 1:
+							connection.sendall(b'\x40\x02' + body[2 + topicLength:payloadOffset])
+					elif packetType == 8:
+						connection.sendall(b'\x90\x03' + body[0:2] + b'\x00')
+					elif packetType == 12:
+						connection.sendall(b'\xd0\x00')
+					elif packetType == 14:
+						return
+			except (OSError, ConnectionError):
+				return
+			finally:
+				connection.close()
+
+		def _readPacket(self, connection) -> tuple:
+			header = self._readBytes(connection, 1)[0]
+			remaining = 0
+			multiplier = 1
+
+			while True:
+				digit = self._readBytes(connection, 1)[0]
+				remaining += (digit & 0x7f) * multiplier
+				multiplier *= 128
+
+				if not digit & 0x80:
+					break
+
+			return (header, self._readBytes(connection, remaining))
+
+		def _readBytes(self, connection, count: int) -> bytes:
+			data = b''
+
+			while len(data) < count:
+				chunk = connection.recv(count - len(data))
+
+				if not chunk:
+					raise ConnectionError("Connection closed")
+
+				data += chunk
+
+			return data
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+
+		ConfigUtil(configFile = self.configFile)
+
+	def setUp(self):
+		self.spoolPath = tempfile.mkdtemp(prefix = 'cda-spool-test-')
+
+	def tearDown(self):
+		shutil.rmtree(self.spoolPath, ignore_errors = True)
+
+	def testNoGapsAfterBrokerOutage(self):
+		broker = self.BrokerStandIn()
+		broker.start()
+
+		mqttClient = MqttClientConnector(clientID = 'CDAMessageSpoolTest001')
+		mqttClient.host = '127.0.0.1'
+		mqttClient.port = broker.port
+		mqttClient.enableCrypt = False
+		mqttClient.spoolAckTimeout = 0.5
+
+		if mqttClient.spool:
+			mqttClient.spool.close()
+
+		mqttClient.spool = MessageSpool(self.spoolPath, replayRate = 500, retryDelay = 0.2)
+
+		mqttClient.connectClient()
+		mqttClient.mqttClient.reconnect_delay_set(min_delay = 1, max_delay = 1)
+
+		self._waitFor(lambda: mqttClient.connected)
+
+		for i in range(0, self.MESSAGE_COUNT):
+			if i == self.MESSAGE_COUNT // 3:
+				logging.info("Stopping broker stand-in after %r messages", i)
+				broker.kill()
+				restartTimer = threading.Timer(self.OUTAGE_SECS, broker.start)
+				restartTimer.start()
+
+			sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+			sd.setValue(float(i))
+
+			self.assertTrue(mqttClient.publishData(resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, data = sd, qos = 1))
+
+			time.sleep(self.PUBLISH_INTERVAL)
+
+		restartTimer.join()
+
+		self.assertTrue(self._waitFor(lambda: mqttClient.getSpool().getPendingCount() == 0, timeout = 30))
+
+		metrics = mqttClient.getSpool().getMetrics()
+		mqttClient.disconnectClient()
+		mqttClient.getSpool().close()
+		broker.kill()
+
+		values = [int(DataUtil().jsonToSensorData(payload.decode('utf-8')).getValue()) for payload in broker.getPayloads()]
+		inOrder = [value for index, value in enumerate(values) if index == 0 or value != values[index - 1]]
+
+		logging.info("Spool metrics: %r | received = %r | repeats = %r", metrics, len(values), len(values) - len(inOrder))
+
+		self.assertEqual(inOrder, list(range(0, self.MESSAGE_COUNT)))
+		self.assertEqual(metrics['dropped'], 0)
+
+	def _waitFor(self, condition, timeout: float = 10) -> bool:
+		endTime = time.monotonic() + timeout
+
+		while time.monotonic() < endTime:
+			if condition():
+				return True
+
+			time.sleep(0.05)
+
+		return False
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,133 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.DeadbandFilter import DeadbandFilter
+from programmingtheiot.cda.pipeline.PredictiveFilter import PredictiveFilter
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataModel import SensorDataModel
+from programmingtheiot.data.SensorDataPredictor import SensorDataPredictor
+
+class PredictiveFilterReplayTest(unittest.TestCase):
+	"""
+	This test case class replays the simulated sensor data sets through
+	PredictiveFilter, sends the readings it lets through as JSON to a
+	receiving SensorDataPredictor, and fills in the other readings from
+	the receiver's predictions. It reports the messages saved and the
+	largest reconstruction error for several models, and for
+	DeadbandFilter (where the receiver holds the last value) at the same
+	tolerance.
+	
+	The heartbeat is off, so only the model decides what's sent.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	# (label, alpha, beta)
+	MODELS = [
+		("last value", 1.0, 0.0),
+		("last value plus slope", 1.0, 1.0),
+		("holt", ConfigConst.DEFAULT_PREDICTION_ALPHA, ConfigConst.DEFAULT_PREDICTION_BETA)
+	]
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		ConfigUtil(configFile = self.configFile)
+		
+	def setUp(self):
+		self.dataUtil = DataUtil()
+		
+	def tearDown(self):
+		pass
+	
+	def testEnvironmentPressure(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_EnvironmentPressure.json", 1.0)
+		
+	def testIndoorHumidity(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorHumidity.json", 0.5)
+		
+	def testIndoorTemperature(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorTemperature.json", 0.25)
+		
+	def _execTestDataSet(self, fileName: str, tolerance: float):
+		readings = []
+		
+		with open(self.simDataPath + fileName, 'r') as simDataFile:
+			entries = json.load(simDataFile)['sensorDataList']
+			
+		for entry in entries:
+			sd = SensorData()
+			self.dataUtil._fillIotDataFromDict(sd, entry)
+			readings.append(sd)
+			
+		typeID = readings[0].getTypeID()
+		results = {}
+		
+		for label, alpha, beta in self.MODELS:
+			predictiveFilter = PredictiveFilter()
+			predictiveFilter.setModel(typeID, tolerance = tolerance, alpha = alpha, beta = beta, maxSilenceSecs = 0)
+			
+			results[label] = self._replay(fileName, label, readings, tolerance, predictiveFilter.filter, SensorDataPredictor())
+			
+		deadbandFilter = DeadbandFilter()
+		deadbandFilter.setThresholds(typeID, absolute = tolerance, maxSilenceSecs = 0)
+		
+		# a receiver that holds the last value
+		results["deadband"] = self._replay(fileName, "deadband", readings, tolerance, \
+			lambda sd: sd if deadbandFilter.accept(sd) else None, SensorDataPredictor(alpha = 1.0, beta = 0.0))
+		
+		for label, (sentCount, maxError) in results.items():
+			self.assertLessEqual(maxError, tolerance + 1e-9)
+			
+		self.assertLessEqual(results["holt"][0], results["deadband"][0])
+		
+	def _replay(self, fileName: str, label: str, readings: list, tolerance: float, filterFunc, receiver: SensorDataPredictor) -> tuple:
+		sentCount = 0
+		sentBytes = 0
+		maxError = 0.0
+		
+		for sd in readings:
+			sentData = filterFunc(sd)
+			
+			if sentData:
+				jsonData = self.dataUtil.sensorDataToJson(sentData)
+				dataDict = self.dataUtil._jsonToDict(jsonData)
+				
+				received = SensorDataModel() if isinstance(sentData, SensorDataModel) else SensorData()
+				self.dataUtil._fillIotDataFromDict(received, dataDict)
+				receiver.apply(received)
+				
+				sentCount += 1
+				sentBytes += len(jsonData)
+				value = received.getValue()
+			else:
+				value = receiver.predict(sd.getTimeStampNanos())
+				
+			maxError = max(maxError, abs(value - sd.getValue()))
+			
+		logging.info( \
+			"\n\tTesting predictive reporting: %s | %s | tolerance = %r | readings = %r | sent = %r (%r bytes) | saved = %.1f%% | max reconstruction error = %.4f", \
+			fileName, label, tolerance, len(readings), sentCount, sentBytes, 100.0 * (1.0 - sentCount / len(readings)), maxError)
+		
+		return (sentCount, maxError)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,151 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import random
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.RuleEngine import RuleEngine
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class RuleEnginePerformanceTest(unittest.TestCase):
+	"""
+	This test case class benchmarks RuleEngine with 1,000 rules (single
+	thresholds with hysteresis, multi-sensor conditions and rates of
+	change) over 10,000 readings replayed from the simulated sensor data
+	sets, and compares it with checking every rule on every reading.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	NS_IN_MICROS = 1000
+	
+	RULE_COUNT = 1000
+	READING_COUNT = 10000
+	TARGET_READINGS_PER_SEC = 10000
+	
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	DATA_SETS = [
+		"PIOT_SimulatedTestData_EnvironmentPressure.json",
+		"PIOT_SimulatedTestData_IndoorHumidity.json",
+		"PIOT_SimulatedTestData_IndoorTemperature.json"
+	]
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+	def setUp(self):
+		self.readings = self._loadReadings()
+		self.ruleEngine = RuleEngine()
+		
+		for name in self.ruleEngine.getRuleNames():
+			self.ruleEngine.removeRule(name)
+			
+		self._addRules(random.Random(42))
+		
+	def tearDown(self):
+		pass
+	
+	def testRuleEvaluation(self):
+		commandCount = 0
+		startNanos = time.perf_counter_ns()
+		
+		for sd in self.readings:
+			commandCount += len(self.ruleEngine.evaluate(sd))
+			
+		elapsedNanos = time.perf_counter_ns() - startNanos
+		metrics = self.ruleEngine.getMetrics()
+		readingsPerSec = len(self.readings) * self.NS_IN_SECS / elapsedNanos
+		
+		# for comparison: checking every rule on every reading
+		rules = [self.ruleEngine.rules[name] for name in self.ruleEngine.getRuleNames()]
+		startNanos = time.perf_counter_ns()
+		
+		for sd in self.readings:
+			for rule in rules:
+				rule.check(rule.isActive)
+				
+		naiveReadingsPerSec = len(self.readings) * self.NS_IN_SECS / (time.perf_counter_ns() - startNanos)
+		
+		logging.info( \
+			"\n\tTesting rule engine: rules = %r | readings = %r | commands = %r | checks per reading = %.1f | %.1f us per reading | %.0f readings/s (target %r) | every rule on every reading: %.0f readings/s", \
+			metrics['rules'], metrics['readings'], commandCount, metrics['checksPerReading'], \
+			elapsedNanos / len(self.readings) / self.NS_IN_MICROS, readingsPerSec, self.TARGET_READINGS_PER_SEC, naiveReadingsPerSec)
+		
+		self.assertEqual(metrics['rules'], self.RULE_COUNT)
+		self.assertEqual(metrics['readings'], self.READING_COUNT)
+		self.assertEqual(metrics['commands'], commandCount)
+		self.assertGreater(commandCount, 0)
+		self.assertLess(metrics['checksPerReading'], self.RULE_COUNT / 3)
+		
+	def _addRules(self, rand: random.Random):
+		# thresholds are spread over the range of each data set, so the
+		# replay crosses many of them
+		ranges = {}
+		
+		for sd in self.readings:
+			low, high = ranges.get(sd.getTypeID(), (sd.getValue(), sd.getValue()))
+			ranges[sd.getTypeID()] = (min(low, sd.getValue()), max(high, sd.getValue()))
+			
+		typeIDs = sorted(ranges.keys())
+		
+		def threshold(typeID: int) -> float:
+			return round(rand.uniform(*ranges[typeID]), 2)
+		
+		for i in range(0, self.RULE_COUNT):
+			typeID = typeIDs[i % len(typeIDs)]
+			op = rand.choice(['<', '>'])
+			
+			if i % 10 == 8:
+				otherTypeID = typeIDs[(i + 1) % len(typeIDs)]
+				condition = f"{typeID} {op} {threshold(typeID)} and {otherTypeID} {op} {threshold(otherTypeID)}"
+			elif i % 10 == 9:
+				condition = f"rate({typeID}) {op} {'-' if op == '<' else ''}{rand.uniform(0.001, 0.01):.4f}"
+			else:
+				condition = f"{typeID} {op} {threshold(typeID)}"
+				
+			self.ruleEngine.addRule(f"Rule{i}", condition, ConfigConst.HVAC_ACTUATOR_TYPE, \
+				actuatorValue = 1.0, hysteresis = round(rand.uniform(0.0, 0.5), 2))
+			
+	def _loadReadings(self) -> list:
+		dataUtil = DataUtil()
+		dataSets = []
+		
+		for fileName in self.DATA_SETS:
+			with open(self.simDataPath + fileName, 'r') as simDataFile:
+				entries = json.load(simDataFile)['sensorDataList']
+				
+			dataSets.append(entries)
+			
+		# interleave the data sets, repeating them with later time stamps
+		# until there are enough readings
+		readings = []
+		offsetNanos = 0
+		
+		while len(readings) < self.READING_COUNT:
+			for entries in zip(*dataSets):
+				for entry in entries:
+					sd = SensorData()
+					dataUtil._fillIotDataFromDict(sd, entry)
+					sd.setTimeStampNanos(sd.getTimeStampNanos() + offsetNanos)
+					readings.append(sd)
+					
+			offsetNanos = readings[-1].getTimeStampNanos() + self.NS_IN_SECS - readings[0].getTimeStampNanos()
+			
+		return readings[:self.READING_COUNT]
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,125 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import json
+import logging
+import os
+import unittest
+
+import numpy as calcLib
+
+from programmingtheiot.cda.pipeline.WindowAggregator import WindowAggregator
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class WindowAggregatorAccuracyTest(unittest.TestCase):
+	"""
+	This test case class replays the simulated sensor data sets through
+	WindowAggregator, with a tumbling and a sliding window, and compares
+	each window summary with NumPy statistics computed over the same
+	readings. Mean, min, max and standard deviation must match; the
+	percentile estimates must be within a fraction of the window's range.
+	
+	The P-Square estimates are rough for small windows: a 600 s window
+	holds about 36 readings, too few to place a 99th percentile well.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	simDataPath = os.path.dirname(__file__) + "/../../../simTestData/"
+	
+	NS_IN_SECS = 1000000000
+	
+	# (windowSecs, slideSecs)
+	WINDOWS = [(600, None), (3600, 900)]
+	PERCENTILES = [50, 90, 99]
+	
+	# max and mean percentile error, as a fraction of (max - min) of the window
+	PERCENTILE_TOLERANCE      = 0.3
+	MEAN_PERCENTILE_TOLERANCE = 0.15
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		ConfigUtil(configFile = self.configFile)
+		
+	def setUp(self):
+		self.aggregator = WindowAggregator()
+		self.aggregator.setPercentiles(self.PERCENTILES)
+		
+	def tearDown(self):
+		pass
+	
+	def testEnvironmentPressure(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_EnvironmentPressure.json")
+		
+	def testIndoorHumidity(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorHumidity.json")
+		
+	def testIndoorTemperature(self):
+		self._execTestDataSet("PIOT_SimulatedTestData_IndoorTemperature.json")
+		
+	def _execTestDataSet(self, fileName: str):
+		dataUtil = DataUtil()
+		readings = []
+		
+		with open(self.simDataPath + fileName, 'r') as simDataFile:
+			entries = json.load(simDataFile)['sensorDataList']
+			
+		for entry in entries:
+			sd = SensorData()
+			dataUtil._fillIotDataFromDict(sd, entry)
+			readings.append(sd)
+			
+		self.aggregator.setWindows(readings[0].getTypeID(), self.WINDOWS)
+		
+		summaries = []
+		
+		for sd in readings:
+			summaries += self.aggregator.add(sd)
+			
+		summaries += self.aggregator.flush()
+		
+		timeStamps = calcLib.array([sd.getTimeStampNanos() for sd in readings], dtype = calcLib.int64)
+		values = calcLib.array([sd.getValue() for sd in readings])
+		
+		percentileErrors = []
+		
+		for summary in summaries:
+			endNanos = summary.getTimeStampNanos()
+			startNanos = endNanos - int(summary.getWindowSecs() * self.NS_IN_SECS)
+			window = values[(timeStamps >= startNanos) & (timeStamps < endNanos)]
+			
+			self.assertEqual(summary.getSampleCount(), len(window))
+			self.assertAlmostEqual(summary.getValue(), calcLib.mean(window), delta = 1e-9)
+			self.assertAlmostEqual(summary.getStddev(), calcLib.std(window), delta = 1e-9)
+			self.assertEqual(summary.getMinValue(), calcLib.min(window))
+			self.assertEqual(summary.getMaxValue(), calcLib.max(window))
+			
+			valueRange = calcLib.max(window) - calcLib.min(window)
+			
+			for percentile in self.PERCENTILES:
+				error = abs(summary.getPercentile(percentile) - calcLib.percentile(window, percentile))
+				
+				self.assertLessEqual(error, self.PERCENTILE_TOLERANCE * valueRange + 1e-9)
+				
+				if valueRange > 0:
+					percentileErrors.append(error / valueRange)
+					
+		self.assertLessEqual(calcLib.mean(percentileErrors), self.MEAN_PERCENTILE_TOLERANCE)
+		self.assertEqual(self.aggregator.getMetrics()['late'], 0)
+		
+		logging.info( \
+			"\n\tTesting aggregation: %s | readings = %r | summaries = %r | percentile error = %.1f%% mean, %.1f%% max of window range", \
+			fileName, len(readings), len(summaries), calcLib.mean(percentileErrors) * 100, max(percentileErrors) * 100)
+		
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,138 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import time
+import tracemalloc
+import unittest
+
+import numpy
+
+from programmingtheiot.cda.sim.SensorDataGenerator import SensorDataGenerator
+
+class SensorDataGeneratorPerformanceTest(unittest.TestCase):
+	"""
+	This test case class compares generating the daily data sets of
+	SENSOR_COUNT simulated sensors at second granularity up front, as
+	SensorDataSets, with streaming them as SensorDataStreams: the time to
+	create them (the startup cost), the memory they hold, the peak memory,
+	and the time to then read READ_SECS worth of entries from each.
+	
+	It also compares generating the data of MATRIX_SENSOR_COUNT sensors
+	(at minute granularity), with a mix of ranges, curve types and noise
+	levels, one sensor at a time with generateDailySensorDataSet(), with
+	generating them all at once with generateSensorDataMatrix().
+	
+	"""
+	
+	SENSOR_COUNT = 100
+	READ_SECS = 60 * 60
+	
+	MATRIX_SENSOR_COUNT = 2000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+	def testStartupAndMemory(self):
+		dataSetResults = self._generate(streamData = False)
+		streamResults = self._generate(streamData = True)
+		
+		logging.info("".join( \
+			f"\n\t{name}: {createSecs:.3f} s to create, {heldBytes / 1048576.0:.1f} MB held, " + \
+			f"{peakBytes / 1048576.0:.1f} MB peak, {readSecs:.3f} s to read {self.READ_SECS} entries each" \
+			for name, (createSecs, heldBytes, peakBytes, readSecs) in (('SensorDataSet', dataSetResults), ('SensorDataStream', streamResults))))
+		
+		self.assertLess(streamResults[0], dataSetResults[0])
+		self.assertLess(streamResults[1] * 10, dataSetResults[1])
+		self.assertLess(streamResults[2] * 10, dataSetResults[2])
+		
+	def testMatrix(self):
+		curveTypes = numpy.resize([SensorDataGenerator.FULL_WAVE, SensorDataGenerator.BELL_CURVE, SensorDataGenerator.INVERSE_CURVE], self.MATRIX_SENSOR_COUNT)
+		noiseLevels = numpy.resize([1, 10, 50], self.MATRIX_SENSOR_COUNT)
+		minValues = numpy.linspace(10.0, 1000.0, self.MATRIX_SENSOR_COUNT)
+		maxValues = minValues * 1.5
+		
+		dataGenerator = SensorDataGenerator()
+		results = {}
+		
+		def generateDataSets():
+			return [dataGenerator.generateDailySensorDataSet(curveType = int(curveType), noiseLevel = int(noiseLevel), \
+				minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24) \
+				for curveType, noiseLevel, minValue, maxValue in zip(curveTypes, noiseLevels, minValues, maxValues)]
+			
+		def generateMatrix(dtype):
+			return lambda: dataGenerator.createSensorDataSets(dataGenerator.generateSensorDataMatrix( \
+				curveTypes = curveTypes, noiseLevels = noiseLevels, minValues = minValues, maxValues = maxValues, dtype = dtype))
+			
+		for name, generate in (('per sensor', generateDataSets), ('matrix', generateMatrix(numpy.float64)), ('float32 matrix', generateMatrix(numpy.float32))):
+			results[name] = self._measure(generate)
+			
+		logging.info("".join( \
+			f"\n\t{name}: {createSecs:.3f} s to create {self.MATRIX_SENSOR_COUNT} data sets, " + \
+			f"{heldBytes / 1048576.0:.1f} MB held, {peakBytes / 1048576.0:.1f} MB peak" \
+			for name, (createSecs, heldBytes, peakBytes) in results.items()))
+		
+		self.assertLess(results['matrix'][0], results['per sensor'][0])
+		self.assertLess(results['matrix'][1], results['per sensor'][1])
+		self.assertLess(results['float32 matrix'][1], results['matrix'][1])
+		
+	def _measure(self, generate) -> tuple:
+		logging.disable(logging.INFO)
+		tracemalloc.start()
+		
+		try:
+			startTime = time.perf_counter()
+			dataSets = generate()
+			createSecs = time.perf_counter() - startTime
+			
+			heldBytes, peakBytes = tracemalloc.get_traced_memory()
+			
+		finally:
+			tracemalloc.stop()
+			logging.disable(logging.NOTSET)
+			
+		return createSecs, heldBytes, peakBytes
+	
+	def _generate(self, streamData: bool) -> tuple:
+		dataGenerator = SensorDataGenerator()
+		
+		# the data sets log their creation
+		logging.disable(logging.INFO)
+		tracemalloc.start()
+		
+		try:
+			startTime = time.perf_counter()
+			
+			dataSets = [ \
+				dataGenerator.generateDailyIndoorTemperatureDataSet( \
+					minValue = SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, maxValue = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP, \
+					useSeconds = True, streamData = streamData) \
+				for _ in range(self.SENSOR_COUNT)]
+			
+			createSecs = time.perf_counter() - startTime
+			heldBytes = tracemalloc.get_traced_memory()[0]
+			
+			startTime = time.perf_counter()
+			
+			for dataSet in dataSets:
+				for index in range(self.READ_SECS):
+					dataSet.getDataEntry(index)
+					
+			readSecs = time.perf_counter() - startTime
+			peakBytes = tracemalloc.get_traced_memory()[1]
+			
+		finally:
+			tracemalloc.stop()
+			logging.disable(logging.NOTSET)
+			
+		return createSecs, heldBytes, peakBytes, readSecs
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,152 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import threading
+import time
+import unittest
+
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from apscheduler.schedulers.background import BackgroundScheduler
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.sim.BaseSensorSimTask import BaseSensorSimTask
+from programmingtheiot.cda.system.ActuatorAdapterManager import ActuatorAdapterManager
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
+from programmingtheiot.cda.system.SensorAdapterManager import SensorAdapterManager
+from programmingtheiot.cda.system.SystemPerformanceManager import SystemPerformanceManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+
+class SchedulerServicePerformanceTest(unittest.TestCase):
+	"""
+	This test case class runs 50 simulated sensors and the system
+	performance metrics, first the way the managers used to (a scheduler
+	per manager, polling all of its sensors in one job every
+	pollCycleSecs), then with the shared SchedulerService (a job per
+	sensor, metric and actuator heartbeat, each at its configured
+	interval). It logs the threads added to the process and the scheduler
+	wakeups per minute of each.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	
+	SENSOR_COUNT = 50
+	RUN_SECS = 20
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		# the sensors are simulated, whatever the configured emulator setting
+		self.configParser = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.enableEmulator = self.configParser.get(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, fallback = 'False')
+		self.configParser.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, 'False')
+		
+	@classmethod
+	def tearDownClass(self):
+		self.configParser.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, self.enableEmulator)
+		
+	def setUp(self):
+		self.sensorAdapterMgr = SensorAdapterManager()
+		self.systemPerfMgr = SystemPerformanceManager()
+		self.actuatorAdapterMgr = ActuatorAdapterManager()
+		
+		# add simulated sensors to the three built in, alternating 5 s and 10 s polls
+		for i in range(len(self.sensorAdapterMgr.sensorAdapters), self.SENSOR_COUNT):
+			sensor = BaseSensorSimTask(name = f"SimSensor{i}", typeID = ConfigConst.TEMP_SENSOR_TYPE, minVal = 15.0, maxVal = 25.0)
+			self.sensorAdapterMgr.addSensorAdapter(sensor, 5.0 if i % 2 else 10.0)
+			
+	def testThreadsAndWakeups(self):
+		self.assertEqual(len(self.sensorAdapterMgr.sensorAdapters), self.SENSOR_COUNT)
+		
+		pollRate = self.sensorAdapterMgr.pollRate
+		
+		# before: one scheduler per manager, one job polling everything
+		wakeups = []
+		schedulers = []
+		
+		for func in (self._pollAllSensors, self.systemPerfMgr.handleTelemetry):
+			scheduler = BackgroundScheduler()
+			scheduler.add_job(func, 'interval', seconds = pollRate, max_instances = 2, coalesce = True, misfire_grace_time = 15)
+			scheduler.add_listener(lambda event: wakeups.append(event.scheduled_run_times[-1]), EVENT_JOB_SUBMITTED)
+			schedulers.append(scheduler)
+			
+		threadCount = threading.active_count()
+		
+		for scheduler in schedulers:
+			scheduler.start()
+			
+		beforeThreads = self._sampleThreads() - threadCount
+		
+		for scheduler in schedulers:
+			scheduler.shutdown()
+			
+		beforeWakeups = len(wakeups) * 60.0 / self.RUN_SECS
+		
+		# after: the shared scheduler, a job per sensor, metric and heartbeat
+		scheduler = SchedulerService()
+		
+		threadCount = threading.active_count()
+		
+		self.sensorAdapterMgr.startManager()
+		self.systemPerfMgr.startManager()
+		self.actuatorAdapterMgr.startManager()
+		
+		# the wakeups are counted once the first readings, taken at start, are in
+		time.sleep(1.0)
+		wakeupCount = scheduler.getMetrics()['wakeups']
+		
+		# the sensor read workers are bounded by sensorReadWorkers, not the scheduler
+		afterThreads = self._sampleThreads() - threadCount
+		readThreads = len([thread for thread in threading.enumerate() if thread.name.startswith('SensorRead')])
+		metrics = scheduler.getMetrics()
+		
+		self.actuatorAdapterMgr.stopManager()
+		self.systemPerfMgr.stopManager()
+		self.sensorAdapterMgr.stopManager()
+		
+		afterWakeups = (metrics['wakeups'] - wakeupCount) * 60.0 / self.RUN_SECS
+		
+		logging.info( \
+			f"\n\tBefore ({len(schedulers)} schedulers, all sensors every {pollRate} s): " + \
+			f"{beforeThreads} threads added, {beforeWakeups:.0f} wakeups/min" + \
+			f"\n\tAfter (shared scheduler, {metrics['jobs']} jobs): " + \
+			f"{afterThreads} threads added ({readThreads} sensor read workers), {afterWakeups:.0f} wakeups/min, " + \
+			f"{metrics['runs']} runs, {metrics['misfires']} misfires, {metrics['overruns']} overruns")
+		
+		self.assertLess(afterThreads - readThreads, beforeThreads)
+		self.assertLessEqual(readThreads, self.sensorAdapterMgr.readWorkers)
+		self.assertEqual(metrics['misfires'], 0)
+		self.assertEqual(metrics['overruns'], 0)
+		self.assertFalse(scheduler.isRunning())
+		
+		# staggering spreads the polls, but never wakes more than once per step
+		self.assertLessEqual(afterWakeups, 60.0 / scheduler.staggerSecs)
+		
+	def _pollAllSensors(self):
+		# as SensorAdapterManager.handleTelemetry() used to: one sensor after another
+		for adapter, pollSecs in self.sensorAdapterMgr.sensorAdapters:
+			self.sensorAdapterMgr._handleSensorData(adapter.generateTelemetry())
+			
+	def _sampleThreads(self) -> int:
+		# the peak thread count while running
+		peakCount = 0
+		endTime = time.time() + self.RUN_SECS
+		
+		while time.time() < endTime:
+			peakCount = max(peakCount, threading.active_count())
+			time.sleep(0.05)
+			
+		return peakCount
+
+if __name__ == "__main__":
+	unittest.main()
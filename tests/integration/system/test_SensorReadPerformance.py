@@ -0,0 +1,129 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.sim.BaseSensorSimTask import BaseSensorSimTask
+from programmingtheiot.cda.system.SensorAdapterManager import SensorAdapterManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class SensorReadPerformanceTest(unittest.TestCase):
+	"""
+	This test case class measures the latency of a SensorAdapterManager
+	poll cycle with 3, 30 and 300 simulated sensors whose reads take 2 to
+	8 ms, like I2C or SenseHAT reads, reading them one after another (as
+	the manager used to) and concurrently with the configured workers. It
+	then adds a sensor that hangs and one that is never ready, which the
+	concurrent cycle skips after the read timeout.
+	
+	"""
+	
+	configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props"
+	
+	SENSOR_COUNTS = [3, 30, 300]
+	CYCLE_COUNT = 5
+	
+	class DelayedSensorTask(BaseSensorSimTask):
+		def __init__(self, name: str, delaySecs: float, isReady: bool = True):
+			super().__init__(name = name, typeID = ConfigConst.TEMP_SENSOR_TYPE, minVal = 15.0, maxVal = 25.0)
+			
+			self.delaySecs = delaySecs
+			self.isReady = isReady
+			
+		def generateTelemetry(self) -> SensorData:
+			time.sleep(self.delaySecs)
+			
+			return super().generateTelemetry() if self.isReady else None
+		
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.INFO)
+		
+		# the sensors are simulated, whatever the configured emulator setting
+		self.configParser = ConfigUtil(configFile = self.configFile)._getConfig()
+		self.enableEmulator = self.configParser.get(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, fallback = 'False')
+		self.configParser.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, 'False')
+		
+	@classmethod
+	def tearDownClass(self):
+		self.configParser.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, self.enableEmulator)
+		
+	def testCycleLatency(self):
+		for sensorCount in self.SENSOR_COUNTS:
+			sensorAdapterMgr = self._createManager(sensorCount)
+			adapters = [adapter for adapter, pollSecs in sensorAdapterMgr.sensorAdapters]
+			
+			serialSecs = self._timeCycles(lambda: [adapter.generateTelemetry() for adapter in adapters])
+			concurrentSecs = self._timeCycles(sensorAdapterMgr.handleTelemetry)
+			
+			sensorAdapterMgr.stopManager()
+			
+			logging.info( \
+				f"\n\t{sensorCount} sensors: serial {serialSecs * 1000.0:.1f} ms/cycle, " + \
+				f"concurrent ({sensorAdapterMgr.readWorkers} workers) {concurrentSecs * 1000.0:.1f} ms/cycle, " + \
+				f"{serialSecs / concurrentSecs:.1f}x")
+			
+			self.assertEqual(sensorAdapterMgr.getReadMetrics()['reads'], sensorCount * self.CYCLE_COUNT)
+			self.assertLess(concurrentSecs, serialSecs)
+			
+	def testHungAndNotReadySensors(self):
+		sensorAdapterMgr = self._createManager(self.SENSOR_COUNTS[1])
+		timeoutSecs = sensorAdapterMgr.readTimeout
+		
+		sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("HungSensor", timeoutSecs * self.CYCLE_COUNT))
+		sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("NotReadySensor", 0.005, isReady = False))
+		
+		cycleSecs = []
+		
+		for i in range(0, self.CYCLE_COUNT):
+			startTime = time.perf_counter()
+			sensorAdapterMgr.handleTelemetry()
+			cycleSecs.append(time.perf_counter() - startTime)
+			
+		sensorAdapterMgr.stopManager()
+		metrics = sensorAdapterMgr.getReadMetrics()
+		
+		logging.info( \
+			f"\n\t{len(sensorAdapterMgr.sensorAdapters)} sensors, one hung and one not ready: " + \
+			f"first cycle {cycleSecs[0] * 1000.0:.1f} ms (timeout {timeoutSecs} s), " + \
+			f"then {max(cycleSecs[1:]) * 1000.0:.1f} ms max; {metrics}")
+		
+		# the hung sensor costs one timeout, then is skipped while still busy
+		self.assertLess(cycleSecs[0], timeoutSecs + 0.5)
+		self.assertLess(max(cycleSecs[1:]), timeoutSecs)
+		self.assertEqual(metrics['timeouts'], 1)
+		self.assertEqual(metrics['busy'], self.CYCLE_COUNT - 1)
+		self.assertEqual(metrics['notReady'], self.CYCLE_COUNT)
+		
+	def _createManager(self, sensorCount: int) -> SensorAdapterManager:
+		sensorAdapterMgr = SensorAdapterManager()
+		sensorAdapterMgr.sensorAdapters = []
+		sensorAdapterMgr.isStarted = True
+		
+		for i in range(0, sensorCount):
+			sensorAdapterMgr.sensorAdapters.append((self.DelayedSensorTask(f"SimSensor{i}", 0.002 + 0.006 * (i % 7) / 6), 5.0))
+			
+		return sensorAdapterMgr
+	
+	def _timeCycles(self, func) -> float:
+		startTime = time.perf_counter()
+		
+		for i in range(0, self.CYCLE_COUNT):
+			func()
+			
+		return (time.perf_counter() - startTime) / self.CYCLE_COUNT
+
+if __name__ == "__main__":
+	unittest.main()
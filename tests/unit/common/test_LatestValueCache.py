@@ -0,0 +1,173 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import threading
+import time
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.common.LatestValueCache import LatestValueCache
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+
+class LatestValueCacheTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	LatestValueCache, including a stress test with concurrent
+	writers and readers.
+
+	"""
+	WRITER_COUNT = 4
+	READER_COUNT = 4
+	WRITES_PER_WRITER = 5000
+	NAMES_PER_WRITER = 8
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing LatestValueCache class...")
+
+	def testGetByNameAndTypeID(self):
+		cache = LatestValueCache()
+
+		temp = self._createSensorData(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE, 21.0)
+		humidity = self._createSensorData(ConfigConst.HUMIDITY_SENSOR_NAME, ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0)
+
+		self.assertIsNone(cache.get())
+		self.assertTrue(cache.put(temp))
+		self.assertTrue(cache.put(humidity))
+		self.assertFalse(cache.put(None))
+
+		self.assertIs(cache.get(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE), temp)
+		self.assertIs(cache.get(ConfigConst.TEMP_SENSOR_NAME), temp)
+		self.assertIs(cache.get(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE), humidity)
+		self.assertIs(cache.get(), humidity)
+		self.assertIsNone(cache.get(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.HUMIDITY_SENSOR_TYPE))
+
+		# removing the latest item makes the one before it the latest
+		self.assertTrue(cache.remove(ConfigConst.HUMIDITY_SENSOR_NAME, ConfigConst.HUMIDITY_SENSOR_TYPE))
+		self.assertIs(cache.get(), temp)
+		self.assertIsNone(cache.get(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE))
+		self.assertEqual(cache.getSize(), 1)
+
+	def testBoundedSize(self):
+		cache = LatestValueCache(maxSize = 3)
+
+		for i in range(0, 5):
+			cache.put(self._createSensorData('sensor' + str(i), ConfigConst.TEMP_SENSOR_TYPE, float(i)))
+
+		self.assertEqual(cache.getSize(), 3)
+		self.assertEqual(cache.getEvictionCount(), 2)
+		self.assertIsNone(cache.get('sensor0'))
+		self.assertIsNone(cache.get('sensor1'))
+		self.assertEqual(cache.get('sensor2').getValue(), 2.0)
+		self.assertEqual(cache.get().getValue(), 4.0)
+
+	def testTtlExpiry(self):
+		cache = LatestValueCache(ttl = 0.05)
+		cache.put(self._createSensorData(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE, 21.0))
+
+		self.assertIsNotNone(cache.get(ConfigConst.TEMP_SENSOR_NAME))
+
+		time.sleep(0.1)
+
+		self.assertIsNone(cache.get(ConfigConst.TEMP_SENSOR_NAME))
+
+	def testDeviceDataManagerCaches(self):
+		ddm = DeviceDataManager(noComms = True)
+
+		self.assertIsNone(ddm.getLatestSensorDataFromCache(ConfigConst.TEMP_SENSOR_NAME))
+
+		temp = self._createSensorData(ConfigConst.TEMP_SENSOR_NAME, ConfigConst.TEMP_SENSOR_TYPE, 21.0)
+		response = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		response.setName(ConfigConst.HVAC_ACTUATOR_NAME)
+
+		ddm.handleSensorMessage(temp)
+		ddm.handleActuatorCommandResponse(response)
+
+		self.assertIs(ddm.getLatestSensorDataFromCache(ConfigConst.TEMP_SENSOR_NAME), temp)
+		self.assertIs(ddm.getLatestActuatorDataResponseFromCache(ConfigConst.HVAC_ACTUATOR_NAME), response)
+		self.assertIsNone(ddm.getLatestSystemPerformanceDataFromCache())
+
+	def testConcurrentWritersAndReaders(self):
+		# each writer owns a set of names and writes increasing values, so a
+		# reader must only ever see an item's value go up
+		cache = LatestValueCache(maxSize = self.WRITER_COUNT * self.NAMES_PER_WRITER)
+		isWriting = threading.Event()
+		isWriting.set()
+		errors = []
+		readCounts = []
+
+		def write(writerID: int):
+			for i in range(0, self.WRITES_PER_WRITER):
+				name = 'sensor' + str(writerID) + '-' + str(i % self.NAMES_PER_WRITER)
+				cache.put(self._createSensorData(name, ConfigConst.TEMP_SENSOR_TYPE + writerID, float(i)))
+
+		def read(readerID: int):
+			lastValues = {}
+			readCount = 0
+
+			while isWriting.is_set():
+				for writerID in range(0, self.WRITER_COUNT):
+					name = 'sensor' + str(writerID) + '-' + str(readCount % self.NAMES_PER_WRITER)
+					data = cache.get(name, ConfigConst.TEMP_SENSOR_TYPE + writerID)
+					anyData = cache.get(typeID = ConfigConst.TEMP_SENSOR_TYPE + writerID)
+					readCount += 1
+
+					if data:
+						if data.getName() != name or data.getValue() < lastValues.get(name, -1.0):
+							errors.append((readerID, name, data.getName(), data.getValue()))
+
+						lastValues[name] = data.getValue()
+
+					if anyData and anyData.getTypeID() != ConfigConst.TEMP_SENSOR_TYPE + writerID:
+						errors.append((readerID, writerID, anyData.getTypeID()))
+
+			readCounts.append(readCount)
+
+		readers = [threading.Thread(target = read, args = (i,)) for i in range(0, self.READER_COUNT)]
+		writers = [threading.Thread(target = write, args = (i,)) for i in range(0, self.WRITER_COUNT)]
+
+		startTime = time.perf_counter()
+
+		for thread in readers + writers:
+			thread.start()
+
+		for thread in writers:
+			thread.join()
+
+		elapsed = time.perf_counter() - startTime
+		isWriting.clear()
+
+		for thread in readers:
+			thread.join()
+
+		logging.info("Wrote %r and read %r items in %.3f s", \
+			self.WRITER_COUNT * self.WRITES_PER_WRITER, sum(readCounts) * 2, elapsed)
+
+		self.assertEqual(errors, [])
+		self.assertEqual(cache.getSize(), self.WRITER_COUNT * self.NAMES_PER_WRITER)
+		self.assertEqual(cache.getEvictionCount(), 0)
+
+		for writerID in range(0, self.WRITER_COUNT):
+			for n in range(0, self.NAMES_PER_WRITER):
+				lastValue = max(i for i in range(0, self.WRITES_PER_WRITER) if i % self.NAMES_PER_WRITER == n)
+				self.assertEqual(cache.get('sensor' + str(writerID) + '-' + str(n)).getValue(), float(lastValue))
+
+	def _createSensorData(self, name: str, typeID: int, value: float) -> SensorData:
+		sd = SensorData(typeID = typeID, name = name)
+		sd.setValue(value)
+
+		return sd
+
+if __name__ == "__main__":
+	unittest.main()
@@ -10,6 +10,8 @@
 import logging
 import unittest
 
+from datetime import datetime
+
 import programmingtheiot.common.ConfigConst as ConfigConst
 
 from programmingtheiot.data.BaseIotData import BaseIotData
@@ -71,6 +73,29 @@ class BaseIotDataTest(unittest.TestCase):
 		self.assertEqual(td.getLocationID(), self.DEFAULT_LOCATION_ID)
 		self.assertEqual(td.getStatusCode(), self.DEFAULT_STATUS_CODE)
 		
+	def testTimeStampRendering(self):
+		td = TestIotData()
+		
+		self.assertIsNone(td.getTimeStamp())
+		self.assertIsNone(td.getTimeStampNanos())
+		
+		td.updateTimeStamp()
+		
+		nanos = td.getTimeStampNanos()
+		timeStamp = td.getTimeStamp()
+		
+		self.assertIsNotNone(nanos)
+		self.assertEqual(int(datetime.fromisoformat(timeStamp).timestamp()), nanos // 1000000000)
+		self.assertEqual(datetime.fromisoformat(timeStamp).microsecond, (nanos // 1000) % 1000000)
+		self.assertTrue(timeStamp.endswith('+00:00'))
+		
+		# setting the ISO string (e.g. from JSON) must round trip to nanos
+		td2 = TestIotData()
+		td2.timeStamp = timeStamp
+		
+		self.assertEqual(td2.getTimeStamp(), timeStamp)
+		self.assertEqual(td2.getTimeStampNanos(), (nanos // 1000) * 1000)
+		
 	def _createTestIotData(self):
 		td = TestIotData()
 		
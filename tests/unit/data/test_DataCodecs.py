@@ -0,0 +1,143 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.DataUtil import DataUtil
+
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SystemPerformanceData import SystemPerformanceData
+
+class DataCodecsTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	the payload codecs returned by DataUtil.getCodec().
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing payload codecs...")
+		
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+	
+	def testUnknownCodecFallsBackToJson(self):
+		codec = DataUtil.getCodec("FooBar")
+		
+		self.assertEqual(codec.getName(), ConfigConst.JSON_CODEC)
+		self.assertEqual(codec.getTopicSuffix(), '')
+		self.assertIs(codec, DataUtil.getCodec(ConfigConst.JSON_CODEC))
+		
+	def testJsonCodecs(self):
+		for codecName in (ConfigConst.JSON_CODEC, ConfigConst.JSON_COMPACT_CODEC):
+			codec = DataUtil.getCodec(codecName)
+			
+			self.assertEqual(codec.getName(), codecName)
+			self._checkRoundTrips(codec)
+		
+	def testCborCodec(self):
+		codec = self._getBinaryCodec(ConfigConst.CBOR_CODEC)
+		
+		self.assertEqual(codec.getContentFormat(), ConfigConst.CBOR_CONTENT_FORMAT)
+		self._checkRoundTrips(codec)
+		
+	def testMsgPackCodec(self):
+		codec = self._getBinaryCodec(ConfigConst.MSGPACK_CODEC)
+		
+		self.assertEqual(codec.getContentFormat(), ConfigConst.MSGPACK_CONTENT_FORMAT)
+		self._checkRoundTrips(codec)
+		
+	def testStructCodec(self):
+		codec = DataUtil.getCodec(ConfigConst.STRUCT_CODEC)
+		sd = self._createSensorData()
+		
+		self.assertTrue(codec.canEncode(sd))
+		self.assertFalse(codec.canEncode(ActuatorData()))
+		self.assertFalse(codec.canEncode(SystemPerformanceData()))
+		
+		for statusCode, isEncodable in ((-0x8000, True), (0x7FFF, True), (-0x8001, False), (0x8000, False)):
+			sdStatus = self._createSensorData()
+			sdStatus.setStatusCode(statusCode)
+			
+			self.assertEqual(codec.canEncode(sdStatus), isEncodable)
+			
+		payload = codec.encode(sd)
+		sdCopy = codec.decode(payload, SensorData)
+		
+		self.assertEqual(len(payload), codec.SENSOR_DATA_FORMAT.size)
+		self.assertEqual(sdCopy.getName(), sd.getName())
+		self.assertEqual(sdCopy.getTypeID(), sd.getTypeID())
+		self.assertEqual(sdCopy.getValue(), sd.getValue())
+		self.assertEqual(sdCopy.getStatusCode(), sd.getStatusCode())
+		self.assertEqual(sdCopy.getTimeStampNanos(), sd.getTimeStampNanos())
+		self.assertIsNone(codec.decode(b'', SensorData))
+		
+		# more records than a 16-bit count can hold
+		recordCount = 0x10000 + 1
+		batch = codec.decodeBatch(codec.joinPayloads([payload] * recordCount), SensorData)
+		
+		self.assertEqual(len(batch), recordCount)
+		self.assertEqual(batch[-1].getValue(), sd.getValue())
+		
+	def _checkRoundTrips(self, codec):
+		sd = self._createSensorData()
+		sdCopy = codec.decode(codec.encode(sd), SensorData)
+		
+		self.assertEqual(sdCopy.getName(), sd.getName())
+		self.assertEqual(sdCopy.getValue(), sd.getValue())
+		self.assertEqual(sdCopy.getStatusCode(), sd.getStatusCode())
+		self.assertEqual(sdCopy.getTimeStamp(), sd.getTimeStamp())
+		
+		ad = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)
+		ad.setCommand(ConfigConst.COMMAND_ON)
+		ad.setValue(20.5)
+		ad.setStateData("FooBar")
+		ad.setAsResponse()
+		adCopy = codec.decode(codec.encode(ad), ActuatorData)
+		
+		self.assertEqual(adCopy.getCommand(), ad.getCommand())
+		self.assertEqual(adCopy.getValue(), ad.getValue())
+		self.assertEqual(adCopy.getStateData(), ad.getStateData())
+		self.assertTrue(adCopy.isResponseFlagEnabled())
+		
+		spd = SystemPerformanceData()
+		spd.setCpuUtilization(12.5)
+		spd.setMemoryUtilization(42.0)
+		spdCopy = codec.decode(codec.encode(spd), SystemPerformanceData)
+		
+		self.assertEqual(spdCopy.getCpuUtilization(), spd.getCpuUtilization())
+		self.assertEqual(spdCopy.getMemoryUtilization(), spd.getMemoryUtilization())
+		self.assertIsNone(codec.decode(b'', SensorData))
+		
+	def _createSensorData(self) -> SensorData:
+		sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(21.123456789)
+		sd.setStatusCode(-2)
+		
+		return sd
+		
+	def _getBinaryCodec(self, codecName: str):
+		codec = DataUtil.getCodec(codecName)
+		
+		if codec.getName() != codecName:
+			self.skipTest(f"Codec '{codecName}' is not available.")
+			
+		return codec
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -7,6 +7,7 @@
 # Copyright (c) 2020 - 2025 by Andrew D. King
 # 
 
+import json
 import logging
 import unittest
 
@@ -183,5 +184,64 @@ class DataUtilTest(unittest.TestCase):
 		self.assertEqual(spdObj1.getTimeStamp(), spdObj2.getTimeStamp())
 		self.assertEqual(spdObj1Str, spdObj2Str)
 
+	#@unittest.skip("Ignore for now.")
+	def testCompactFormatConversions(self):
+		logging.info("\n\n----- [Compact JSON Conversions] -----")
+		
+		compactUtil = DataUtil(useCompactFormat = True)
+		stdlibUtil = DataUtil(useCompactFormat = True, useFastBackend = False)
+		
+		ad = ActuatorData()
+		ad.setName(self.adName)
+		ad.setCommand(1)
+		ad.setStateData("Foo Bar \u00b0C")
+		
+		for data in (ad, self._createSensorData(), SystemPerformanceData()):
+			prettyJson = self.dataUtil._objectToJson(data)
+			compactJson = compactUtil._objectToJson(data)
+			
+			logging.info("Compact JSON: " + compactJson)
+			
+			# same content and key order as the default format, and the same bytes for either backend
+			self.assertEqual(list(json.loads(compactJson).items()), list(json.loads(prettyJson).items()))
+			self.assertEqual(compactJson, stdlibUtil._objectToJson(data))
+			self.assertNotIn("\n", compactJson)
+			
+		adObj = compactUtil.jsonToActuatorData(compactUtil.actuatorDataToJson(ad))
+		
+		self.assertEqual(adObj.getName(), self.adName)
+		self.assertEqual(adObj.getCommand(), 1)
+		self.assertEqual(adObj.getTimeStamp(), ad.getTimeStamp())
+		self.assertEqual(compactUtil.actuatorDataToJson(adObj), compactUtil.actuatorDataToJson(ad))
+		
+		# unknown attributes are ignored on the fast path
+		sdObj = compactUtil.jsonToSensorData('{"name":"Foo","value":1.5,"bogus":1}')
+		
+		self.assertEqual(sdObj.getName(), "Foo")
+		self.assertEqual(sdObj.getValue(), 1.5)
+		
+	def testCompactFormatUnslottedSubclass(self):
+		class TaggedSensorData(SensorData):
+			def __init__(self):
+				super().__init__()
+				self.tag = "FooBar"
+				
+		sd = TaggedSensorData()
+		sd.setValue(21.5)
+		
+		for compactUtil in (DataUtil(useCompactFormat = True), DataUtil(useCompactFormat = True, useFastBackend = False)):
+			compactJson = compactUtil._objectToJson(sd)
+			
+			# the attributes kept in __dict__ aren't dropped
+			self.assertEqual(json.loads(compactJson)['tag'], "FooBar")
+			self.assertEqual(list(json.loads(compactJson).items()), list(json.loads(self.dataUtil._objectToJson(sd)).items()))
+			
+	def _createSensorData(self) -> SensorData:
+		sd = SensorData()
+		sd.setName(self.sdName)
+		sd.setValue(21.123456789)
+		
+		return sd
+
 if __name__ == "__main__":
 	unittest.main()
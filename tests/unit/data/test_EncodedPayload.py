@@ -0,0 +1,135 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.connection.MqttClientConnector import MqttClientConnector
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+
+class EncodedPayloadTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	EncodedPayload, including the number of encodes needed
+	for a sensor message that goes to several sinks.
+
+	"""
+
+	class RecordingSink():
+		"""
+		Stands in for the Redis adapter and CoAP client, requesting the
+		payload the same way they do.
+
+		"""
+		def __init__(self):
+			self.payloads = []
+
+		def storePayload(self, resource, payload):
+			self.payloads.append(payload.getPayloadView(DataUtil.getCodec()))
+			return True
+
+		def sendPutData(self, resource = None, name = None, enableCON = False, data = None, timeout = None, useSpool = True):
+			self.payloads.append(data.getPayload(DataUtil.getCodec()))
+			return True
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing EncodedPayload class...")
+
+	def setUp(self):
+		pass
+
+	def tearDown(self):
+		pass
+
+	def testEncodeOncePerCodec(self):
+		sd = self._createSensorData()
+		payload = EncodedPayload(sd)
+
+		self.assertEqual(payload.getEncodeCount(), 0)
+
+		jsonPayload = payload.getPayload(DataUtil.getCodec(ConfigConst.JSON_CODEC))
+
+		self.assertIs(payload.getPayload(DataUtil.getCodec(ConfigConst.JSON_CODEC)), jsonPayload)
+		self.assertIs(payload.getPayload(), jsonPayload)
+		self.assertEqual(payload.getEncodeCount(), 1)
+		self.assertEqual(DataUtil(encodeToUtf8 = True).sensorDataToJson(sd), jsonPayload)
+
+		payload.getPayload(DataUtil.getCodec(ConfigConst.STRUCT_CODEC))
+		payload.getPayload(DataUtil.getCodec(ConfigConst.STRUCT_CODEC))
+
+		self.assertEqual(payload.getEncodeCount(), 2)
+
+	def testFallbackForUnsupportedData(self):
+		payload = EncodedPayload(ActuatorData())
+		structCodec = DataUtil.getCodec(ConfigConst.STRUCT_CODEC)
+
+		self.assertEqual(payload.resolveCodec(structCodec).getName(), ConfigConst.JSON_CODEC)
+		self.assertIs(payload.getPayload(structCodec), payload.getPayload())
+		self.assertEqual(payload.getEncodeCount(), 1)
+
+	def testPayloadView(self):
+		payload = EncodedPayload(self._createSensorData())
+		view = payload.getPayloadView()
+
+		self.assertTrue(view.readonly)
+		self.assertEqual(view.tobytes(), payload.getPayload())
+		self.assertEqual(payload.getEncodeCount(), 1)
+
+		self.assertFalse(EncodedPayload())
+		self.assertIsNone(EncodedPayload().getPayload())
+		self.assertIs(EncodedPayload.wrap(payload), payload)
+
+	def testSensorMessageEncodeCount(self):
+		ddm = DeviceDataManager(noComms = True)
+		redisSink = self.RecordingSink()
+		coapSink = self.RecordingSink()
+
+		# not connected, so publishing fails after the payload is requested
+		ddm.mqttClient = MqttClientConnector()
+		ddm.coapClient = coapSink
+		ddm.redisClient = redisSink
+
+		encodeCounts = []
+		encode = EncodedPayload.getPayload
+
+		def _countingGetPayload(payload, codec = None):
+			result = encode(payload, codec)
+			encodeCounts.append(payload.getEncodeCount())
+			return result
+
+		EncodedPayload.getPayload = _countingGetPayload
+
+		try:
+			self.assertTrue(ddm.handleSensorMessage(self._createSensorData()))
+		finally:
+			EncodedPayload.getPayload = encode
+
+		# Redis, MQTT and CoAP each requested the payload, and it was encoded once
+		self.assertEqual(len(encodeCounts), 3)
+		self.assertEqual(encodeCounts[-1], 1)
+		self.assertIs(coapSink.payloads[0], redisSink.payloads[0].obj)
+
+	def _createSensorData(self) -> SensorData:
+		sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(21.5)
+
+		return sd
+
+if __name__ == "__main__":
+	unittest.main()
@@ -63,6 +63,34 @@ class SensorDataTest(unittest.TestCase):
 		self.assertEqual(sd.getName(), self.DEFAULT_NAME)
 		self.assertEqual(sd.getValue(), self.MIN_VALUE)
 	
+	def testSlottedFields(self):
+		sd = self._createTestSensorData()
+		
+		self.assertFalse(hasattr(sd, '__dict__'))
+		
+		sdDict = sd.toDict()
+		
+		self.assertEqual(list(sdDict.keys())[-1], ConfigConst.VALUE_PROP)
+		self.assertEqual(sdDict[ConfigConst.NAME_PROP], self.DEFAULT_NAME)
+		self.assertEqual(sdDict[ConfigConst.VALUE_PROP], self.MIN_VALUE)
+		self.assertEqual(sdDict[ConfigConst.LOCATION_ID_PROP], SensorData.getConfiguredLocationID())
+	
+	def testUnslottedSubclassFields(self):
+		class TaggedSensorData(SensorData):
+			def __init__(self):
+				super().__init__()
+				self.tag = "FooBar"
+				
+		sd = TaggedSensorData()
+		sd.setValue(self.MIN_VALUE)
+		
+		sdDict = sd.toDict()
+		
+		# attributes without slots follow the slotted ones
+		self.assertEqual(list(sdDict.keys())[-2:], [ConfigConst.VALUE_PROP, 'tag'])
+		self.assertEqual(sdDict['tag'], "FooBar")
+		self.assertEqual(sdDict[ConfigConst.VALUE_PROP], self.MIN_VALUE)
+	
 	def _createTestSensorData(self):
 		sd = SensorData()
 		
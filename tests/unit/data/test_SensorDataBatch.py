@@ -0,0 +1,130 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataBatch import SensorDataBatch
+
+class SensorDataBatchTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataBatch. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	DEFAULT_LOCATION_ID = "MyLocation"
+	TEST_COUNT = 100
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataBatch class...")
+		
+	def setUp(self):
+		self.dataList = self._createTestSensorDataList()
+		
+	def tearDown(self):
+		pass
+	
+	def testListConversion(self):
+		batch = SensorDataBatch.fromSensorDataList(self.dataList)
+		
+		self.assertEqual(len(batch), self.TEST_COUNT)
+		self.assertEqual(batch.getLocationID(), self.DEFAULT_LOCATION_ID)
+		self.assertEqual(len(batch.getNames()), 2)
+		
+		dataList = batch.toSensorDataList()
+		
+		self.assertEqual(len(dataList), self.TEST_COUNT)
+		
+		for sd, sd2 in zip(self.dataList, dataList):
+			self.assertEqual(sd.getName(), sd2.getName())
+			self.assertEqual(sd.getTypeID(), sd2.getTypeID())
+			self.assertEqual(sd.getValue(), sd2.getValue())
+			self.assertEqual(sd.getStatusCode(), sd2.getStatusCode())
+			self.assertEqual(sd.getTimeStamp(), sd2.getTimeStamp())
+			self.assertEqual(sd.getLocationID(), sd2.getLocationID())
+			
+	def testGrowOnAppend(self):
+		batch = SensorDataBatch(capacity = 1, locationID = self.DEFAULT_LOCATION_ID)
+		
+		for sd in self.dataList:
+			batch.append(sd)
+			
+		self.assertEqual(batch.getSize(), self.TEST_COUNT)
+		self.assertEqual(batch.getValues().tolist(), [sd.getValue() for sd in self.dataList])
+		
+	def testFilter(self):
+		batch = SensorDataBatch.fromSensorDataList(self.dataList)
+		
+		tempBatch = batch.filterByTypeID(ConfigConst.TEMP_SENSOR_TYPE)
+		
+		self.assertEqual(len(tempBatch), self.TEST_COUNT // 2)
+		self.assertTrue((tempBatch.getTypeIDs() == ConfigConst.TEMP_SENSOR_TYPE).all())
+		self.assertEqual(tempBatch.toSensorDataList()[0].getName(), ConfigConst.TEMP_SENSOR_NAME)
+		
+		rangeBatch = batch.filterByValueRange(10.0, 19.0)
+		
+		self.assertEqual(len(rangeBatch), 10)
+		self.assertEqual(len(batch.filterErrors()), self.TEST_COUNT // 10)
+		
+	def testAggregate(self):
+		batch = SensorDataBatch.fromSensorDataList(self.dataList)
+		
+		aggregates = batch.aggregateByTypeID()
+		tempValues = [sd.getValue() for sd in self.dataList if sd.getTypeID() == ConfigConst.TEMP_SENSOR_TYPE]
+		tempAggregate = aggregates[ConfigConst.TEMP_SENSOR_TYPE]
+		
+		self.assertEqual(len(aggregates), 2)
+		self.assertEqual(tempAggregate['count'], len(tempValues))
+		self.assertEqual(tempAggregate['min'], min(tempValues))
+		self.assertEqual(tempAggregate['max'], max(tempValues))
+		self.assertAlmostEqual(tempAggregate['mean'], sum(tempValues) / len(tempValues))
+		
+	def testJsonConversion(self):
+		dataUtil = DataUtil()
+		batch = SensorDataBatch.fromSensorDataList(self.dataList)
+		
+		batchJson = dataUtil.sensorDataBatchToJson(batch)
+		batch2 = dataUtil.jsonToSensorDataBatch(batchJson)
+		
+		self.assertEqual(len(batch2), self.TEST_COUNT)
+		self.assertEqual(batch2.getNames(), batch.getNames())
+		self.assertEqual(batch2.getValues().tolist(), batch.getValues().tolist())
+		self.assertEqual(batch2.getTimeStamps().tolist(), batch.getTimeStamps().tolist())
+		self.assertEqual(dataUtil.sensorDataBatchToJson(batch2), batchJson)
+		
+	def _createTestSensorDataList(self) -> list:
+		dataList = []
+		
+		for i in range(0, self.TEST_COUNT):
+			if i % 2 == 0:
+				sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+			else:
+				sd = SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE, name = ConfigConst.HUMIDITY_SENSOR_NAME)
+				
+			sd.setLocationID(self.DEFAULT_LOCATION_ID)
+			sd.setValue(float(i))
+			
+			if i % 10 == 0:
+				sd.setStatusCode(-1)
+				
+			dataList.append(sd)
+			
+		return dataList
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,110 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataHistory import SensorDataHistory
+
+class SensorDataHistoryTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataHistory.
+
+	"""
+	NS_IN_SECS = 1000000000
+	CAPACITY = 10
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataHistory class...")
+
+	def setUp(self):
+		self.history = SensorDataHistory(capacity = self.CAPACITY, name = ConfigConst.TEMP_SENSOR_NAME, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+
+	def testEmpty(self):
+		self.assertIsNone(self.history.getLatest())
+		self.assertEqual(len(self.history.getLast(5)[0]), 0)
+		self.assertEqual(len(self.history.getRange()[1]), 0)
+		self.assertEqual(len(self.history.getDownsampled(self.NS_IN_SECS)[1]), 0)
+
+	def testWrapAround(self):
+		# seconds 0 - 14 into a buffer of 10, so seconds 5 - 14 are kept
+		self._appendSeconds(0, 15)
+
+		self.assertEqual(len(self.history), self.CAPACITY)
+		self.assertEqual(self.history.getLatest(), (14 * self.NS_IN_SECS, 14.0))
+
+		timeStamps, values = self.history.getLast(4)
+
+		self.assertEqual(values.tolist(), [11.0, 12.0, 13.0, 14.0])
+		self.assertEqual(timeStamps.tolist(), [second * self.NS_IN_SECS for second in range(11, 15)])
+
+		# seconds 5 - 9 are at the end of the buffer and 10 - 14 at the start
+		self.assertEqual(self.history.getLast(100)[1].tolist(), [float(second) for second in range(5, 15)])
+
+	def testRange(self):
+		self._appendSeconds(0, 15)
+
+		self.assertEqual(self.history.getRange(7 * self.NS_IN_SECS, 12 * self.NS_IN_SECS)[1].tolist(), [7.0, 8.0, 9.0, 10.0, 11.0])
+		self.assertEqual(self.history.getRange(11 * self.NS_IN_SECS)[1].tolist(), [11.0, 12.0, 13.0, 14.0])
+		self.assertEqual(self.history.getRange(endNanos = 7 * self.NS_IN_SECS)[1].tolist(), [5.0, 6.0])
+		self.assertEqual(len(self.history.getRange(20 * self.NS_IN_SECS)[1]), 0)
+		self.assertEqual(len(self.history.getRange(9 * self.NS_IN_SECS, 3 * self.NS_IN_SECS)[1]), 0)
+
+	def testViewsWhenNotWrapped(self):
+		self._appendSeconds(0, 8)
+
+		timeStamps, values = self.history.getLast(5)
+
+		self.assertTrue(calcLib.shares_memory(values, self.history.values))
+
+	def testDownsampled(self):
+		self._appendSeconds(0, 15)
+
+		# 4 second intervals: [4 - 7], [8 - 11], [12 - 15]
+		intervalStarts, means = self.history.getDownsampled(4 * self.NS_IN_SECS)
+
+		self.assertEqual(intervalStarts.tolist(), [4 * self.NS_IN_SECS, 8 * self.NS_IN_SECS, 12 * self.NS_IN_SECS])
+		self.assertEqual(means.tolist(), [6.0, 9.5, 13.0])
+		self.assertEqual(self.history.getDownsampled(4 * self.NS_IN_SECS, method = SensorDataHistory.MIN)[1].tolist(), [5.0, 8.0, 12.0])
+		self.assertEqual(self.history.getDownsampled(4 * self.NS_IN_SECS, method = SensorDataHistory.MAX)[1].tolist(), [7.0, 11.0, 14.0])
+
+	def testAddSensorData(self):
+		sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(21.5)
+
+		self.history.add(sd)
+
+		self.assertEqual(self.history.getLatest(), (sd.getTimeStampNanos(), 21.5))
+		self.assertEqual(self.history.getMemoryFootprint(), self.CAPACITY * 16)
+
+	def testCompressedRoundTrip(self):
+		self._appendSeconds(0, 15)
+
+		block = self.history.getCompressed(startNanos = 8 * self.NS_IN_SECS)
+
+		restored = SensorDataHistory(capacity = self.CAPACITY)
+		restored.addCompressed(block)
+
+		self.assertEqual(restored.getRange()[0].tolist(), self.history.getRange(8 * self.NS_IN_SECS)[0].tolist())
+		self.assertEqual(restored.getRange()[1].tolist(), list(range(8, 15)))
+
+	def _appendSeconds(self, first: int, last: int):
+		for second in range(first, last):
+			self.history.append(second * self.NS_IN_SECS, float(second))
+
+if __name__ == "__main__":
+	unittest.main()
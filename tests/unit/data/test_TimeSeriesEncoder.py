@@ -0,0 +1,116 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import math
+import random
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.data.TimeSeriesDecoder import TimeSeriesDecoder
+from programmingtheiot.data.TimeSeriesEncoder import TimeSeriesEncoder
+
+class TimeSeriesEncoderTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	TimeSeriesEncoder and TimeSeriesDecoder.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing TimeSeriesEncoder class...")
+		
+	def setUp(self):
+		self.encoder = TimeSeriesEncoder(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		
+	def tearDown(self):
+		pass
+	
+	def testEmptyBlock(self):
+		decoder = TimeSeriesDecoder(self.encoder.getBytes())
+		
+		self.assertEqual(len(decoder), 0)
+		self.assertEqual(list(decoder), [])
+		self.assertEqual(decoder.getName(), ConfigConst.TEMP_SENSOR_NAME)
+		self.assertEqual(decoder.getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		
+	def testRegularSeriesCompresses(self):
+		for second in range(0, 1000):
+			self.encoder.append(second * self.NS_IN_SECS, 21.5)
+			
+		block = self.encoder.getBytes()
+		
+		# after the first reading, 1 bit each for time stamp and value
+		self.assertEqual(len(block), self.encoder.getSize())
+		self.assertLess(len(block), 16 + 2 * 1000 // 8 + 32)
+		
+		timeStamps, values = TimeSeriesDecoder(block).decodeAll()
+		
+		self.assertEqual(timeStamps.tolist(), [second * self.NS_IN_SECS for second in range(0, 1000)])
+		self.assertEqual(set(values.tolist()), {21.5})
+		
+	def testIrregularSeriesRoundTrip(self):
+		rng = random.Random(1)
+		
+		# every delta-of-delta bucket, out-of-order and repeated time stamps
+		timeStamps = [0, 1000, 1000, 0, 5000, 5000 + 10 ** 12, -10 ** 15, 3 * 10 ** 18]
+		timeStamps += [timeStamps[-1] + i * rng.choice([17, 100000, 3000000]) for i in range(1, 200)]
+		
+		# the buckets' boundaries, as jitter on a 1 s series
+		for deltaOfDelta in (63, 64, 65, 255, 256, 257, 2047, 2048, 2049):
+			for sign in (1, -1):
+				timeStamps += [timeStamps[-1] + 1000000, timeStamps[-1] + 2000000 + sign * deltaOfDelta, timeStamps[-1] + 3000000]
+				
+		
+		values = [0.0, -0.0, math.inf, -math.inf, 5e-324, 1.7976931348623157e308, 21.5, 21.5]
+		values += [rng.uniform(-1e6, 1e6) for i in range(len(values), len(timeStamps))]
+		
+		timeStamps = [timeStamp * 1000 for timeStamp in timeStamps]
+		
+		self.encoder.appendAll(timeStamps, values)
+		self.encoder.append(timeStamps[-1] + 1000, math.nan)
+		
+		decoded = list(TimeSeriesDecoder(self.encoder.getBytes()))
+		
+		self.assertEqual([timeStamp for timeStamp, value in decoded[:-1]], timeStamps)
+		self.assertEqual([value for timeStamp, value in decoded[:-1]], values)
+		self.assertEqual(math.copysign(1.0, decoded[1][1]), -1.0)
+		self.assertTrue(math.isnan(decoded[-1][1]))
+		
+	def testStreamingAndResolution(self):
+		self.encoder.append(1234567, 1.0)
+		self.encoder.append(2234567, 2.0)
+		
+		# a block can be taken at any time, and readings appended after
+		first = TimeSeriesDecoder(self.encoder.getBytes())
+		
+		self.encoder.append(3234567, 3.0)
+		
+		second = TimeSeriesDecoder(self.encoder.getBytes())
+		
+		# time stamps are kept to the microsecond by default
+		self.assertEqual(list(first), [(1234000, 1.0), (2234000, 2.0)])
+		self.assertEqual(list(second), [(1234000, 1.0), (2234000, 2.0), (3234000, 3.0)])
+		
+	def testInvalidBlocks(self):
+		self.encoder.append(0, 1.0)
+		self.encoder.append(self.NS_IN_SECS, 2.0)
+		
+		block = self.encoder.getBytes()
+		
+		self.assertRaises(ValueError, TimeSeriesDecoder, block[:4])
+		self.assertRaises(ValueError, TimeSeriesDecoder, b'\x09' + block[1:])
+		self.assertRaises(ValueError, list, TimeSeriesDecoder(block[:-10]))
+		
+if __name__ == "__main__":
+	unittest.main()
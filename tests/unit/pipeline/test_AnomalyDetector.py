@@ -0,0 +1,163 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import math
+import unittest
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.pipeline.AnomalyDetector import AnomalyDetector
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataBatch import SensorDataBatch
+
+class AnomalyDetectorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	AnomalyDetector.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AnomalyDetector class...")
+		
+	def setUp(self):
+		self.detector = AnomalyDetector()
+		self.detector.alpha = 0.05
+		self.detector.zThreshold = 4.0
+		self.detector.warmupCount = 30
+		self.detector.normalForwardSecs = 0.0
+		
+		self.noise = calcLib.random.default_rng(1).normal(0.0, 0.1, 400)
+		
+	def tearDown(self):
+		pass
+	
+	def testSpikesDetected(self):
+		values = 20.0 + self.noise
+		values[[100, 101, 250]] += [2.0, -2.0, 1.5]
+		
+		results = [self._detect(ConfigConst.TEMP_SENSOR_TYPE, val, secs) for secs, val in enumerate(values)]
+		anomalies = [secs for secs, (isAnomaly, isForwarded, zScore) in enumerate(results) if isAnomaly]
+		
+		# consecutive spikes are each detected, as they're clipped before updating the model
+		self.assertEqual(anomalies, [100, 101, 250])
+		self.assertGreater(results[100][2], 4.0)
+		self.assertLess(results[101][2], -4.0)
+		
+		metrics = self.detector.getMetrics()
+		
+		self.assertEqual(metrics['sensors'], 1)
+		self.assertEqual(metrics['anomalies'], 3)
+		self.assertEqual(metrics['suppressed'], 0)
+		
+	def testReducedRateForwarding(self):
+		self.detector.normalForwardSecs = 10.0
+		
+		values = 20.0 + self.noise[:60]
+		values[45] += 5.0
+		
+		forwarded = [secs for secs, val in enumerate(values) if self._detect(ConfigConst.TEMP_SENSOR_TYPE, val, secs)[1]]
+		
+		# anomalies are always forwarded, and don't restart the interval of normal readings
+		self.assertEqual(forwarded, [0, 10, 20, 30, 40, 45, 50])
+		
+	def testSeasonalBaseline(self):
+		self.detector.seasonPeriodSecs = 100
+		
+		curve = 20.0 + 5.0 * calcLib.sin(calcLib.linspace(0, 2 * math.pi, 1440))
+		phases = calcLib.arange(400) % 100 / 100
+		values = 20.0 + 5.0 * calcLib.sin(2 * math.pi * phases) + self.noise
+		values[350] += 1.0
+		
+		# without the baseline, the curve hides the spike
+		anomalies = [secs for secs, val in enumerate(values) if self._detect(ConfigConst.TEMP_SENSOR_TYPE, val, secs)[0]]
+		
+		self.assertNotIn(350, anomalies)
+		
+		self.detector = AnomalyDetector()
+		self.detector.seasonPeriodSecs = 100
+		self.detector.setBaseline(ConfigConst.TEMP_SENSOR_TYPE, curve)
+		
+		anomalies = [secs for secs, val in enumerate(values) if self._detect(ConfigConst.TEMP_SENSOR_TYPE, val, secs)[0]]
+		
+		self.assertEqual(anomalies, [350])
+		
+	def testBatchMatchesSingleReadings(self):
+		sensorCount = 20
+		steps = 60
+		
+		rng = calcLib.random.default_rng(2)
+		values = 40.0 + rng.normal(0.0, 0.5, (steps, sensorCount))
+		values[50, 3] += 10.0
+		
+		# two time steps per batch, so each batch holds two readings per sensor
+		batchDetector = AnomalyDetector()
+		batchScores = []
+		
+		for step in range(0, steps, 2):
+			dataList = []
+			
+			for offset in (0, 1):
+				for sensor in range(0, sensorCount):
+					dataList.append(self._createSensorData(ConfigConst.HUMIDITY_SENSOR_TYPE, values[step + offset, sensor], step + offset, f"Sensor{sensor}"))
+					
+			zScores, anomalies, forwarded = batchDetector.detectBatch(SensorDataBatch.fromSensorDataList(dataList))
+			batchScores.extend(zScores)
+			
+		singleScores = []
+		
+		for step in range(0, steps):
+			for sensor in range(0, sensorCount):
+				singleScores.append(self._detect(ConfigConst.HUMIDITY_SENSOR_TYPE, values[step, sensor], step, f"Sensor{sensor}")[2])
+				
+		calcLib.testing.assert_allclose(batchScores, singleScores)
+		
+		self.assertEqual(batchDetector.getMetrics()['sensors'], sensorCount)
+		self.assertEqual(batchDetector.getMetrics()['anomalies'], 1)
+		
+	def testAnomaliesSentOnAlertLane(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.anomalyDetector = self.detector
+		self.detector.normalForwardSecs = 30.0
+		
+		lanes = []
+		
+		ddm._handleSensorDataAnalysis = lambda resource = None, data = None: None
+		ddm._handleUpstreamTransmission = lambda resourceName, data: \
+			lanes.append((int(data.getData().getTimeStampNanos() / self.NS_IN_SECS), ddm._getEgressLane(resourceName, data)))
+		
+		values = 20.0 + self.noise[:100]
+		values[75] += 5.0
+		
+		for secs, val in enumerate(values):
+			ddm.handleSensorMessage(self._createSensorData(ConfigConst.TEMP_SENSOR_TYPE, val, secs))
+			
+		self.assertEqual(lanes, [
+			(0, ConfigConst.TELEMETRY_LANE), (30, ConfigConst.TELEMETRY_LANE), (60, ConfigConst.TELEMETRY_LANE),
+			(75, ConfigConst.ALERT_LANE), (90, ConfigConst.TELEMETRY_LANE)])
+		
+	def _createSensorData(self, typeID: int, value: float, secs: int, name: str = ConfigConst.NOT_SET) -> SensorData:
+		sd = SensorData(typeID = typeID, name = name)
+		sd.setValue(float(value))
+		sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+		
+		return sd
+		
+	def _detect(self, typeID: int, value: float, secs: int, name: str = ConfigConst.NOT_SET) -> tuple:
+		return self.detector.detect(self._createSensorData(typeID, value, secs, name))
+		
+if __name__ == "__main__":
+	unittest.main()
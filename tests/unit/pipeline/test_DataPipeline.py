@@ -0,0 +1,140 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import threading
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.DataPipeline import DataPipeline
+
+class DataPipelineTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	DataPipeline and PipelineStage.
+
+	"""
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DataPipeline class...")
+
+	def setUp(self):
+		self.results = []
+		self.pipeline = None
+
+	def tearDown(self):
+		if self.pipeline:
+			self.pipeline.stop()
+
+	def testItemsPassThroughStagesInOrder(self):
+		self.pipeline = DataPipeline()
+		self.pipeline.addStage(ConfigConst.INGEST_STAGE, lambda item: item + 1)
+		self.pipeline.addStage(ConfigConst.ANALYZE_STAGE, lambda item: item * 10 if item % 2 else None)
+		self.pipeline.addStage(ConfigConst.TRANSMIT_STAGE, self.results.append)
+		self.pipeline.start()
+
+		for i in range(0, 10):
+			self.assertTrue(self.pipeline.submit(i))
+
+		self.assertTrue(self.pipeline.submit(100, ConfigConst.TRANSMIT_STAGE))
+		self.assertFalse(self.pipeline.submit(1, "FooBar"))
+		self.assertTrue(self.pipeline.waitUntilIdle())
+
+		# even values are filtered out by the analyze stage
+		self.assertEqual(sorted(self.results), [10, 30, 50, 70, 90, 100])
+
+		metrics = self.pipeline.getMetrics()
+
+		self.assertEqual(metrics[ConfigConst.INGEST_STAGE]['processed'], 10)
+		self.assertEqual(metrics[ConfigConst.ANALYZE_STAGE]['processed'], 10)
+		self.assertEqual(metrics[ConfigConst.TRANSMIT_STAGE]['processed'], 6)
+		self.assertEqual(metrics[ConfigConst.TRANSMIT_STAGE]['dropped'], 0)
+
+	def testHandlerErrorsAreCounted(self):
+		self.pipeline = DataPipeline()
+		self.pipeline.addStage(ConfigConst.INGEST_STAGE, lambda item: 1 / item)
+		self.pipeline.addStage(ConfigConst.TRANSMIT_STAGE, self.results.append)
+		self.pipeline.start()
+
+		self.pipeline.submit(0)
+		self.pipeline.submit(2)
+		self.assertTrue(self.pipeline.waitUntilIdle())
+
+		self.assertEqual(self.results, [0.5])
+		self.assertEqual(self.pipeline.getMetrics()[ConfigConst.INGEST_STAGE]['errors'], 1)
+
+	def testDropNewestPolicy(self):
+		stage = self._createBlockedPipeline(ConfigConst.DROP_NEWEST_POLICY)
+
+		self.assertTrue(self.pipeline.submit(1))
+		self.assertTrue(self.pipeline.submit(2))
+		self.assertFalse(self.pipeline.submit(3))
+
+		self.assertEqual(stage.getDropCount(), 1)
+		self.assertEqual(stage.getQueueDepth(), 2)
+
+		self.release.set()
+		self.assertTrue(self.pipeline.waitUntilIdle())
+		self.assertEqual(self.results, [0, 1, 2])
+
+	def testDropOldestPolicy(self):
+		stage = self._createBlockedPipeline(ConfigConst.DROP_OLDEST_POLICY)
+
+		for i in range(1, 5):
+			self.assertTrue(self.pipeline.submit(i))
+
+		self.assertEqual(stage.getDropCount(), 2)
+
+		self.release.set()
+		self.assertTrue(self.pipeline.waitUntilIdle())
+		self.assertEqual(self.results, [0, 3, 4])
+
+	def testBlockPolicyTimesOut(self):
+		stage = self._createBlockedPipeline(ConfigConst.BLOCK_POLICY, blockTimeout = 0.05)
+
+		self.assertTrue(self.pipeline.submit(1))
+		self.assertTrue(self.pipeline.submit(2))
+		self.assertFalse(self.pipeline.submit(3))
+		self.assertEqual(stage.getDropCount(), 1)
+
+		self.release.set()
+		self.assertTrue(self.pipeline.waitUntilIdle())
+
+		metrics = stage.getMetrics()
+
+		self.assertEqual(metrics['processed'], 3)
+		self.assertEqual(metrics['maxQueueDepth'], 2)
+		self.assertGreater(metrics['maxServiceMillis'], 0.0)
+
+	def _createBlockedPipeline(self, overflowPolicy: str, blockTimeout: float = 0.5):
+		# a single worker that blocks on its first item until released, with
+		# room for two more queued items
+		self.release = threading.Event()
+		started = threading.Event()
+
+		def _handle(item):
+			started.set()
+			self.release.wait(timeout = 5)
+			self.results.append(item)
+
+		self.pipeline = DataPipeline()
+		stage = self.pipeline.addStage( \
+			ConfigConst.TRANSMIT_STAGE, _handle, queueSize = 2, overflowPolicy = overflowPolicy, blockTimeout = blockTimeout)
+		self.pipeline.start()
+
+		self.pipeline.submit(0)
+		started.wait(timeout = 5)
+
+		return stage
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,108 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.pipeline.DeadbandFilter import DeadbandFilter
+from programmingtheiot.data.SensorData import SensorData
+
+class DeadbandFilterTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	DeadbandFilter.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing DeadbandFilter class...")
+		
+	def setUp(self):
+		self.deadbandFilter = DeadbandFilter()
+		self.deadbandFilter.setThresholds(ConfigConst.TEMP_SENSOR_TYPE, absolute = 0.5, maxSilenceSecs = 60)
+		self.deadbandFilter.setThresholds(ConfigConst.PRESSURE_SENSOR_TYPE, percent = 1.0, maxSilenceSecs = 0)
+		self.deadbandFilter.setThresholds(ConfigConst.HUMIDITY_SENSOR_TYPE)
+		
+	def tearDown(self):
+		pass
+	
+	def testAbsoluteDeadband(self):
+		results = [self._accept(ConfigConst.TEMP_SENSOR_TYPE, val, secs) for secs, val in \
+			enumerate([20.0, 20.2, 20.5, 20.6, 19.9, 20.0, 19.0])]
+		
+		# 20.6 is only 0.6 from the last reported value (20.0)
+		self.assertEqual(results, [True, False, False, True, True, False, True])
+		self.assertAlmostEqual(self.deadbandFilter.getSuppressionRatio(ConfigConst.TEMP_SENSOR_TYPE), 3 / 7)
+		
+	def testPercentDeadband(self):
+		results = [self._accept(ConfigConst.PRESSURE_SENSOR_TYPE, val, secs * 1000) for secs, val in \
+			enumerate([1000.0, 1009.0, 991.0, 1011.0, 1011.5])]
+		
+		self.assertEqual(results, [True, False, False, True, False])
+		
+	def testHeartbeat(self):
+		self.assertTrue(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 0))
+		self.assertFalse(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 59))
+		self.assertTrue(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 60))
+		self.assertFalse(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 119))
+		
+	def testUnfilteredTypesAndErrors(self):
+		self.assertTrue(self._accept(ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0, 0))
+		self.assertTrue(self._accept(ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0, 1))
+		
+		self.assertTrue(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 0))
+		self.assertTrue(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 1, statusCode = -1))
+		
+		# sensors of the same type are tracked separately by name
+		self.assertTrue(self._accept(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 2, name = "FooBar"))
+		
+		metrics = self.deadbandFilter.getMetrics()
+		
+		self.assertEqual(metrics['readings'], 5)
+		self.assertEqual(metrics['suppressed'], 0)
+		self.assertEqual(metrics['byType'][ConfigConst.TEMP_SENSOR_TYPE]['readings'], 3)
+		
+		self.deadbandFilter.reset()
+		
+		self.assertEqual(self.deadbandFilter.getMetrics()['readings'], 0)
+		
+	def testSuppressedReadingsAreStillAnalyzed(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.deadbandFilter = self.deadbandFilter
+		
+		analyzed = []
+		transmitted = []
+		
+		ddm._handleSensorDataAnalysis = lambda resource = None, data = None: analyzed.append(data)
+		ddm._handleUpstreamTransmission = lambda resourceName, data: transmitted.append(data)
+		
+		for val in (20.0, 20.1, 20.2, 21.0):
+			sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE)
+			sd.setValue(val)
+			ddm.handleSensorMessage(sd)
+			
+		self.assertEqual(len(analyzed), 4)
+		self.assertEqual([payload.getData().getValue() for payload in transmitted], [20.0, 21.0])
+		
+	def _accept(self, typeID: int, value: float, secs: int, statusCode: int = 0, name: str = ConfigConst.NOT_SET) -> bool:
+		sd = SensorData(typeID = typeID, name = name)
+		sd.setValue(value)
+		sd.setStatusCode(statusCode)
+		sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+		
+		return self.deadbandFilter.accept(sd)
+	
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,130 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import threading
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.MessageBatcher import MessageBatcher
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+from programmingtheiot.data.EncodedPayloadBatch import EncodedPayloadBatch
+
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.SensorData import SensorData
+
+class MessageBatcherTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	MessageBatcher and EncodedPayloadBatch.
+
+	"""
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing MessageBatcher class...")
+
+	def setUp(self):
+		self.batches = []
+		self.flushed = threading.Event()
+
+	def tearDown(self):
+		pass
+
+	def testFlushBySize(self):
+		batcher = MessageBatcher(self._handleFlush, maxBatchSize = 3, maxBatchDelay = 0)
+
+		for i in range(0, 7):
+			batcher.add(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, self._createPayload(i))
+
+		batcher.add(ResourceNameEnum.CDA_SYSTEM_PERF_MSG_RESOURCE, self._createPayload(100))
+
+		self.assertEqual([len(batch) for resource, batch in self.batches], [3, 3])
+		self.assertEqual(batcher.getPendingCount(), 2)
+
+		batcher.flushAll()
+
+		self.assertEqual(sorted(len(batch) for resource, batch in self.batches), [1, 1, 3, 3])
+		self.assertEqual(batcher.getMetrics(), {'messages': 8, 'batches': 4, 'pending': 0, 'avgBatchSize': 2.0})
+
+	def testFlushByDelay(self):
+		batcher = MessageBatcher(self._handleFlush, maxBatchSize = 100, maxBatchDelay = 0.05)
+
+		for i in range(0, 3):
+			batcher.add(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, self._createPayload(i))
+
+		self.assertTrue(self.flushed.wait(timeout = 5))
+
+		resource, batch = self.batches[0]
+
+		self.assertEqual(resource, ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE)
+		self.assertEqual([sd.getValue() for sd in batch.getData()], [0.0, 1.0, 2.0])
+		self.assertFalse(batcher.flush(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE))
+
+	def testStaleTimerIgnored(self):
+		batcher = MessageBatcher(self._handleFlush, maxBatchSize = 2, maxBatchDelay = 60)
+		resource = ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE
+
+		for i in range(0, 3):
+			batcher.add(resource, self._createPayload(i))
+
+		# the first batch's timer fires as it's flushed by size: it mustn't
+		# flush the second batch, whose own timer is still running
+		batcher._flushOnTimer(resource, 0)
+
+		self.assertEqual([len(batch) for resource, batch in self.batches], [2])
+		self.assertEqual(batcher.getPendingCount(), 1)
+
+		batcher._flushOnTimer(resource, 1)
+
+		self.assertEqual([len(batch) for resource, batch in self.batches], [2, 1])
+
+	def testBatchPayloadRoundTrips(self):
+		payloads = [self._createPayload(i) for i in range(0, 20)]
+
+		# codecs that aren't installed fall back to JSON
+		codecs = {codec.getName(): codec for codec in [DataUtil.getCodec(codecName) for codecName in \
+			(ConfigConst.JSON_CODEC, ConfigConst.JSON_COMPACT_CODEC, ConfigConst.CBOR_CODEC, ConfigConst.MSGPACK_CODEC, ConfigConst.STRUCT_CODEC)]}
+
+		for codecName, codec in codecs.items():
+			batch = EncodedPayloadBatch(payloads)
+			dataList = codec.decodeBatch(batch.getPayload(codec), SensorData)
+
+			self.assertEqual([sd.getValue() for sd in dataList], [float(i) for i in range(0, 20)], codecName)
+			self.assertEqual(dataList[0].getName(), ConfigConst.TEMP_SENSOR_NAME)
+
+		# each member is encoded once per codec, however many batches it's in
+		self.assertEqual(EncodedPayloadBatch(payloads).getEncodeCount(), len(payloads) * len(codecs))
+
+	def testBatchFallsBackToJson(self):
+		structCodec = DataUtil.getCodec(ConfigConst.STRUCT_CODEC)
+		batch = EncodedPayloadBatch([self._createPayload(1), EncodedPayload(ActuatorData())])
+
+		self.assertEqual(batch.resolveCodec(structCodec).getName(), ConfigConst.JSON_CODEC)
+		self.assertEqual(len(DataUtil.getCodec().decodeBatch(batch.getPayload(structCodec), SensorData)), 2)
+		self.assertFalse(EncodedPayloadBatch())
+		self.assertIsNone(EncodedPayloadBatch().getPayload())
+
+	def _createPayload(self, value: float) -> EncodedPayload:
+		sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE, name = ConfigConst.TEMP_SENSOR_NAME)
+		sd.setValue(float(value))
+
+		return EncodedPayload(sd)
+
+	def _handleFlush(self, resource, batch):
+		self.batches.append((resource, batch))
+		self.flushed.set()
+
+if __name__ == "__main__":
+	unittest.main()
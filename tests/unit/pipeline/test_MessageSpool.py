@@ -0,0 +1,209 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+from programmingtheiot.cda.pipeline.MessageSpool import MessageSpool
+from programmingtheiot.cda.pipeline.SpoolSegment import SpoolSegment
+
+class MessageSpoolTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	MessageSpool and SpoolSegment.
+
+	"""
+	SEGMENT_SIZE = 4096
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing MessageSpool class...")
+
+	def setUp(self):
+		self.spoolPath = tempfile.mkdtemp(prefix = 'cda-spool-test-')
+		self.spools = []
+
+	def tearDown(self):
+		for spool in self.spools:
+			spool.close()
+
+		shutil.rmtree(self.spoolPath, ignore_errors = True)
+
+	def testAppendPeekCommit(self):
+		spool = self._createSpool()
+
+		self.assertIsNone(spool.peek())
+		self.assertFalse(spool.append('topic', b''))
+
+		for i in range(0, 3):
+			self.assertTrue(spool.append('topic/' + str(i), str(i), tag = i))
+
+		self.assertEqual(self._drain(spool), [('topic/0', b'0', 0), ('topic/1', b'1', 1), ('topic/2', b'2', 2)])
+		self.assertEqual(spool.getPendingCount(), 0)
+
+	def testCommitOutOfOrder(self):
+		spool = self._createSpool()
+		spool.append('topic', b'1')
+		spool.append('topic', b'2')
+
+		position = spool.peek()[0]
+
+		self.assertTrue(spool.commit(position))
+		self.assertFalse(spool.commit(position))
+		self.assertEqual(spool.peek()[2], b'2')
+
+	def testSurvivesRestart(self):
+		spool = self._createSpool()
+
+		for i in range(0, 500):
+			spool.append('topic', b'%d' % i)
+
+		self.assertGreater(spool.getSegmentCount(), 1)
+
+		for i in range(0, 200):
+			spool.commit(spool.peek()[0])
+
+		spool.close()
+		self.spools.remove(spool)
+
+		spool = self._createSpool()
+
+		self.assertEqual(spool.getPendingCount(), 300)
+		self.assertEqual([payload for channel, payload, tag in self._drain(spool)], [b'%d' % i for i in range(200, 500)])
+
+		# fully delivered segments are removed
+		self.assertEqual(spool.getSegmentCount(), 1)
+
+	def testTornRecordIsIgnored(self):
+		spool = self._createSpool()
+		spool.append('topic', b'first')
+		spool.append('topic', b'second')
+		spool.close()
+		self.spools.remove(spool)
+
+		# corrupt the last byte of the second record, as if the write was cut short
+		segmentPath = os.path.join(self.spoolPath, SpoolSegment.getFileName(0))
+		recordSize = SpoolSegment.RECORD_HEADER.size + len('topic')
+
+		with open(segmentPath, 'r+b') as segmentFile:
+			segmentFile.seek(recordSize * 2 + len(b'first') + len(b'second') - 1)
+			segmentFile.write(b'X')
+
+		spool = self._createSpool()
+
+		self.assertEqual(spool.getPendingCount(), 1)
+
+		spool.append('topic', b'third')
+
+		self.assertEqual([payload for channel, payload, tag in self._drain(spool)], [b'first', b'third'])
+
+	def testBoundedSize(self):
+		spool = self._createSpool(maxSegments = 2)
+		payload = bytes(1000)
+
+		for i in range(0, 20):
+			spool.append('topic', payload)
+
+		self.assertFalse(spool.append('topic', bytes(self.SEGMENT_SIZE)))
+
+		metrics = spool.getMetrics()
+
+		self.assertEqual(metrics['segments'], 2)
+		self.assertEqual(metrics['appended'], 20)
+		self.assertEqual(metrics['dropped'] + metrics['pending'], 21)
+		self.assertEqual(len(self._drain(spool)), metrics['pending'])
+		self.assertLessEqual(sum(os.path.getsize(os.path.join(self.spoolPath, fileName)) \
+			for fileName in os.listdir(self.spoolPath) if fileName.endswith(SpoolSegment.FILE_EXT)), self.SEGMENT_SIZE * 2)
+
+	def testForwardsInOrderAfterFailures(self):
+		spool = self._createSpool(replayRate = 0, retryDelay = 10)
+		delivered = []
+		isReachable = threading.Event()
+		isDone = threading.Event()
+
+		def send(channel, payload, tag):
+			if not isReachable.is_set():
+				return False
+
+			delivered.append(int(payload))
+
+			if len(delivered) == 10:
+				isDone.set()
+
+			return True
+
+		for i in range(0, 5):
+			spool.append('topic', b'%d' % i)
+
+		spool.start(send)
+		time.sleep(0.1)
+
+		for i in range(5, 10):
+			spool.append('topic', b'%d' % i)
+
+		# resume() ends the retry delay, as on reconnect
+		isReachable.set()
+		spool.resume()
+
+		self.assertTrue(isDone.wait(timeout = 5))
+		self.assertEqual(delivered, list(range(0, 10)))
+		self.assertGreater(spool.getMetrics()['failed'], 0)
+		self.assertTrue(spool.stop(timeout = 5))
+
+	def testReplayRate(self):
+		spool = self._createSpool(replayRate = 100)
+		isDone = threading.Event()
+		delivered = []
+
+		def send(channel, payload, tag):
+			delivered.append(payload)
+
+			if len(delivered) == 20:
+				isDone.set()
+
+			return True
+
+		for i in range(0, 20):
+			spool.append('topic', b'%d' % i)
+
+		startTime = time.monotonic()
+		spool.start(send)
+
+		self.assertTrue(isDone.wait(timeout = 5))
+
+		# 20 messages at 100 per second take at least 0.19 seconds
+		self.assertGreaterEqual(time.monotonic() - startTime, 0.18)
+
+	def _createSpool(self, maxSegments: int = 16, replayRate: float = 0, retryDelay: float = 0.1) -> MessageSpool:
+		spool = MessageSpool(self.spoolPath, segmentSize = self.SEGMENT_SIZE, maxSegments = maxSegments, \
+			replayRate = replayRate, retryDelay = retryDelay)
+		self.spools.append(spool)
+
+		return spool
+
+	def _drain(self, spool: MessageSpool) -> list:
+		messages = []
+		message = spool.peek()
+
+		while message:
+			position, channel, payload, tag = message
+			messages.append((channel, payload, tag))
+			spool.commit(position)
+			message = spool.peek()
+
+		return messages
+
+if __name__ == "__main__":
+	unittest.main()
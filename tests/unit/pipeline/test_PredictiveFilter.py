@@ -0,0 +1,161 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.pipeline.PredictiveFilter import PredictiveFilter
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.DataUtil import DataUtil
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataModel import SensorDataModel
+from programmingtheiot.data.SensorDataPredictor import SensorDataPredictor
+from programmingtheiot.data.SensorDataSummary import SensorDataSummary
+
+class PredictiveFilterTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	PredictiveFilter.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing PredictiveFilter class...")
+		
+	def setUp(self):
+		self.predictiveFilter = PredictiveFilter()
+		
+		# the last value plus the last slope
+		self.predictiveFilter.setModel(ConfigConst.TEMP_SENSOR_TYPE, tolerance = 0.1, alpha = 1.0, beta = 1.0, maxSilenceSecs = 60)
+		self.predictiveFilter.setModel(ConfigConst.HUMIDITY_SENSOR_TYPE)
+		
+	def tearDown(self):
+		pass
+	
+	def testLinearTrendSuppressed(self):
+		results = [self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0 + 0.5 * secs, secs) for secs in range(0, 10)]
+		
+		# the first reading carries the model, the second sets the slope
+		self.assertIsInstance(results[0], SensorDataModel)
+		self.assertEqual(results[0].getModelAlpha(), 1.0)
+		self.assertEqual(results[0].getTolerance(), 0.1)
+		self.assertEqual(type(results[1]), SensorData)
+		self.assertEqual(results[2:], [None] * 8)
+		
+		# a change of slope is sent, and the new slope predicted from then on
+		results = [self._filter(ConfigConst.TEMP_SENSOR_TYPE, 25.0 - 0.5 * (secs - 10), secs) for secs in range(10, 20)]
+		
+		self.assertEqual([sd is not None for sd in results], [False, True, True] + [False] * 7)
+		
+		metrics = self.predictiveFilter.getMetrics()
+		
+		self.assertEqual(metrics['readings'], 20)
+		self.assertEqual(metrics['sent'], 4)
+		self.assertEqual(metrics['modelUpdates'], 1)
+		self.assertAlmostEqual(metrics['suppressionRatio'], 0.8)
+		
+	def testHeartbeatAndErrors(self):
+		self.assertIsNotNone(self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 0))
+		self.assertIsNone(self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 59))
+		self.assertIsNotNone(self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 60))
+		self.assertIsNotNone(self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 61, statusCode = ConfigConst.ANOMALY_STATUS_CODE))
+		
+		# types without a tolerance are always sent as plain readings
+		self.assertEqual(type(self._filter(ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0, 0)), SensorData)
+		self.assertEqual(type(self._filter(ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0, 1)), SensorData)
+		
+	def testModelChangeSentWithNextReading(self):
+		self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 0)
+		self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 1)
+		
+		self.predictiveFilter.setModel(ConfigConst.TEMP_SENSOR_TYPE, tolerance = 0.2, alpha = 0.5, beta = 0.1, maxSilenceSecs = 60)
+		
+		sd = self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 2)
+		
+		self.assertIsInstance(sd, SensorDataModel)
+		self.assertEqual(sd.getModelAlpha(), 0.5)
+		self.assertEqual(sd.getModelBeta(), 0.1)
+		self.assertEqual(sd.getTolerance(), 0.2)
+		
+		self.assertIsNone(self._filter(ConfigConst.TEMP_SENSOR_TYPE, 20.1, 3))
+		
+	def testReceiverReconstructsReadings(self):
+		self.predictiveFilter.setModel(ConfigConst.TEMP_SENSOR_TYPE, tolerance = 0.1, alpha = 0.5, beta = 0.3, maxSilenceSecs = 0)
+		
+		dataUtil = DataUtil()
+		receiver = SensorDataPredictor()
+		values = [20.0, 20.05, 20.2, 20.3, 20.6, 20.65, 20.6, 20.4, 20.0, 19.9, 19.95, 20.3]
+		
+		for secs, val in enumerate(values):
+			sd = self._filter(ConfigConst.TEMP_SENSOR_TYPE, val, secs + 0.123456789)
+			
+			if sd:
+				# through JSON, which keeps time stamps to the microsecond
+				dataDict = dataUtil._jsonToDict(dataUtil.sensorDataToJson(sd))
+				received = SensorDataModel() if isinstance(sd, SensorDataModel) else SensorData()
+				dataUtil._fillIotDataFromDict(received, dataDict)
+				
+				receiver.apply(received)
+				self.assertEqual(received.getValue(), val)
+			else:
+				self.assertLessEqual(abs(receiver.predict(int((secs + 0.123456789) * self.NS_IN_SECS)) - val), 0.1)
+				
+		sender = self.predictiveFilter.getPredictor(ConfigConst.TEMP_SENSOR_TYPE, ConfigConst.NOT_SET)
+		
+		self.assertEqual((receiver.level, receiver.trend, receiver.alpha), (sender.level, sender.trend, sender.alpha))
+		self.assertGreater(self.predictiveFilter.getMetrics()['suppressed'], 0)
+		
+	def testManagerSendsModelFirst(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.predictiveFilter = self.predictiveFilter
+		
+		transmitted = []
+		
+		ddm._handleSensorDataAnalysis = lambda resource = None, data = None: None
+		ddm._handleUpstreamTransmission = lambda resourceName, data: transmitted.append(data.getData())
+		
+		for secs in range(0, 5):
+			ddm.handleSensorMessage(self._createSensorData(ConfigConst.TEMP_SENSOR_TYPE, 20.0 + secs, secs))
+			
+		self.assertEqual(len(transmitted), 2)
+		self.assertIsInstance(transmitted[0], SensorDataModel)
+		
+	def testManagerSendsFilteredReadingsOnAlertLane(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.predictiveFilter = self.predictiveFilter
+		
+		reading = EncodedPayload.wrap(self._createSensorData(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 0))
+		unfiltered = EncodedPayload.wrap(self._createSensorData(ConfigConst.PRESSURE_SENSOR_TYPE, 1000.0, 0))
+		summary = EncodedPayload.wrap(SensorDataSummary(typeID = ConfigConst.TEMP_SENSOR_TYPE))
+		
+		# only readings the receiver models must not be dropped
+		self.assertEqual(ddm._getEgressLane(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, reading), ConfigConst.ALERT_LANE)
+		self.assertEqual(ddm._getEgressLane(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, unfiltered), ConfigConst.TELEMETRY_LANE)
+		self.assertEqual(ddm._getEgressLane(ResourceNameEnum.CDA_SENSOR_MSG_RESOURCE, summary), ConfigConst.TELEMETRY_LANE)
+		
+	def _createSensorData(self, typeID: int, value: float, secs: float, statusCode: int = 0) -> SensorData:
+		sd = SensorData(typeID = typeID)
+		sd.setValue(value)
+		sd.setStatusCode(statusCode)
+		sd.setTimeStampNanos(int(secs * self.NS_IN_SECS))
+		
+		return sd
+		
+	def _filter(self, typeID: int, value: float, secs: float, statusCode: int = 0) -> SensorData:
+		return self.predictiveFilter.filter(self._createSensorData(typeID, value, secs, statusCode))
+		
+if __name__ == "__main__":
+	unittest.main()
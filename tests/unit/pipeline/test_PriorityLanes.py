@@ -0,0 +1,118 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import threading
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.pipeline.PriorityLanes import PriorityLanes
+from programmingtheiot.common.ResourceNameEnum import ResourceNameEnum
+from programmingtheiot.data.ActuatorData import ActuatorData
+from programmingtheiot.data.EncodedPayload import EncodedPayload
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SystemPerformanceData import SystemPerformanceData
+
+class PriorityLanesTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	PriorityLanes, and for the lanes DeviceDataManager assigns
+	upstream messages to.
+
+	"""
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing PriorityLanes class...")
+
+	def setUp(self):
+		self.handled = []
+		self.release = threading.Event()
+		self.lanes = PriorityLanes(self._handleItem)
+
+	def tearDown(self):
+		self.release.set()
+		self.lanes.stop()
+
+	def testStrictPriority(self):
+		for lane in ConfigConst.EGRESS_LANES:
+			self.lanes.addLane(lane, queueSize = 10)
+
+		self.lanes.start()
+
+		# the first item holds up the worker while the rest are queued
+		self.lanes.offer(ConfigConst.BULK_LANE, 'first')
+		self._waitForHandled(1)
+
+		self.lanes.offer(ConfigConst.BULK_LANE, 'bulk')
+		self.lanes.offer(ConfigConst.TELEMETRY_LANE, 'telemetry-1')
+		self.lanes.offer(ConfigConst.TELEMETRY_LANE, 'telemetry-2')
+		self.lanes.offer(ConfigConst.ALERT_LANE, 'alert')
+		self.lanes.offer(ConfigConst.CONTROL_LANE, 'control')
+
+		self.release.set()
+
+		self.assertTrue(self.lanes.waitUntilIdle(timeout = 5))
+		self.assertEqual(self.handled, ['first', 'control', 'alert', 'telemetry-1', 'telemetry-2', 'bulk'])
+
+		metrics = self.lanes.getMetrics()
+
+		self.assertEqual(list(metrics.keys()), ConfigConst.EGRESS_LANES)
+		self.assertEqual(metrics[ConfigConst.TELEMETRY_LANE]['processed'], 2)
+		self.assertEqual(metrics[ConfigConst.TELEMETRY_LANE]['maxQueueDepth'], 2)
+
+	def testOverflowPolicyPerLane(self):
+		self.lanes.addLane(ConfigConst.CONTROL_LANE, queueSize = 2, overflowPolicy = ConfigConst.BLOCK_POLICY, blockTimeout = 0.05)
+		self.lanes.addLane(ConfigConst.TELEMETRY_LANE, queueSize = 2, overflowPolicy = ConfigConst.DROP_OLDEST_POLICY)
+		self.lanes.addLane(ConfigConst.BULK_LANE, queueSize = 2, overflowPolicy = ConfigConst.DROP_NEWEST_POLICY)
+
+		results = {lane: [self.lanes.offer(lane, lane + '-' + str(i)) for i in range(0, 3)] for lane in self.lanes.getLaneNames()}
+
+		self.assertEqual(results[ConfigConst.CONTROL_LANE], [True, True, False])
+		self.assertEqual(results[ConfigConst.TELEMETRY_LANE], [True, True, True])
+		self.assertEqual(results[ConfigConst.BULK_LANE], [True, True, False])
+		self.assertFalse(self.lanes.offer('unknown', 'item'))
+
+		self.release.set()
+		self.lanes.start()
+
+		self.assertTrue(self.lanes.waitUntilIdle(timeout = 5))
+		self.assertEqual(self.handled, ['control-0', 'control-1', 'telemetry-1', 'telemetry-2', 'bulk-0', 'bulk-1'])
+		self.assertEqual([entry['dropped'] for entry in self.lanes.getMetrics().values()], [1, 1, 1])
+
+	def testDeviceDataManagerLanes(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.egressLanes = ddm._createEgressLanes()
+
+		errorData = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE)
+		errorData.setStatusCode(-1)
+
+		self.assertTrue(ddm.handleActuatorCommandResponse(ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE)))
+		self.assertTrue(ddm.handleSensorMessage(SensorData(typeID = ConfigConst.HUMIDITY_SENSOR_TYPE)))
+		self.assertTrue(ddm.handleSensorMessage(errorData))
+
+		ddm._handleUpstreamTransmission(ResourceNameEnum.CDA_SYSTEM_PERF_MSG_RESOURCE, EncodedPayload(SystemPerformanceData()))
+
+		depths = {lane: entry['queueDepth'] for lane, entry in ddm.getEgressLaneMetrics().items()}
+
+		self.assertEqual(depths, {ConfigConst.CONTROL_LANE: 1, ConfigConst.ALERT_LANE: 1, ConfigConst.TELEMETRY_LANE: 1, ConfigConst.BULK_LANE: 1})
+
+	def _handleItem(self, item):
+		self.handled.append(item)
+		self.release.wait(timeout = 5)
+
+	def _waitForHandled(self, count: int):
+		while len(self.handled) < count:
+			self.release.wait(timeout = 0.01)
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,158 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import random
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.pipeline.RuleEngine import RuleEngine
+from programmingtheiot.data.SensorData import SensorData
+
+class RuleEngineTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	RuleEngine.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing RuleEngine class...")
+		
+	def setUp(self):
+		self.ruleEngine = RuleEngine()
+		
+	def tearDown(self):
+		pass
+	
+	def testThresholdTransitions(self):
+		self.ruleEngine.addRule('HvacHeat', 'temp < 18.0', ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = 18.0)
+		self.ruleEngine.addRule('HvacCool', 'temp > 20.0', ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = 20.0)
+		
+		commands = [self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, val, secs) for secs, val in \
+			enumerate([19.0, 21.0, 22.0, 21.5, 19.0, 17.0, 16.0, 19.0])]
+		
+		# commands are only issued when a rule changes state
+		self.assertEqual([[(cmd.getCommand(), cmd.getValue()) for cmd in cmds] for cmds in commands], [
+			[], [(ConfigConst.COMMAND_ON, 20.0)], [], [], [(ConfigConst.COMMAND_OFF, ConfigConst.DEFAULT_VAL)],
+			[(ConfigConst.COMMAND_ON, 18.0)], [], [(ConfigConst.COMMAND_OFF, ConfigConst.DEFAULT_VAL)]])
+		
+		self.assertTrue(all(cmd.getTypeID() == ConfigConst.HVAC_ACTUATOR_TYPE for cmds in commands for cmd in cmds))
+		
+		# readings that cross no threshold don't check the indexed rules
+		metrics = self.ruleEngine.getMetrics()
+		
+		self.assertEqual(metrics['commands'], 4)
+		self.assertLess(metrics['checks'], 2 * metrics['readings'])
+		
+	def testOffBeforeOnInOneReading(self):
+		self.ruleEngine.addRule('HvacHeat', 'temp < 18.0', ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = 18.0)
+		self.ruleEngine.addRule('HvacCool', 'temp > 20.0', ConfigConst.HVAC_ACTUATOR_TYPE, actuatorValue = 20.0)
+		
+		self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 25.0, 0)
+		
+		# the reading crosses both thresholds: cooling clears, then heating
+		# starts, so the actuator is left on
+		commands = self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 15.0, 1)
+		
+		self.assertEqual([(cmd.getCommand(), cmd.getValue()) for cmd in commands], \
+			[(ConfigConst.COMMAND_OFF, ConfigConst.DEFAULT_VAL), (ConfigConst.COMMAND_ON, 18.0)])
+		self.assertTrue(self.ruleEngine.isRuleActive('HvacHeat'))
+		self.assertFalse(self.ruleEngine.isRuleActive('HvacCool'))
+		
+	def testHysteresis(self):
+		self.ruleEngine.addRule('HumidifierOn', 'humidity < 30', ConfigConst.HUMIDIFIER_ACTUATOR_TYPE, hysteresis = 2.0)
+		
+		states = []
+		
+		for secs, val in enumerate([31.0, 29.0, 30.5, 31.9, 29.5, 32.0, 31.0]):
+			self._evaluate(ConfigConst.HUMIDITY_SENSOR_TYPE, val, secs)
+			states.append(self.ruleEngine.isRuleActive('HumidifierOn'))
+			
+		self.assertEqual(states, [False, True, True, True, True, False, False])
+		
+	def testRateAndMultiSensorRules(self):
+		self.ruleEngine.addRule('StormWarning', 'rate(pressure) < -0.5', ConfigConst.LED_DISPLAY_ACTUATOR_TYPE)
+		self.ruleEngine.addRule('Muggy', 'temp > 25 and humidity > 60', ConfigConst.HVAC_ACTUATOR_TYPE)
+		
+		self._evaluate(ConfigConst.PRESSURE_SENSOR_TYPE, 1000.0, 0)
+		self._evaluate(ConfigConst.PRESSURE_SENSOR_TYPE, 999.0, 10)
+		
+		self.assertFalse(self.ruleEngine.isRuleActive('StormWarning'))
+		
+		self.assertEqual(len(self._evaluate(ConfigConst.PRESSURE_SENSOR_TYPE, 990.0, 20)), 1)
+		self.assertTrue(self.ruleEngine.isRuleActive('StormWarning'))
+		
+		# false until both sensor types have readings
+		self.assertEqual(self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 27.0, 0), [])
+		self.assertEqual(len(self._evaluate(ConfigConst.HUMIDITY_SENSOR_TYPE, 65.0, 1)), 1)
+		self.assertEqual(len(self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 24.0, 2)), 1)
+		self.assertFalse(self.ruleEngine.isRuleActive('Muggy'))
+		
+	def testRulesAddedAfterReadings(self):
+		self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 25.0, 0)
+		self.ruleEngine.addRule('HvacCool', 'temp > 20.0', ConfigConst.HVAC_ACTUATOR_TYPE)
+		
+		# checked on the next reading even though no threshold was crossed
+		self.assertEqual(len(self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 25.5, 1)), 1)
+		
+		self.assertTrue(self.ruleEngine.removeRule('HvacCool'))
+		self.assertEqual(self._evaluate(ConfigConst.TEMP_SENSOR_TYPE, 15.0, 2), [])
+		
+	def testIndexMatchesCheckingEveryRule(self):
+		rand = random.Random(7)
+		reference = RuleEngine()
+		typeIDs = [ConfigConst.HUMIDITY_SENSOR_TYPE, ConfigConst.TEMP_SENSOR_TYPE]
+		
+		for i in range(0, 60):
+			condition = f"{typeIDs[i % 2]} {rand.choice(['<', '>', '<=', '>='])} {rand.randint(0, 10)}"
+			
+			if i % 3 == 0:
+				condition += f" and {typeIDs[(i + 1) % 2]} > {rand.randint(0, 10)}"
+			elif i % 5 == 0:
+				condition += f" and rate({typeIDs[i % 2]}) > 0"
+				
+			for ruleEngine in (self.ruleEngine, reference):
+				ruleEngine.addRule(f"Rule{i}", condition, ConfigConst.HVAC_ACTUATOR_TYPE, hysteresis = i % 4 / 2)
+				
+		for secs in range(0, 500):
+			sd = SensorData(typeID = rand.choice(typeIDs))
+			sd.setValue(float(rand.randint(0, 10)))
+			sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+			
+			self.ruleEngine.evaluate(sd)
+			reference.evaluate(sd)
+			
+			for rule in reference.rules.values():
+				rule.isActive = rule.check(rule.isActive)
+				
+			self.assertEqual( \
+				[self.ruleEngine.isRuleActive(name) for name in self.ruleEngine.getRuleNames()], \
+				[reference.isRuleActive(name) for name in reference.getRuleNames()])
+			
+	def testInvalidRules(self):
+		for condition in ('', 'temp', 'temp ~ 3', 'foo > 3', 'temp > 3 or humidity < 2'):
+			with self.assertRaises(ValueError):
+				self.ruleEngine.addRule('Invalid', condition, ConfigConst.HVAC_ACTUATOR_TYPE)
+				
+		self.assertEqual(self.ruleEngine.getRuleNames(), [])
+		
+	def _evaluate(self, typeID: int, value: float, secs: int) -> list:
+		sd = SensorData(typeID = typeID)
+		sd.setValue(value)
+		sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+		
+		return self.ruleEngine.evaluate(sd)
+		
+if __name__ == "__main__":
+	unittest.main()
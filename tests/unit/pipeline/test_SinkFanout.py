@@ -0,0 +1,137 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import threading
+import time
+import unittest
+
+from programmingtheiot.cda.pipeline.SinkFanout import SinkFanout
+
+class SinkFanoutTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SinkFanout.
+
+	"""
+
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SinkFanout class...")
+
+	def setUp(self):
+		self.release = threading.Event()
+		self.fanout = SinkFanout(maxPending = 2)
+
+	def tearDown(self):
+		self.release.set()
+		self.fanout.shutdown()
+
+	def testSinksSendInParallel(self):
+		self.fanout.addSink('first', lambda message: time.sleep(0.2) or True, timeout = 1.0)
+		self.fanout.addSink('second', lambda message: time.sleep(0.2) or True, timeout = 1.0)
+
+		startTime = time.monotonic()
+		results = self.fanout.send('message')
+		elapsed = time.monotonic() - startTime
+
+		self.assertEqual(results, {'first': SinkFanout.SENT, 'second': SinkFanout.SENT})
+		self.assertLess(elapsed, 0.35)
+
+		metrics = self.fanout.getMetrics()
+
+		self.assertEqual(metrics['first']['succeeded'], 1)
+		self.assertGreaterEqual(metrics['second']['maxLatencyMillis'], 200)
+
+	def testDeadSinkDoesNotHoldUpOthers(self):
+		sent = []
+
+		self.fanout.addSink('live', lambda message: sent.append(message) or True, timeout = 1.0)
+		self.fanout.addSink('dead', lambda message: self.release.wait(timeout = 5), timeout = 0.1)
+
+		# the first send waits for the dead sink's timeout; later sends don't
+		# wait for it at all, and once it has 'maxPending' sends it drops
+		results = [self.fanout.send(i) for i in range(0, 4)]
+
+		self.assertEqual(sent, [0, 1, 2, 3])
+		self.assertEqual([result['live'] for result in results], [SinkFanout.SENT] * 4)
+		self.assertEqual([result['dead'] for result in results], \
+			[SinkFanout.TIMED_OUT, SinkFanout.QUEUED, SinkFanout.DROPPED, SinkFanout.DROPPED])
+
+		metrics = self.fanout.getMetrics()['dead']
+
+		self.assertEqual((metrics['sent'], metrics['timedOut'], metrics['dropped'], metrics['pending']), (2, 1, 2, 2))
+
+		self.release.set()
+		self.fanout.shutdown()
+
+		metrics = self.fanout.getMetrics()['dead']
+
+		self.assertEqual((metrics['succeeded'], metrics['pending']), (2, 0))
+
+	def testShutdownDoesNotWaitForStuckSink(self):
+		self.fanout.addSink('stuck', lambda message: self.release.wait(timeout = 5), timeout = 0.1)
+
+		self.assertEqual(self.fanout.send('message')['stuck'], SinkFanout.TIMED_OUT)
+
+		startTime = time.time()
+		self.fanout.shutdown(timeout = 0.2)
+
+		self.assertLess(time.time() - startTime, 1.0)
+
+	def testFailuresAndDisabledSinks(self):
+		isEnabled = [False]
+
+		def fail(message):
+			raise IOError("Sink is down")
+
+		self.fanout.addSink('failing', fail)
+		self.fanout.addSink('refusing', lambda message: False)
+		self.fanout.addSink('optional', lambda message: True, isEnabled = lambda: isEnabled[0])
+
+		self.assertEqual(self.fanout.send('message'), {'failing': SinkFanout.FAILED, 'refusing': SinkFanout.FAILED})
+
+		isEnabled[0] = True
+
+		self.assertEqual(self.fanout.send('message'), \
+			{'failing': SinkFanout.FAILED, 'refusing': SinkFanout.FAILED, 'optional': SinkFanout.SENT})
+		self.assertEqual([entry['failed'] for entry in self.fanout.getMetrics().values()], [2, 2, 0])
+
+	def testBusySinkSendsByPriority(self):
+		sent = []
+
+		self.fanout = SinkFanout(maxPending = 3)
+		self.fanout.addSink('slow', lambda message: self.release.wait(timeout = 5) and sent.append(message) or True, timeout = 0.1)
+
+		# 'first' holds the sink; once it has 'maxPending' sends, a message
+		# evicts a queued one with a lower priority (a higher value), but
+		# not one with the same priority
+		results = [ \
+			self.fanout.send('first', priority = 2)['slow'],
+			self.fanout.send('telemetry-1', priority = 2)['slow'],
+			self.fanout.send('telemetry-2', priority = 2)['slow'],
+			self.fanout.send('control', priority = 0)['slow'],
+			self.fanout.send('telemetry-3', priority = 2)['slow'],
+			self.fanout.send('alert', priority = 1)['slow']]
+
+		self.assertEqual(results, \
+			[SinkFanout.TIMED_OUT, SinkFanout.QUEUED, SinkFanout.QUEUED, SinkFanout.QUEUED, SinkFanout.DROPPED, SinkFanout.QUEUED])
+
+		self.release.set()
+		self.fanout.shutdown()
+
+		self.assertEqual(sent, ['first', 'control', 'alert'])
+
+		metrics = self.fanout.getMetrics()['slow']
+
+		self.assertEqual((metrics['sent'], metrics['succeeded'], metrics['dropped'], metrics['pending']), (3, 3, 3, 0))
+
+if __name__ == "__main__":
+	unittest.main()
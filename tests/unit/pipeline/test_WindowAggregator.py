@@ -0,0 +1,149 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import numpy as calcLib
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.app.DeviceDataManager import DeviceDataManager
+from programmingtheiot.cda.pipeline.WindowAggregator import WindowAggregator
+from programmingtheiot.data.SensorData import SensorData
+from programmingtheiot.data.SensorDataSummary import SensorDataSummary
+
+class WindowAggregatorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	WindowAggregator.
+	
+	"""
+	NS_IN_SECS = 1000000000
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing WindowAggregator class...")
+		
+	def setUp(self):
+		self.aggregator = WindowAggregator()
+		self.aggregator.setPercentiles([50, 90])
+		self.aggregator.setWindows(ConfigConst.TEMP_SENSOR_TYPE, [(10, None)])
+		self.aggregator.setWindows(ConfigConst.PRESSURE_SENSOR_TYPE, [(10, 5)])
+		
+	def tearDown(self):
+		pass
+	
+	def testTumblingWindow(self):
+		values = [20.0, 21.0, 22.0, 23.0, 24.0]
+		summaries = []
+		
+		for secs, val in zip(range(0, 10, 2), values):
+			summaries += self._add(ConfigConst.TEMP_SENSOR_TYPE, val, secs)
+			
+		self.assertEqual(summaries, [])
+		
+		# the reading at 12 s closes [0, 10) and opens [10, 20)
+		summaries = self._add(ConfigConst.TEMP_SENSOR_TYPE, 30.0, 12)
+		
+		self.assertEqual(len(summaries), 1)
+		
+		summary = summaries[0]
+		
+		self.assertIsInstance(summary, SensorDataSummary)
+		self.assertEqual(summary.getTypeID(), ConfigConst.TEMP_SENSOR_TYPE)
+		self.assertEqual(summary.getSampleCount(), 5)
+		self.assertEqual(summary.getWindowSecs(), 10)
+		self.assertEqual(summary.getTimeStampNanos(), 10 * self.NS_IN_SECS)
+		self.assertAlmostEqual(summary.getValue(), calcLib.mean(values))
+		self.assertAlmostEqual(summary.getStddev(), calcLib.std(values))
+		self.assertEqual(summary.getMinValue(), 20.0)
+		self.assertEqual(summary.getMaxValue(), 24.0)
+		self.assertAlmostEqual(summary.getPercentile(50), 22.0)
+		self.assertAlmostEqual(summary.getPercentile(90), calcLib.percentile(values, 90))
+		
+		# the remaining window is published on flush
+		summaries = self.aggregator.flush()
+		
+		self.assertEqual([summary.getSampleCount() for summary in summaries], [1])
+		self.assertEqual(self.aggregator.getMetrics()['openWindows'], 0)
+		
+	def testSlidingWindow(self):
+		summaries = []
+		
+		for secs in range(0, 30):
+			summaries += self._add(ConfigConst.PRESSURE_SENSOR_TYPE, float(secs), secs)
+			
+		# windows of 10 s every 5 s: [-5, 5), [0, 10), ... [15, 25)
+		self.assertEqual([summary.getTimeStampNanos() // self.NS_IN_SECS for summary in summaries], [5, 10, 15, 20, 25])
+		self.assertEqual([summary.getSampleCount() for summary in summaries], [5, 10, 10, 10, 10])
+		self.assertEqual([summary.getMinValue() for summary in summaries], [0.0, 0.0, 5.0, 10.0, 15.0])
+		self.assertEqual(summaries[-1].getSlideSecs(), 5)
+		
+		metrics = self.aggregator.getMetrics()
+		
+		self.assertEqual(metrics['readings'], 30)
+		self.assertEqual(metrics['summaries'], 5)
+		self.assertEqual(metrics['openWindows'], 2)
+		
+	def testSensorsAndLateReadings(self):
+		self.assertEqual(self._add(ConfigConst.HUMIDITY_SENSOR_TYPE, 40.0, 0), [])
+		self.assertFalse(self.aggregator.isAggregated(ConfigConst.HUMIDITY_SENSOR_TYPE))
+		
+		# sensors of the same type are aggregated separately by name
+		self._add(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 1)
+		self._add(ConfigConst.TEMP_SENSOR_TYPE, 30.0, 2, name = "FooBar")
+		
+		summaries = self._add(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 11)
+		
+		self.assertEqual([summary.getName() for summary in summaries], [ConfigConst.NOT_SET])
+		
+		# [0, 10) is closed, so a reading from it isn't counted
+		self.assertEqual(self._add(ConfigConst.TEMP_SENSOR_TYPE, 20.0, 5), [])
+		self.assertEqual(self.aggregator.getMetrics()['late'], 1)
+		
+	def testSummariesArePublished(self):
+		ddm = DeviceDataManager(noComms = True)
+		ddm.windowAggregator = self.aggregator
+		
+		transmitted = []
+		
+		ddm._handleSensorDataAnalysis = lambda resource = None, data = None: None
+		ddm._handleUpstreamTransmission = lambda resourceName, data: transmitted.append(data.getData())
+		
+		for secs in (0, 5, 10):
+			sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE)
+			sd.setValue(20.0)
+			sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+			ddm.handleSensorMessage(sd)
+			
+		self.assertEqual([type(data) for data in transmitted], [SensorData, SensorData, SensorDataSummary, SensorData])
+		
+		# aggregated readings can be suppressed, leaving only the summaries
+		transmitted.clear()
+		ddm.suppressAggregatedReadings = True
+		
+		for secs in (15, 20):
+			sd = SensorData(typeID = ConfigConst.TEMP_SENSOR_TYPE)
+			sd.setValue(20.0)
+			sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+			ddm.handleSensorMessage(sd)
+			
+		self.assertEqual([type(data) for data in transmitted], [SensorDataSummary])
+		
+	def _add(self, typeID: int, value: float, secs: int, name: str = ConfigConst.NOT_SET) -> list:
+		sd = SensorData(typeID = typeID, name = name)
+		sd.setValue(value)
+		sd.setTimeStampNanos(secs * self.NS_IN_SECS)
+		
+		return self.aggregator.add(sd)
+		
+if __name__ == "__main__":
+	unittest.main()
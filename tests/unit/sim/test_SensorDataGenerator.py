@@ -0,0 +1,160 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import unittest
+
+import numpy
+
+from programmingtheiot.cda.sim.SensorDataGenerator import SensorDataGenerator, SensorDataStream
+from programmingtheiot.cda.sim.TemperatureSensorSimTask import TemperatureSensorSimTask
+
+class SensorDataGeneratorTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorDataGenerator, mostly checking that a SensorDataStream holds
+	the same data as the SensorDataSet generated with the same parameters.
+	
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorDataGenerator class...")
+		
+	def setUp(self):
+		self.dataGenerator = SensorDataGenerator()
+		
+	def tearDown(self):
+		pass
+	
+	def testStreamMatchesDataSet(self):
+		for alignGeneratorToDay in (True, False):
+			self.dataGenerator.alignGeneratorToDay = alignGeneratorToDay
+			
+			for curveType in (SensorDataGenerator.FULL_WAVE, SensorDataGenerator.BELL_CURVE, SensorDataGenerator.INVERSE_CURVE, SensorDataGenerator.CURVE_UP):
+				params = {'curveType': curveType, 'noiseLevel': SensorDataGenerator.NO_NOISE, 'minValue': 10.0, 'maxValue': 20.0, 'startHour': 2, 'endHour': 26}
+				
+				dataSet = self.dataGenerator.generateDailySensorDataSet(**params)
+				dataStream = self.dataGenerator.generateDailySensorDataSet(streamData = True, chunkSize = 100, **params)
+				
+				self.assertIsInstance(dataStream, SensorDataStream)
+				self.assertEqual(dataStream.getDataEntryCount(), dataSet.getDataEntryCount())
+				
+				numpy.testing.assert_allclose(dataStream.getTimeEntries(), dataSet.getTimeEntries())
+				numpy.testing.assert_allclose(dataStream.getDataEntries(), dataSet.getDataEntries())
+				
+				for index in (0, 99, 100, 1234, dataSet.getDataEntryCount() - 1):
+					self.assertAlmostEqual(dataStream.getTimeEntry(index), dataSet.getTimeEntry(index))
+					self.assertAlmostEqual(dataStream.getDataEntry(index), dataSet.getDataEntry(index))
+					
+	def testStreamChunks(self):
+		dataStream = self.dataGenerator.generateDailySensorDataSet(noiseLevel = 10, minValue = 10.0, maxValue = 20.0, \
+			startHour = 0, endHour = 24, useSeconds = True, streamData = True, chunkSize = 3600)
+		
+		chunks = list(dataStream.getChunks())
+		
+		self.assertEqual(dataStream.getDataEntryCount(), 24 * 60 * 60)
+		self.assertEqual(len(chunks), 24)
+		self.assertTrue(all(len(chunk) == 3600 for chunk in chunks))
+		
+		# the noise is drawn per chunk, with the scale of the data set's
+		noise = numpy.concatenate(chunks) - dataStream._scale(dataStream._calcCurve(numpy.arange(24 * 60 * 60)))
+		
+		self.assertAlmostEqual(numpy.std(noise), dataStream.noiseScale, delta = dataStream.noiseScale * 0.05)
+		
+		# reading in order keeps one chunk, generated (with its noise) when first read
+		self.assertEqual(dataStream.getDataEntry(3599), dataStream.getDataEntry(3599))
+		self.assertEqual(dataStream.chunkStart, 0)
+		
+		dataStream.getDataEntry(3600)
+		
+		self.assertEqual(dataStream.chunkStart, 3600)
+		self.assertEqual(len(dataStream.chunk), 3600)
+		
+	def testSingleEntry(self):
+		params = {'noiseLevel': SensorDataGenerator.NO_NOISE, 'minValue': 10.0, 'maxValue': 20.0, 'startHour': 3, 'endHour': 3}
+		
+		dataStream = self.dataGenerator.generateDailySensorDataSet(streamData = True, **params)
+		dataSet = self.dataGenerator.generateDailySensorDataSet(**params)
+		
+		self.assertEqual(dataStream.getDataEntryCount(), 1)
+		self.assertEqual(dataStream.getTimeEntry(5), 3.0)
+		self.assertEqual(dataStream.getDataEntry(0), dataSet.getDataEntry(0))
+		
+	def testMatrixMatchesDataSets(self):
+		curveTypes = [SensorDataGenerator.FULL_WAVE, SensorDataGenerator.BELL_CURVE, SensorDataGenerator.INVERSE_CURVE, SensorDataGenerator.CURVE_DOWN]
+		minValues = [15.0, 35.0, 990.0, -5.0]
+		maxValues = [25.0, 45.0, 1010.0, 5.0]
+		
+		dataMatrix = self.dataGenerator.generateSensorDataMatrix( \
+			curveTypes = curveTypes, noiseLevels = SensorDataGenerator.NO_NOISE, minValues = minValues, maxValues = maxValues, useSeconds = True)
+		floatMatrix = self.dataGenerator.generateSensorDataMatrix( \
+			curveTypes = curveTypes, noiseLevels = SensorDataGenerator.NO_NOISE, minValues = minValues, maxValues = maxValues, useSeconds = True, dtype = numpy.float32)
+		
+		self.assertEqual(dataMatrix.shape, (4, 24 * 60 * 60))
+		self.assertEqual(floatMatrix.dtype, numpy.float32)
+		self.assertEqual(floatMatrix.nbytes * 2, dataMatrix.nbytes)
+		
+		for row, params in enumerate(zip(curveTypes, minValues, maxValues)):
+			curveType, minValue, maxValue = params
+			dataSet = self.dataGenerator.generateDailySensorDataSet(curveType = curveType, noiseLevel = SensorDataGenerator.NO_NOISE, \
+				minValue = minValue, maxValue = maxValue, startHour = 0, endHour = 24, useSeconds = True)
+			
+			numpy.testing.assert_allclose(dataMatrix[row], dataSet.getDataEntries())
+			numpy.testing.assert_allclose(floatMatrix[row], dataSet.getDataEntries(), atol = (maxValue - minValue) * 1e-6)
+			
+	def testMatrixNoise(self):
+		params = {'curveTypes': SensorDataGenerator.FULL_WAVE, 'noiseLevels': [0, 10, 100], 'minValues': 10.0, 'maxValues': 20.0, 'seed': 42}
+		
+		dataMatrix = self.dataGenerator.generateSensorDataMatrix(**params)
+		cleanMatrix = self.dataGenerator.generateSensorDataMatrix(curveTypes = SensorDataGenerator.FULL_WAVE, noiseLevels = 0, minValues = 10.0, maxValues = 20.0)
+		
+		# the scalar parameters are broadcast to the noise levels
+		self.assertEqual(dataMatrix.shape, (3, 24 * 60))
+		
+		# noise scale: (noiseLevel / 100) * (10 ** log10(mean)) / 10
+		noise = numpy.std(dataMatrix - cleanMatrix, axis = 1)
+		
+		self.assertEqual(noise[0], 0.0)
+		self.assertAlmostEqual(noise[1], 0.1, delta = 0.01)
+		self.assertAlmostEqual(noise[2], 1.0, delta = 0.1)
+		
+		numpy.testing.assert_array_equal(self.dataGenerator.generateSensorDataMatrix(**params), dataMatrix)
+		
+	def testSensorDataSetViews(self):
+		dataMatrix = self.dataGenerator.generateSensorDataMatrix( \
+			curveTypes = [SensorDataGenerator.FULL_WAVE] * 10, minValues = numpy.linspace(10.0, 19.0, 10), maxValues = 30.0, dtype = numpy.float32)
+		dataSets = self.dataGenerator.createSensorDataSets(dataMatrix)
+		
+		self.assertEqual(len(dataSets), 10)
+		
+		for row, dataSet in enumerate(dataSets):
+			self.assertTrue(numpy.shares_memory(dataSet.getDataEntries(), dataMatrix[row]))
+			self.assertTrue(numpy.shares_memory(dataSet.getTimeEntries(), dataSets[0].getTimeEntries()))
+			self.assertEqual(dataSet.getTimeEntry(dataSet.getDataEntryCount() - 1), 24.0)
+			
+		simTask = TemperatureSensorSimTask(dataSet = dataSets[3])
+		
+		# entries are read as floats, whatever the matrix's dtype
+		self.assertIsInstance(simTask.generateTelemetry().getValue(), float)
+		self.assertEqual(simTask.getTelemetryValue(), float(dataMatrix[3, 0]))
+		
+	def testSimTaskWithStream(self):
+		dataStream = self.dataGenerator.generateDailyIndoorTemperatureDataSet( \
+			minValue = SensorDataGenerator.LOW_NORMAL_INDOOR_TEMP, maxValue = SensorDataGenerator.HI_NORMAL_INDOOR_TEMP, streamData = True)
+		
+		simTask = TemperatureSensorSimTask(dataSet = dataStream)
+		values = [simTask.generateTelemetry().getValue() for _ in range(dataStream.getDataEntryCount() + 1)]
+		
+		self.assertEqual(len(values), 24 * 60 + 1)
+		self.assertTrue(all(SensorDataGenerator.MIN_INDOOR_TEMP < value < SensorDataGenerator.MAX_INDOOR_TEMP for value in values))
+		
+if __name__ == "__main__":
+	unittest.main()
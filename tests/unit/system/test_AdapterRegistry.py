@@ -0,0 +1,181 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import logging
+import sys
+import unittest
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.system.ActuatorAdapterManager import ActuatorAdapterManager
+from programmingtheiot.cda.system.AdapterRegistry import AdapterRegistry
+from programmingtheiot.cda.system.SensorAdapterManager import SensorAdapterManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.ActuatorData import ActuatorData
+
+class AdapterRegistryTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	AdapterRegistry. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	SIM_SENSOR_CLASS = 'programmingtheiot.cda.sim.BaseSensorSimTask'
+	
+	# only imported if a hardware sensor is created
+	HARDWARE_SENSOR_CLASS = 'programmingtheiot.cda.embedded.HumidityI2cSensorAdapterTask'
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing AdapterRegistry class...")
+		
+	def setUp(self):
+		self.configParser = ConfigUtil()._getConfig()
+		
+		# (section, key) -> original value, or None if not set
+		self.savedOptions = {}
+		self.addedSections = []
+		
+		self._setOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, 'False')
+		
+	def tearDown(self):
+		for (section, key), val in self.savedOptions.items():
+			if val is None:
+				self.configParser.remove_option(section, key)
+			else:
+				self.configParser.set(section, key, val)
+				
+		for section in self.addedSections:
+			self.configParser.remove_section(section)
+			
+	def testDefaultAdapters(self):
+		self._removeOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SENSORS_KEY)
+		self._removeOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ACTUATORS_KEY)
+		
+		registry = AdapterRegistry()
+		
+		self.assertEqual(registry.getMode(), AdapterRegistry.SIM_MODE)
+		self.assertEqual( \
+			[entry.name for entry in registry.getSensorEntries()], \
+			[ConfigConst.HUMIDITY_SENSOR_NAME, ConfigConst.PRESSURE_SENSOR_NAME, ConfigConst.TEMP_SENSOR_NAME])
+		
+		# there's no simulated LED display
+		actuators = [registry.createAdapter(entry) for entry in registry.getActuatorEntries()]
+		
+		self.assertEqual([actuator is not None for actuator in actuators], [True, True, False])
+		self.assertEqual(actuators[1].getLatestActuatorResponse().getTypeID(), ConfigConst.HVAC_ACTUATOR_TYPE)
+
+	def testDeclaredSensors(self):
+		self._declareSensors(5)
+		
+		registry = AdapterRegistry()
+		entries = registry.getSensorEntries()
+		
+		self.assertEqual(len(entries), 5)
+		self.assertEqual(entries[0].pollSecs, 2.0)
+		
+		sensor = registry.createAdapter(entries[3])
+		sensorData = sensor.generateTelemetry()
+		
+		self.assertEqual(sensorData.getName(), "TestSensor3")
+		self.assertEqual(sensorData.getTypeID(), 5003)
+		self.assertGreaterEqual(sensorData.getValue(), 10.0)
+		self.assertLessEqual(sensorData.getValue(), 20.0)
+		
+		# the hardware adapters aren't imported in sim mode
+		self.assertEqual(registry.getImportedClassNames(), [self.SIM_SENSOR_CLASS])
+		self.assertNotIn(self.HARDWARE_SENSOR_CLASS, sys.modules)
+
+	def testInvalidEntries(self):
+		self._setOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SENSORS_KEY, "MissingSensor, BadSensor")
+		self._addSection(ConfigConst.SENSOR_SECTION_PREFIX + "BadSensor", {ConfigConst.ADAPTER_SIM_CLASS_KEY: 'programmingtheiot.cda.sim.NoSuchTask'})
+		
+		registry = AdapterRegistry()
+		entries = registry.getSensorEntries()
+		
+		self.assertEqual([entry.name for entry in entries], ["BadSensor"])
+		self.assertIsNone(registry.createAdapter(entries[0]))
+
+	def testSensorAdapterManager(self):
+		self._declareSensors(5)
+		
+		sensorAdapterMgr = SensorAdapterManager()
+		
+		self.assertEqual( \
+			[(adapter.getName(), pollSecs) for adapter, pollSecs in sensorAdapterMgr.sensorAdapters], \
+			[(f"TestSensor{i}", 2.0 if i == 0 else float(sensorAdapterMgr.pollRate)) for i in range(0, 5)])
+
+	def testActuatorAdapterManager(self):
+		self._setOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ACTUATORS_KEY, "HvacActuator, Hvac2")
+		self._setOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.DEVICE_LOCATION_ID_KEY, "TestLocation")
+		
+		for name in ("HvacActuator", "Hvac2"):
+			self._addSection(ConfigConst.ACTUATOR_SECTION_PREFIX + name, { \
+				ConfigConst.ADAPTER_TYPE_ID_KEY: str(ConfigConst.HVAC_ACTUATOR_TYPE), \
+				ConfigConst.ADAPTER_SIM_CLASS_KEY: 'programmingtheiot.cda.sim.BaseActuatorSimTask'})
+			
+		actuatorAdapterMgr = ActuatorAdapterManager()
+		
+		data = ActuatorData(typeID = ConfigConst.HVAC_ACTUATOR_TYPE, name = "Hvac2")
+		data.setLocationID("TestLocation")
+		data.setCommand(ConfigConst.COMMAND_ON)
+		data.setValue(21.0)
+		
+		response = actuatorAdapterMgr.sendActuatorCommand(data)
+		
+		self.assertEqual(response.getName(), "Hvac2")
+		self.assertEqual(response.getValue(), 21.0)
+		self.assertEqual(len(actuatorAdapterMgr.actuators[ConfigConst.HVAC_ACTUATOR_TYPE]), 2)
+
+	def _declareSensors(self, count: int):
+		names = [f"TestSensor{i}" for i in range(0, count)]
+		
+		self._setOption(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.SENSORS_KEY, ", ".join(names))
+		
+		for i, name in enumerate(names):
+			options = { \
+				ConfigConst.ADAPTER_TYPE_ID_KEY: str(5000 + i), \
+				ConfigConst.ADAPTER_SIM_CLASS_KEY: self.SIM_SENSOR_CLASS, \
+				ConfigConst.ADAPTER_HARDWARE_CLASS_KEY: self.HARDWARE_SENSOR_CLASS, \
+				ConfigConst.ADAPTER_MIN_VAL_KEY: '10.0', \
+				ConfigConst.ADAPTER_MAX_VAL_KEY: '20.0'}
+			
+			if i == 0:
+				options[ConfigConst.ADAPTER_POLL_SECS_KEY] = '2.0'
+				
+			self._addSection(ConfigConst.SENSOR_SECTION_PREFIX + name, options)
+			
+	def _addSection(self, section: str, options: dict):
+		self.configParser.add_section(section)
+		self.addedSections.append(section)
+		
+		for key, val in options.items():
+			self.configParser.set(section, key, val)
+			
+	def _removeOption(self, section: str, key: str):
+		if self.configParser.has_option(section, key):
+			self._saveOption(section, key)
+			self.configParser.remove_option(section, key)
+			
+	def _saveOption(self, section: str, key: str):
+		if not self.configParser.has_section(section):
+			self._addSection(section, {})
+			
+		if (section, key) not in self.savedOptions:
+			self.savedOptions[(section, key)] = self.configParser.get(section, key, fallback = None)
+			
+	def _setOption(self, section: str, key: str, val: str):
+		self._saveOption(section, key)
+		self.configParser.set(section, key, val)
+
+if __name__ == "__main__":
+	unittest.main()
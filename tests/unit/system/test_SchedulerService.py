@@ -0,0 +1,136 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import asyncio
+import logging
+import threading
+import time
+import unittest
+
+from programmingtheiot.cda.system.SchedulerService import SchedulerService
+
+class SchedulerServiceTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SchedulerService. It should not be considered complete,
+	but serve as a starting point for the student implementing
+	additional functionality within their Programming the IoT
+	environment.
+	"""
+	
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SchedulerService class...")
+		
+	def setUp(self):
+		self.scheduler = SchedulerService()
+		self.runCount = 0
+
+	def tearDown(self):
+		for jobID in self.scheduler.getJobIDs():
+			self.scheduler.removeJob(jobID)
+
+	def testStaggeredPhases(self):
+		for i in range(0, 4):
+			self.scheduler.addJob(f"test.stagger{i}", self._run, 1.0)
+			
+		self.scheduler.addJob("test.fixed", self._run, 1.0, phaseSecs = 0.25)
+		
+		byJob = self.scheduler.getMetrics()['byJob']
+		
+		# the default stagger step is 0.5 s, so two slots per second
+		self.assertEqual([byJob[f"test.stagger{i}"]['phaseSecs'] for i in range(0, 4)], [0.0, 0.5, 0.0, 0.5])
+		self.assertEqual(byJob['test.fixed']['phaseSecs'], 0.25)
+
+	def testRunsAndWakeups(self):
+		wakeups = self.scheduler.getMetrics()['wakeups']
+		
+		# two jobs in the same phase share each wakeup
+		self.scheduler.addJob("test.a", self._run, 0.2, phaseSecs = 0.0)
+		self.scheduler.addJob("test.b", self._run, 0.2, phaseSecs = 0.0)
+		
+		time.sleep(1.1)
+		
+		metrics = self.scheduler.getMetrics()
+		
+		self.assertGreaterEqual(metrics['runs'], 8)
+		self.assertGreaterEqual(self.runCount, metrics['runs'])
+		self.assertLessEqual(metrics['wakeups'] - wakeups, metrics['runs'] // 2 + 1)
+		self.assertEqual(metrics['overruns'], 0)
+		self.assertEqual(metrics['errors'], 0)
+
+	def testOverrunsAndErrors(self):
+		self.scheduler.addJob("test.slow", time.sleep, 0.1, args = [0.35])
+		self.scheduler.addJob("test.failing", self._fail, 0.2)
+		
+		time.sleep(1.1)
+		
+		byJob = self.scheduler.getMetrics()['byJob']
+		
+		self.assertGreater(byJob['test.slow']['overruns'], 0)
+		self.assertGreater(byJob['test.slow']['maxDelayMillis'], 350.0)
+		self.assertGreater(byJob['test.failing']['errors'], 0)
+
+	def testStopsWithoutJobs(self):
+		threadCount = threading.active_count()
+		
+		self.assertTrue(self.scheduler.addJob("test.a", self._run, 5.0))
+		self.assertTrue(self.scheduler.isRunning())
+		self.assertTrue(self.scheduler.addJob("test.b", self._run, 5.0))
+		
+		self.assertTrue(self.scheduler.removeJob("test.a"))
+		self.assertTrue(self.scheduler.isRunning())
+		self.assertTrue(self.scheduler.removeJob("test.b"))
+		self.assertFalse(self.scheduler.isRunning())
+		self.assertFalse(self.scheduler.removeJob("test.b"))
+		
+		time.sleep(0.2)
+		
+		self.assertLessEqual(threading.active_count(), threadCount)
+
+	def testRunNow(self):
+		self.scheduler.addJob("test.now", self._run, 10.0, phaseSecs = 5.0, runNow = True)
+		
+		time.sleep(0.3)
+		
+		self.assertEqual(self.runCount, 1)
+		self.assertEqual(self.scheduler.getMetrics()['byJob']['test.now']['phaseSecs'], 5.0)
+
+	def testEventLoop(self):
+		threadIDs = set()
+		
+		async def runOnLoop():
+			self.scheduler.addJob("test.loop", lambda: threadIDs.add(threading.get_ident()), 0.1, runNow = True)
+			self.assertTrue(self.scheduler.isAsync())
+			
+			await asyncio.sleep(0.5)
+			
+			self.assertGreaterEqual(self.scheduler.getMetrics()['byJob']['test.loop']['runs'], 4)
+			self.scheduler.removeJob("test.loop")
+			
+		asyncio.run(runOnLoop())
+		
+		# jobs added from a running event loop run on the loop's thread
+		self.assertEqual(threadIDs, {threading.get_ident()})
+		self.assertFalse(self.scheduler.isRunning())
+		self.assertFalse(self.scheduler.isAsync())
+
+	def testInvalidInterval(self):
+		self.assertFalse(self.scheduler.addJob("test.invalid", self._run, 0))
+		self.assertEqual(self.scheduler.getJobIDs(), [])
+
+	def _run(self):
+		self.runCount += 1
+		
+	def _fail(self):
+		raise RuntimeError("Failing on purpose.")
+
+if __name__ == "__main__":
+	unittest.main()
@@ -0,0 +1,250 @@
+#####
+# 
+# This class is part of the Programming the Internet of Things
+# project, and is available via the MIT License, which can be
+# found in the LICENSE file at the top level of this repository.
+# 
+# Copyright (c) 2020 - 2025 by Andrew D. King
+# 
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import unittest
+
+import numpy
+
+import programmingtheiot.common.ConfigConst as ConfigConst
+
+from programmingtheiot.cda.sim.BaseSensorSimTask import BaseSensorSimTask
+from programmingtheiot.cda.system.SensorAdapterManager import SensorAdapterManager
+from programmingtheiot.common.ConfigUtil import ConfigUtil
+from programmingtheiot.data.SensorData import SensorData
+
+class SensorAdapterManagerTest(unittest.TestCase):
+	"""
+	This test case class contains very basic unit tests for
+	SensorAdapterManager's concurrent sensor reads. It should not be
+	considered complete, but serve as a starting point for the student
+	implementing additional functionality within their Programming the
+	IoT environment.
+	"""
+	
+	class DelayedSensorTask(BaseSensorSimTask):
+		def __init__(self, name: str, delaySecs: float = 0.0, isReady: bool = True):
+			super().__init__(name = name, typeID = ConfigConst.TEMP_SENSOR_TYPE)
+			
+			self.delaySecs = delaySecs
+			self.isReady = isReady
+			self.readCount = 0
+			
+		def generateTelemetry(self) -> SensorData:
+			self.readCount += 1
+			time.sleep(self.delaySecs)
+			
+			return super().generateTelemetry() if self.isReady else None
+		
+	class ReadingListener(object):
+		def __init__(self, delaySecs: float = 0.0):
+			self.delaySecs = delaySecs
+			self.names = []
+			self.threadIDs = []
+			
+		def handleSensorMessage(self, data: SensorData) -> bool:
+			time.sleep(self.delaySecs)
+			self.names.append(data.getName())
+			self.threadIDs.append(threading.get_ident())
+			return True
+		
+	@classmethod
+	def setUpClass(self):
+		logging.basicConfig(format = '%(asctime)s:%(module)s:%(levelname)s:%(message)s', level = logging.DEBUG)
+		logging.info("Testing SensorAdapterManager class...")
+		
+		self.config = ConfigUtil(configFile = os.path.dirname(__file__) + "/../../../config/PiotConfig.props")._getConfig()
+		
+	def setUp(self):
+		self.listener = self.ReadingListener()
+		
+		self.sensorAdapterMgr = SensorAdapterManager(self.listener)
+		self.sensorAdapterMgr.sensorAdapters = []
+		self.sensorAdapterMgr.readWorkers = 4
+		self.sensorAdapterMgr.readTimeout = 0.5
+		
+	def tearDown(self):
+		if self.sensorAdapterMgr.readExecutor:
+			self.sensorAdapterMgr.readExecutor.shutdown(wait = False)
+			
+		if self.sensorAdapterMgr.handlerExecutor:
+			self.sensorAdapterMgr.handlerExecutor.shutdown(wait = False)
+
+	def testConcurrentReads(self):
+		for i in range(0, 4):
+			self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask(f"Sensor{i}", 0.2))
+			
+		startTime = time.perf_counter()
+		self.sensorAdapterMgr.handleTelemetry()
+		elapsedSecs = time.perf_counter() - startTime
+		
+		# four 0.2 s reads on four workers
+		self.assertLess(elapsedSecs, 0.4)
+		self.assertEqual(sorted(self.listener.names), [f"Sensor{i}" for i in range(0, 4)])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['reads'], 4)
+
+	def testNotReadySkipped(self):
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Ready"))
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("NotReady", isReady = False))
+		
+		self.sensorAdapterMgr.handleTelemetry()
+		
+		self.assertEqual(self.listener.names, ["Ready"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['notReady'], 1)
+
+	def testHungSensorSkipped(self):
+		hungSensor = self.DelayedSensorTask("Hung", 1.5)
+		
+		self.sensorAdapterMgr.addSensorAdapter(hungSensor)
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Fast", 0.05))
+		
+		startTime = time.perf_counter()
+		self.sensorAdapterMgr.handleTelemetry()
+		elapsedSecs = time.perf_counter() - startTime
+		
+		self.assertLess(elapsedSecs, 0.7)
+		self.assertEqual(self.listener.names, ["Fast"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['timeouts'], 1)
+		
+		# the hung sensor isn't read again until its read finishes
+		self.sensorAdapterMgr.handleTelemetry()
+		
+		self.assertEqual(hungSensor.readCount, 1)
+		self.assertEqual(self.listener.names, ["Fast", "Fast"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['busy'], 1)
+
+	def testScheduledReads(self):
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Slow", 0.2))
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Late", 0.8))
+		
+		# the scheduled polls don't wait for the readings
+		startTime = time.perf_counter()
+		
+		for adapter, pollSecs in self.sensorAdapterMgr.sensorAdapters:
+			self.sensorAdapterMgr.handleSensorTelemetry(adapter)
+			
+		self.assertLess(time.perf_counter() - startTime, 0.1)
+		self.assertEqual(self.listener.names, [])
+		
+		time.sleep(1.0)
+		
+		# the late reading is dropped
+		self.assertEqual(self.listener.names, ["Slow"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['timeouts'], 1)
+
+	def testSlowListenerDoesNotHoldReadWorkers(self):
+		self.listener.delaySecs = 0.6
+		self.sensorAdapterMgr.readWorkers = 1
+		
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("First", 0.05))
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Second", 0.05))
+		
+		# the one read worker takes both readings while the first is handled
+		for adapter, pollSecs in self.sensorAdapterMgr.sensorAdapters:
+			self.sensorAdapterMgr.handleSensorTelemetry(adapter)
+			
+		time.sleep(1.5)
+		
+		self.assertEqual(self.listener.names, ["First", "Second"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['timeouts'], 0)
+		self.assertEqual(len(set(self.listener.threadIDs)), 1)
+		self.assertNotEqual(self.listener.threadIDs[0], threading.get_ident())
+		
+	def testScheduledReadsOnEventLoop(self):
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Slow", 0.1))
+		
+		async def pollOnLoop():
+			for adapter, pollSecs in self.sensorAdapterMgr.sensorAdapters:
+				self.sensorAdapterMgr.handleSensorTelemetry(adapter)
+				
+			await asyncio.sleep(0.3)
+			
+		asyncio.run(pollOnLoop())
+		
+		# the sensor is read on a read worker, but its reading is handled on the loop
+		self.assertEqual(self.listener.names, ["Slow"])
+		self.assertEqual(self.listener.threadIDs, [threading.get_ident()])
+
+	def testFailedReadSkipped(self):
+		failingSensor = self.DelayedSensorTask("Failing")
+		failingSensor.generateTelemetry = lambda: 1 / 0
+		
+		self.sensorAdapterMgr.addSensorAdapter(failingSensor)
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Working"))
+		
+		self.sensorAdapterMgr.handleTelemetry()
+		
+		self.assertEqual(self.listener.names, ["Working"])
+		self.assertEqual(self.sensorAdapterMgr.getReadMetrics()['errors'], 1)
+		
+	def testClearedHistoryKept(self):
+		self.sensorAdapterMgr.enableSensorHistory = True
+		self.sensorAdapterMgr.addSensorAdapter(self.DelayedSensorTask("Sensor"))
+		self.sensorAdapterMgr.handleTelemetry()
+		
+		history = self.sensorAdapterMgr.getSensorHistory("Sensor")
+		history.clear()
+		
+		# an empty history is still the sensor's history
+		self.sensorAdapterMgr.handleTelemetry()
+		
+		self.assertIs(self.sensorAdapterMgr.getSensorHistory("Sensor"), history)
+		self.assertEqual(len(history), 1)
+		
+	def testSimSensorsShareDataMatrix(self):
+		sensorAdapterMgr = SensorAdapterManager(self.listener)
+		dataSets = [adapter.dataSet for adapter, pollSecs in sensorAdapterMgr.sensorAdapters if getattr(adapter, 'dataSet', None)]
+		
+		if not dataSets:
+			self.skipTest("No simulated sensors configured.")
+			
+		# each sim task holds a view of its row of one generated matrix
+		dataMatrix = dataSets[0].getDataEntries().base
+		
+		self.assertEqual(dataMatrix.shape[0], len(dataSets))
+		
+		for dataSet in dataSets:
+			self.assertIs(dataSet.getDataEntries().base, dataMatrix)
+			self.assertTrue(numpy.shares_memory(dataSet.getTimeEntries(), dataSets[0].getTimeEntries()))
+			
+		numpy.testing.assert_array_equal(numpy.array([dataSet.getDataEntries() for dataSet in dataSets]), dataMatrix)
+
+	def testSimRangeClamped(self):
+		keys = (ConfigConst.ENABLE_EMULATOR_KEY, ConfigConst.HUMIDITY_SIM_FLOOR_KEY, ConfigConst.HUMIDITY_SIM_CEILING_KEY)
+		savedConfig = {key: self.config.get(ConfigConst.CONSTRAINED_DEVICE, key, fallback = None) for key in keys}
+		
+		# simulated sensors: a ceiling above 100 % is lowered to it, and a
+		# floor above the ceiling is set just below it
+		self.config.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.ENABLE_EMULATOR_KEY, 'False')
+		self.config.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.HUMIDITY_SIM_FLOOR_KEY, '120.0')
+		self.config.set(ConfigConst.CONSTRAINED_DEVICE, ConfigConst.HUMIDITY_SIM_CEILING_KEY, '150.0')
+		
+		try:
+			sensorAdapterMgr = SensorAdapterManager(self.listener)
+		finally:
+			for key, val in savedConfig.items():
+				if val is None:
+					self.config.remove_option(ConfigConst.CONSTRAINED_DEVICE, key)
+				else:
+					self.config.set(ConfigConst.CONSTRAINED_DEVICE, key, val)
+					
+		dataSets = [adapter.dataSet for adapter, pollSecs in sensorAdapterMgr.sensorAdapters \
+			if getattr(adapter, 'dataSet', None) and adapter.getTypeID() == ConfigConst.HUMIDITY_SENSOR_TYPE]
+		
+		if not dataSets:
+			self.skipTest("No simulated humidity sensor configured.")
+			
+		self.assertAlmostEqual(float(numpy.mean(dataSets[0].getDataEntries())), 99.5, delta = 1.0)
+		
+if __name__ == "__main__":
+	unittest.main()